@@ -1,5 +1,5 @@
 from os import getcwd
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from napytau.util.coalesce import coalesce
 from argparse import Namespace
@@ -12,6 +12,19 @@ class CLIArguments:
     fit_file_path: Optional[str]
     setup_identifier: Optional[str]
     t_hyp_estimate: Optional[float]
+    batch_paths: Optional[List[str]]
+    workers: Optional[int]
+    results_file_path: Optional[str]
+    index_root: Optional[str]
+    update_index: bool
+    velocity_range: Optional[Tuple[float, float]]
+    stale_only: bool
+    cache_directory: Optional[str]
+    influence: bool
+    trusted: bool
+    numpy_export_directory: Optional[str]
+    monte_carlo_samples: Optional[int]
+    monte_carlo_seed: Optional[int]
 
     def __init__(self, raw_args: Namespace):
         self.headless = coalesce(raw_args.headless, False)
@@ -20,6 +33,23 @@ class CLIArguments:
         self.fit_file_path = raw_args.fit_file
         self.setup_identifier = raw_args.setup_identifier
         self.t_hyp_estimate = raw_args.t_hyp_estimate
+        self.batch_paths = raw_args.batch
+        self.workers = raw_args.workers
+        self.results_file_path = raw_args.results_file
+        self.index_root = raw_args.index_root
+        self.update_index = coalesce(raw_args.update_index, False)
+        self.velocity_range = (
+            (raw_args.velocity_range[0], raw_args.velocity_range[1])
+            if raw_args.velocity_range is not None
+            else None
+        )
+        self.stale_only = coalesce(raw_args.stale, False)
+        self.cache_directory = raw_args.cache_directory
+        self.influence = coalesce(raw_args.influence, False)
+        self.trusted = coalesce(raw_args.trusted, False)
+        self.numpy_export_directory = raw_args.export_numpy
+        self.monte_carlo_samples = raw_args.monte_carlo_samples
+        self.monte_carlo_seed = raw_args.monte_carlo_seed
 
     def is_headless(self) -> bool:
         return self.headless
@@ -38,3 +68,42 @@ class CLIArguments:
 
     def get_t_hyp_estimate(self) -> Optional[float]:
         return self.t_hyp_estimate
+
+    def get_batch_paths(self) -> Optional[List[str]]:
+        return self.batch_paths
+
+    def get_workers(self) -> Optional[int]:
+        return self.workers
+
+    def get_results_file_path(self) -> Optional[str]:
+        return self.results_file_path
+
+    def get_index_root(self) -> Optional[str]:
+        return self.index_root
+
+    def should_update_index(self) -> bool:
+        return self.update_index
+
+    def get_velocity_range(self) -> Optional[Tuple[float, float]]:
+        return self.velocity_range
+
+    def is_stale_only(self) -> bool:
+        return self.stale_only
+
+    def get_cache_directory(self) -> Optional[str]:
+        return self.cache_directory
+
+    def should_calculate_influence(self) -> bool:
+        return self.influence
+
+    def is_trusted(self) -> bool:
+        return self.trusted
+
+    def get_numpy_export_directory(self) -> Optional[str]:
+        return self.numpy_export_directory
+
+    def get_monte_carlo_samples(self) -> Optional[int]:
+        return self.monte_carlo_samples
+
+    def get_monte_carlo_seed(self) -> Optional[int]:
+        return self.monte_carlo_seed
@@ -21,7 +21,8 @@ def parse_cli_arguments() -> CLIArguments:
         "--data_files_directory",
         type=str,
         help="""Path to the directory containing either data files or subdirectories
-        with data files""",
+        with data files, the file for NaPyTau format or the directory of .npy files
+        for numpy format""",
     )
     parser.add_argument(
         "--fit_file",
@@ -34,7 +35,7 @@ def parse_cli_arguments() -> CLIArguments:
         "--setup_identifier",
         type=str,
         help="""Identifier of the setup to use with the dataset, file path for legacy
-        format, or setup name for NaPyTau format""",
+        format, or setup name for NaPyTau and numpy format""",
     )
 
     parser.add_argument(
@@ -43,4 +44,96 @@ def parse_cli_arguments() -> CLIArguments:
         help="""Custom t_hyp estimate to use for the calculations""",
     )
 
+    parser.add_argument(
+        "--batch",
+        type=str,
+        nargs="+",
+        help="""Paths, glob patterns or directory trees of datasets to process in
+        batch mode, the results are written as a CSV table""",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="""Number of worker processes in batch mode and for the Monte Carlo
+        uncertainty, defaults to the number of CPUs""",
+    )
+
+    parser.add_argument(
+        "--results_file",
+        type=str,
+        help="""Path of the CSV file to write the batch results to, defaults to
+        stdout""",
+    )
+
+    parser.add_argument(
+        "--index_root",
+        type=str,
+        help="""Root directory of the datasets whose campaign index to query, the index
+        is stored in this directory. In batch mode, the results are recorded in it""",
+    )
+
+    parser.add_argument(
+        "--update_index",
+        action="store_true",
+        help="""Search the index root for datasets and update the index before
+        querying it""",
+    )
+
+    parser.add_argument(
+        "--velocity_range",
+        type=float,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        help="""Only list indexed datasets with a relative velocity in this range""",
+    )
+
+    parser.add_argument(
+        "--stale",
+        action="store_true",
+        help="""Only list indexed datasets whose results are stale""",
+    )
+
+    parser.add_argument(
+        "--cache_directory",
+        type=str,
+        help="""Directory of the on-disk result cache, which keeps the results of the
+        calculations across runs, so only changed datasets are recalculated""",
+    )
+
+    parser.add_argument(
+        "--influence",
+        action="store_true",
+        help="""Also print the lifetime without each datapoint and the leverage and
+        Cook's distance of the datapoints""",
+    )
+
+    parser.add_argument(
+        "--trusted",
+        action="store_true",
+        help="""Skip the validation of NaPyTau format files against the json schema
+        and stream them instead, for files written by NaPyTau itself""",
+    )
+
+    parser.add_argument(
+        "--export_numpy",
+        type=str,
+        help="""Directory to save the loaded dataset to in the numpy format, which is
+        opened with --dataset_format numpy without parsing the dataset again""",
+    )
+
+    parser.add_argument(
+        "--monte_carlo_samples",
+        type=int,
+        help="""Also print percentiles of the lifetime from this number of datasets
+        drawn from the values and errors of the dataset""",
+    )
+
+    parser.add_argument(
+        "--monte_carlo_seed",
+        type=int,
+        help="""Seed of the random generator for the Monte Carlo uncertainty, a random
+        seed is used and printed if omitted""",
+    )
+
     return CLIArguments(parser.parse_args())
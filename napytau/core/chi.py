@@ -3,14 +3,13 @@ from napytau.core.polynomials import (
     evaluate_polynomial_at_measuring_times,
 )
 import numpy as np
-import scipy as sp
-from typing import Tuple
+from typing import Tuple, Union
 
-from napytau.import_export.model.dataset import DataSet
+from napytau.core.fit_context import FitContext
 
 
 def calculate_chi_squared(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
     tau_factor: float,
     weight_factor: float,
@@ -19,7 +18,7 @@ def calculate_chi_squared(
     Computes the chi-squared value for a given hypothesis t_hyp
 
     Args:
-        dataset (DataSet): The dataset of the experiment
+        context (FitContext): The prepared data of the experiment
         coefficients (ndarray):
         Polynomial coefficients for fitting
         tau_factor (float):
@@ -31,24 +30,23 @@ def calculate_chi_squared(
         float: The chi-squared value for the given inputs.
     """
 
-    datapoints = dataset.get_datapoints()
     # Compute the difference between Doppler-shifted intensities and polynomial model
     shifted_intensity_difference: np.ndarray = (
-        datapoints.get_shifted_intensities().get_values()
-        - evaluate_polynomial_at_measuring_times(dataset, coefficients)
-    ) / datapoints.get_shifted_intensities().get_errors()
+        context.shifted_intensities
+        - evaluate_polynomial_at_measuring_times(context, coefficients)
+    ) / context.shifted_intensity_errors
 
     # Compute the difference between unshifted intensities and
     # scaled derivative of the polynomial model
     unshifted_intensity_difference: np.ndarray = (
-        datapoints.get_unshifted_intensities().get_values()
+        context.unshifted_intensities
         - (
             tau_factor
             * evaluate_differentiated_polynomial_at_measuring_times(
-                dataset, coefficients
+                context, coefficients
             )
         )
-    ) / datapoints.get_unshifted_intensities().get_errors()
+    ) / context.unshifted_intensity_errors
 
     # combine the weighted sum of squared differences
     result: float = np.sum(
@@ -59,27 +57,182 @@ def calculate_chi_squared(
     return result
 
 
+def calculate_chi_squared_for_tau_factors(
+    context: FitContext,
+    coefficients: np.ndarray,
+    tau_factors: np.ndarray,
+    weight_factors: Union[float, np.ndarray],
+) -> np.ndarray:
+    """
+    Computes the chi-squared values for many hypotheses t_hyp, and optionally many
+    weighting factors, at once. The polynomial and its derivative are evaluated a
+    single time and the residuals of all hypotheses are computed in one broadcast
+    operation, so the whole chi-squared curve costs about as much as a handful of
+    calls to calculate_chi_squared.
+
+    Args:
+        context (FitContext): The prepared data of the experiment
+        coefficients (ndarray):
+        Polynomial coefficients for fitting
+        tau_factors (ndarray):
+        Hypothesis values for the scaling factor
+        weight_factors (float or ndarray):
+        Weighting factor, or an array of weighting factors, for unshifted
+        intensities
+
+    Returns:
+        ndarray: The chi-squared value for every tau factor. For an array of
+        weighting factors, a grid with one row per weighting factor and one column
+        per tau factor.
+    """
+    tau_factors = np.asarray(tau_factors, dtype=float)
+
+    # The shifted part of chi-squared does not depend on t_hyp or the weighting
+    shifted_intensity_difference: np.ndarray = (
+        context.shifted_intensities
+        - evaluate_polynomial_at_measuring_times(context, coefficients)
+    ) / context.shifted_intensity_errors
+    shifted_chi_squared: float = np.sum(np.power(shifted_intensity_difference, 2))
+
+    # One row of residuals of the unshifted intensities per tau factor
+    unshifted_intensity_differences: np.ndarray = (
+        context.unshifted_intensities
+        - np.multiply.outer(
+            tau_factors,
+            evaluate_differentiated_polynomial_at_measuring_times(
+                context, coefficients
+            ),
+        )
+    ) / context.unshifted_intensity_errors
+    unshifted_chi_squared: np.ndarray = np.sum(
+        np.power(unshifted_intensity_differences, 2), axis=-1
+    )
+
+    result: np.ndarray = shifted_chi_squared + np.multiply.outer(
+        weight_factors, unshifted_chi_squared
+    )
+
+    return result
+
+
 def optimize_tau_factor(
-    dataset: DataSet,
+    context: FitContext,
     weight_factor: float,
     coefficients: np.ndarray,
     tau_factor_range: Tuple[float, float],
+    use_iterative_optimizer: bool = False,
 ) -> float:
     """
     Optimizes the hypothesis value t_hyp to minimize the chi-squared function.
+    For fixed coefficients the chi-squared function is a quadratic in t_hyp, so
+    its minimum is found in closed form and clipped to the given range. As the
+    parabola is convex, the clipped value is also the minimum within the range.
 
     Parameters:
-        dataset (DataSet): The dataset of the experiment
+        context (FitContext): The prepared data of the experiment
         weight_factor (float): Weighting factor for unshifted intensities
         coefficients (ndarray): Polynomial coefficients for fitting
         tau_factor_range (tuple): Range for hypothesis optimization (min, max)
+        use_iterative_optimizer (bool):
+        Use a general bounded minimization instead of the closed form. Intended
+        for model variants in which chi-squared is not quadratic in t_hyp.
 
     Returns:
         float: Optimized t_hyp value.
     """
+    if use_iterative_optimizer:
+        return _optimize_tau_factor_iteratively(
+            context,
+            weight_factor,
+            coefficients,
+            tau_factor_range,
+        )
+
+    numerator, denominator = _calculate_tau_factor_normal_equation(
+        context, coefficients
+    )
+
+    # Without weight on the unshifted intensities, or with a vanishing derivative,
+    # chi-squared does not depend on t_hyp. Like the iterative optimizer, stay at
+    # the mean of the range in this case.
+    if weight_factor == 0 or denominator == 0:
+        return float(np.mean(tau_factor_range))
+
+    # Setting d(chi^2)/d(t_hyp) to zero yields t_hyp = numerator / denominator
+    return float(
+        np.clip(numerator / denominator, tau_factor_range[0], tau_factor_range[1])
+    )
+
+
+def calculate_tau_factor_uncertainty(
+    context: FitContext,
+    weight_factor: float,
+    coefficients: np.ndarray,
+) -> float:
+    """
+    Computes the uncertainty of the optimized t_hyp value from the curvature of
+    the chi-squared function. The uncertainty is the distance from the minimum at
+    which chi-squared has increased by one, i.e. sqrt(2 / (d^2(chi^2)/d(t_hyp)^2)).
+
+    Parameters:
+        context (FitContext): The prepared data of the experiment
+        weight_factor (float): Weighting factor for unshifted intensities
+        coefficients (ndarray): Polynomial coefficients for fitting
+
+    Returns:
+        float: Uncertainty of t_hyp, infinite if chi-squared does not depend on it.
+    """
+    _, denominator = _calculate_tau_factor_normal_equation(context, coefficients)
+
+    # d^2(chi^2)/d(t_hyp)^2 = 2 * weight_factor * denominator
+    curvature: float = 2 * weight_factor * denominator
+    if curvature <= 0:
+        return float("inf")
+
+    return float(np.sqrt(2 / curvature))
+
+
+def _calculate_tau_factor_normal_equation(
+    context: FitContext,
+    coefficients: np.ndarray,
+) -> Tuple[float, float]:
+    """
+    Computes sum(I_u * P' / delta_I_u^2) and sum(P'^2 / delta_I_u^2), the two
+    sums the t_hyp dependent part of chi-squared is made of.
+    """
+    inverse_squared_errors: np.ndarray = 1 / np.power(
+        context.unshifted_intensity_errors, 2
+    )
+    differentiated_polynomial: np.ndarray = (
+        evaluate_differentiated_polynomial_at_measuring_times(context, coefficients)
+    )
+
+    numerator: float = float(
+        np.sum(
+            context.unshifted_intensities
+            * differentiated_polynomial
+            * inverse_squared_errors
+        )
+    )
+    denominator: float = float(
+        np.sum(np.power(differentiated_polynomial, 2) * inverse_squared_errors)
+    )
+
+    return numerator, denominator
+
+
+def _optimize_tau_factor_iteratively(
+    context: FitContext,
+    weight_factor: float,
+    coefficients: np.ndarray,
+    tau_factor_range: Tuple[float, float],
+) -> float:
+    # Imported here, as scipy is only needed for the iterative optimization
+    import scipy as sp
+
     result: sp.optimize.OptimizeResult = sp.optimize.minimize(
         lambda t_hyp: calculate_chi_squared(
-            dataset,
+            context,
             coefficients,
             t_hyp,
             weight_factor,
@@ -91,4 +244,4 @@ def optimize_tau_factor(
     )
 
     # Return optimized t_hyp value
-    return float(result.x)
+    return float(result.x[0])
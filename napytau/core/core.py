@@ -1,38 +1,133 @@
-from napytau.core.chi import optimize_tau_factor
+from napytau.core.chi import (
+    calculate_chi_squared_for_tau_factors,
+    optimize_tau_factor,
+)
+from napytau.core.fit_context import FitContext, create_fit_context
 from napytau.core.polynomials import (
     calculate_polynomial_coefficients_for_fit,
     calculate_polynomial_coefficients_for_tau_factor,
+    calculate_polynomial_coefficients_for_tau_factors,
 )
 from napytau.core.tau import calculate_tau_i_values
-from napytau.core.delta_tau import calculate_error_propagation_terms
-from napytau.core.tau_final import calculate_tau_final
-from typing import Tuple
+from napytau.core.delta_tau import (
+    calculate_error_propagation_terms,
+    calculate_error_propagation_terms_for_tau_factors,
+)
+from napytau.core.tau_final import (
+    calculate_tau_final,
+    calculate_tau_final_for_tau_factors,
+)
+from napytau.core.result_cache import (
+    get_result_cache,
+    hash_dataset_contents,
+    hash_mask,
+)
+from typing import Optional, Tuple, Union
+from weakref import WeakKeyDictionary
 import numpy as np
 from napytau.import_export.model.dataset import DataSet
 
+# The coefficients of the standard fit are needed by several core functions, they
+# are cached per fit context, which is itself cached until the dataset changes
+_fit_coefficients_cache: WeakKeyDictionary[FitContext, np.ndarray] = WeakKeyDictionary()
+
+
+def _calculate_fit_coefficients(context: FitContext) -> np.ndarray:
+    if context not in _fit_coefficients_cache:
+        _fit_coefficients_cache[context] = calculate_polynomial_coefficients_for_fit(
+            context
+        )
+
+    return _fit_coefficients_cache[context]
+
+
+def create_fit_contexts(
+    dataset: DataSet,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
+) -> Tuple[FitContext, FitContext]:
+    """
+    Creates the fit contexts of the datapoints the polynomial is fitted to and of
+    the datapoints the lifetimes are calculated for. Both masks default to the
+    active datapoints, and equal masks share a context.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        fitting_mask (ndarray):
+        Optional boolean mask selecting the datapoints the polynomial is fitted to
+        calculation_mask (ndarray):
+        Optional boolean mask selecting the datapoints the lifetimes are
+        calculated for
+
+    Returns:
+        tuple: The fitting context and the calculation context
+    """
+    active_mask: np.ndarray = dataset.get_datapoints().get_columns().get_active_mask()
+    fitting_mask = active_mask if fitting_mask is None else fitting_mask
+    calculation_mask = active_mask if calculation_mask is None else calculation_mask
+
+    fitting_context: FitContext = create_fit_context(
+        dataset, polynomial_degree, mask=fitting_mask
+    )
+    if np.array_equal(fitting_mask, calculation_mask):
+        return fitting_context, fitting_context
+
+    return fitting_context, create_fit_context(
+        dataset, polynomial_degree, mask=calculation_mask
+    )
+
 
 def calculate_lifetime_for_fit(
-    dataset: DataSet, polynomial_degree: int
+    dataset: DataSet,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
 ) -> Tuple[float, float]:
     """
     Docstring missing. To be implemented with issue #44.
     """
-    # Now we find the optimal coefficients for the given taufactor
-    coefficients: np.ndarray = calculate_polynomial_coefficients_for_fit(
-        dataset, polynomial_degree
+    return get_result_cache().get_or_compute(
+        (
+            "lifetime_for_fit",
+            hash_dataset_contents(dataset),
+            polynomial_degree,
+            hash_mask(fitting_mask),
+            hash_mask(calculation_mask),
+        ),
+        lambda: _calculate_lifetime_for_fit(
+            dataset, polynomial_degree, fitting_mask, calculation_mask
+        ),
+    )
+
+
+def _calculate_lifetime_for_fit(
+    dataset: DataSet,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray],
+    calculation_mask: Optional[np.ndarray],
+) -> Tuple[float, float]:
+    # The measuring times and the intensities are prepared once for all stages
+    fitting_context, calculation_context = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, calculation_mask
     )
 
+    # Now we find the optimal coefficients for the given taufactor
+    coefficients: np.ndarray = _calculate_fit_coefficients(fitting_context)
+
     # We now calculate the lifetimes tau_i for all measured distances
     tau_i_values: np.ndarray = calculate_tau_i_values(
-        dataset,
+        calculation_context,
         coefficients,
     )
 
     # And we calculate the respective errors for the lifetimes
     delta_tau_i_values: np.ndarray = calculate_error_propagation_terms(
-        dataset,
+        calculation_context,
         coefficients,
         0,
+        fitting_context=fitting_context,
     )
 
     # From lifetimes and associated errors we can now calculate the weighted mean
@@ -49,16 +144,42 @@ def calculate_optimal_tau_factor(
     t_hyp_range: Tuple[float, float],
     weight_factor: float,
     polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
 ) -> float:
     """
     Docstring missing. To be implemented with issue #44.
     """
-    coefficients: np.ndarray = calculate_polynomial_coefficients_for_fit(
-        dataset, polynomial_degree
+    return get_result_cache().get_or_compute(
+        (
+            "optimal_tau_factor",
+            hash_dataset_contents(dataset),
+            tuple(t_hyp_range),
+            weight_factor,
+            polynomial_degree,
+            hash_mask(fitting_mask),
+        ),
+        lambda: _calculate_optimal_tau_factor(
+            dataset, t_hyp_range, weight_factor, polynomial_degree, fitting_mask
+        ),
     )
 
+
+def _calculate_optimal_tau_factor(
+    dataset: DataSet,
+    t_hyp_range: Tuple[float, float],
+    weight_factor: float,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray],
+) -> float:
+    # The tau factor only depends on the datapoints the polynomial is fitted to
+    context, _ = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, fitting_mask
+    )
+
+    coefficients: np.ndarray = _calculate_fit_coefficients(context)
+
     optimal_t_hyp = optimize_tau_factor(
-        dataset,
+        context,
         weight_factor,
         coefficients,
         t_hyp_range,
@@ -67,32 +188,105 @@ def calculate_optimal_tau_factor(
     return optimal_t_hyp
 
 
+def calculate_chi_squared_curve(
+    dataset: DataSet,
+    tau_factors: np.ndarray,
+    weight_factors: Union[float, np.ndarray],
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Calculates chi-squared of the fit for every given tau factor, and optionally
+    for every given weight factor, in a single evaluation.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        tau_factors (ndarray): The tau factors to evaluate chi-squared for
+        weight_factors (float or ndarray):
+        The weight factor, or an array of weight factors, for the unshifted
+        intensities
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        fitting_mask (ndarray):
+        Optional boolean mask selecting the datapoints the polynomial is fitted
+        to. Defaults to the active datapoints.
+
+    Returns:
+        ndarray: The chi-squared values, one row per weight factor for an array of
+        weight factors.
+    """
+    context, _ = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, fitting_mask
+    )
+
+    coefficients: np.ndarray = _calculate_fit_coefficients(context)
+
+    return calculate_chi_squared_for_tau_factors(
+        context,
+        coefficients,
+        tau_factors,
+        weight_factors,
+    )
+
+
 def calculate_lifetime_for_custom_tau_factor(
     dataset: DataSet,
     custom_tau_factor: float,
     polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
 ) -> Tuple[float, float]:
     """
     Docstring missing. To be implemented with issue #44.
     """
+    return get_result_cache().get_or_compute(
+        (
+            "lifetime_for_custom_tau_factor",
+            hash_dataset_contents(dataset),
+            custom_tau_factor,
+            polynomial_degree,
+            hash_mask(fitting_mask),
+            hash_mask(calculation_mask),
+        ),
+        lambda: _calculate_lifetime_for_custom_tau_factor(
+            dataset,
+            custom_tau_factor,
+            polynomial_degree,
+            fitting_mask,
+            calculation_mask,
+        ),
+    )
+
+
+def _calculate_lifetime_for_custom_tau_factor(
+    dataset: DataSet,
+    custom_tau_factor: float,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray],
+    calculation_mask: Optional[np.ndarray],
+) -> Tuple[float, float]:
+    # The measuring times and the intensities are prepared once for all stages
+    fitting_context, calculation_context = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, calculation_mask
+    )
+
     # Now we find the optimal coefficients for the given taufactor
     coefficients: np.ndarray = calculate_polynomial_coefficients_for_tau_factor(
-        dataset,
+        fitting_context,
         custom_tau_factor,
-        polynomial_degree,
     )
 
     # We now calculate the lifetimes tau_i for all measured distances
     tau_i_values: np.ndarray = calculate_tau_i_values(
-        dataset,
+        calculation_context,
         coefficients,
     )
 
     # And we calculate the respective errors for the lifetimes
     delta_tau_i_values: np.ndarray = calculate_error_propagation_terms(
-        dataset,
+        calculation_context,
         coefficients,
         custom_tau_factor,
+        fitting_context=fitting_context,
     )
 
     # From lifetimes and associated errors we can now calculate the weighted mean
@@ -102,3 +296,61 @@ def calculate_lifetime_for_custom_tau_factor(
     )
 
     return tau_final
+
+
+def calculate_lifetimes_for_tau_factors(
+    dataset: DataSet,
+    tau_factors: np.ndarray,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the lifetime and its uncertainty for every given tau factor. The
+    preparation of the dataset and the polynomial uncertainties are shared by all
+    tau factors, and the remaining stages are evaluated for all of them at once.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        tau_factors (ndarray): The tau factors to calculate the lifetimes for
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        fitting_mask (ndarray):
+        Optional boolean mask selecting the datapoints the polynomials are fitted
+        to. Defaults to the active datapoints.
+        calculation_mask (ndarray):
+        Optional boolean mask selecting the datapoints the lifetimes are
+        calculated for. Defaults to the active datapoints.
+
+    Returns:
+        tuple: The lifetimes (ndarray) and their uncertainties (ndarray), one entry
+        per tau factor
+    """
+    tau_factors = np.asarray(tau_factors, dtype=float)
+
+    # The measuring times and the intensities are prepared once for all stages
+    fitting_context, calculation_context = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, calculation_mask
+    )
+
+    # One row of coefficients per tau factor
+    coefficients: np.ndarray = calculate_polynomial_coefficients_for_tau_factors(
+        fitting_context,
+        tau_factors,
+    )
+
+    # The lifetimes tau_i for all tau factors and measured distances
+    tau_i_values: np.ndarray = calculate_tau_i_values(
+        calculation_context,
+        coefficients,
+    )
+
+    # And the respective errors for the lifetimes
+    delta_tau_i_values: np.ndarray = calculate_error_propagation_terms_for_tau_factors(
+        calculation_context,
+        coefficients,
+        tau_factors,
+        fitting_context=fitting_context,
+    )
+
+    # The weighted mean and the uncertainty for every tau factor
+    return calculate_tau_final_for_tau_factors(tau_i_values, delta_tau_i_values)
@@ -3,48 +3,71 @@ from napytau.core.polynomials import (
     evaluate_polynomial_at_measuring_times,
 )
 import numpy as np
+from typing import Optional, Union
 
-from napytau.import_export.model.dataset import DataSet
+from napytau.core.fit_context import FitContext
 
 
 def calculate_jacobian_matrix(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
+    use_finite_differences: bool = False,
 ) -> np.ndarray:
     """
-    calculated the jacobian matrix for a set of polynomial coefficients taking
+    calculates the jacobian matrix for a set of polynomial coefficients taking
     different distances into account.
-    Adds Disturbances to each coefficient to calculate partial derivatives,
-    safes them in jacobian matrix
+    As the polynomial P(t) = a_0 + a_1*t + ... + a_n*t^n is linear in its
+    coefficients, the partial derivative dP/da_k is simply t^k. The jacobian
+    matrix is therefore the power basis (Vandermonde matrix) of the measuring
+    times and can be built exactly in a single pass.
     Args:
-        dataset (DataSet): The dataset of the experiment
-        Datapoints for fitting, consisting of distances and intensities
+        context (FitContext): The prepared data of the experiment
         coefficients (ndarray): Array of polynomial coefficients.
+        use_finite_differences (bool):
+        Approximate the partial derivatives by disturbing each coefficient
+        instead of using the closed form. Only intended for cross-checking.
 
     Returns:
         ndarray:
         The computed Jacobian matrix with shape (len(distances), len(coefficients)).
     """
 
-    datapoints = dataset.get_datapoints()
+    if use_finite_differences:
+        return _calculate_jacobian_matrix_by_finite_differences(context, coefficients)
+
+    # Column k of the jacobian matrix holds t^k for all measuring times
+    jacobian_matrix: np.ndarray = context.get_power_basis(len(coefficients))
+
+    return jacobian_matrix
+
+
+def _calculate_jacobian_matrix_by_finite_differences(
+    context: FitContext,
+    coefficients: np.ndarray,
+) -> np.ndarray:
+    """
+    Approximates the jacobian matrix by adding disturbances to each coefficient to
+    calculate partial derivatives, saves them in the jacobian matrix.
+    """
+
     # initializes the jacobian matrix
-    jacobian_matrix: np.ndarray = np.zeros(
-        (len(datapoints.get_distances().get_values()), len(coefficients))
-    )
+    jacobian_matrix: np.ndarray = np.zeros((len(context), len(coefficients)))
 
     epsilon: float = 1e-6  # small disturbance value
 
+    # The undisturbed polynomial does not depend on the loop, so evaluate it once
+    original_function: np.ndarray = evaluate_polynomial_at_measuring_times(
+        context, coefficients
+    )
+
     # Loop over each coefficient and calculate the partial derivative
     for i in range(len(coefficients)):
         perturbed_coefficients: np.ndarray = np.array(coefficients, dtype=float)
         perturbed_coefficients[i] += epsilon  # slightly disturb the current coefficient
 
-        # Compute the disturbed and original polynomial values at the given distances
+        # Compute the disturbed polynomial values at the given distances
         perturbed_function: np.ndarray = evaluate_polynomial_at_measuring_times(
-            dataset, perturbed_coefficients
-        )
-        original_function: np.ndarray = evaluate_polynomial_at_measuring_times(
-            dataset, coefficients
+            context, perturbed_coefficients
         )
 
         # Calculate the partial derivative coefficients and store it in the
@@ -57,30 +80,39 @@ def calculate_jacobian_matrix(
 
 
 def calculate_covariance_matrix(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
 ) -> np.ndarray:
     """
     Computes the covariance matrix for the polynomial coefficients using the
     jacobian matrix and a weight matrix derived from the shifted intensities' errors.
     Args:
-        dataset (Dataset): The dataset of the experiment
-        Datapoints for fitting, consisting of distances and intensities
+        context (FitContext): The prepared data of the experiment
         coefficients (ndarray): Array of polynomial coefficients.
 
     Returns:
         ndarray: The computed covariance matrix for the polynomial coefficients.
     """
 
-    datapoints = dataset.get_datapoints()
-    jacobian_matrix: np.ndarray = calculate_jacobian_matrix(dataset, coefficients)
+    jacobian_matrix: np.ndarray = calculate_jacobian_matrix(context, coefficients)
 
-    # Construct the weight matrix from the inverse squared errors
-    weight_matrix: np.ndarray = np.diag(
-        1 / np.power(datapoints.get_shifted_intensities().get_errors(), 2)
+    return _calculate_covariance_matrix_from_jacobian(
+        jacobian_matrix,
+        context.shifted_intensity_errors,
     )
 
-    fit_matrix: np.ndarray = jacobian_matrix.T @ weight_matrix @ jacobian_matrix
+
+def _calculate_covariance_matrix_from_jacobian(
+    jacobian_matrix: np.ndarray,
+    shifted_intensity_errors: np.ndarray,
+) -> np.ndarray:
+    # The weight matrix is diagonal, so instead of building it explicitly the
+    # rows of the jacobian matrix are scaled by the inverse squared errors
+    weights: np.ndarray = 1 / np.power(shifted_intensity_errors, 2)
+
+    fit_matrix: np.ndarray = jacobian_matrix.T @ (
+        weights[:, np.newaxis] * jacobian_matrix
+    )
 
     covariance_matrix: np.ndarray = np.linalg.inv(fit_matrix)
 
@@ -88,66 +120,194 @@ def calculate_covariance_matrix(
 
 
 def calculate_error_propagation_terms(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
     taufactor: float,
+    fitting_context: Optional[FitContext] = None,
 ) -> np.ndarray:
     """
     creates the error propagation term for the polynomial coefficients.
     combining direct errors, polynomial uncertainties, and mixed covariance terms.
     Args:
-        dataset (DataSet): The dataset of the experiment
+        context (FitContext): The prepared data of the experiment
         coefficients (ndarray): Array of polynomial coefficients.
         taufactor (float): Scaling factor related to the Doppler-shift model.
+        fitting_context (FitContext):
+        The datapoints the polynomial was fitted to, if they differ from the
+        datapoints the errors are calculated for.
 
     Returns:
         ndarray: The combined error propagation terms for each distance point.
     """
 
-    datapoints = dataset.get_datapoints()
-    calculated_differentiated_polynomial_sum_at_measuring_distances = (
+    return _calculate_error_propagation_terms(
+        context,
         evaluate_differentiated_polynomial_at_measuring_times(
-            dataset,
+            context,
             coefficients,
+        ),
+        calculate_polynomial_uncertainties(context, len(coefficients), fitting_context),
+        taufactor,
+    )
+
+
+def calculate_error_propagation_terms_for_tau_factors(
+    context: FitContext,
+    coefficients: np.ndarray,
+    taufactors: np.ndarray,
+    fitting_context: Optional[FitContext] = None,
+) -> np.ndarray:
+    """
+    creates the error propagation terms for several tau factors at once. As the
+    polynomial uncertainties only depend on the measuring times and the errors of
+    the shifted intensities, they are calculated once for all tau factors.
+    Args:
+        context (FitContext): The prepared data of the experiment
+        coefficients (ndarray):
+        Array with one row of polynomial coefficients per tau factor.
+        taufactors (ndarray): Scaling factors related to the Doppler-shift model.
+        fitting_context (FitContext):
+        The datapoints the polynomials were fitted to, if they differ from the
+        datapoints the errors are calculated for.
+
+    Returns:
+        ndarray:
+        The combined error propagation terms, one row per tau factor and one
+        column per distance point.
+    """
+
+    return _calculate_error_propagation_terms(
+        context,
+        evaluate_differentiated_polynomial_at_measuring_times(
+            context,
+            coefficients,
+        ),
+        calculate_polynomial_uncertainties(
+            context, np.shape(coefficients)[-1], fitting_context
+        ),
+        np.asarray(taufactors, dtype=float)[:, np.newaxis],
+    )
+
+
+def calculate_polynomial_uncertainties(
+    context: FitContext,
+    number_of_coefficients: int,
+    fitting_context: Optional[FitContext] = None,
+) -> np.ndarray:
+    """
+    calculates the squared uncertainty of the fitted polynomial at every measuring
+    time, sum_k sum_l t_i^k * t_i^l * C_kl with the covariance matrix C of the
+    coefficients. As the polynomial is linear in its coefficients, the result does
+    not depend on their values.
+    Args:
+        context (FitContext): The prepared data of the experiment
+        number_of_coefficients (int): The number of polynomial coefficients.
+        fitting_context (FitContext):
+        The datapoints the polynomial was fitted to, which determine the
+        covariance matrix. Defaults to the datapoints of the context.
+
+    Returns:
+        ndarray: The squared polynomial uncertainty for each distance point.
+    """
+
+    # Without a separate fitting context, the power basis of the measuring times is
+    # shared by the covariance matrix and the polynomial uncertainty term
+    power_basis: np.ndarray = context.get_power_basis(number_of_coefficients)
+    if fitting_context is None or fitting_context is context:
+        covariance_matrix: np.ndarray = _calculate_covariance_matrix_from_jacobian(
+            power_basis,
+            context.shifted_intensity_errors,
+        )
+    else:
+        covariance_matrix = _calculate_covariance_matrix_from_jacobian(
+            fitting_context.get_power_basis(number_of_coefficients),
+            fitting_context.shifted_intensity_errors,
         )
+
+    # This is the diagonal of V @ C @ V.T evaluated without building the full
+    # N x N matrix
+    delta_p_j_i_squared: np.ndarray = np.einsum(
+        "ik,kl,il->i",
+        power_basis,
+        covariance_matrix,
+        power_basis,
+    )
+
+    return delta_p_j_i_squared
+
+
+def calculate_error_propagation_terms_from_uncertainties(
+    context: FitContext,
+    differentiated_polynomial_values: np.ndarray,
+    delta_p_j_i_squared: np.ndarray,
+    taufactor: Union[float, np.ndarray],
+    unshifted_intensities: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    combines the error propagation terms from the derivative of the polynomial and
+    the squared polynomial uncertainty at every measuring time, for callers that
+    obtain them otherwise than by fitting the datapoints of the context, e.g. for
+    several fits at once.
+    Args:
+        context (FitContext): The prepared data of the experiment
+        differentiated_polynomial_values (ndarray):
+        The derivative of the polynomial at the measuring times, optionally with
+        one row per polynomial.
+        delta_p_j_i_squared (ndarray):
+        The squared polynomial uncertainty, in the same layout.
+        taufactor (float or ndarray):
+        Scaling factor related to the Doppler-shift model.
+        unshifted_intensities (ndarray):
+        Optional unshifted intensities to use instead of those of the context,
+        e.g. resampled ones, in the same layout.
+
+    Returns:
+        ndarray: The combined error propagation terms, in the same layout.
+    """
+
+    return _calculate_error_propagation_terms(
+        context,
+        differentiated_polynomial_values,
+        delta_p_j_i_squared,
+        taufactor,
+        unshifted_intensities,
     )
 
-    gaussian_error_from_unshifted_intensity: np.ndarray = np.power(
-        datapoints.get_unshifted_intensities().get_errors(), 2
-    ) / np.power(
-        calculated_differentiated_polynomial_sum_at_measuring_distances,
-        2,
+
+def _calculate_error_propagation_terms(
+    context: FitContext,
+    calculated_differentiated_polynomial_sum_at_measuring_distances: np.ndarray,
+    delta_p_j_i_squared: np.ndarray,
+    taufactor: Union[float, np.ndarray],
+    unshifted_intensities: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    unshifted_intensity_values: np.ndarray = (
+        context.unshifted_intensities
+        if unshifted_intensities is None
+        else unshifted_intensities
     )
 
-    # Initialize the polynomial uncertainty term for second term
-    delta_p_j_i_squared: np.ndarray = np.zeros(
-        len(datapoints.get_distances().get_values())
+    # The powers of the derivative are built by multiplication, which is much
+    # cheaper than np.power for the large arrays of batched evaluations
+    derivative_squared: np.ndarray = np.square(
+        calculated_differentiated_polynomial_sum_at_measuring_distances
+    )
+    derivative_cubed: np.ndarray = (
+        derivative_squared
+        * calculated_differentiated_polynomial_sum_at_measuring_distances
+    )
+
+    gaussian_error_from_unshifted_intensity: np.ndarray = (
+        np.square(context.unshifted_intensity_errors) / derivative_squared
     )
-    covariance_matrix: np.ndarray = calculate_covariance_matrix(dataset, coefficients)
-
-    # Calculate the polynomial uncertainty contributions
-    for k in range(len(coefficients)):
-        for l in range(len(coefficients)):  # noqa E741
-            delta_p_j_i_squared = (
-                delta_p_j_i_squared
-                + np.power(datapoints.get_distances().get_values(), k)
-                * np.power(datapoints.get_distances().get_values(), l)
-                * covariance_matrix[k, l]
-            )
 
     gaussian_error_from_polynomial_uncertainties: np.ndarray = (
-        np.power(datapoints.get_unshifted_intensities().get_values(), 2)
-        / np.power(
-            calculated_differentiated_polynomial_sum_at_measuring_distances,
-            4,
-        )
-    ) * np.power(delta_p_j_i_squared, 2)
+        np.square(unshifted_intensity_values) / np.square(derivative_squared)
+    ) * np.square(delta_p_j_i_squared)
 
     error_from_covariance: np.ndarray = (
-        datapoints.get_unshifted_intensities().get_values()
-        * taufactor
-        * delta_p_j_i_squared
-    ) / np.power(calculated_differentiated_polynomial_sum_at_measuring_distances, 3)
+        unshifted_intensity_values * taufactor * delta_p_j_i_squared
+    ) / derivative_cubed
 
     interim_result: np.ndarray = (
         gaussian_error_from_unshifted_intensity
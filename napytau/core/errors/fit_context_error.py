@@ -0,0 +1,5 @@
+from napytau.core.errors.core_error import CoreError
+
+
+class FitContextError(CoreError):
+    pass
@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+from napytau.core.errors.fit_context_error import FitContextError
+from napytau.core.time import calculate_times_from_distances_and_relative_velocity
+from napytau.import_export.model.datapoint_columns import (
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+    DatapointColumns,
+)
+from napytau.import_export.model.dataset import DataSet
+
+
+@dataclass(frozen=True, eq=False)
+class FitContext:
+    """
+    Holds everything the core calculations need to know about a dataset, prepared
+    once for a given selection of datapoints and polynomial degree:
+    - the measuring times, derived from the distances and the relative velocity
+    - the shifted and unshifted intensities and their errors
+    - the power basis t^k and its derivative basis k*t^(k-1) of the measuring times
+
+    Only the datapoints selected by the mask that carry both intensities are
+    included. The arrays are read-only, so a context can safely be shared by all
+    core stages and reused for as long as the data does not change.
+    """
+
+    polynomial_degree: int
+    mask: np.ndarray
+    times: np.ndarray
+    shifted_intensities: np.ndarray
+    shifted_intensity_errors: np.ndarray
+    unshifted_intensities: np.ndarray
+    unshifted_intensity_errors: np.ndarray
+    power_basis: np.ndarray
+    derivative_basis: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def get_power_basis(self, number_of_coefficients: int) -> np.ndarray:
+        """
+        The matrix with t_i^k in row i and column k for k < number_of_coefficients.
+        Evaluating a polynomial at the measuring times is a product with it.
+        """
+        if number_of_coefficients <= self.power_basis.shape[1]:
+            return self.power_basis[:, :number_of_coefficients]
+
+        return _calculate_power_basis(self.times, number_of_coefficients)
+
+    def get_derivative_basis(self, number_of_coefficients: int) -> np.ndarray:
+        """
+        The matrix with k*t_i^(k-1) in row i and column k for
+        k < number_of_coefficients. Evaluating the derivative of a polynomial at
+        the measuring times is a product with it.
+        """
+        if number_of_coefficients <= self.derivative_basis.shape[1]:
+            return self.derivative_basis[:, :number_of_coefficients]
+
+        return _calculate_derivative_basis(self.times, number_of_coefficients)
+
+
+# Contexts are cached per columnar representation of the datapoints. As the
+# collection replaces its columns whenever a datapoint changes, stale contexts are
+# dropped together with the columns they were built from. Within the columns,
+# the relative velocity, the polynomial degree and the mask identify a context.
+_fit_context_cache: WeakKeyDictionary[
+    DatapointColumns, Dict[Tuple[float, int, bytes], FitContext]
+] = WeakKeyDictionary()
+
+
+def create_fit_context(
+    dataset: DataSet,
+    polynomial_degree: int,
+    mask: Optional[np.ndarray] = None,
+) -> FitContext:
+    """
+    Creates the fit context for a dataset, or returns the cached one if the
+    datapoints, the relative velocity, the polynomial degree and the mask are
+    unchanged since it was created.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        mask (ndarray):
+        Optional boolean mask selecting the datapoints to include, in the order of
+        the datapoint collection. All datapoints are included if it is omitted.
+
+    Returns:
+        FitContext: The prepared context.
+    """
+    if polynomial_degree < 0:
+        raise FitContextError(
+            f"The polynomial degree must not be negative, got {polynomial_degree}."
+        )
+
+    columns = dataset.get_datapoints().get_columns()
+
+    if mask is None:
+        mask = np.ones(len(columns), dtype=bool)
+    else:
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(columns),):
+            raise FitContextError(
+                f"The mask has {mask.size} entries, but the dataset contains "
+                f"{len(columns)} datapoints."
+            )
+
+    key = (
+        dataset.get_relative_velocity().value.get_velocity(),
+        polynomial_degree,
+        mask.tobytes(),
+    )
+    contexts = _fit_context_cache.setdefault(columns, {})
+    if key not in contexts:
+        contexts[key] = _build_fit_context(dataset, columns, polynomial_degree, mask)
+
+    return contexts[key]
+
+
+def _build_fit_context(
+    dataset: DataSet,
+    columns: DatapointColumns,
+    polynomial_degree: int,
+    mask: np.ndarray,
+) -> FitContext:
+    selection: np.ndarray = (
+        mask
+        & columns.get_mask(SHIFTED_INTENSITY)
+        & columns.get_mask(UNSHIFTED_INTENSITY)
+    )
+
+    times: np.ndarray = calculate_times_from_distances_and_relative_velocity(dataset)[
+        selection
+    ]
+
+    return FitContext(
+        polynomial_degree=polynomial_degree,
+        mask=_read_only(selection),
+        times=_read_only(times),
+        shifted_intensities=_read_only(
+            columns.get_values(SHIFTED_INTENSITY)[selection]
+        ),
+        shifted_intensity_errors=_read_only(
+            columns.get_errors(SHIFTED_INTENSITY)[selection]
+        ),
+        unshifted_intensities=_read_only(
+            columns.get_values(UNSHIFTED_INTENSITY)[selection]
+        ),
+        unshifted_intensity_errors=_read_only(
+            columns.get_errors(UNSHIFTED_INTENSITY)[selection]
+        ),
+        power_basis=_read_only(_calculate_power_basis(times, polynomial_degree + 1)),
+        derivative_basis=_read_only(
+            _calculate_derivative_basis(times, polynomial_degree + 1)
+        ),
+    )
+
+
+def _calculate_power_basis(
+    times: np.ndarray, number_of_coefficients: int
+) -> np.ndarray:
+    return np.vander(times, number_of_coefficients, increasing=True).astype(float)
+
+
+def _calculate_derivative_basis(
+    times: np.ndarray, number_of_coefficients: int
+) -> np.ndarray:
+    # d/dt t^k = k * t^(k-1), the first column belongs to the constant and is zero
+    derivative_basis: np.ndarray = np.zeros((len(times), number_of_coefficients))
+    if number_of_coefficients > 1:
+        derivative_basis[:, 1:] = _calculate_power_basis(
+            times, number_of_coefficients - 1
+        ) * np.arange(1, number_of_coefficients)
+
+    return derivative_basis
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+
+    return array
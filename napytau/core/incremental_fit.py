@@ -0,0 +1,183 @@
+from typing import Optional
+
+import numpy as np
+
+from napytau.util.coalesce import coalesce
+
+# A downdate is refused if one minus the leverage of the removed point is below
+# this, as the normal equations would become (nearly) singular
+_MIN_DENOMINATOR = 1e-8
+
+
+class IncrementalPolynomialFit:
+    """
+    A weighted least squares polynomial fit of a fixed set of points, of which only
+    the active ones are fitted. The fit keeps the inverse of the normal equations
+    of the active points, so activating or deactivating a single point is a
+    rank-one update or downdate of the inverse (Sherman-Morrison) instead of a new
+    fit, and the coefficients are only solved for when they are needed.
+
+    The points are mapped onto [-1, 1] before fitting, like
+    numpy.polynomial.Polynomial.fit, which keeps the normal equations well
+    conditioned. The fit falls back to a full refit if a downdate would make the
+    normal equations (nearly) singular, and after a number of updates, so rounding
+    errors do not accumulate. With fewer active points than coefficients, or ill
+    conditioned normal equations, the minimum norm solution is used.
+    """
+
+    polynomial_degree: int
+    max_updates: int
+    max_condition: float
+    refit_count: int
+    _domain: np.ndarray
+    _basis: np.ndarray
+    _values: np.ndarray
+    _weights: np.ndarray
+    _active: np.ndarray
+    _inverse: Optional[np.ndarray]
+    _right_hand_side: np.ndarray
+    _scaled_coefficients: Optional[np.ndarray]
+    _updates_since_refit: int
+
+    def __init__(
+        self,
+        x_values: np.ndarray,
+        y_values: np.ndarray,
+        polynomial_degree: int,
+        weights: Optional[np.ndarray] = None,
+        active: Optional[np.ndarray] = None,
+        max_updates: int = 64,
+        max_condition: float = 1e12,
+    ):
+        x_values = np.asarray(x_values, dtype=float)
+        self.polynomial_degree = polynomial_degree
+        self.max_updates = max_updates
+        self.max_condition = max_condition
+        self.refit_count = 0
+
+        self._domain = (
+            np.array([x_values.min(), x_values.max()])
+            if len(x_values) > 0
+            else np.array([-1.0, 1.0])
+        )
+        if self._domain[0] == self._domain[1]:
+            self._domain = self._domain + np.array([-1.0, 1.0])
+        self._basis = np.vander(
+            self._map_to_window(x_values), polynomial_degree + 1, increasing=True
+        )
+        self._values = np.asarray(y_values, dtype=float)
+        self._weights = (
+            np.ones(len(x_values))
+            if weights is None
+            else np.asarray(weights, dtype=float)
+        )
+        self._active = (
+            np.ones(len(x_values), dtype=bool)
+            if active is None
+            else np.array(active, dtype=bool)
+        )
+
+        self.refit()
+
+    def get_active_mask(self) -> np.ndarray:
+        """Returns a copy of the mask of the active points."""
+        return self._active.copy()
+
+    def set_active(self, index: int, active: bool) -> None:
+        """
+        Activates or deactivates a single point, updating the fit in place.
+        """
+        if self._active[index] == active:
+            return
+
+        self._active[index] = active
+        if self._inverse is None or self._updates_since_refit >= self.max_updates:
+            self.refit()
+            return
+
+        signed_weight = self._weights[index] if active else -self._weights[index]
+        row = self._basis[index]
+        inverse_row = self._inverse @ row
+        # One minus the leverage of the point for a downdate, which vanishes if
+        # the remaining points no longer determine the fit
+        denominator = 1.0 + signed_weight * (row @ inverse_row)
+        if denominator < _MIN_DENOMINATOR:
+            self.refit()
+            return
+
+        self._inverse -= np.outer(
+            inverse_row, inverse_row * (signed_weight / denominator)
+        )
+        self._right_hand_side += (signed_weight * self._values[index]) * row
+        self._scaled_coefficients = None
+        self._updates_since_refit += 1
+
+    def set_active_mask(self, active: np.ndarray) -> None:
+        """
+        Sets the active points, updating the fit point by point if only a few
+        changed, and refitting it otherwise.
+        """
+        active = np.asarray(active, dtype=bool)
+        changed_indices = np.flatnonzero(active != self._active)
+        if len(changed_indices) > self.max_updates - self._updates_since_refit:
+            self._active = active.copy()
+            self.refit()
+            return
+
+        for index in changed_indices:
+            self.set_active(int(index), bool(active[index]))
+
+    def refit(self) -> None:
+        """
+        Fits the active points from scratch and inverts their normal equations.
+        """
+        self.refit_count += 1
+        self._updates_since_refit = 0
+
+        basis = self._basis[self._active]
+        weights = self._weights[self._active]
+        values = self._values[self._active]
+        self._right_hand_side = basis.T @ (weights * values)
+        self._scaled_coefficients = None
+
+        self._inverse = None
+        if len(values) >= self._basis.shape[1]:
+            normal_matrix = (basis.T * weights) @ basis
+            if np.linalg.cond(normal_matrix) <= self.max_condition:
+                self._inverse = np.linalg.inv(normal_matrix)
+
+        if self._inverse is None:
+            # The minimum norm solution of the weighted least squares problem
+            square_root_weights = np.sqrt(weights)
+            self._scaled_coefficients = np.linalg.lstsq(
+                basis * square_root_weights[:, np.newaxis],
+                values * square_root_weights,
+                rcond=None,
+            )[0]
+
+    def get_coefficients(self) -> np.ndarray:
+        """
+        Returns the polynomial coefficients [a_0, a_1, ..., a_n] of the fit in the
+        unmapped x values, where P(x) = a_0 + a_1*x + ... + a_n*x^n.
+        """
+        coefficients: np.ndarray = self._get_polynomial().convert().coef
+        return coefficients
+
+    def evaluate(self, x_values: np.ndarray) -> np.ndarray:
+        """Evaluates the fitted polynomial at the given x values."""
+        values: np.ndarray = self._get_polynomial()(np.asarray(x_values, dtype=float))
+        return values
+
+    def _get_polynomial(self) -> np.polynomial.Polynomial:
+        if self._scaled_coefficients is None:
+            self._scaled_coefficients = coalesce(self._inverse) @ self._right_hand_side
+
+        return np.polynomial.Polynomial(
+            self._scaled_coefficients, domain=self._domain, window=[-1.0, 1.0]
+        )
+
+    def _map_to_window(self, x_values: np.ndarray) -> np.ndarray:
+        mapped_values: np.ndarray = (2 * x_values - self._domain.sum()) / (
+            self._domain[1] - self._domain[0]
+        )
+        return mapped_values
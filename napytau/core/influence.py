@@ -0,0 +1,255 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from napytau.core.core import create_fit_contexts
+from napytau.core.delta_tau import (
+    calculate_error_propagation_terms_from_uncertainties,
+)
+from napytau.core.errors.polynomial_coefficient_error import (
+    PolynomialCoefficientError,
+)
+from napytau.core.fit_context import FitContext
+from napytau.core.polynomials import (
+    evaluate_differentiated_polynomial_at_measuring_times,
+)
+from napytau.core.tau import calculate_tau_i_values
+from napytau.core.tau_final import calculate_tau_final_for_tau_factors
+from napytau.import_export.model.dataset import DataSet
+
+# Datapoints whose leverage is closer to one than this are needed to determine the
+# fit, the fit without them is undefined
+_MIN_LEVERAGE_COMPLEMENT = 1e-10
+
+
+@dataclass(frozen=True)
+class DatapointInfluences:
+    """
+    The influence of every datapoint on the lifetime for the fit, from leaving out
+    each datapoint in turn (jackknife). The arrays have one entry per analysed
+    datapoint, in the order of the datapoint collection.
+    - indices: the indices of the datapoints in the datapoint collection
+    - lifetime, lifetime_error: the lifetime and its uncertainty of all datapoints
+    - lifetimes, lifetime_errors: the lifetime and its uncertainty without the
+    datapoint
+    - leverages: the diagonal of the hat matrix of the fit, NaN for datapoints
+    that are not fitted
+    - cooks_distances: Cook's distance of the datapoint in the fit, NaN for
+    datapoints that are not fitted
+
+    Lifetimes that can not be determined without a datapoint, e.g. as the
+    remaining datapoints no longer determine the fit, are NaN.
+    """
+
+    indices: np.ndarray
+    lifetime: float
+    lifetime_error: float
+    lifetimes: np.ndarray
+    lifetime_errors: np.ndarray
+    leverages: np.ndarray
+    cooks_distances: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def get_lifetime_shifts(self) -> np.ndarray:
+        """The change of the lifetime if the datapoint is left out."""
+        lifetime_shifts: np.ndarray = self.lifetimes - self.lifetime
+        return lifetime_shifts
+
+    def get_jackknife_error(self) -> float:
+        """
+        The jackknife estimate of the uncertainty of the lifetime, from the spread
+        of the lifetimes without each datapoint. NaN lifetimes are ignored.
+        """
+        lifetimes = self.lifetimes[np.isfinite(self.lifetimes)]
+        if len(lifetimes) < 2:
+            return float("nan")
+
+        return float(
+            np.sqrt(
+                (len(lifetimes) - 1)
+                / len(lifetimes)
+                * np.sum((lifetimes - lifetimes.mean()) ** 2)
+            )
+        )
+
+
+def calculate_datapoint_influences(
+    dataset: DataSet,
+    polynomial_degree: int,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
+) -> DatapointInfluences:
+    """
+    Calculates the lifetime for the fit with each datapoint left out in turn,
+    together with the leverage and Cook's distance of the datapoints in the fit.
+    A datapoint is left out of the fit and of the calculation of the lifetime.
+
+    No fit is repeated. As the polynomial fit is linear in its coefficients, the
+    coefficients without a datapoint follow from the full fit with the hat matrix
+    identity a_(k) = a - (V^T V)^-1 v_k e_k / (1 - h_k), and the covariance
+    matrix of the coefficients with a rank-one downdate (Sherman-Morrison). The
+    lifetimes without every datapoint are then evaluated at once.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        fitting_mask (ndarray):
+        Optional boolean mask selecting the datapoints the polynomial is fitted
+        to. Defaults to the active datapoints.
+        calculation_mask (ndarray):
+        Optional boolean mask selecting the datapoints the lifetimes are
+        calculated for. Defaults to the active datapoints.
+
+    Returns:
+        DatapointInfluences: The influences of the fitted and calculated
+        datapoints
+    """
+    fitting_context, calculation_context = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, calculation_mask
+    )
+    number_of_coefficients: int = polynomial_degree + 1
+    if len(fitting_context) < number_of_coefficients:
+        raise PolynomialCoefficientError(
+            f"A polynomial of degree {polynomial_degree} can not be fitted to "
+            f"{len(fitting_context)} datapoints."
+        )
+
+    # The analysed datapoints, and their rows in both contexts, -1 if they are not
+    # part of a context
+    indices: np.ndarray = np.flatnonzero(
+        fitting_context.mask | calculation_context.mask
+    )
+    fitting_rows: np.ndarray = _get_context_rows(fitting_context, indices)
+    calculation_rows: np.ndarray = _get_context_rows(calculation_context, indices)
+    fitted: np.ndarray = fitting_rows >= 0
+
+    # The fit works on the times t/s, scaled to at most one, which keeps the
+    # columns of the bases at comparable magnitudes
+    time_scale: float = float(np.max(np.abs(fitting_context.times), initial=0)) or 1.0
+    powers_of_time_scale: np.ndarray = time_scale ** np.arange(number_of_coefficients)
+    power_basis: np.ndarray = (
+        fitting_context.get_power_basis(number_of_coefficients) / powers_of_time_scale
+    )
+    calculation_power_basis: np.ndarray = (
+        calculation_context.get_power_basis(number_of_coefficients)
+        / powers_of_time_scale
+    )
+
+    # The unweighted least squares fit of the shifted intensities, like
+    # calculate_polynomial_coefficients_for_fit, with the leverages h_k as the
+    # diagonal of the hat matrix Q @ Q.T
+    q_matrix, r_matrix = np.linalg.qr(power_basis)
+    leverages: np.ndarray = np.sum(q_matrix**2, axis=1)
+    pseudo_inverse: np.ndarray = np.linalg.solve(r_matrix, q_matrix.T)
+    coefficients: np.ndarray = pseudo_inverse @ fitting_context.shifted_intensities
+    residuals: np.ndarray = (
+        fitting_context.shifted_intensities - power_basis @ coefficients
+    )
+
+    # The covariance matrix C of the coefficients is weighted with the errors of the
+    # shifted intensities, as in calculate_polynomial_uncertainties. With
+    # C = R_w^-1 R_w^-T, the polynomial uncertainty at the calculated datapoints is
+    # the squared norm of the rows of A = P R_w^-1, and A @ B.T with B = V R_w^-1
+    # holds the covariances with the fitted datapoints, which downdate it.
+    weights: np.ndarray = 1 / np.power(fitting_context.shifted_intensity_errors, 2)
+    weighted_r_matrix: np.ndarray = np.linalg.qr(
+        np.sqrt(weights)[:, np.newaxis] * power_basis, mode="r"
+    )
+    calculation_factors: np.ndarray = np.linalg.solve(
+        weighted_r_matrix.T, calculation_power_basis.T
+    ).T
+    fitting_factors: np.ndarray = np.linalg.solve(weighted_r_matrix.T, power_basis.T).T
+    polynomial_uncertainties: np.ndarray = np.sum(calculation_factors**2, axis=1)
+    weighted_leverages: np.ndarray = weights * np.sum(fitting_factors**2, axis=1)
+    covariances: np.ndarray = calculation_factors @ fitting_factors.T
+
+    # One row of coefficients and polynomial uncertainties per left out datapoint,
+    # datapoints that are not fitted do not change them
+    left_out_coefficients: np.ndarray = np.tile(coefficients, (len(indices), 1))
+    left_out_polynomial_uncertainties: np.ndarray = np.tile(
+        polynomial_uncertainties, (len(indices), 1)
+    )
+    rows: np.ndarray = fitting_rows[fitted]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        left_out_coefficients[fitted] -= (
+            pseudo_inverse[:, rows] * (residuals[rows] / (1 - leverages[rows]))
+        ).T
+        left_out_polynomial_uncertainties[fitted] += (
+            weights[rows] / (1 - weighted_leverages[rows])
+        )[:, np.newaxis] * covariances[:, rows].T ** 2
+
+        lifetimes, lifetime_errors = _calculate_lifetimes(
+            calculation_context,
+            np.vstack([coefficients, left_out_coefficients]) / powers_of_time_scale,
+            np.vstack([polynomial_uncertainties, left_out_polynomial_uncertainties]),
+            calculation_rows,
+        )
+
+        degrees_of_freedom: int = len(residuals) - number_of_coefficients
+        residual_variance: float = (
+            float(residuals @ residuals) / degrees_of_freedom
+            if degrees_of_freedom > 0
+            else float("nan")
+        )
+        fitted_cooks_distances: np.ndarray = (
+            residuals**2
+            * leverages
+            / (number_of_coefficients * residual_variance * (1 - leverages) ** 2)
+        )
+
+    # Datapoints without a finite lifetime can not be left out
+    impossible: np.ndarray = ~np.isfinite(lifetimes[1:])
+    impossible[fitted] |= 1 - leverages[rows] <= _MIN_LEVERAGE_COMPLEMENT
+
+    return DatapointInfluences(
+        indices=indices,
+        lifetime=float(lifetimes[0]),
+        lifetime_error=float(lifetime_errors[0]),
+        lifetimes=np.where(impossible, np.nan, lifetimes[1:]),
+        lifetime_errors=np.where(impossible, np.nan, lifetime_errors[1:]),
+        leverages=_expand(leverages, fitting_rows),
+        cooks_distances=_expand(fitted_cooks_distances, fitting_rows),
+    )
+
+
+def _get_context_rows(context: FitContext, indices: np.ndarray) -> np.ndarray:
+    # The row of every datapoint within the arrays of the context, or -1
+    rows: np.ndarray = np.cumsum(context.mask) - 1
+    return np.where(context.mask[indices], rows[indices], -1)
+
+
+def _expand(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    # The values of the rows of a context, NaN for datapoints not in the context
+    expanded_values: np.ndarray = np.full(len(rows), np.nan)
+    expanded_values[rows >= 0] = values[rows[rows >= 0]]
+    return expanded_values
+
+
+def _calculate_lifetimes(
+    context: FitContext,
+    coefficients: np.ndarray,
+    polynomial_uncertainties: np.ndarray,
+    calculation_rows: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # The first row belongs to the fit of all datapoints, every further row to the
+    # fit without one datapoint, which is also excluded from the weighted mean
+    tau_i_values: np.ndarray = calculate_tau_i_values(context, coefficients)
+    delta_tau_i_values: np.ndarray = (
+        calculate_error_propagation_terms_from_uncertainties(
+            context,
+            evaluate_differentiated_polynomial_at_measuring_times(
+                context, coefficients
+            ),
+            polynomial_uncertainties,
+            0,
+        )
+    )
+
+    left_out: np.ndarray = np.flatnonzero(calculation_rows >= 0)
+    tau_i_values[left_out + 1, calculation_rows[left_out]] = 0
+    delta_tau_i_values[left_out + 1, calculation_rows[left_out]] = np.inf
+
+    return calculate_tau_final_for_tau_factors(tau_i_values, delta_tau_i_values)
@@ -0,0 +1,196 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from napytau.core.core import calculate_lifetimes_for_tau_factors
+from napytau.import_export.model.dataset import DataSet
+
+
+@dataclass(frozen=True)
+class LifetimeTable:
+    """
+    The lifetime and its uncertainty as a function of the tau factor, precomputed
+    on a grid of tau factors, so lifetimes for other tau factors can be
+    interpolated instantly. The grid is refined where the interpolation is not
+    accurate enough. For every interval of the grid, an estimate of the deviation
+    of the interpolated from the exact lifetime and uncertainty is kept.
+    """
+
+    tau_factors: np.ndarray
+    lifetimes: np.ndarray
+    lifetime_errors: np.ndarray
+    lifetime_interpolation_errors: np.ndarray
+    lifetime_error_interpolation_errors: np.ndarray
+
+    def interpolate(self, tau_factor: float) -> Tuple[float, float, float, float]:
+        """
+        Interpolates the lifetime for a tau factor within the range of the table,
+        linearly in the logarithm of the tau factor.
+
+        Args:
+            tau_factor (float): The tau factor to interpolate the lifetime for
+
+        Returns:
+            tuple: The lifetime, its uncertainty and the estimated interpolation
+            errors of both
+        """
+        log_tau_factors = np.log(self.tau_factors)
+        log_tau_factor = np.log(
+            np.clip(tau_factor, self.tau_factors[0], self.tau_factors[-1])
+        )
+        interval = int(
+            np.clip(
+                np.searchsorted(log_tau_factors, log_tau_factor) - 1,
+                0,
+                len(self.tau_factors) - 2,
+            )
+        )
+
+        return (
+            float(np.interp(log_tau_factor, log_tau_factors, self.lifetimes)),
+            float(np.interp(log_tau_factor, log_tau_factors, self.lifetime_errors)),
+            float(self.lifetime_interpolation_errors[interval]),
+            float(self.lifetime_error_interpolation_errors[interval]),
+        )
+
+
+def calculate_lifetime_table(
+    dataset: DataSet,
+    polynomial_degree: int,
+    tau_factor_range: Tuple[float, float] = (0.01, 100.0),
+    relative_tolerance: float = 1e-3,
+    initial_size: int = 17,
+    max_size: int = 1025,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
+) -> LifetimeTable:
+    """
+    Calculates a lifetime table on an adaptive grid of tau factors. The grid starts
+    evenly spaced in the logarithm of the tau factor. In every round, the lifetimes
+    at the midpoints of all intervals that are not accurate yet are calculated at
+    once and compared with the interpolated lifetimes, which estimates the
+    interpolation error of the interval. The midpoints are added to the grid, and
+    intervals whose estimate exceeds the tolerance are checked again in the next
+    round, until all intervals are accurate or the grid reached its maximum size.
+    If fewer tau factors are left than intervals to check, only the intervals with
+    the largest relative interpolation errors are refined, so the grid never
+    exceeds its maximum size.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        tau_factor_range (tuple): The smallest and largest tau factor of the table
+        relative_tolerance (float): The interpolation error of the lifetime and
+        its uncertainty, relative to their value, up to which an interval is
+        accurate
+        initial_size (int): The number of tau factors of the initial grid
+        max_size (int): The largest number of tau factors of the grid
+        fitting_mask (ndarray):
+        Optional boolean mask selecting the datapoints the polynomials are fitted
+        to. Defaults to the active datapoints.
+        calculation_mask (ndarray):
+        Optional boolean mask selecting the datapoints the lifetimes are
+        calculated for. Defaults to the active datapoints.
+
+    Returns:
+        LifetimeTable: The lifetime table
+    """
+    tau_factors = np.geomspace(tau_factor_range[0], tau_factor_range[1], initial_size)
+    lifetimes, lifetime_errors = calculate_lifetimes_for_tau_factors(
+        dataset, tau_factors, polynomial_degree, fitting_mask, calculation_mask
+    )
+    # The interpolation error of the intervals, infinite until they were checked
+    lifetime_interpolation_errors = np.full(initial_size - 1, np.inf)
+    lifetime_error_interpolation_errors = np.full(initial_size - 1, np.inf)
+    unchecked = np.ones(initial_size - 1, dtype=bool)
+
+    while unchecked.any() and len(tau_factors) < max_size:
+        intervals = np.flatnonzero(unchecked)
+        remaining_size = max_size - len(tau_factors)
+        if len(intervals) > remaining_size:
+            relative_errors = _calculate_relative_interpolation_errors(
+                intervals,
+                lifetimes,
+                lifetime_errors,
+                lifetime_interpolation_errors,
+                lifetime_error_interpolation_errors,
+            )
+            intervals = np.sort(
+                intervals[np.argsort(-relative_errors, kind="stable")[:remaining_size]]
+            )
+        # The midpoints in the logarithm of the tau factor
+        midpoints = np.sqrt(tau_factors[intervals] * tau_factors[intervals + 1])
+        midpoint_lifetimes, midpoint_lifetime_errors = (
+            calculate_lifetimes_for_tau_factors(
+                dataset, midpoints, polynomial_degree, fitting_mask, calculation_mask
+            )
+        )
+
+        # Linear interpolation in the logarithm of the tau factor is the mean of
+        # the neighbouring values at the midpoint
+        lifetime_deviations = np.abs(
+            midpoint_lifetimes - (lifetimes[intervals] + lifetimes[intervals + 1]) / 2
+        )
+        lifetime_error_deviations = np.abs(
+            midpoint_lifetime_errors
+            - (lifetime_errors[intervals] + lifetime_errors[intervals + 1]) / 2
+        )
+        # NaN deviations never count as accurate
+        accurate = (
+            lifetime_deviations <= relative_tolerance * np.abs(midpoint_lifetimes)
+        ) & (
+            lifetime_error_deviations
+            <= relative_tolerance * np.abs(midpoint_lifetime_errors)
+        )
+
+        # Both halves of a checked interval keep its deviation as a conservative
+        # estimate, only the halves of inaccurate intervals are checked again
+        insert_positions = intervals + 1
+        tau_factors = np.insert(tau_factors, insert_positions, midpoints)
+        lifetimes = np.insert(lifetimes, insert_positions, midpoint_lifetimes)
+        lifetime_errors = np.insert(
+            lifetime_errors, insert_positions, midpoint_lifetime_errors
+        )
+        lifetime_interpolation_errors[intervals] = lifetime_deviations
+        lifetime_interpolation_errors = np.insert(
+            lifetime_interpolation_errors, insert_positions, lifetime_deviations
+        )
+        lifetime_error_interpolation_errors[intervals] = lifetime_error_deviations
+        lifetime_error_interpolation_errors = np.insert(
+            lifetime_error_interpolation_errors,
+            insert_positions,
+            lifetime_error_deviations,
+        )
+        unchecked[intervals] = ~accurate
+        unchecked = np.insert(unchecked, insert_positions, ~accurate)
+
+    return LifetimeTable(
+        tau_factors,
+        lifetimes,
+        lifetime_errors,
+        lifetime_interpolation_errors,
+        lifetime_error_interpolation_errors,
+    )
+
+
+def _calculate_relative_interpolation_errors(
+    intervals: np.ndarray,
+    lifetimes: np.ndarray,
+    lifetime_errors: np.ndarray,
+    lifetime_interpolation_errors: np.ndarray,
+    lifetime_error_interpolation_errors: np.ndarray,
+) -> np.ndarray:
+    # The larger of the interpolation errors of the lifetime and its uncertainty
+    # in the intervals, relative to their mean value. Intervals that were not
+    # checked yet or whose errors are undefined come first.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_errors = np.fmax(
+            lifetime_interpolation_errors[intervals]
+            / np.abs((lifetimes[intervals] + lifetimes[intervals + 1]) / 2),
+            lifetime_error_interpolation_errors[intervals]
+            / np.abs((lifetime_errors[intervals] + lifetime_errors[intervals + 1]) / 2),
+        )
+
+    defined_relative_errors: np.ndarray = np.nan_to_num(relative_errors, nan=np.inf)
+    return defined_relative_errors
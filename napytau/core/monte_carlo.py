@@ -0,0 +1,322 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from napytau.core.core import create_fit_contexts
+from napytau.core.delta_tau import (
+    calculate_error_propagation_terms_from_uncertainties,
+)
+from napytau.core.errors.polynomial_coefficient_error import (
+    PolynomialCoefficientError,
+)
+from napytau.core.fit_context import FitContext
+from napytau.core.tau_final import calculate_tau_final_for_tau_factors
+from napytau.import_export.model.datapoint_columns import (
+    DISTANCE,
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+)
+from napytau.import_export.model.dataset import DataSet
+
+# The percentiles of the median and of the one and two sigma intervals of a normal
+# distribution
+DEFAULT_PERCENTILES = (2.275, 15.866, 50.0, 84.134, 97.725)
+
+
+@dataclass(frozen=True)
+class MonteCarloLifetimes:
+    """
+    The lifetimes for the fit of datasets resampled from the value/error pairs of
+    a dataset, one per sample, in the order they were drawn in. Samples whose
+    lifetime is undefined, e.g. as the derivative of the polynomial vanishes at a
+    measuring time, are NaN. The seed reproduces the samples.
+    """
+
+    lifetimes: np.ndarray
+    seed: int
+
+    def __len__(self) -> int:
+        return len(self.lifetimes)
+
+    def get_valid_lifetimes(self) -> np.ndarray:
+        """The lifetimes of all samples with a defined lifetime."""
+        valid_lifetimes: np.ndarray = self.lifetimes[np.isfinite(self.lifetimes)]
+        return valid_lifetimes
+
+    def get_invalid_sample_count(self) -> int:
+        """The number of samples without a defined lifetime."""
+        return len(self) - len(self.get_valid_lifetimes())
+
+    def get_percentiles(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> np.ndarray:
+        """The percentiles of the lifetime, NaN if no lifetime is defined."""
+        valid_lifetimes = self.get_valid_lifetimes()
+        if len(valid_lifetimes) == 0:
+            return np.full(len(percentiles), np.nan)
+
+        lifetime_percentiles: np.ndarray = np.percentile(valid_lifetimes, percentiles)
+        return lifetime_percentiles
+
+    def get_mean(self) -> float:
+        """The mean of the defined lifetimes."""
+        return float(np.mean(self.get_valid_lifetimes()))
+
+    def get_standard_deviation(self) -> float:
+        """The sample standard deviation of the defined lifetimes."""
+        return float(np.std(self.get_valid_lifetimes(), ddof=1))
+
+
+@dataclass(frozen=True)
+class _MonteCarloInputs:
+    # The value/error pairs to resample, for the fitted and calculated datapoints
+    # in the order of the datapoint collection
+    fitted: np.ndarray
+    calculated: np.ndarray
+    distances: np.ndarray
+    distance_errors: np.ndarray
+    velocity: float
+    velocity_error: float
+    shifted_intensities: np.ndarray
+    shifted_intensity_errors: np.ndarray
+    unshifted_intensities: np.ndarray
+    unshifted_intensity_errors: np.ndarray
+    calculation_context: FitContext
+
+
+def calculate_monte_carlo_lifetimes(
+    dataset: DataSet,
+    polynomial_degree: int,
+    number_of_samples: int,
+    seed: Optional[int] = None,
+    chunk_size: int = 10000,
+    max_workers: Optional[int] = None,
+    fitting_mask: Optional[np.ndarray] = None,
+    calculation_mask: Optional[np.ndarray] = None,
+) -> MonteCarloLifetimes:
+    """
+    Calculates the distribution of the lifetime for the fit by drawing datasets
+    from the value/error pairs of the dataset. The distances, the shifted and
+    unshifted intensities and the relative velocity are drawn from normal
+    distributions, and the fit, the lifetimes tau_i, their errors and the
+    weighted mean are calculated for every drawn dataset, in contrast to the
+    linearized errors of calculate_error_propagation_terms.
+
+    The samples are drawn in chunks, each a single array with one row per sample,
+    and all stages are evaluated for a whole chunk at once. The chunk size bounds
+    the memory, apart from the resulting lifetimes. Every chunk draws from its own
+    random generator spawned from the seed, so the lifetimes do not depend on the
+    number of worker processes.
+
+    Args:
+        dataset (DataSet): The dataset of the experiment
+        polynomial_degree (int): The degree of the polynomial to be fitted
+        number_of_samples (int): The number of datasets to draw
+        seed (int):
+        Optional seed of the random generators. A random seed is used if omitted,
+        which is recorded in the result.
+        chunk_size (int): The maximum number of samples drawn at once
+        max_workers (int):
+        The number of worker processes, the number of CPUs if omitted. With a
+        single worker or a single chunk, the samples are drawn in the current
+        process, which avoids the start-up cost of the pool.
+        fitting_mask (ndarray):
+        Optional boolean mask selecting the datapoints the polynomial is fitted
+        to. Defaults to the active datapoints.
+        calculation_mask (ndarray):
+        Optional boolean mask selecting the datapoints the lifetimes are
+        calculated for. Defaults to the active datapoints.
+
+    Returns:
+        MonteCarloLifetimes: The lifetimes of all samples and the seed.
+    """
+    if number_of_samples <= 0:
+        raise ValueError(
+            f"The number of samples must be positive, got {number_of_samples}."
+        )
+    if chunk_size <= 0:
+        raise ValueError(f"The chunk size must be positive, got {chunk_size}.")
+
+    fitting_context, calculation_context = create_fit_contexts(
+        dataset, polynomial_degree, fitting_mask, calculation_mask
+    )
+    if len(fitting_context) < polynomial_degree + 1:
+        raise PolynomialCoefficientError(
+            f"A polynomial of degree {polynomial_degree} can not be fitted to "
+            f"{len(fitting_context)} datapoints."
+        )
+
+    inputs = _create_inputs(dataset, fitting_context, calculation_context)
+
+    # A random seed is drawn up front, so it can be recorded in the result
+    if seed is None:
+        seed = int(np.random.default_rng().integers(2**63))
+    seed_sequence = np.random.SeedSequence(seed)
+    chunk_sizes: List[int] = [chunk_size] * (number_of_samples // chunk_size)
+    if number_of_samples % chunk_size > 0:
+        chunk_sizes.append(number_of_samples % chunk_size)
+    chunk_seed_sequences = seed_sequence.spawn(len(chunk_sizes))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(chunk_sizes)))
+
+    if max_workers == 1:
+        chunks = [
+            _calculate_lifetimes_for_chunk(inputs, chunk_seed_sequence, size)
+            for chunk_seed_sequence, size in zip(chunk_seed_sequences, chunk_sizes)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(
+                executor.map(
+                    _calculate_lifetimes_for_chunk,
+                    repeat(inputs),
+                    chunk_seed_sequences,
+                    chunk_sizes,
+                )
+            )
+
+    return MonteCarloLifetimes(
+        lifetimes=np.concatenate(chunks),
+        seed=seed,
+    )
+
+
+def _create_inputs(
+    dataset: DataSet,
+    fitting_context: FitContext,
+    calculation_context: FitContext,
+) -> _MonteCarloInputs:
+    columns = dataset.get_datapoints().get_columns()
+    selection: np.ndarray = fitting_context.mask | calculation_context.mask
+    relative_velocity = dataset.get_relative_velocity()
+
+    return _MonteCarloInputs(
+        fitted=fitting_context.mask[selection],
+        calculated=calculation_context.mask[selection],
+        distances=columns.get_values(DISTANCE)[selection],
+        distance_errors=columns.get_errors(DISTANCE)[selection],
+        velocity=relative_velocity.value.get_velocity(),
+        velocity_error=relative_velocity.error.get_velocity(),
+        shifted_intensities=columns.get_values(SHIFTED_INTENSITY)[selection],
+        shifted_intensity_errors=columns.get_errors(SHIFTED_INTENSITY)[selection],
+        unshifted_intensities=columns.get_values(UNSHIFTED_INTENSITY)[selection],
+        unshifted_intensity_errors=columns.get_errors(UNSHIFTED_INTENSITY)[selection],
+        calculation_context=calculation_context,
+    )
+
+
+def _calculate_lifetimes_for_chunk(
+    inputs: _MonteCarloInputs,
+    seed_sequence: np.random.SeedSequence,
+    number_of_samples: int,
+) -> np.ndarray:
+    # Imported here, as loading scipy is a noticeable part of the start-up time
+    from scipy.constants import speed_of_light
+
+    random = np.random.default_rng(seed_sequence)
+    velocities: np.ndarray = inputs.velocity + inputs.velocity_error * (
+        random.standard_normal(number_of_samples)
+    )
+    times: np.ndarray = _draw(
+        random, inputs.distances, inputs.distance_errors, number_of_samples
+    ) / (velocities[:, np.newaxis] * speed_of_light)
+    shifted_intensities: np.ndarray = _draw(
+        random,
+        inputs.shifted_intensities,
+        inputs.shifted_intensity_errors,
+        number_of_samples,
+    )[:, inputs.fitted]
+    unshifted_intensities: np.ndarray = _draw(
+        random,
+        inputs.unshifted_intensities,
+        inputs.unshifted_intensity_errors,
+        number_of_samples,
+    )[:, inputs.calculated]
+
+    # Every sample is fitted on its times mapped onto [-1, 1], like
+    # numpy.polynomial.Polynomial.fit, which keeps the normal equations well
+    # conditioned. With x = (2t - (t_min + t_max)) / (t_max - t_min) and
+    # Q(x) = P(t), the derivative becomes P'(t) = Q'(x) * 2 / (t_max - t_min).
+    number_of_coefficients: int = inputs.calculation_context.polynomial_degree + 1
+    fitted_times: np.ndarray = times[:, inputs.fitted]
+    minimum_times: np.ndarray = np.min(fitted_times, axis=1, keepdims=True)
+    time_spans: np.ndarray = np.max(fitted_times, axis=1, keepdims=True) - (
+        minimum_times
+    )
+    time_spans[time_spans == 0] = 2.0
+    mapped_times: np.ndarray = 2 * (times - minimum_times) / time_spans - 1
+    power_basis: np.ndarray = np.empty(mapped_times.shape + (number_of_coefficients,))
+    power_basis[..., 0] = 1.0
+    for power in range(1, number_of_coefficients):
+        power_basis[..., power] = power_basis[..., power - 1] * mapped_times
+    fitting_power_basis: np.ndarray = power_basis[:, inputs.fitted]
+    calculation_power_basis: np.ndarray = power_basis[:, inputs.calculated]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # The unweighted least squares fit of the shifted intensities of every
+        # sample, like calculate_polynomial_coefficients_for_fit
+        transposed_basis: np.ndarray = np.swapaxes(fitting_power_basis, 1, 2)
+        coefficients: np.ndarray = np.linalg.solve(
+            transposed_basis @ fitting_power_basis,
+            transposed_basis @ shifted_intensities[..., np.newaxis],
+        )
+        # Q'(x) = sum_k k * c_k * x^(k-1)
+        derivative_coefficients: np.ndarray = (
+            coefficients[:, 1:] * np.arange(1, number_of_coefficients)[:, np.newaxis]
+        )
+        differentiated_polynomial_values: np.ndarray = (
+            calculation_power_basis[..., :-1] @ derivative_coefficients
+        )[..., 0] * (2 / time_spans)
+        tau_i_values: np.ndarray = (
+            unshifted_intensities / differentiated_polynomial_values
+        )
+
+        # The polynomial uncertainties of every sample, as in
+        # calculate_polynomial_uncertainties, which do not depend on the mapping of
+        # the times: the diagonal of V_c C V_c^T with the covariance matrix C of
+        # the fit weighted with the errors of the shifted intensities
+        weights: np.ndarray = 1 / np.power(
+            inputs.shifted_intensity_errors[inputs.fitted], 2
+        )
+        covariance_matrices: np.ndarray = np.linalg.inv(
+            (transposed_basis * weights) @ fitting_power_basis
+        )
+        polynomial_uncertainties: np.ndarray = np.einsum(
+            "sik,sik->si",
+            calculation_power_basis @ covariance_matrices,
+            calculation_power_basis,
+        )
+        delta_tau_i_values: np.ndarray = (
+            calculate_error_propagation_terms_from_uncertainties(
+                inputs.calculation_context,
+                differentiated_polynomial_values,
+                polynomial_uncertainties,
+                0,
+                unshifted_intensities=unshifted_intensities,
+            )
+        )
+
+        lifetimes, _ = calculate_tau_final_for_tau_factors(
+            tau_i_values, delta_tau_i_values
+        )
+
+    return np.where(np.isfinite(lifetimes), lifetimes, np.nan)
+
+
+def _draw(
+    random: np.random.Generator,
+    values: np.ndarray,
+    errors: np.ndarray,
+    number_of_samples: int,
+) -> np.ndarray:
+    # One row of values drawn from normal distributions per sample
+    drawn_values: np.ndarray = values + errors * random.standard_normal(
+        (number_of_samples, len(values))
+    )
+    return drawn_values
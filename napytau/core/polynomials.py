@@ -1,46 +1,51 @@
 from napytau.core.errors.polynomial_coefficient_error import (
     PolynomialCoefficientError,
 )
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
 import numpy as np
-import scipy as sp
 
-from napytau.core.time import calculate_times_from_distances_and_relative_velocity
-from napytau.import_export.model.dataset import DataSet
+from napytau.core.fit_context import FitContext
+from napytau.util.coalesce import coalesce
 
 
 def evaluate_polynomial_at_measuring_times(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
 ) -> np.ndarray:
     """
     Computes the sum of a polynomial evaluated at given time points.
 
     Args:
-        dataset (DataSet): The dataset of the experiment
-        Datapoints for fitting, consisting of distances and intensities
+        context (FitContext): The prepared data of the experiment
         coefficients (ndarray):
         Array of polynomial coefficients [a_0, a_1, ..., a_n],
         where the polynomial is P(t) = a_0 + a_1*t + a_2*t^2 + ... + a_n*t^n.
+        A 2D array with one set of coefficients per row evaluates several
+        polynomials at once.
 
     Returns:
-        ndarray: Array of polynomial values evaluated at the given time points.
+        ndarray: Array of polynomial values evaluated at the given time points,
+        with one row per polynomial for 2D coefficients.
     """
-    if len(coefficients) == 0:
+    coefficients = np.asarray(coefficients, dtype=float)
+    if coefficients.shape[-1] == 0:
         raise PolynomialCoefficientError(
             "An empty array of coefficients can not be evaluated."
         )
 
-    times: np.ndarray = calculate_times_from_distances_and_relative_velocity(dataset)
-    # Evaluate the polynomial sum at the given time points
-    sum_at_measuring_distances: np.ndarray = np.zeros_like(times, dtype=float)
-    for exponent, coefficient in enumerate(coefficients):
-        sum_at_measuring_distances += coefficient * np.power(times, exponent)
+    # Evaluate the polynomial sum at the given time points, row i of the power
+    # basis holds the powers t_i^k
+    sum_at_measuring_distances: np.ndarray = (
+        coefficients @ context.get_power_basis(coefficients.shape[-1]).T
+    )
 
     return sum_at_measuring_distances
 
 
 def evaluate_differentiated_polynomial_at_measuring_times(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
 ) -> np.ndarray:
     """
@@ -48,44 +53,41 @@ def evaluate_differentiated_polynomial_at_measuring_times(
     at given time points.
 
     Args:
-        dataset (DataSet): The dataset of the experiment
-        Datapoints for fitting, consisting of distances and intensities
+        context (FitContext): The prepared data of the experiment
         coefficients (ndarray):
         Array of polynomial coefficients [a_0, a_1, ..., a_n],
         where the polynomial is P(t) = a_0 + a_1*t + a_2*t^2 + ... + a_n*t^n.
+        A 2D array with one set of coefficients per row evaluates several
+        polynomials at once.
 
     Returns:
         ndarray:
-        Array of the derivative values of the polynomial at the given time points.
+        Array of the derivative values of the polynomial at the given time points,
+        with one row per polynomial for 2D coefficients.
     """
-    if len(coefficients) == 0:
+    coefficients = np.asarray(coefficients, dtype=float)
+    if coefficients.shape[-1] == 0:
         raise PolynomialCoefficientError(
             "An empty array of coefficients can not be evaluated."
         )
 
-    times: np.ndarray = calculate_times_from_distances_and_relative_velocity(dataset)
-    sum_of_derivative_at_measuring_distances: np.ndarray = np.zeros_like(
-        times, dtype=float
+    # Row i of the derivative basis holds k * t_i^(k-1)
+    sum_of_derivative_at_measuring_distances: np.ndarray = (
+        coefficients @ context.get_derivative_basis(coefficients.shape[-1]).T
     )
-    for exponent, coefficient in enumerate(coefficients):
-        if exponent > 0:
-            sum_of_derivative_at_measuring_distances += (
-                exponent * coefficient * np.power(times, (exponent - 1))
-            )
 
     return sum_of_derivative_at_measuring_distances
 
 
 def calculate_polynomial_coefficients_for_fit(
-    dataset: DataSet,
-    degree: int,
+    context: FitContext,
 ) -> np.ndarray:
     """
     Calculates the polynomial coefficients for the polynomial fit.
 
     Args:
-        dataset (DataSet): The dataset of the experiment
-        degree (int): The degree of the polynomial to be fitted
+        context (FitContext):
+        The prepared data of the experiment, including the polynomial degree
 
     Returns:
         ndarray: Array of polynomial coefficients for the fit.
@@ -93,9 +95,9 @@ def calculate_polynomial_coefficients_for_fit(
     # Calculate the polynomial coefficients for the fit
     polynomial_coefficients: np.ndarray = (
         np.polynomial.Polynomial.fit(
-            calculate_times_from_distances_and_relative_velocity(dataset),
-            dataset.get_datapoints().get_shifted_intensities().get_values(),
-            degree,
+            context.times,
+            context.shifted_intensities,
+            context.polynomial_degree,
         )
         .convert()
         .coef
@@ -105,39 +107,296 @@ def calculate_polynomial_coefficients_for_fit(
 
 
 def calculate_polynomial_coefficients_for_tau_factor(
-    dataset: DataSet,
+    context: FitContext,
     tau_factor: float,
-    degree: int,
+    initial_coefficients: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Calculates the polynomial coefficients for the tau factor.
 
     Args:
-        dataset (DataSet): The dataset of the experiment
+        context (FitContext):
+        The prepared data of the experiment, including the polynomial degree
         tau_factor (float): The tau factor to be used in the polynomial fit
-        degree (int): The degree of the polynomial to be fitted
+        initial_coefficients (ndarray):
+        Optional starting point of the solver, e.g. the coefficients of a nearby
+        tau factor. The coefficients of the polynomial fit are used if omitted.
 
     Returns:
         ndarray: Array of polynomial coefficients for the tau factor.
     """
+    return solve_polynomial_coefficients_for_tau_factor(
+        context,
+        tau_factor,
+        initial_coefficients,
+    ).coefficients
+
+
+@dataclass(frozen=True)
+class TauFactorFitResult:
+    """
+    The outcome of the coefficient solver for a tau factor.
+    - coefficients: the polynomial coefficients in increasing order of degree
+    - cost: half the sum of the squared residuals P(t_i)/P'(t_i) - tau_factor
+    - iterations: the number of Levenberg-Marquardt iterations
+    - evaluations: the number of residual evaluations, including rejected steps
+    Iterations and evaluations are summed over all starting points of the solver.
+    - converged: whether a tolerance was met before the iteration limit
+    """
+
+    coefficients: np.ndarray
+    cost: float
+    iterations: int
+    evaluations: int
+    converged: bool
+
+
+def solve_polynomial_coefficients_for_tau_factor(
+    context: FitContext,
+    tau_factor: float,
+    initial_coefficients: Optional[np.ndarray] = None,
+    max_iterations: int = 100,
+    tolerance: float = 1e-8,
+) -> TauFactorFitResult:
+    """
+    Solves for the polynomial coefficients that make P(t_i)/P'(t_i) match the tau
+    factor at all measuring times, in the least squares sense.
+
+    The residual r_i = P(t_i)/P'(t_i) - tau_factor is minimized with the
+    Levenberg-Marquardt method. Its jacobian matrix is known in closed form,
+    dr_i/da_k = t_i^k/P'(t_i) - P(t_i)*k*t_i^(k-1)/P'(t_i)^2, and is built from
+    the power bases of the fit context, so no polynomial objects are created
+    and no time conversion is repeated during the iterations.
+
+    The residual does not change if all coefficients are scaled by the same
+    factor. The solver therefore works on coefficients of unit length and
+    finally fixes the scale by fitting the polynomial to the shifted intensities.
+    This makes the result independent of the scale of the starting point.
+
+    Args:
+        context (FitContext):
+        The prepared data of the experiment, including the polynomial degree
+        tau_factor (float): The tau factor to be used in the polynomial fit
+        initial_coefficients (ndarray):
+        Optional starting point of the solver, e.g. the coefficients of a nearby
+        tau factor. The coefficients of the polynomial fit are used if omitted.
+        max_iterations (int): The maximum number of Levenberg-Marquardt iterations
+        tolerance (float):
+        Relative decrease of the cost and relative step size below which the
+        solver stops
 
-    polynomial_fit = (
-        lambda x, *coefficients: (
-            np.poly1d(coefficients)(x) / np.polyder(np.poly1d(coefficients))(x)
+    Returns:
+        TauFactorFitResult: The coefficients together with the solver statistics.
+    """
+    number_of_coefficients: int = context.polynomial_degree + 1
+
+    # The solver works on the times t/s, scaled to at most one, which keeps the
+    # columns of the bases at comparable magnitudes. With Q(t/s) = P(t) the
+    # residual becomes (Q/Q' - tau_factor/s) * s and a_k = b_k / s^k.
+    time_scale: float = float(np.max(np.abs(context.times), initial=0)) or 1.0
+    powers_of_time_scale: np.ndarray = time_scale ** np.arange(number_of_coefficients)
+    power_basis: np.ndarray = (
+        context.get_power_basis(number_of_coefficients) / powers_of_time_scale
+    )
+    derivative_basis: np.ndarray = (
+        context.get_derivative_basis(number_of_coefficients)
+        * time_scale
+        / powers_of_time_scale
+    )
+    scaled_tau_factor: float = tau_factor / time_scale
+
+    if initial_coefficients is None:
+        initial_coefficients = calculate_polynomial_coefficients_for_fit(context)
+    initial_coefficients = np.asarray(initial_coefficients, dtype=float)
+    warm_start: np.ndarray = np.zeros(number_of_coefficients)
+    warm_start[: len(initial_coefficients)] = initial_coefficients[
+        :number_of_coefficients
+    ]
+    warm_start *= powers_of_time_scale
+
+    # The residual has several local minima, separated by the poles at which P'
+    # vanishes at a measuring time. Besides the warm start, the solver therefore
+    # also starts from the minimizer of sum((P(t_i) - tau_factor*P'(t_i))^2),
+    # which is linear in the coefficients and has a closed form solution.
+    linearized_start: np.ndarray = np.linalg.svd(
+        power_basis - scaled_tau_factor * derivative_basis
+    )[2][-1]
+
+    best: Optional[Tuple[np.ndarray, float, bool]] = None
+    iterations: int = 0
+    evaluations: int = 0
+    for start in (warm_start, linearized_start):
+        coefficients, cost, start_iterations, start_evaluations, converged = (
+            _minimize_tau_factor_residuals(
+                power_basis,
+                derivative_basis,
+                scaled_tau_factor,
+                _normalize(start),
+                max_iterations,
+                tolerance,
+            )
         )
-        - tau_factor
+        iterations += start_iterations
+        evaluations += start_evaluations
+        if best is None or cost < best[1]:
+            best = (coefficients, cost, converged)
+
+    # Both starting points were tried, so a best result exists
+    coefficients, cost, converged = coalesce(best)
+    coefficients = coefficients / powers_of_time_scale
+    cost *= time_scale**2
+
+    return TauFactorFitResult(
+        coefficients=_fit_scale_to_shifted_intensities(context, coefficients),
+        cost=cost,
+        iterations=iterations,
+        evaluations=evaluations,
+        converged=converged,
     )
 
-    # Initial guess: coefficients as ones
-    initial_guess = np.ones(degree)
 
-    # Solve for coefficients using least squares
-    res = sp.optimize.least_squares(
-        lambda coefficients: polynomial_fit(
-            calculate_times_from_distances_and_relative_velocity(dataset),
-            *coefficients,
-        ),
-        initial_guess,
+def _minimize_tau_factor_residuals(
+    power_basis: np.ndarray,
+    derivative_basis: np.ndarray,
+    tau_factor: float,
+    coefficients: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+) -> Tuple[np.ndarray, float, int, int, bool]:
+    def evaluate(
+        coefficients: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        polynomial: np.ndarray = power_basis @ coefficients
+        differentiated_polynomial: np.ndarray = derivative_basis @ coefficients
+        with np.errstate(divide="ignore", invalid="ignore"):
+            residuals: np.ndarray = polynomial / differentiated_polynomial - tau_factor
+        cost: float = 0.5 * float(residuals @ residuals)
+
+        return polynomial, differentiated_polynomial, residuals, cost
+
+    polynomial, differentiated_polynomial, residuals, cost = evaluate(coefficients)
+    evaluations: int = 1
+    iterations: int = 0
+    converged: bool = cost == 0
+    damping: float = 1e-3
+
+    while not converged and iterations < max_iterations and np.isfinite(cost):
+        iterations += 1
+
+        jacobian_matrix: np.ndarray = (
+            power_basis
+            - (polynomial / differentiated_polynomial)[:, np.newaxis] * derivative_basis
+        ) / differentiated_polynomial[:, np.newaxis]
+        # Marquardt's scaling makes the damping independent of the magnitudes of
+        # the columns, which differ by the powers of the measuring times
+        scaling: np.ndarray = np.linalg.norm(jacobian_matrix, axis=0)
+        scaling = np.maximum(scaling, np.finfo(float).eps * max(scaling.max(), 1))
+        scaled_jacobian_matrix: np.ndarray = jacobian_matrix / scaling
+        normal_matrix: np.ndarray = scaled_jacobian_matrix.T @ scaled_jacobian_matrix
+        gradient: np.ndarray = scaled_jacobian_matrix.T @ residuals
+
+        # Increase the damping until a step decreases the cost. The damping also
+        # regularizes the normal matrix, which is singular along the coefficients
+        # themselves.
+        while True:
+            step: np.ndarray = (
+                np.linalg.solve(
+                    normal_matrix + damping * np.eye(len(coefficients)), -gradient
+                )
+                / scaling
+            )
+            candidate: np.ndarray = _normalize(coefficients + step)
+            candidate_values = evaluate(candidate)
+            evaluations += 1
+            if np.isfinite(candidate_values[3]) and candidate_values[3] < cost:
+                damping = max(damping / 3, 1e-9)
+                break
+            damping *= 4
+            if damping > 1e12:
+                break
+
+        if damping > 1e12:
+            # Even tiny steps along the gradient do not decrease the cost
+            converged = True
+            break
+
+        previous_cost: float = cost
+        step_size: float = float(np.linalg.norm(candidate - coefficients))
+        coefficients = candidate
+        polynomial, differentiated_polynomial, residuals, cost = candidate_values
+
+        converged = previous_cost - cost <= tolerance * previous_cost or (
+            step_size <= tolerance
+        )
+
+    return coefficients, cost, iterations, evaluations, bool(converged)
+
+
+def _normalize(coefficients: np.ndarray) -> np.ndarray:
+    norm: float = float(np.linalg.norm(coefficients))
+    if norm == 0:
+        return coefficients
+
+    normalized_coefficients: np.ndarray = coefficients / norm
+
+    return normalized_coefficients
+
+
+def _fit_scale_to_shifted_intensities(
+    context: FitContext,
+    coefficients: np.ndarray,
+) -> np.ndarray:
+    # The scale s minimizing sum((I_sh - s*P)^2 / delta_I_sh^2)
+    polynomial: np.ndarray = evaluate_polynomial_at_measuring_times(
+        context, coefficients
     )
+    weights: np.ndarray = 1 / np.power(context.shifted_intensity_errors, 2)
+    normalization: float = float(np.sum(weights * polynomial**2))
+    if normalization == 0 or not np.isfinite(normalization):
+        return coefficients
+
+    scale: float = (
+        float(np.sum(weights * polynomial * context.shifted_intensities))
+        / normalization
+    )
+    if scale == 0:
+        return coefficients
+
+    return scale * coefficients
+
+
+def calculate_polynomial_coefficients_for_tau_factors(
+    context: FitContext,
+    tau_factors: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculates the polynomial coefficients for each of the given tau factors.
+
+    Args:
+        context (FitContext):
+        The prepared data of the experiment, including the polynomial degree
+        tau_factors (ndarray): The tau factors to be used in the polynomial fits
+
+    Returns:
+        ndarray: Array with one row of polynomial coefficients per tau factor.
+    """
+    coefficients: np.ndarray = np.empty(
+        (len(tau_factors), context.polynomial_degree + 1)
+    )
+    if len(tau_factors) == 0:
+        return coefficients
+
+    # Each solve starts from the solution of the previous tau factor, which is
+    # close by for the usual ranges of tau factors
+    initial_coefficients: np.ndarray = calculate_polynomial_coefficients_for_fit(
+        context
+    )
+    for index, tau_factor in enumerate(np.asarray(tau_factors, dtype=float)):
+        coefficients[index] = calculate_polynomial_coefficients_for_tau_factor(
+            context,
+            tau_factor,
+            initial_coefficients,
+        )
+        initial_coefficients = coefficients[index]
 
-    return np.array(res.x)
+    return coefficients
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+from napytau.import_export.model.datapoint_columns import (
+    DISTANCE,
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+    DatapointColumns,
+)
+from napytau.import_export.model.dataset import DataSet
+
+T = TypeVar("T")
+
+# The columns the core calculations depend on
+_HASHED_COLUMNS = [DISTANCE, SHIFTED_INTENSITY, UNSHIFTED_INTENSITY]
+
+# Salts the keys of the results, as the disk tier outlives the code that computed
+# them. Increase it whenever a change of the core calculations changes results.
+_CACHE_FORMAT_VERSION = 1
+
+# When the disk tier exceeds its size, the least recently used entries are evicted
+# until it is below this fraction of its size, so eviction does not run on every
+# write
+_DISK_EVICTION_TARGET = 0.8
+
+# Content hashes are cached per columnar representation of the datapoints, which
+# the collection replaces whenever a datapoint changes
+_content_hash_cache: WeakKeyDictionary[DatapointColumns, str] = WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    """
+    The number of lookups of a result cache that were answered from memory, from
+    disk, or had to be computed.
+    """
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+
+class ResultCache:
+    """
+    A cache for the results of core calculations, addressed by a key built from a
+    hash of the dataset contents and the parameters of the calculation. The most
+    recently used results are kept in memory. If a directory is given, results are
+    also stored on disk, where they outlive the process and are shared by all
+    processes using the same directory.
+
+    Results must be floats or tuples of floats, as they are stored as json.
+    """
+
+    max_entries: int
+    directory: Optional[str]
+    max_disk_bytes: int
+    _entries: OrderedDict[str, Any]
+    _statistics: CacheStatistics
+    _disk_bytes: Optional[int]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 64 << 20,
+    ):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._statistics = CacheStatistics()
+        # The size of the disk tier is only determined once something is written
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], T]) -> T:
+        """
+        Returns the cached result for the key, or computes, caches and returns it.
+        Errors raised by the computation are not cached.
+        """
+        digest = hashlib.sha256(repr((_CACHE_FORMAT_VERSION, key)).encode()).hexdigest()
+
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                self._count(memory_hits=1)
+                result: T = self._entries[digest]
+                return result
+
+        disk_result: Optional[T] = self._read_from_disk(digest)
+        if disk_result is not None:
+            with self._lock:
+                self._count(disk_hits=1)
+                self._store_in_memory(digest, disk_result)
+            return disk_result
+
+        computed_result = compute()
+        with self._lock:
+            self._count(misses=1)
+            self._store_in_memory(digest, computed_result)
+        self._write_to_disk(digest, computed_result)
+
+        return computed_result
+
+    def get_statistics(self) -> CacheStatistics:
+        return self._statistics
+
+    def clear(self) -> None:
+        """Drops the results held in memory and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._statistics = CacheStatistics()
+
+    def _count(self, memory_hits: int = 0, disk_hits: int = 0, misses: int = 0) -> None:
+        self._statistics = CacheStatistics(
+            self._statistics.memory_hits + memory_hits,
+            self._statistics.disk_hits + disk_hits,
+            self._statistics.misses + misses,
+        )
+
+    def _store_in_memory(self, digest: str, result: Any) -> None:
+        self._entries[digest] = result
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_from_disk(self, digest: str) -> Any:
+        if self.directory is None:
+            return None
+
+        file_path = os.path.join(self.directory, f"{digest}.json")
+        try:
+            with open(file_path) as file:
+                raw_result = json.load(file)
+            # The modification time marks the entry as recently used for eviction
+            os.utime(file_path)
+        except (OSError, ValueError):
+            return None
+
+        return tuple(raw_result) if isinstance(raw_result, list) else raw_result
+
+    def _write_to_disk(self, digest: str, result: Any) -> None:
+        if self.directory is None:
+            return
+
+        file_path = os.path.join(self.directory, f"{digest}.json")
+        # Other processes never see a partially written entry
+        temporary_file_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_file_path, "w") as file:
+                json.dump(result, file)
+            os.replace(temporary_file_path, file_path)
+            written_bytes = os.path.getsize(file_path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._measure_disk_tier()[0]
+            else:
+                self._disk_bytes += written_bytes
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_from_disk()
+
+    def _measure_disk_tier(self) -> Tuple[int, Dict[str, Tuple[float, int]]]:
+        # Returns the total size and the modification time and size of every entry
+        entries: Dict[str, Tuple[float, int]] = {}
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries[entry.path] = (stat.st_mtime, stat.st_size)
+
+        return sum(size for _, size in entries.values()), entries
+
+    def _evict_from_disk(self) -> None:
+        disk_bytes, entries = self._measure_disk_tier()
+        for file_path, (_, size) in sorted(entries.items(), key=lambda item: item[1]):
+            if disk_bytes <= self.max_disk_bytes * _DISK_EVICTION_TARGET:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                # The entry may have been evicted by another process already
+                pass
+            disk_bytes -= size
+
+        self._disk_bytes = disk_bytes
+
+
+def hash_dataset_contents(dataset: DataSet) -> str:
+    """
+    A hash of everything the core calculations depend on: the distances, the
+    shifted and unshifted intensities with their errors, the active mask and the
+    relative velocity. It is only computed once for the current datapoints.
+    """
+    columns = dataset.get_datapoints().get_columns()
+    if columns not in _content_hash_cache:
+        content_hash = hashlib.blake2b(digest_size=16)
+        for column in _HASHED_COLUMNS:
+            content_hash.update(column.encode())
+            content_hash.update(columns.get_values(column).tobytes())
+            content_hash.update(columns.get_errors(column).tobytes())
+            content_hash.update(np.packbits(columns.get_mask(column)).tobytes())
+        content_hash.update(np.packbits(columns.get_active_mask()).tobytes())
+        _content_hash_cache[columns] = content_hash.hexdigest()
+
+    relative_velocity = dataset.get_relative_velocity()
+
+    return (
+        f"{_content_hash_cache[columns]}:"
+        f"{relative_velocity.value.get_velocity()!r}:"
+        f"{relative_velocity.error.get_velocity()!r}"
+    )
+
+
+def hash_mask(mask: Optional[np.ndarray]) -> Optional[str]:
+    """
+    A hash of a mask selecting datapoints, for the keys of calculations that take
+    one. Omitted masks stay None, as they are derived from the dataset.
+    """
+    if mask is None:
+        return None
+
+    mask = np.asarray(mask, dtype=bool)
+
+    return f"{mask.size}:{np.packbits(mask).tobytes().hex()}"
+
+
+_result_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    """The result cache used by the core functions."""
+    return _result_cache
+
+
+def configure_result_cache(
+    max_entries: int = 256,
+    directory: Optional[str] = None,
+    max_disk_bytes: int = 64 << 20,
+) -> ResultCache:
+    """
+    Replaces the result cache used by the core functions, e.g. to add a disk tier.
+    The cache is kept if it is already configured the same way.
+    """
+    global _result_cache
+    if (
+        _result_cache.max_entries != max_entries
+        or _result_cache.directory != directory
+        or _result_cache.max_disk_bytes != max_disk_bytes
+    ):
+        _result_cache = ResultCache(max_entries, directory, max_disk_bytes)
+
+    return _result_cache
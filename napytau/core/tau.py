@@ -2,11 +2,11 @@ from napytau.core.polynomials import (
     evaluate_differentiated_polynomial_at_measuring_times,
 )  # noqa E501
 import numpy as np
-from napytau.import_export.model.dataset import DataSet
+from napytau.core.fit_context import FitContext
 
 
 def calculate_tau_i_values(
-    dataset: DataSet,
+    context: FitContext,
     coefficients: np.ndarray,
 ) -> np.ndarray:
     """
@@ -14,22 +14,20 @@ def calculate_tau_i_values(
     intensities and time points.
 
     Args:
-        dataset (DataSet): The dataset of the experiment
-        initial_coefficients (ndarray):
-        Initial guess for the polynomial coefficients
-        t_hyp_range (tuple):
-        Range for hypothesis optimization (min, max)
-        weight_factor (float):
-        Weighting factor for unshifted intensities
+        context (FitContext): The prepared data of the experiment
+        coefficients (ndarray):
+        Polynomial coefficients for fitting, or a 2D array with one set of
+        coefficients per row
 
     Returns:
-        ndarray: Calculated decay times for each distance point.
+        ndarray: Calculated decay times for each distance point, with one row per
+        set of coefficients for 2D coefficients.
     """
 
     # calculate decay times using the optimized coefficients
     tau_i_values: np.ndarray = (
-        dataset.get_datapoints().get_unshifted_intensities().get_values()
-        / evaluate_differentiated_polynomial_at_measuring_times(dataset, coefficients)
+        context.unshifted_intensities
+        / evaluate_differentiated_polynomial_at_measuring_times(context, coefficients)
     )
 
     return tau_i_values
@@ -31,3 +31,41 @@ def calculate_tau_final(
     uncertainty: float = np.sqrt(1 / np.sum(weights))
 
     return weighted_mean, uncertainty
+
+
+def calculate_tau_final_for_tau_factors(
+    tau_i_values: np.ndarray,
+    delta_tau_i_values: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the final decay times (tau_final) and their associated uncertainties
+    for several tau factors at once.
+
+    Args:
+        tau_i_values (ndarray):
+        Array of individual decay times (tau_i), one row per tau factor and one
+        column per measurement
+        delta_tau_i_values (ndarray):
+        Array of uncertainties associated with each tau_i, in the same layout
+
+    Returns:
+        tuple: Weighted means of tau (ndarray) and their uncertainties (ndarray),
+        one entry per tau factor
+    """
+    # For empty input arrays return -1 to show the invalidity of the input data.
+    if np.shape(tau_i_values)[-1] == 0:
+        invalid: np.ndarray = np.full(np.shape(tau_i_values)[0], -1.0)
+        return invalid, invalid.copy()
+
+    weights: np.ndarray = 1 / np.power(delta_tau_i_values, 2)
+    sum_of_weights: np.ndarray = np.sum(weights, axis=-1)
+
+    # Calculate the weighted means of tau_i
+    weighted_means: np.ndarray = (
+        np.sum(weights * tau_i_values, axis=-1) / sum_of_weights
+    )
+
+    # Calculate the uncertainties of the weighted means
+    uncertainties: np.ndarray = np.sqrt(1 / sum_of_weights)
+
+    return weighted_means, uncertainties
@@ -1,5 +1,4 @@
 import numpy as np
-import scipy as sp
 
 from napytau.import_export.model.dataset import DataSet
 
@@ -7,10 +6,10 @@ from napytau.import_export.model.dataset import DataSet
 def calculate_times_from_distances_and_relative_velocity(
     dataset: DataSet,
 ) -> np.ndarray:
+    # Imported here, as loading scipy is a noticeable part of the start-up time
+    from scipy.constants import speed_of_light
+
     return np.array(
         dataset.get_datapoints().get_distances().get_values()
-        / (
-            dataset.get_relative_velocity().value.get_velocity()
-            * sp.constants.speed_of_light
-        )
+        / (dataset.get_relative_velocity().value.get_velocity() * speed_of_light)
     )
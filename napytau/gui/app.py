@@ -1,10 +1,11 @@
 from pathlib import PurePath
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import tkinter as tk
 from tkinter import filedialog
 
 import customtkinter
+import numpy as np
 
 from napytau.cli.cli_arguments import CLIArguments
 
@@ -51,6 +52,9 @@ class App(customtkinter.CTk):
         # Datapoints
         self.datapoints_for_fitting: DatapointCollection = DatapointCollection([])
         self.datapoints_for_calculation: DatapointCollection = DatapointCollection([])
+        # The checkboxes for fitting toggle whether the datapoints are active, the
+        # checkboxes for the calculation of tau only toggle this mask
+        self.calculation_mask: np.ndarray = np.ones(0, dtype=bool)
 
         # values
         self.tau = tk.IntVar()
@@ -97,6 +101,7 @@ class App(customtkinter.CTk):
             "select_number_of_polynomials": self.select_number_of_polynomials,
             "select_polynomial_mode": self.select_polynomial_mode,
             "select_alpha_calc_mode": self.select_alpha_calc_mode,
+            "toggle_influence": self.toggle_influence,
         }
 
         # Initialize the menu bar
@@ -143,14 +148,20 @@ class App(customtkinter.CTk):
             )
 
             if file_path:
-                self.dataset = import_napytau_format_from_file(PurePath(file_path))
+                (dataset, raw_setups) = import_napytau_format_from_file(
+                    PurePath(file_path)
+                )
+                self.dataset = (dataset, list(raw_setups))
                 self.logger.log_message(
                     f"chosen directory: {file_path}", LogMessageType.INFO
                 )
 
         if len(self.dataset) > 0:
+            # Results calculated for the previous dataset are outdated
+            self.control_panel.compute_worker.cancel_all()
             self.update_data_checkboxes()
             self.graph.update_plot()
+            self.control_panel.update_lifetime_table()
 
     def save_file(self) -> None:
         """
@@ -229,11 +240,13 @@ class App(customtkinter.CTk):
         )
         popup.destroy()
         self.logger.log_message(f"Setup '{value}' loaded.", LogMessageType.SUCCESS)
+        self.control_panel.update_lifetime_table()
 
     def quit(self) -> None:
         """
         Quits the program.
         """
+        self.control_panel.compute_worker.shutdown()
         self.destroy()
 
     def change_appearance_mode(self) -> None:
@@ -243,6 +256,13 @@ class App(customtkinter.CTk):
         customtkinter.set_appearance_mode(self.menu_bar.appearance_mode.get())
         self.logger.switch_logger_appearance(self.menu_bar.appearance_mode.get())
         self.graph.update_plot()
+        self.toolbar.apply_coloring()
+
+    def toggle_influence(self) -> None:
+        """
+        Shows or hides the influence of the datapoints on the lifetime in the graph.
+        """
+        self.graph.update_plot()
 
     def select_number_of_polynomials(self) -> None:
         """
@@ -286,6 +306,7 @@ class App(customtkinter.CTk):
         for point in self.dataset[0].get_datapoints():
             self.datapoints_for_fitting.add_datapoint(point)
             self.datapoints_for_calculation.add_datapoint(point)
+        self.calculation_mask = np.ones(len(self.get_datapoints()), dtype=bool)
 
         self.checkbox_panel.update_data_checkboxes_fitting()
         self.checkbox_panel.update_data_checkboxes_calculation()
@@ -297,6 +318,18 @@ class App(customtkinter.CTk):
 
         return self.dataset[0].get_datapoints()
 
+    def get_calculation_mask(self) -> Optional[np.ndarray]:
+        """
+        Returns a copy of the mask of the datapoints checked for the calculation,
+        which is not affected by checkboxes toggled while a calculation runs.
+        Returns None if the checkboxes do not belong to the current datapoints, in
+        which case the active datapoints are used.
+        """
+        if len(self.calculation_mask) != len(self.get_datapoints()):
+            return None
+
+        return self.calculation_mask.copy()
+
 
 def init(cli_arguments: CLIArguments) -> None:
     app = App()
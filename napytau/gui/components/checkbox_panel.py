@@ -110,9 +110,21 @@ class CheckboxPanel:
         """
         Do not call from outside. Is called if a data checkbox for the calculation
         of tau and delta-tau is called.
-        Toggles the intern boolean value of the datapoint.
+        Toggles the datapoint in the calculation mask, so the datapoint stays
+        active for the fitting.
         :param index: Index of the pressed data checkbox.
         """
-        self.parent.datapoints_for_calculation[
-            index
-        ].active = not self.parent.datapoints_for_calculation[index].active
+        self.parent.calculation_mask[index] = not self.parent.calculation_mask[index]
+        if self.parent.calculation_mask[index]:
+            self.parent.logger.log_message(
+                "[calculation] checkbox with index " + str(index) + " activated.",
+                LogMessageType.INFO,
+            )
+
+        else:
+            self.parent.logger.log_message(
+                "[calculation] checkbox with index " + str(index) + " deactivated.",
+                LogMessageType.INFO,
+            )
+        self.parent.control_panel.update_lifetime_table()
+        self.parent.graph.update_plot()
@@ -1,17 +1,31 @@
+import dataclasses
 import customtkinter
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
+from napytau.gui.model.compute_worker import ComputeWorker
 from napytau.gui.model.log_message_type import LogMessageType
 
 from napytau.core.core import (
     calculate_optimal_tau_factor,
     calculate_lifetime_for_custom_tau_factor,
 )
+from napytau.core.lifetime_table import LifetimeTable, calculate_lifetime_table
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.datapoint_columns import DatapointColumns
+from napytau.import_export.model.dataset import DataSet
 from napytau.util.coalesce import coalesce
 
 if TYPE_CHECKING:
     from napytau.gui.app import App  # Import only for the type checking.
 
+# Channels of the compute worker, a new request replaces the pending one of its channel
+LIFETIME_CHANNEL = "lifetime"
+OPTIMAL_TAU_FACTOR_CHANNEL = "optimal_tau_factor"
+LIFETIME_TABLE_CHANNEL = "lifetime_table"
+
+# The lifetime is only calculated once the slider rested for this long
+SLIDER_DEBOUNCE_SECONDS = 0.05
+
 
 class ControlPanel(customtkinter.CTkFrame):
     def __init__(self, parent: "App"):
@@ -40,6 +54,20 @@ class ControlPanel(customtkinter.CTkFrame):
         self.result_tau_error = customtkinter.StringVar(value="N/A")
         self.result_absolute_tau_t = customtkinter.StringVar(value="N/A")
 
+        # Calculations run in the background, so the GUI stays responsive
+        self.compute_worker = ComputeWorker(self)
+
+        # Lifetimes for the slider are interpolated from a table, which is
+        # calculated in the background for the datapoints, the datapoints selected
+        # for the calculation and the polynomial degree
+        self.lifetime_table: Optional[LifetimeTable] = None
+        self._lifetime_table_key: Optional[
+            Tuple[DatapointColumns, Optional[bytes], int]
+        ] = None
+        self._requested_lifetime_table_key: Optional[
+            Tuple[DatapointColumns, Optional[bytes], int]
+        ] = None
+
         self._create_widgets()
 
     def _create_widgets(self) -> None:
@@ -65,6 +93,7 @@ class ControlPanel(customtkinter.CTkFrame):
 
         timescale_min = 0.01
         timescale_max = 100.0
+        self.timescale_range = (timescale_min, timescale_max)
 
         frame = customtkinter.CTkFrame(self)
         frame.columnconfigure(0, weight=1)  # Button "t [ps]"
@@ -85,17 +114,13 @@ class ControlPanel(customtkinter.CTkFrame):
                     self.parent.logger.log_message(
                         f"Timescale set to: {value}", LogMessageType.INFO
                     )
-                    lifetime = calculate_lifetime_for_custom_tau_factor(
-                        self.parent.datasets[0],
+                    self._submit_lifetime_calculation(
                         value,
-                        int(self.parent.menu_bar.number_of_polynomials.get()),
+                        lambda lifetime: self._tau_button_event(
+                            lifetime[0], lifetime[1]
+                        ),
                     )
 
-                    self.result_tau.set(str(lifetime[0]))
-                    self.result_tau_error.set(str(lifetime[1]))
-
-                    self._tau_button_event(lifetime[0], lifetime[1])
-
                 else:
                     self.parent.logger.log_message(
                         f"Error: Value out of valid range ({timescale_min:.2f}"
@@ -112,14 +137,23 @@ class ControlPanel(customtkinter.CTkFrame):
         def sync_slider(value: float) -> None:
             if self._check_dataset_set():
                 tau_factor.set(f"{value:.2f}")
-                lifetime = calculate_lifetime_for_custom_tau_factor(
-                    coalesce(self.parent.dataset[0]),
-                    value,
-                    int(self.parent.menu_bar.number_of_polynomials.get()),
-                )
+                lifetime_table = self._get_lifetime_table()
+                if lifetime_table is not None:
+                    # The exact lifetime follows once the slider is released
+                    lifetime, lifetime_error, _, _ = lifetime_table.interpolate(value)
+                    self._show_lifetime((lifetime, lifetime_error))
+                else:
+                    self._submit_lifetime_calculation(
+                        value,
+                        self._show_lifetime,
+                        SLIDER_DEBOUNCE_SECONDS,
+                    )
 
-                self.result_tau.set(str(lifetime[0]))
-                self.result_tau_error.set(str(lifetime[1]))
+        def release_slider(event: object) -> None:
+            if self._check_dataset_set() and self.lifetime_table is not None:
+                self._submit_lifetime_calculation(
+                    self.timescale.get(), self._show_lifetime
+                )
 
         update_timescale_button = customtkinter.CTkButton(
             frame,
@@ -164,6 +198,7 @@ class ControlPanel(customtkinter.CTkFrame):
             variable=self.timescale,
             command=sync_slider,
         )
+        slider.bind("<ButtonRelease-1>", release_slider)
 
         # Layout:
         add_taufactor_button.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
@@ -304,15 +339,145 @@ class ControlPanel(customtkinter.CTkFrame):
         Event if the chi2 button is clicked.
         """
         if self._check_dataset_set():
-            self.set_result_chi_squared(
-                calculate_optimal_tau_factor(
-                    coalesce(self.parent.dataset[0]),
-                    (5, 100),
-                    1.0,
-                    int(self.parent.menu_bar.number_of_polynomials.get()),
-                )
+            # The tau factor only depends on the datapoints checked for fitting,
+            # which are the active datapoints of the dataset
+            dataset = self._get_dataset_snapshot()
+            polynomial_degree = int(self.parent.menu_bar.number_of_polynomials.get())
+            self.compute_worker.submit(
+                OPTIMAL_TAU_FACTOR_CHANNEL,
+                lambda: calculate_optimal_tau_factor(
+                    dataset, (5, 100), 1.0, polynomial_degree
+                ),
+                self.set_result_chi_squared,
+                self._log_calculation_error,
+            )
+
+    def _submit_lifetime_calculation(
+        self,
+        tau_factor: float,
+        on_result: Callable[[Tuple[float, float]], None],
+        debounce_seconds: float = 0.0,
+    ) -> None:
+        """
+        Calculates the lifetime for the tau factor in the background and passes it
+        to on_result on the main thread. Replaces any lifetime calculation that
+        did not start yet.
+        :param tau_factor: The tau factor to calculate the lifetime for.
+        :param on_result: Is called with the lifetime and its error.
+        :param debounce_seconds: How long no newer value must be submitted before
+        the calculation starts.
+        """
+        dataset = self._get_dataset_snapshot()
+        calculation_mask = self.parent.get_calculation_mask()
+        polynomial_degree = int(self.parent.menu_bar.number_of_polynomials.get())
+        self.compute_worker.submit(
+            LIFETIME_CHANNEL,
+            lambda: calculate_lifetime_for_custom_tau_factor(
+                dataset,
+                tau_factor,
+                polynomial_degree,
+                calculation_mask=calculation_mask,
+            ),
+            on_result,
+            self._log_calculation_error,
+            debounce_seconds,
+        )
+
+    def update_lifetime_table(self) -> None:
+        """
+        Calculates the lifetime table for the current datapoints and polynomial
+        degree in the background, unless it is already calculated or requested.
+        Is called whenever a dataset or setup was loaded, or the datapoints for
+        the calculation changed.
+        """
+        self._get_lifetime_table()
+
+    def _get_lifetime_table(self) -> Optional[LifetimeTable]:
+        """
+        Returns the lifetime table if it belongs to the current datapoints and
+        polynomial degree, otherwise requests it.
+        :return: The lifetime table, or None while it is calculated.
+        """
+        dataset = coalesce(self.parent.dataset[0])
+        columns = dataset.get_datapoints().get_columns()
+        calculation_mask = self.parent.get_calculation_mask()
+        polynomial_degree = int(self.parent.menu_bar.number_of_polynomials.get())
+        key = (
+            columns,
+            None if calculation_mask is None else calculation_mask.tobytes(),
+            polynomial_degree,
+        )
+
+        if self._lifetime_table_key == key:
+            return self.lifetime_table
+
+        if len(columns) > 0 and (
+            self._requested_lifetime_table_key != key
+            or not self.compute_worker.is_busy(LIFETIME_TABLE_CHANNEL)
+        ):
+            self._requested_lifetime_table_key = key
+            dataset_snapshot = self._get_dataset_snapshot()
+            timescale_range = self.timescale_range
+            self.compute_worker.submit(
+                LIFETIME_TABLE_CHANNEL,
+                lambda: calculate_lifetime_table(
+                    dataset_snapshot,
+                    polynomial_degree,
+                    timescale_range,
+                    calculation_mask=calculation_mask,
+                ),
+                lambda lifetime_table: self._set_lifetime_table(key, lifetime_table),
+                self._log_calculation_error,
             )
 
+        return None
+
+    def _set_lifetime_table(
+        self,
+        key: Tuple[DatapointColumns, Optional[bytes], int],
+        lifetime_table: LifetimeTable,
+    ) -> None:
+        """
+        Stores a calculated lifetime table.
+        :param key: The datapoints, the calculation mask and the polynomial degree
+        of the table.
+        :param lifetime_table: The calculated lifetime table.
+        """
+        self.lifetime_table = lifetime_table
+        self._lifetime_table_key = key
+
+    def _show_lifetime(self, lifetime: Tuple[float, float]) -> None:
+        """
+        Displays a calculated lifetime and its error.
+        :param lifetime: The lifetime and its error.
+        """
+        self.result_tau.set(str(lifetime[0]))
+        self.result_tau_error.set(str(lifetime[1]))
+
+    def _log_calculation_error(self, error: Exception) -> None:
+        """
+        Logs an error raised by a calculation in the background.
+        :param error: The raised error.
+        """
+        self.parent.logger.log_message(
+            f"Calculation failed: {error}", LogMessageType.ERROR
+        )
+
+    def _get_dataset_snapshot(self) -> DataSet:
+        """
+        Returns a copy of the dataset for calculations in the background, which is
+        not affected by datapoints toggled while the calculation runs. It shares
+        the read-only columns of the datapoints, so it is cheap to create.
+        :return: The copy of the dataset.
+        """
+        dataset = coalesce(self.parent.dataset[0])
+        return dataclasses.replace(
+            dataset,
+            datapoints=DatapointCollection.from_columns(
+                dataset.get_datapoints().get_columns()
+            ),
+        )
+
     def _absolute_tau_button_event(self) -> None:
         """
         Event if the absolute tau button is clicked.
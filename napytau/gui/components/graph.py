@@ -3,25 +3,44 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
 import customtkinter
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Tuple
 import numpy as np
 
-from napytau.gui.components.toolbar import Toolbar
+from napytau.core.errors.core_error import CoreError
+from napytau.core.incremental_fit import IncrementalPolynomialFit
+from napytau.core.influence import calculate_datapoint_influences
 from napytau.gui.model.color import Color
-from napytau.gui.model.marker_factory import generate_marker
-from napytau.gui.model.marker_factory import generate_error_marker_path
+from napytau.gui.model.marker_factory import get_error_marker_path
 
 from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.datapoint_columns import (
+    DISTANCE,
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+)
 
 
 if TYPE_CHECKING:
     from napytau.gui.app import App  # Import only for the type checking.
 
+# the radius in points of the influence marker of the datapoint changing the
+# lifetime the most, the others are scaled relative to it
+INFLUENCE_MARKER_MAX_RADIUS = 12.0
+
 
 class Graph:
     def __init__(self, parent: "App") -> None:
         self.parent = parent
+        self.appearance: Optional[str] = None
+        # the fits of the curves, which are updated when datapoints are toggled
+        self.fits: Optional[
+            Tuple[IncrementalPolynomialFit, IncrementalPolynomialFit]
+        ] = None
+        self.fitted_values: Tuple[np.ndarray, ...] = ()
         self.graph_frame = self.plot(customtkinter.get_appearance_mode())
         self.graph_frame.grid(
             row=1, column=0, rowspan=2, padx=(10, 10), pady=(10, 0), sticky="nsew"
@@ -29,57 +48,130 @@ class Graph:
         self.graph_frame.grid_propagate(False)
 
     def plot(self, appearance: str) -> Canvas:
+        """
+        Creates the figure, the axes and the curves of the graph. This is only done
+        once, afterwards update_plot updates them in place.
+        """
         # the figure that will contain the plot
-        fig = Figure(
+        self.figure = Figure(
             figsize=(3, 2), dpi=100, facecolor=Color.WHITE, edgecolor=Color.BLACK
         )
 
         # adding the subplot
-        axes_1 = fig.add_subplot(111)
-        fig.subplots_adjust(left=0.1, bottom=0.1, right=0.9, top=0.9)
-
-        # set colors according to appearance mode
-        self.set_colors(appearance)
-
-        # apply colors onto figure and axes
-        self.apply_coloring(fig, axes_1)
-
-        # add grid style
-        axes_1.grid(
-            True,
-            which="both",
-            color=self.secondary_color,
-            linestyle="--",
-            linewidth=0.3,
+        self.axes = self.figure.add_subplot(111)
+        self.figure.subplots_adjust(left=0.1, bottom=0.1, right=0.9, top=0.9)
+        self.axes.set_xscale("log")
+
+        # every series of markers is a single collection, which gets its
+        # positions, shapes and sizes on every update
+        self.shifted_markers = self.create_marker_collection()
+        self.unshifted_markers = self.create_marker_collection()
+
+        # the influence of the datapoints on the lifetime is drawn as filled
+        # circles behind the shifted intensities, if selected in the view menu
+        self.influence_markers = PathCollection(
+            [Path.unit_circle()],
+            alpha=0.3,
+            linewidths=0.0,
+            offsets=np.empty((0, 2)),
+            offset_transform=self.axes.transData,
+            transform=IdentityTransform(),
+            zorder=0.5,
         )
+        self.axes.add_collection(self.influence_markers, autolim=False)
 
-        axes_1.set_xscale("log")
-
-        # draw the markers on the axes
-        self.plot_markers(self.parent.datapoints_for_fitting, axes_1)
-
-        if len(self.parent.datapoints_for_fitting.get_active_datapoints()) > 0:
-            # draw the fitting curve
-            self.plot_fitting_curve(self.parent.datapoints_for_fitting, axes_1)
-            self.plot_derivative_curve(self.parent.datapoints_for_fitting, axes_1)
+        # the curves only get their data once datapoints are active
+        (self.fitting_curve,) = self.axes.plot(
+            [], [], color="red", linestyle="--", linewidth=0.6
+        )
+        (self.derivative_curve,) = self.axes.plot(
+            [], [], color="blue", linestyle="-", linewidth=0.6
+        )
 
         # creating the Tkinter canvas
         # containing the Matplotlib figure
-        self.canvas = FigureCanvasTkAgg(fig, master=self.parent)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.parent)
+        self.update_artists(appearance)
         self.canvas.draw()
 
         return self.canvas.get_tk_widget()
 
+    def create_marker_collection(self) -> PathCollection:
+        """
+        Creates an empty collection of markers on the axes.
+        """
+        markers = PathCollection(
+            [],
+            facecolors="none",
+            linewidths=1.0,
+            offsets=np.empty((0, 2)),
+            offset_transform=self.axes.transData,
+            # the marker paths are scaled in points, only the offsets are data
+            transform=IdentityTransform(),
+        )
+        self.axes.add_collection(markers, autolim=False)
+
+        return markers
+
     def update_plot(self) -> None:
         """
         Is called whenever the graph needs to be re-rendered.
+        Updates the existing figure in place and schedules a redraw of the canvas.
         """
-        self.graph_frame = self.plot(customtkinter.get_appearance_mode())
-        self.graph_frame.grid(
-            row=1, column=0, rowspan=2, padx=(10, 10), pady=(10, 0), sticky="nsew"
+        self.update_artists(customtkinter.get_appearance_mode())
+        self.canvas.draw_idle()
+        # The views of the toolbar refer to the previous data
+        self.parent.toolbar.reset_views()
+
+    def update_artists(self, appearance: str) -> None:
+        """
+        Updates the colors, markers and curves of the figure to the current
+        appearance mode and datapoints, without drawing them.
+        """
+        # restyling is only needed when the appearance mode changed
+        if appearance != self.appearance:
+            self.appearance = appearance
+
+            # set colors according to appearance mode
+            self.set_colors(appearance)
+
+            # apply colors onto figure and axes
+            self.apply_coloring(self.figure, self.axes)
+            self.shifted_markers.set_edgecolor(self.main_marker_color)
+            self.unshifted_markers.set_edgecolor(self.secondary_marker_color)
+            self.influence_markers.set_facecolor(self.main_marker_color)
+
+            # add grid style
+            self.axes.grid(
+                True,
+                which="both",
+                color=self.secondary_color,
+                linestyle="--",
+                linewidth=0.3,
+            )
+
+        # draw the markers on the axes
+        self.plot_markers(self.parent.datapoints_for_fitting)
+        self.influence_markers.set_visible(
+            bool(self.parent.menu_bar.show_influence.get()) and self.plot_influence()
         )
-        self.graph_frame.grid_propagate(False)
-        self.parent.toolbar = Toolbar(self.parent, self.canvas)
+
+        has_active_datapoints = bool(
+            self.parent.datapoints_for_fitting.get_columns().get_active_mask().any()
+        )
+        if has_active_datapoints:
+            # draw the fitting curve
+            self.plot_fitting_curve(self.parent.datapoints_for_fitting)
+            self.plot_derivative_curve(self.parent.datapoints_for_fitting)
+        self.fitting_curve.set_visible(has_active_datapoints)
+        self.derivative_curve.set_visible(has_active_datapoints)
+
+        # zooming or panning disables autoscaling, a new plot starts unzoomed
+        self.axes.relim(visible_only=True)
+        # relim only considers the curves, not the marker collections
+        for markers in [self.shifted_markers, self.unshifted_markers]:
+            self.axes.update_datalim(markers.get_offsets())
+        self.axes.autoscale(True)
 
     def set_colors(self, appearance: str) -> None:
         if appearance == "Light":
@@ -111,121 +203,159 @@ class Graph:
         axes.tick_params(axis="x", colors=self.secondary_color)
         axes.tick_params(axis="y", colors=self.secondary_color)
 
-    def plot_markers(self, datapoints: DatapointCollection, axes: Axes) -> None:
+    def plot_markers(self, datapoints: DatapointCollection) -> None:
         """
         plotting the datapoints with appropriate markers
-        :param x_data: x coordinates
-        :param y_data: y coordinates
-        :param distances: error amount of datapoint -> needed to configure marker length
-        :param axes: the axes on which to draw the markers
+        :param datapoints: the datapoints whose active ones are drawn; the error of
+        each intensity configures the length of its marker
         :return: nothing
         """
         # Extracting distance values / intensities of checked datapoints
-        checked_datapoints: DatapointCollection = datapoints.get_active_datapoints()
-
-        index: int = 0
-        for datapoint in checked_datapoints:
-            # Generate marker and compute dynamic markersize
-            marker_shifted = generate_marker(
-                generate_error_marker_path(datapoint.get_intensity()[0].error)
+        columns = datapoints.get_columns()
+        active_mask = columns.get_active_mask()
+        checked_distances = columns.get_values(DISTANCE)[active_mask]
+
+        for markers, column in [
+            (self.shifted_markers, SHIFTED_INTENSITY),
+            (self.unshifted_markers, UNSHIFTED_INTENSITY),
+        ]:
+            errors = columns.get_errors(column)[active_mask]
+            markers.set_offsets(
+                np.column_stack(
+                    [checked_distances, columns.get_values(column)[active_mask]]
+                )
             )
+            # Marker shapes are cached, so equal errors share a path
+            markers.set_paths([get_error_marker_path(error) for error in errors])
+            # Scale markersize based on error, sizes are areas in points squared
+            markers.set_sizes(errors**2)
 
-            marker_unshifted = generate_marker(
-                generate_error_marker_path(datapoint.get_intensity()[1].error)
+    def plot_influence(self) -> bool:
+        """
+        plotting the influence of the datapoints on the lifetime as circles around
+        their shifted intensities. The area of a circle grows with the change of
+        the lifetime if its datapoint is left out, relative to the datapoint
+        changing it the most.
+        :return: whether the influence could be calculated
+        """
+        dataset = self.parent.dataset[0]
+        try:
+            influences = calculate_datapoint_influences(
+                dataset,
+                int(self.parent.menu_bar.number_of_polynomials.get()),
+                calculation_mask=self.parent.get_calculation_mask(),
             )
-
-            # Scale markersize based on distance
-            size_shifted = datapoint.get_intensity()[0].error
-            axes.plot(
-                datapoint.get_distance().value,
-                datapoint.get_intensity()[0].value,
-                marker=marker_shifted,
-                linestyle="None",
-                markersize=size_shifted,
-                label=f"Point {index + 1}",
-                color=self.main_marker_color,
+        except (CoreError, np.linalg.LinAlgError):
+            # e.g. too few datapoints to fit the polynomial
+            return False
+
+        lifetime_shifts = np.abs(influences.get_lifetime_shifts())
+        finite_lifetime_shifts = lifetime_shifts[np.isfinite(lifetime_shifts)]
+        if len(finite_lifetime_shifts) == 0 or finite_lifetime_shifts.max() == 0:
+            return False
+
+        columns = dataset.get_datapoints().get_columns()
+        radii = np.nan_to_num(
+            INFLUENCE_MARKER_MAX_RADIUS * lifetime_shifts / finite_lifetime_shifts.max()
+        )
+        self.influence_markers.set_offsets(
+            np.column_stack(
+                [
+                    columns.get_values(DISTANCE)[influences.indices],
+                    columns.get_values(SHIFTED_INTENSITY)[influences.indices],
+                ]
             )
+        )
+        # sizes are areas in points squared, the unit circle has a radius of one
+        self.influence_markers.set_sizes(radii**2)
 
-            size_unshifted = datapoint.get_intensity()[1].error
-            axes.plot(
-                datapoint.get_distance().value,
-                datapoint.get_intensity()[1].value,
-                marker=marker_unshifted,
-                linestyle="None",
-                markersize=size_unshifted,
-                label=f"Point {index + 1}",
-                color=self.secondary_marker_color,
-            )
-            index = index + 1
+        return True
 
-    def plot_fitting_curve(self, datapoints: DatapointCollection, axes: Axes) -> None:
+    def plot_fitting_curve(self, datapoints: DatapointCollection) -> None:
         """
          plotting fitting curve of datapoints
-        :param x_data: x coordinates
-        :param y_data: y coordinates
-        :param axes: the axes on which to draw the fitting curve
+        :param datapoints: the datapoints to fit
         :return: nothing
         """
+        shifted_intensity_fit, _ = self.get_fits(datapoints)
 
-        # Extracting distance values / intensities of checked datapoints
-        checked_datapoints: DatapointCollection = datapoints.get_active_datapoints()
-
-        checked_distances: list[float] = [
-            valueErrorPair.value
-            for valueErrorPair in checked_datapoints.get_distances()
-        ]
-
-        checked_shifted_intensities: list[float] = [
-            valueErrorPair.value
-            for valueErrorPair in checked_datapoints.get_shifted_intensities()
-        ]
-
-        # Calculating coefficients
-        coeffs = np.polyfit(
-            checked_distances,
-            checked_shifted_intensities,
-            int(self.parent.menu_bar.number_of_polynomials.get()),
-        )
+        x_fit = self._get_curve_distances(datapoints)
+        y_fit = shifted_intensity_fit.evaluate(x_fit)
 
-        poly = np.poly1d(coeffs)  # Creating polynomial with given coefficients
+        # update the curve
+        self.fitting_curve.set_data(x_fit, y_fit)
 
-        x_fit = np.linspace(min(checked_distances), max(checked_distances), 100)
-        y_fit = poly(x_fit)
-
-        # plot the curve
-        axes.plot(x_fit, y_fit, color="red", linestyle="--", linewidth="0.6")
-
-    def plot_derivative_curve(
-        self, datapoints: DatapointCollection, axes: Axes
-    ) -> None:
+    def plot_derivative_curve(self, datapoints: DatapointCollection) -> None:
         """
          plotting derivative curve of datapoints
-        :param x_data: x coordinates
-        :param y_data: y coordinates
-        :param axes: the axes on which to draw the fitting curve
+        :param datapoints: the datapoints to fit
         :return: nothing
         """
+        _, unshifted_intensity_fit = self.get_fits(datapoints)
 
-        # Extracting distance values / intensities of checked datapoints
-        checked_datapoints: DatapointCollection = datapoints.get_active_datapoints()
+        x_fit = self._get_curve_distances(datapoints)
+        y_fit = unshifted_intensity_fit.evaluate(x_fit)
 
-        checked_distances = checked_datapoints.get_distances().get_values()
+        # update the curve
+        self.derivative_curve.set_data(x_fit, y_fit)
 
-        checked_unshifted_intensities = (
-            checked_datapoints.get_unshifted_intensities().get_values()
+    def get_fits(
+        self, datapoints: DatapointCollection
+    ) -> Tuple[IncrementalPolynomialFit, IncrementalPolynomialFit]:
+        """
+        Returns the fits of the shifted and unshifted intensities of the active
+        datapoints. While only datapoints are toggled, the existing fits are
+        updated for the toggled datapoints instead of fitting all datapoints again.
+        These fits only draw the curves, the lifetime, the optimal tau factor and
+        the lifetime table are still calculated by the core from all active
+        datapoints.
+        :param datapoints: the datapoints to fit
+        :return: the fits of the shifted and unshifted intensities
+        """
+        columns = datapoints.get_columns()
+        polynomial_degree = int(self.parent.menu_bar.number_of_polynomials.get())
+        fitted_values = (
+            columns.get_values(DISTANCE),
+            columns.get_values(SHIFTED_INTENSITY),
+            columns.get_values(UNSHIFTED_INTENSITY),
         )
 
-        # Calculating coefficients
-        coeffs = np.polyfit(
-            checked_distances,
-            checked_unshifted_intensities,
-            int(self.parent.menu_bar.number_of_polynomials.get()),
-        )
+        if (
+            self.fits is None
+            or self.fits[0].polynomial_degree != polynomial_degree
+            or not all(
+                np.array_equal(values, previous_values, equal_nan=True)
+                for values, previous_values in zip(fitted_values, self.fitted_values)
+            )
+        ):
+            self.fitted_values = fitted_values
+            self.fits = (
+                IncrementalPolynomialFit(
+                    fitted_values[0],
+                    fitted_values[1],
+                    polynomial_degree,
+                    active=columns.get_active_mask(),
+                ),
+                IncrementalPolynomialFit(
+                    fitted_values[0],
+                    fitted_values[2],
+                    polynomial_degree,
+                    active=columns.get_active_mask(),
+                ),
+            )
+        else:
+            for fit in self.fits:
+                fit.set_active_mask(columns.get_active_mask())
 
-        poly = np.poly1d(coeffs)  # Creating polynomial with given coefficients
+        return self.fits
 
-        x_fit = np.linspace(min(checked_distances), max(checked_distances), 100)
-        y_fit = poly(x_fit)
+    def _get_curve_distances(self, datapoints: DatapointCollection) -> np.ndarray:
+        """
+        The distances at which the curves are drawn, spanning the active datapoints.
+        :param datapoints: the datapoints to fit
+        :return: the distances
+        """
+        columns = datapoints.get_columns()
+        checked_distances = columns.get_values(DISTANCE)[columns.get_active_mask()]
 
-        # plot the curve
-        axes.plot(x_fit, y_fit, color="blue", linestyle="-", linewidth="0.6")
+        return np.linspace(checked_distances.min(), checked_distances.max(), 100)
@@ -48,6 +48,7 @@ class MenuBar(customtkinter.CTkFrame):
         self.alpha_calc_mode = tk.StringVar(value="sum ratio")
         self.polynomial_mode = tk.StringVar(value="Exponential")
         self.mode = tk.StringVar(value=IMPORT_FORMAT_NAPYTAU)
+        self.show_influence = tk.BooleanVar(value=False)
         self.mode.trace_add("write", self.on_mode_change)
 
         self._create_file_button()
@@ -118,6 +119,12 @@ class MenuBar(customtkinter.CTkFrame):
             value="system",
             command=self.callbacks["change_appearance_mode"],
         )
+        self.view_menu.add_separator()
+        self.view_menu.add_checkbutton(
+            label="Datapoint Influence",
+            variable=self.show_influence,
+            command=self.callbacks["toggle_influence"],
+        )
 
     def _create_polynomial_button(self) -> None:
         """
@@ -17,13 +17,30 @@ class Toolbar:
 
         # Create frame to hold Toolbar
 
-        toolbar_frame = tk.Frame(parent)
-        toolbar_frame.config(bg=self.parent.graph.main_color)
-        toolbar_frame.grid(row=1, column=0, padx=10, pady=10, sticky="new")
+        self.toolbar_frame = tk.Frame(parent)
+        self.toolbar_frame.grid(row=1, column=0, padx=10, pady=10, sticky="new")
 
         # Create Toolbar
 
-        toolbar = CustomToolbar(canvas, toolbar_frame, parent)
+        self.toolbar = CustomToolbar(canvas, self.toolbar_frame, parent)
         # Adjust background color
-        toolbar.config(bg=self.parent.graph.main_color)
-        toolbar.update()
+        self.apply_coloring()
+        self.toolbar.update()
+
+    def apply_coloring(self) -> None:
+        """
+        Applies the colors of the graph to the toolbar.
+        Is called whenever the appearance mode changes.
+        """
+        self.toolbar_frame.config(bg=self.parent.graph.main_color)
+        self.toolbar.config(bg=self.parent.graph.main_color)
+        self.toolbar.apply_coloring(
+            self.parent.graph.main_color, self.parent.graph.secondary_color
+        )
+
+    def reset_views(self) -> None:
+        """
+        Forgets the zoomed and panned views, so the home button returns to
+        the view of the current data.
+        """
+        self.toolbar.update()
@@ -0,0 +1,211 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import tkinter as tk
+
+
+@dataclass
+class ComputeRequest:
+    """
+    A calculation requested by the GUI, with the callbacks receiving its result or
+    the error it raised on the main thread.
+    """
+
+    channel: str
+    generation: int
+    compute: Callable[[], Any]
+    on_result: Callable[[Any], None]
+    on_error: Optional[Callable[[Exception], None]]
+    due_time: float
+
+
+class _Channel:
+    """
+    The requests of one channel, which are calculated one after another by the
+    channels own thread.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        # Results of requests up to this generation are discarded
+        self.cancelled_generation = 0
+        self.pending: Optional[ComputeRequest] = None
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+
+class ComputeWorker:
+    """
+    Calculates requests of the GUI in background threads, so the main thread keeps
+    handling events while e.g. the lifetime is calculated.
+
+    Requests are submitted to named channels. Each channel calculates at most one
+    request at a time and only keeps the latest pending request, so values that are
+    superseded before their calculation starts, e.g. while dragging a slider, are
+    dropped. A request is only started once no newer request was submitted to its
+    channel for its debounce time. The results are posted back to the main thread,
+    which polls for them with after() callbacks, as tkinter must not be used from
+    other threads.
+    """
+
+    def __init__(self, widget: tk.Misc, poll_interval_ms: int = 20) -> None:
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+        self._channels: Dict[str, _Channel] = {}
+        self._results: queue.Queue[Tuple[ComputeRequest, Any, Optional[Exception]]] = (
+            queue.Queue()
+        )
+        self._condition = threading.Condition()
+        self._poll_scheduled = False
+        self._shut_down = False
+
+    def submit(
+        self,
+        channel: str,
+        compute: Callable[[], Any],
+        on_result: Callable[[Any], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        debounce_seconds: float = 0.0,
+    ) -> None:
+        """
+        Requests a calculation on the given channel, replacing the pending request
+        of the channel. Must be called from the main thread, which is also where
+        on_result or on_error are called.
+        """
+        with self._condition:
+            if self._shut_down:
+                return
+
+            worker_channel = self._channels.setdefault(channel, _Channel())
+            worker_channel.generation += 1
+            worker_channel.pending = ComputeRequest(
+                channel,
+                worker_channel.generation,
+                compute,
+                on_result,
+                on_error,
+                time.monotonic() + debounce_seconds,
+            )
+
+            if worker_channel.thread is None:
+                worker_channel.thread = threading.Thread(
+                    target=self._run_channel,
+                    args=(worker_channel,),
+                    name=f"napytau-compute-{channel}",
+                    daemon=True,
+                )
+                worker_channel.thread.start()
+            self._condition.notify_all()
+
+        self._schedule_poll()
+
+    def cancel(self, channel: str) -> None:
+        """
+        Drops the pending request of the channel and discards the result of the
+        request currently calculated, as calculations can not be interrupted.
+        """
+        with self._condition:
+            worker_channel = self._channels.get(channel)
+            if worker_channel is None:
+                return
+
+            worker_channel.cancelled_generation = worker_channel.generation
+            worker_channel.pending = None
+            self._condition.notify_all()
+
+    def cancel_all(self) -> None:
+        """Cancels the requests of all channels."""
+        for channel in list(self._channels):
+            self.cancel(channel)
+
+    def is_busy(self, channel: str) -> bool:
+        """Whether a request of the channel is pending or being calculated."""
+        with self._condition:
+            worker_channel = self._channels.get(channel)
+            return worker_channel is not None and (
+                worker_channel.pending is not None or worker_channel.running
+            )
+
+    def shutdown(self) -> None:
+        """
+        Cancels all requests and stops the threads once their current calculation
+        finished. No further requests are accepted.
+        """
+        self.cancel_all()
+        with self._condition:
+            self._shut_down = True
+            self._condition.notify_all()
+
+    def _run_channel(self, worker_channel: _Channel) -> None:
+        while True:
+            with self._condition:
+                request = self._take_due_request(worker_channel)
+                if request is None:
+                    return
+                worker_channel.running = True
+
+            try:
+                self._results.put((request, request.compute(), None))
+            except Exception as error:
+                self._results.put((request, None, error))
+            finally:
+                with self._condition:
+                    worker_channel.running = False
+
+    def _take_due_request(self, worker_channel: _Channel) -> Optional[ComputeRequest]:
+        # Waits until the pending request is due, a newer request restarts the wait
+        while not self._shut_down:
+            request = worker_channel.pending
+            if request is None:
+                self._condition.wait()
+                continue
+
+            remaining_seconds = request.due_time - time.monotonic()
+            if remaining_seconds > 0:
+                self._condition.wait(remaining_seconds)
+                continue
+
+            worker_channel.pending = None
+            return request
+
+        return None
+
+    def _schedule_poll(self) -> None:
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.widget.after(self.poll_interval_ms, self._poll_results)
+
+    def _poll_results(self) -> None:
+        self._poll_scheduled = False
+
+        while True:
+            try:
+                request, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            # Results of requests superseded during their calculation are still
+            # shown, as the result of the newer request follows
+            with self._condition:
+                cancelled = (
+                    request.generation
+                    <= self._channels[request.channel].cancelled_generation
+                )
+
+            if cancelled:
+                continue
+            if error is None:
+                request.on_result(result)
+            elif request.on_error is not None:
+                request.on_error(error)
+
+        with self._condition:
+            outstanding = any(
+                worker_channel.pending is not None or worker_channel.running
+                for worker_channel in self._channels.values()
+            )
+        if outstanding or not self._results.empty():
+            self._schedule_poll()
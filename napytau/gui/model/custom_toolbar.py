@@ -12,11 +12,8 @@ class CustomToolbar(NavigationToolbar2Tk):
         super().__init__(canvas, window)
 
         # Change background color of the message label
-        self._message_label.config(
-            bg=parent.graph.main_color,
-            fg=parent.graph.secondary_color,
-            font=("Arial", 10),
-        )
+        self.apply_coloring(parent.graph.main_color, parent.graph.secondary_color)
+        self._message_label.config(font=("Arial", 10))
 
         # Customize specific buttons
         for toolitem in self.toolitems:
@@ -29,3 +26,7 @@ class CustomToolbar(NavigationToolbar2Tk):
         # Remove superfluous buttons
         self.winfo_children()[9].destroy()
         self.winfo_children()[6].destroy()
+
+    def apply_coloring(self, main_color: str, secondary_color: str) -> None:
+        """Sets the colors of the message label."""
+        self._message_label.config(bg=main_color, fg=secondary_color)
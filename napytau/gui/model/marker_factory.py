@@ -1,6 +1,12 @@
+from functools import lru_cache
+
 from matplotlib.path import Path
 from matplotlib.markers import MarkerStyle
 
+# Error markers are cached by their error amount rounded to this many significant
+# digits, as smaller differences are not visible
+ERROR_MARKER_SIGNIFICANT_DIGITS = 3
+
 
 def generate_error_marker_path(error_amount: float) -> Path:
     """
@@ -36,3 +42,20 @@ def generate_error_marker_path(error_amount: float) -> Path:
 def generate_marker(path: Path) -> MarkerStyle:
     """Creates new marker for the given path."""
     return MarkerStyle(path)
+
+
+def get_error_marker_path(error_amount: float) -> Path:
+    """
+    Returns the path of the error marker for the given error amount, scaled to the
+    unit size the sizes of a marker collection refer to. Paths are cached by the
+    error amount rounded to ERROR_MARKER_SIGNIFICANT_DIGITS significant digits.
+    """
+    return _generate_scaled_error_marker_path(
+        float(f"{error_amount:.{ERROR_MARKER_SIGNIFICANT_DIGITS}g}")
+    )
+
+
+@lru_cache(maxsize=4096)
+def _generate_scaled_error_marker_path(error_amount: float) -> Path:
+    marker = generate_marker(generate_error_marker_path(error_amount))
+    return marker.get_path().transformed(marker.get_transform())
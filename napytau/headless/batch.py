@@ -0,0 +1,268 @@
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from glob import glob
+from pathlib import PurePath
+from typing import Iterable, List, Optional, TextIO
+
+from napytau.cli.cli_arguments import CLIArguments
+from napytau.core.core import calculate_lifetime_for_fit
+from napytau.core.result_cache import configure_result_cache
+from napytau.headless.headless_kernel import (
+    calculate_lifetime_for_tau_factor,
+    load_dataset,
+)
+from napytau.import_export.factory.numpy.numpy_factory import FORMAT_VERSION_ARRAY
+from napytau.import_export.import_export import (
+    IMPORT_FORMAT_LEGACY,
+    IMPORT_FORMAT_NAPYTAU,
+    IMPORT_FORMAT_NUMPY,
+    crawl_legacy_format_setup_files,
+)
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """
+    A single dataset to process in batch mode, with the same options as a headless
+    run for one dataset. If the results are recorded in a campaign index, the
+    content hash is the hash of the dataset taken before it was processed.
+    """
+
+    dataset_format: str
+    data_files_path: str
+    fit_file_path: Optional[str] = None
+    setup_identifier: Optional[str] = None
+    t_hyp_estimate: Optional[float] = None
+    cache_directory: Optional[str] = None
+    trusted: bool = False
+    content_hash: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """
+    The outcome of a batch job. If the job failed, error holds the reason and the
+    results are None.
+    """
+
+    data_files_path: str
+    tau_fit: Optional[float] = None
+    tau_fit_error: Optional[float] = None
+    tau_factor: Optional[float] = None
+    tau_custom: Optional[float] = None
+    tau_custom_error: Optional[float] = None
+    error: Optional[str] = None
+
+
+def collect_batch_jobs(
+    paths: Iterable[str],
+    dataset_format: str,
+    fit_file_path: Optional[str] = None,
+    setup_identifier: Optional[str] = None,
+    t_hyp_estimate: Optional[float] = None,
+    cache_directory: Optional[str] = None,
+    trusted: bool = False,
+) -> List[BatchJob]:
+    """
+    Creates a job for every dataset found under the given paths. A path may be a
+    glob pattern, a dataset itself or a directory tree that is searched for
+    datasets:
+    - for the napytau format, every *.json file is a dataset
+    - for the legacy format, every directory containing all files of the legacy
+      format is a dataset, the .fit file is not required if a fit file is given
+    - for the numpy format, every directory containing a format_version.npy file is
+      a dataset
+
+    The jobs are sorted by path and every dataset is included only once.
+    """
+    dataset_paths: List[str] = []
+    for path in paths:
+        for matched_path in sorted(glob(path, recursive=True)) or [path]:
+            dataset_paths.extend(
+                _find_datasets(matched_path, dataset_format, fit_file_path)
+            )
+
+    return [
+        BatchJob(
+            dataset_format,
+            dataset_path,
+            fit_file_path,
+            setup_identifier,
+            t_hyp_estimate,
+            cache_directory,
+            trusted,
+        )
+        for dataset_path in sorted(set(dataset_paths))
+    ]
+
+
+def _find_datasets(
+    path: str, dataset_format: str, fit_file_path: Optional[str]
+) -> List[str]:
+    if not os.path.isdir(path):
+        return [path]
+
+    if dataset_format == IMPORT_FORMAT_LEGACY:
+        # The crawler finds the same files as the import of a single dataset
+        return [
+            str(setup_files.velocity_file.parent)
+            for setup_files in crawl_legacy_format_setup_files(
+                PurePath(path), PurePath(fit_file_path) if fit_file_path else None
+            )
+        ]
+    elif dataset_format == IMPORT_FORMAT_NUMPY:
+        return [
+            directory
+            for directory, _, file_names in os.walk(path)
+            if f"{FORMAT_VERSION_ARRAY}.npy" in file_names
+        ]
+    elif dataset_format == IMPORT_FORMAT_NAPYTAU:
+        return [
+            os.path.join(directory, file_name)
+            for directory, _, file_names in os.walk(path)
+            for file_name in file_names
+            if file_name.endswith(".json")
+        ]
+    else:
+        raise ValueError(f"Unknown dataset format: {dataset_format}")
+
+
+def process_batch_job(job: BatchJob) -> BatchResult:
+    """
+    Imports the dataset of a job and calculates its lifetimes. Any error is
+    recorded in the result instead of being raised, so that a broken dataset does
+    not abort the other jobs of the batch.
+    """
+    # The worker processes do not share the result cache of the main process, but
+    # they do share its disk tier
+    if job.cache_directory is not None:
+        configure_result_cache(directory=job.cache_directory)
+
+    try:
+        dataset = load_dataset(
+            job.dataset_format,
+            job.data_files_path,
+            job.fit_file_path,
+            job.setup_identifier,
+            trusted=job.trusted,
+        )
+
+        tau_fit, tau_fit_error = calculate_lifetime_for_fit(
+            dataset=dataset,
+            polynomial_degree=2,
+        )
+        t_hyp, (tau_custom, tau_custom_error) = calculate_lifetime_for_tau_factor(
+            dataset, job.t_hyp_estimate
+        )
+    except Exception as e:
+        return BatchResult(job.data_files_path, error=f"{type(e).__name__}: {e}")
+
+    return BatchResult(
+        job.data_files_path,
+        float(tau_fit),
+        float(tau_fit_error),
+        float(t_hyp),
+        float(tau_custom),
+        float(tau_custom_error),
+    )
+
+
+def run_batch(
+    jobs: List[BatchJob], max_workers: Optional[int] = None
+) -> List[BatchResult]:
+    """
+    Processes the jobs on a pool of worker processes and returns their results in
+    the order of the jobs.
+
+    Args:
+        jobs (List[BatchJob]): The datasets to process
+        max_workers (int):
+        The number of worker processes, the number of CPUs if omitted. With a
+        single worker, the jobs are processed in the current process, which avoids
+        the start-up cost of the pool.
+
+    Returns:
+        List[BatchResult]: One result per job.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    if max_workers == 1:
+        return [process_batch_job(job) for job in jobs]
+
+    # Handing out several jobs per task amortizes the inter-process communication,
+    # while still leaving enough tasks to balance the load between the workers
+    chunk_size: int = max(1, len(jobs) // (max_workers * 4))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(process_batch_job, jobs, chunksize=chunk_size))
+
+
+def write_batch_results(results: Iterable[BatchResult], output: TextIO) -> None:
+    """
+    Writes the results as a CSV table with one row per dataset.
+    """
+    writer = csv.DictWriter(
+        output, fieldnames=[field.name for field in fields(BatchResult)]
+    )
+    writer.writeheader()
+    for result in results:
+        writer.writerow(asdict(result))
+
+
+def run_batch_from_cli_arguments(cli_arguments: CLIArguments) -> List[BatchResult]:
+    """
+    Runs the batch mode of the headless kernel as configured on the command line
+    and writes the results table to the results file, or to stdout if none is
+    given. If an index root is given, the results are also recorded in its campaign
+    index.
+    """
+    jobs = collect_batch_jobs(
+        cli_arguments.get_batch_paths() or [],
+        cli_arguments.get_dataset_format(),
+        cli_arguments.get_fit_file_path(),
+        cli_arguments.get_setup_identifier(),
+        cli_arguments.get_t_hyp_estimate(),
+        cli_arguments.get_cache_directory(),
+        cli_arguments.is_trusted(),
+    )
+
+    index_root = cli_arguments.get_index_root()
+    if index_root is not None:
+        # Imported here, as the campaign index is only needed if results are
+        # recorded in it
+        from napytau.headless.campaign_index import CampaignIndex
+
+        # The datasets are hashed before they are processed, so that the results
+        # of a dataset changed during the batch are recorded as stale
+        with CampaignIndex(index_root) as index:
+            jobs = [
+                replace(job, content_hash=index.hash_dataset(job.data_files_path))
+                for job in jobs
+            ]
+
+    results = run_batch(jobs, cli_arguments.get_workers())
+
+    results_file_path = cli_arguments.get_results_file_path()
+    if results_file_path is None:
+        write_batch_results(results, sys.stdout)
+    else:
+        with open(results_file_path, "w", newline="") as results_file:
+            write_batch_results(results, results_file)
+
+    if index_root is not None:
+        with CampaignIndex(index_root) as index:
+            index.update(cli_arguments.get_dataset_format(), cli_arguments.is_trusted())
+            index.record_results(jobs, results)
+
+    failed_jobs = sum(1 for result in results if result.error is not None)
+    print(
+        f"Processed {len(results)} datasets, {failed_jobs} failed.",
+        file=sys.stderr,
+    )
+
+    return results
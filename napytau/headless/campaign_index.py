@@ -0,0 +1,563 @@
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass, fields
+from pathlib import PurePath
+from types import TracebackType
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple, Type
+
+from napytau.cli.cli_arguments import CLIArguments
+from napytau.headless.batch import BatchJob, BatchResult, collect_batch_jobs
+from napytau.import_export.import_export import (
+    IMPORT_FORMAT_LEGACY,
+    IMPORT_FORMAT_NAPYTAU,
+    IMPORT_FORMAT_NUMPY,
+    import_legacy_format_from_files,
+    import_napytau_format_from_file,
+    import_numpy_format_from_directory,
+)
+from napytau.import_export.model.dataset import DataSet
+
+# The index is stored in the data root, files starting with this name (including
+# the journal of the database) are never part of a dataset
+INDEX_FILE_NAME = ".napytau_index.sqlite"
+
+# Increased whenever the tables of the index change incompatibly
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    path TEXT PRIMARY KEY,
+    dataset_format TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    relative_velocity REAL,
+    relative_velocity_error REAL,
+    datapoint_count INTEGER,
+    setups TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    dataset_path TEXT NOT NULL REFERENCES datasets(path) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (dataset_path, path)
+);
+CREATE TABLE IF NOT EXISTS results (
+    dataset_path TEXT PRIMARY KEY REFERENCES datasets(path) ON DELETE CASCADE,
+    content_hash TEXT NOT NULL,
+    fit_file_path TEXT,
+    setup_identifier TEXT,
+    t_hyp_estimate REAL,
+    tau_fit REAL,
+    tau_fit_error REAL,
+    tau_factor REAL,
+    tau_custom REAL,
+    tau_custom_error REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS datasets_relative_velocity
+    ON datasets (relative_velocity);
+"""
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class IndexUpdate:
+    """
+    The number of datasets the update of an index added, re-read, found unchanged
+    and removed.
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+@dataclass(frozen=True)
+class IndexedDataset:
+    """
+    A dataset as recorded in the index, together with the last results computed for
+    it and the parameters of the run that computed them. If the dataset could not
+    be read, error holds the reason. The results are stale if they were computed
+    for different contents of the dataset or with other parameters than queried,
+    or if no results were computed yet.
+    """
+
+    path: str
+    dataset_format: str
+    content_hash: str
+    relative_velocity: Optional[float]
+    relative_velocity_error: Optional[float]
+    datapoint_count: Optional[int]
+    setups: Tuple[str, ...]
+    error: Optional[str]
+    fit_file_path: Optional[str]
+    setup_identifier: Optional[str]
+    t_hyp_estimate: Optional[float]
+    tau_fit: Optional[float]
+    tau_fit_error: Optional[float]
+    tau_factor: Optional[float]
+    tau_custom: Optional[float]
+    tau_custom_error: Optional[float]
+    results_error: Optional[str]
+    results_stale: bool
+
+
+class CampaignIndex:
+    """
+    A persistent index of the datasets below a data root, stored as a SQLite
+    database in the data root. For every dataset, the index records the paths,
+    modification times and sizes of its files, a hash of their contents, the
+    relative velocity, the number of datapoints, the names of the available setups
+    and the last results computed for it.
+
+    Updating the index only stats the files of the datasets, a dataset is only read
+    again if any of its files changed. Queries are answered from the index alone,
+    without touching the files of the datasets.
+    """
+
+    _data_root: str
+    _connection: sqlite3.Connection
+
+    def __init__(self, data_root: str):
+        if not os.path.isdir(data_root):
+            raise ValueError(f"Data root {data_root} is not a directory.")
+
+        self._data_root = os.path.abspath(data_root)
+        self._connection = sqlite3.connect(
+            os.path.join(self._data_root, INDEX_FILE_NAME)
+        )
+        self._connection.execute("PRAGMA foreign_keys = ON")
+
+        schema_version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version not in (0, SCHEMA_VERSION):
+            self._connection.close()
+            raise ValueError(
+                f"Unsupported version {schema_version} of the campaign index, "
+                f"expected version {SCHEMA_VERSION}"
+            )
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self) -> "CampaignIndex":
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def update(self, dataset_format: str, trusted: bool = False) -> IndexUpdate:
+        """
+        Searches the data root for datasets of the given format, like the batch
+        mode does, and brings the index up to date with them. Datasets of the
+        format that no longer exist are removed from the index.
+
+        Args:
+            dataset_format (str): The format of the datasets to index
+            trusted (bool):
+            Whether NaPyTau format files are streamed instead of being validated
+            against the json schema
+
+        Returns:
+            IndexUpdate: The number of added, updated, unchanged and removed
+            datasets.
+        """
+        stored_datasets: Dict[str, Tuple[str, str]] = {
+            path: (stored_format, content_hash)
+            for path, stored_format, content_hash in self._connection.execute(
+                "SELECT path, dataset_format, content_hash FROM datasets"
+            )
+        }
+        stored_file_stats: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        for dataset_path, path, mtime_ns, size in self._connection.execute(
+            "SELECT dataset_path, path, mtime_ns, size FROM files"
+        ):
+            stored_file_stats.setdefault(dataset_path, {})[path] = (mtime_ns, size)
+
+        added = updated = unchanged = 0
+        found_paths = set()
+        with self._connection:
+            for job in collect_batch_jobs([self._data_root], dataset_format):
+                path = self._relative_path(job.data_files_path)
+                found_paths.add(path)
+                file_stats = self._stat_files(job.data_files_path)
+                stored_dataset = stored_datasets.get(path)
+                if (
+                    stored_dataset is not None
+                    and stored_dataset[0] == dataset_format
+                    and stored_file_stats.get(path) == file_stats
+                ):
+                    unchanged += 1
+                    continue
+
+                content_hash = self._hash_files(file_stats)
+                if stored_dataset == (dataset_format, content_hash):
+                    # The files were only touched, their contents are the same
+                    self._write_file_stats(path, file_stats)
+                    unchanged += 1
+                    continue
+
+                self._write_dataset(
+                    path, dataset_format, content_hash, job.data_files_path, trusted
+                )
+                self._write_file_stats(path, file_stats)
+                if stored_dataset is None:
+                    added += 1
+                else:
+                    updated += 1
+
+            removed_paths = [
+                (path,)
+                for path, (stored_format, _) in stored_datasets.items()
+                if stored_format == dataset_format and path not in found_paths
+            ]
+            self._connection.executemany(
+                "DELETE FROM datasets WHERE path = ?", removed_paths
+            )
+
+        return IndexUpdate(added, updated, unchanged, len(removed_paths))
+
+    def hash_dataset(self, data_files_path: str) -> Optional[str]:
+        """
+        Hashes the contents of a dataset in the same way as the update of the index
+        does. Hashing a dataset before processing it ties its results to the
+        contents they were computed from, even if the dataset changes meanwhile.
+
+        Returns:
+            Optional[str]: The hash, or None if the dataset could not be read.
+        """
+        try:
+            return self._hash_files(self._stat_files(data_files_path))
+        except OSError:
+            return None
+
+    def record_results(
+        self, jobs: Iterable[BatchJob], results: Iterable[BatchResult]
+    ) -> int:
+        """
+        Records the results of a batch run for the indexed datasets, replacing the
+        previously recorded results. The results are tied to the content hash of
+        their job and recorded together with its parameters. Results for datasets
+        that are not indexed or whose job has no content hash are ignored.
+
+        Args:
+            jobs (Iterable[BatchJob]): The jobs of the batch run
+            results (Iterable[BatchResult]): The results, in the order of the jobs
+
+        Returns:
+            int: The number of recorded results.
+        """
+        with self._connection:
+            recorded = self._connection.executemany(
+                """
+                INSERT OR REPLACE INTO results
+                SELECT path, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                FROM datasets WHERE path = ?
+                """,
+                [
+                    (
+                        job.content_hash,
+                        _absolute_path(job.fit_file_path),
+                        job.setup_identifier,
+                        job.t_hyp_estimate,
+                        result.tau_fit,
+                        result.tau_fit_error,
+                        result.tau_factor,
+                        result.tau_custom,
+                        result.tau_custom_error,
+                        result.error,
+                        self._relative_path(result.data_files_path),
+                    )
+                    for job, result in zip(jobs, results)
+                    if job.content_hash is not None
+                ],
+            ).rowcount
+
+        return recorded
+
+    def find_datasets(
+        self,
+        velocity_range: Optional[Tuple[float, float]] = None,
+        stale: Optional[bool] = None,
+        dataset_format: Optional[str] = None,
+        fit_file_path: Optional[str] = None,
+        setup_identifier: Optional[str] = None,
+        t_hyp_estimate: Optional[float] = None,
+    ) -> List[IndexedDataset]:
+        """
+        Finds the indexed datasets matching all given criteria, sorted by path.
+        Results are only up to date if they were computed with the given fit file,
+        setup identifier and tau factor estimate.
+
+        Args:
+            velocity_range (Tuple[float, float]):
+            The inclusive range the relative velocity has to lie in
+            stale (bool):
+            Whether the results of the datasets have to be stale or up to date
+            dataset_format (str): The format the datasets have to be in
+            fit_file_path (str): The fit file of up to date results
+            setup_identifier (str): The setup identifier of up to date results
+            t_hyp_estimate (float): The tau factor estimate of up to date results
+
+        Returns:
+            List[IndexedDataset]: The matching datasets, with absolute paths.
+        """
+        run_parameters = (
+            _absolute_path(fit_file_path),
+            setup_identifier,
+            t_hyp_estimate,
+        )
+        conditions: List[str] = []
+        parameters: List[object] = list(run_parameters)
+        if velocity_range is not None:
+            conditions.append("datasets.relative_velocity BETWEEN ? AND ?")
+            parameters.extend(velocity_range)
+        if stale is not None:
+            conditions.append(f"{'' if stale else 'NOT '}({_STALE_CONDITION})")
+            parameters.extend(run_parameters)
+        if dataset_format is not None:
+            conditions.append("datasets.dataset_format = ?")
+            parameters.append(dataset_format)
+
+        rows = self._connection.execute(
+            f"""
+            SELECT
+                datasets.path,
+                datasets.dataset_format,
+                datasets.content_hash,
+                datasets.relative_velocity,
+                datasets.relative_velocity_error,
+                datasets.datapoint_count,
+                datasets.setups,
+                datasets.error,
+                results.fit_file_path,
+                results.setup_identifier,
+                results.t_hyp_estimate,
+                results.tau_fit,
+                results.tau_fit_error,
+                results.tau_factor,
+                results.tau_custom,
+                results.tau_custom_error,
+                results.error,
+                {_STALE_CONDITION}
+            FROM datasets LEFT JOIN results ON results.dataset_path = datasets.path
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY datasets.path
+            """,
+            parameters,
+        )
+
+        return [
+            IndexedDataset(
+                os.path.join(self._data_root, row[0]),
+                row[1],
+                row[2],
+                row[3],
+                row[4],
+                row[5],
+                tuple(json.loads(row[6])),
+                row[7],
+                row[8],
+                row[9],
+                row[10],
+                row[11],
+                row[12],
+                row[13],
+                row[14],
+                row[15],
+                row[16],
+                bool(row[17]),
+            )
+            for row in rows
+        ]
+
+    def _relative_path(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self._data_root)
+
+    def _stat_files(self, dataset_path: str) -> Dict[str, Tuple[int, int]]:
+        # A dataset is either a single file or all files in its directory
+        if os.path.isfile(dataset_path):
+            file_paths = [dataset_path]
+        else:
+            with os.scandir(dataset_path) as entries:
+                file_paths = [
+                    entry.path
+                    for entry in entries
+                    if entry.is_file() and not entry.name.startswith(INDEX_FILE_NAME)
+                ]
+
+        file_stats: Dict[str, Tuple[int, int]] = {}
+        for file_path in sorted(file_paths):
+            stat = os.stat(file_path)
+            file_stats[self._relative_path(file_path)] = (
+                stat.st_mtime_ns,
+                stat.st_size,
+            )
+
+        return file_stats
+
+    def _hash_files(self, file_stats: Dict[str, Tuple[int, int]]) -> str:
+        content_hash = hashlib.sha256()
+        for path in file_stats:
+            content_hash.update(path.encode())
+            with open(os.path.join(self._data_root, path), "rb") as file:
+                while chunk := file.read(_HASH_CHUNK_SIZE):
+                    content_hash.update(chunk)
+
+        return content_hash.hexdigest()
+
+    def _write_file_stats(
+        self, dataset_path: str, file_stats: Dict[str, Tuple[int, int]]
+    ) -> None:
+        self._connection.execute(
+            "DELETE FROM files WHERE dataset_path = ?", (dataset_path,)
+        )
+        self._connection.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?)",
+            [
+                (dataset_path, path, mtime_ns, size)
+                for path, (mtime_ns, size) in file_stats.items()
+            ],
+        )
+
+    def _write_dataset(
+        self,
+        path: str,
+        dataset_format: str,
+        content_hash: str,
+        data_files_path: str,
+        trusted: bool,
+    ) -> None:
+        try:
+            dataset, setups = _read_dataset(dataset_format, data_files_path, trusted)
+            relative_velocity = dataset.get_relative_velocity()
+            values: Tuple[object, ...] = (
+                relative_velocity.value.get_velocity(),
+                relative_velocity.error.get_velocity(),
+                len(dataset.get_datapoints()),
+                json.dumps(setups),
+                None,
+            )
+        except Exception as e:
+            values = (None, None, None, "[]", f"{type(e).__name__}: {e}")
+
+        # The results of the previous contents are kept, they are now stale
+        self._connection.execute(
+            """
+            INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (path) DO UPDATE SET
+                dataset_format = excluded.dataset_format,
+                content_hash = excluded.content_hash,
+                relative_velocity = excluded.relative_velocity,
+                relative_velocity_error = excluded.relative_velocity_error,
+                datapoint_count = excluded.datapoint_count,
+                setups = excluded.setups,
+                error = excluded.error
+            """,
+            (path, dataset_format, content_hash) + values,
+        )
+
+
+# Results are stale if they are missing, were computed for other contents or with
+# other parameters than the ones bound to the placeholders
+_STALE_CONDITION = (
+    "results.content_hash IS NULL OR results.content_hash != datasets.content_hash"
+    " OR results.fit_file_path IS NOT ? OR results.setup_identifier IS NOT ?"
+    " OR results.t_hyp_estimate IS NOT ?"
+)
+
+
+def _absolute_path(path: Optional[str]) -> Optional[str]:
+    return os.path.abspath(path) if path is not None else None
+
+
+def _read_dataset(
+    dataset_format: str, data_files_path: str, trusted: bool
+) -> Tuple[DataSet, List[str]]:
+    # Returns the dataset and the names of the setups available for it, for the
+    # legacy format these are the setup files in the directory of the dataset
+    if dataset_format == IMPORT_FORMAT_LEGACY:
+        dataset = import_legacy_format_from_files(PurePath(data_files_path))
+        setups = sorted(
+            file_name
+            for file_name in os.listdir(data_files_path)
+            if file_name.endswith(".napset")
+        )
+    elif dataset_format == IMPORT_FORMAT_NAPYTAU:
+        dataset, raw_setups = import_napytau_format_from_file(
+            PurePath(data_files_path), trusted=trusted
+        )
+        setups = [raw_setup["name"] for raw_setup in raw_setups]
+    elif dataset_format == IMPORT_FORMAT_NUMPY:
+        dataset, raw_setups = import_numpy_format_from_directory(
+            PurePath(data_files_path)
+        )
+        setups = [raw_setup["name"] for raw_setup in raw_setups]
+    else:
+        raise ValueError(f"Unknown dataset format: {dataset_format}")
+
+    return dataset, setups
+
+
+def write_indexed_datasets(datasets: Iterable[IndexedDataset], output: TextIO) -> None:
+    """
+    Writes the datasets as a CSV table with one row per dataset, the names of the
+    setups are separated by semicolons.
+    """
+    writer = csv.DictWriter(
+        output, fieldnames=[field.name for field in fields(IndexedDataset)]
+    )
+    writer.writeheader()
+    for dataset in datasets:
+        row = asdict(dataset)
+        row["setups"] = ";".join(dataset.setups)
+        writer.writerow(row)
+
+
+def run_index_from_cli_arguments(cli_arguments: CLIArguments) -> List[IndexedDataset]:
+    """
+    Updates the campaign index of the data root given on the command line if
+    requested, then queries it and writes the matching datasets as a table to the
+    results file, or to stdout if none is given.
+    """
+    with CampaignIndex(cli_arguments.get_index_root() or os.getcwd()) as index:
+        if cli_arguments.should_update_index():
+            update = index.update(
+                cli_arguments.get_dataset_format(), cli_arguments.is_trusted()
+            )
+            print(
+                f"Indexed {update.added} new and {update.updated} changed datasets, "
+                f"{update.unchanged} were unchanged and {update.removed} removed.",
+                file=sys.stderr,
+            )
+
+        datasets = index.find_datasets(
+            cli_arguments.get_velocity_range(),
+            True if cli_arguments.is_stale_only() else None,
+            fit_file_path=cli_arguments.get_fit_file_path(),
+            setup_identifier=cli_arguments.get_setup_identifier(),
+            t_hyp_estimate=cli_arguments.get_t_hyp_estimate(),
+        )
+
+    results_file_path = cli_arguments.get_results_file_path()
+    if results_file_path is None:
+        write_indexed_datasets(datasets, sys.stdout)
+    else:
+        with open(results_file_path, "w", newline="") as results_file:
+            write_indexed_datasets(datasets, results_file)
+
+    return datasets
@@ -1,4 +1,5 @@
 from pathlib import PurePath
+from typing import Iterable, Optional, Tuple
 
 
 from napytau.cli.cli_arguments import CLIArguments
@@ -7,68 +8,191 @@ from napytau.core.core import (
     calculate_lifetime_for_custom_tau_factor,
     calculate_optimal_tau_factor,
 )
-from napytau.headless.logging import log_dataset, log_dataset_setup_data
+from napytau.core.influence import calculate_datapoint_influences
+from napytau.core.monte_carlo import calculate_monte_carlo_lifetimes
+from napytau.core.result_cache import configure_result_cache, get_result_cache
+from napytau.headless.logging import (
+    log_dataset,
+    log_dataset_setup_data,
+    log_datapoint_influences,
+    log_monte_carlo_lifetimes,
+)
 from napytau.import_export.import_export import (
     IMPORT_FORMAT_LEGACY,
     IMPORT_FORMAT_NAPYTAU,
+    IMPORT_FORMAT_NUMPY,
     import_legacy_format_from_files,
     read_legacy_setup_data_into_data_set,
     import_napytau_format_from_file,
+    import_numpy_format_from_directory,
     read_napytau_setup_data_into_data_set,
+    save_numpy_format_to_directory,
 )
 from napytau.import_export.model.dataset import DataSet
 
 
 def init(cli_arguments: CLIArguments) -> None:
-    if cli_arguments.get_dataset_format() == IMPORT_FORMAT_LEGACY:
-        setup_files_directory_path = cli_arguments.get_data_files_directory_path()
+    cache_directory = cli_arguments.get_cache_directory()
+    if cache_directory is not None:
+        configure_result_cache(directory=cache_directory)
 
-        fit_file_path = cli_arguments.get_fit_file_path()
+    batch_paths = cli_arguments.get_batch_paths()
+    if batch_paths is not None:
+        # Imported here, as the batch engine is only needed in batch mode
+        from napytau.headless.batch import run_batch_from_cli_arguments
 
-        dataset: DataSet = import_legacy_format_from_files(
-            PurePath(setup_files_directory_path),
-            PurePath(fit_file_path) if fit_file_path else None,
+        run_batch_from_cli_arguments(cli_arguments)
+        return
+
+    if cli_arguments.get_index_root() is not None:
+        # Imported here, as the campaign index is only needed when querying it
+        from napytau.headless.campaign_index import run_index_from_cli_arguments
+
+        run_index_from_cli_arguments(cli_arguments)
+        return
+
+    (dataset, raw_setups) = load_dataset_with_raw_setups(
+        cli_arguments.get_dataset_format(),
+        cli_arguments.get_data_files_directory_path(),
+        cli_arguments.get_fit_file_path(),
+        cli_arguments.get_setup_identifier(),
+        verbose=True,
+        trusted=cli_arguments.is_trusted(),
+    )
+
+    numpy_export_directory = cli_arguments.get_numpy_export_directory()
+    if numpy_export_directory is not None:
+        save_numpy_format_to_directory(
+            dataset, PurePath(numpy_export_directory), raw_setups
+        )
+        print(f"Saved the dataset in the numpy format to {numpy_export_directory}")
+
+    (tau_fit, tau_fit_error) = calculate_lifetime_for_fit(
+        dataset=dataset,
+        polynomial_degree=2,
+    )
+    print(f"Calculated lifetime: {tau_fit} ± {tau_fit_error}")
+
+    t_hyp, (tau_custom, tau_custom_error) = calculate_lifetime_for_tau_factor(
+        dataset, cli_arguments.get_t_hyp_estimate()
+    )
+    print(f"Tau factor: {t_hyp}")
+    print(
+        f"Calculated lifetime with custom tau factor: {tau_custom} ± {tau_custom_error}"
+    )
+
+    if cli_arguments.should_calculate_influence():
+        log_datapoint_influences(
+            dataset,
+            calculate_datapoint_influences(dataset=dataset, polynomial_degree=2),
+        )
+
+    monte_carlo_samples = cli_arguments.get_monte_carlo_samples()
+    if monte_carlo_samples is not None:
+        log_monte_carlo_lifetimes(
+            calculate_monte_carlo_lifetimes(
+                dataset=dataset,
+                polynomial_degree=2,
+                number_of_samples=monte_carlo_samples,
+                seed=cli_arguments.get_monte_carlo_seed(),
+                max_workers=cli_arguments.get_workers(),
+            )
+        )
+
+    if cache_directory is not None:
+        statistics = get_result_cache().get_statistics()
+        print(
+            f"Result cache: {statistics.hits} hits "
+            f"({statistics.disk_hits} from disk), {statistics.misses} misses"
         )
 
-        log_dataset(dataset)
 
-        setup_file_path = cli_arguments.get_setup_identifier()
-        if setup_file_path is not None:
-            read_legacy_setup_data_into_data_set(dataset, PurePath(setup_file_path))
-            log_dataset_setup_data(dataset)
+def load_dataset(
+    dataset_format: str,
+    data_files_path: str,
+    fit_file_path: Optional[str],
+    setup_identifier: Optional[str],
+    verbose: bool = False,
+    trusted: bool = False,
+) -> DataSet:
+    """
+    Imports a dataset and, if a setup identifier is given, reads the setup data into
+    it. If verbose, the dataset is logged after each step. Trusted NaPyTau format
+    files are streamed instead of being validated against the json schema.
+    """
+    (dataset, _) = load_dataset_with_raw_setups(
+        dataset_format,
+        data_files_path,
+        fit_file_path,
+        setup_identifier,
+        verbose=verbose,
+        trusted=trusted,
+    )
+
+    return dataset
 
-    elif cli_arguments.get_dataset_format() == IMPORT_FORMAT_NAPYTAU:
-        setup_files_directory_path = cli_arguments.get_data_files_directory_path()
-        setup_identifier = cli_arguments.get_setup_identifier()
 
-        (dataset, raw_setups) = import_napytau_format_from_file(
-            PurePath(setup_files_directory_path)
+def load_dataset_with_raw_setups(
+    dataset_format: str,
+    data_files_path: str,
+    fit_file_path: Optional[str],
+    setup_identifier: Optional[str],
+    verbose: bool = False,
+    trusted: bool = False,
+) -> Tuple[DataSet, Iterable[dict]]:
+    """
+    Like load_dataset, but also returns the raw setups of the dataset, so they can be
+    saved along with it. The legacy format keeps its setups in separate files, so no
+    raw setups are returned for it.
+    """
+    raw_setups: Iterable[dict] = ()
+    if dataset_format == IMPORT_FORMAT_LEGACY:
+        dataset: DataSet = import_legacy_format_from_files(
+            PurePath(data_files_path),
+            PurePath(fit_file_path) if fit_file_path else None,
         )
 
-        log_dataset(dataset)
+        if verbose:
+            log_dataset(dataset)
+
+        if setup_identifier is not None:
+            read_legacy_setup_data_into_data_set(dataset, PurePath(setup_identifier))
+            if verbose:
+                log_dataset_setup_data(dataset)
+
+    elif dataset_format in (IMPORT_FORMAT_NAPYTAU, IMPORT_FORMAT_NUMPY):
+        if dataset_format == IMPORT_FORMAT_NAPYTAU:
+            (dataset, raw_setups) = import_napytau_format_from_file(
+                PurePath(data_files_path), trusted=trusted
+            )
+        else:
+            (dataset, raw_setups) = import_numpy_format_from_directory(
+                PurePath(data_files_path)
+            )
+
+        if verbose:
+            log_dataset(dataset)
 
         if setup_identifier is not None:
             read_napytau_setup_data_into_data_set(dataset, raw_setups, setup_identifier)
-            log_dataset_setup_data(dataset)
+            if verbose:
+                log_dataset_setup_data(dataset)
     else:
-        raise ValueError(
-            f"Unknown dataset format: {cli_arguments.get_dataset_format()}"
-        )
+        raise ValueError(f"Unknown dataset format: {dataset_format}")
+
+    return dataset, raw_setups
 
-    (tau_fit, tau_fit_error) = calculate_lifetime_for_fit(
-        dataset=dataset,
-        polynomial_degree=2,
-    )
-    print(f"Calculated lifetime: {tau_fit} ± {tau_fit_error}")
 
-    t_hyp_estimate = cli_arguments.get_t_hyp_estimate()
+def calculate_lifetime_for_tau_factor(
+    dataset: DataSet, t_hyp_estimate: Optional[float]
+) -> Tuple[float, Tuple[float, float]]:
+    """
+    Calculates the lifetime for the given tau factor, or for the optimal tau factor
+    if none is given. Returns the tau factor together with the lifetime and its
+    error.
+    """
     if t_hyp_estimate is not None:
-        print(f"Tau factor: {t_hyp_estimate}")
-        tau_custom, tau_custom_error = calculate_lifetime_for_custom_tau_factor(
-            dataset=dataset,
-            custom_tau_factor=t_hyp_estimate,
-            polynomial_degree=2,
-        )
+        t_hyp = t_hyp_estimate
     else:
         t_hyp = calculate_optimal_tau_factor(
             dataset=dataset,
@@ -76,13 +200,9 @@ def init(cli_arguments: CLIArguments) -> None:
             weight_factor=1.0,
             polynomial_degree=2,
         )
-        print(f"Tau factor: {t_hyp}")
 
-        tau_custom, tau_custom_error = calculate_lifetime_for_custom_tau_factor(
-            dataset=dataset,
-            custom_tau_factor=t_hyp,
-            polynomial_degree=2,
-        )
-    print(
-        f"Calculated lifetime with custom tau factor: {tau_custom} ± {tau_custom_error}"
+    return t_hyp, calculate_lifetime_for_custom_tau_factor(
+        dataset=dataset,
+        custom_tau_factor=t_hyp,
+        polynomial_degree=2,
     )
@@ -1,3 +1,5 @@
+from napytau.core.influence import DatapointInfluences
+from napytau.core.monte_carlo import DEFAULT_PERCENTILES, MonteCarloLifetimes
 from napytau.import_export.model.dataset import DataSet
 from napytau.util.coalesce import coalesce
 
@@ -52,3 +54,43 @@ def log_dataset_setup_data(dataset: DataSet) -> None:
         print(f"    Active:  {datapoint.is_active()} ")
         print("-" * 80)
     print("=" * 80)
+
+
+def log_datapoint_influences(dataset: DataSet, influences: DatapointInfluences) -> None:
+    print("Datapoint influence:")
+    print(
+        f"  Lifetime: {influences.lifetime} ± {influences.lifetime_error}, "
+        f"jackknife error: {influences.get_jackknife_error()}"
+    )
+    distances = dataset.get_datapoints().get_distances().get_values()
+    lifetime_shifts = influences.get_lifetime_shifts()
+    for position, index in enumerate(influences.indices):
+        print(f"  Datapoint at distance {distances[index]}:")
+        print(
+            f"    Lifetime without it: {influences.lifetimes[position]} "
+            f"± {influences.lifetime_errors[position]} "
+            f"(shift: {lifetime_shifts[position]})"
+        )
+        print(
+            f"    Leverage: {influences.leverages[position]} "
+            f"Cook's distance: {influences.cooks_distances[position]}"
+        )
+    print("=" * 80)
+
+
+def log_monte_carlo_lifetimes(monte_carlo_lifetimes: MonteCarloLifetimes) -> None:
+    print("Monte Carlo uncertainty:")
+    print(
+        f"  Samples: {len(monte_carlo_lifetimes)} "
+        f"({monte_carlo_lifetimes.get_invalid_sample_count()} without a lifetime), "
+        f"seed: {monte_carlo_lifetimes.seed}"
+    )
+    print(
+        f"  Lifetime: {monte_carlo_lifetimes.get_mean()} "
+        f"± {monte_carlo_lifetimes.get_standard_deviation()}"
+    )
+    for percentile, lifetime in zip(
+        DEFAULT_PERCENTILES, monte_carlo_lifetimes.get_percentiles()
+    ):
+        print(f"  {percentile}th percentile: {lifetime}")
+    print("=" * 80)
@@ -1,7 +1,9 @@
-from os import walk
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import scandir, walk
 from os.path import isdir
 from pathlib import PurePath
-from typing import List, Callable
+from queue import Queue
+from typing import Iterator, List, Callable, Optional, Set, Tuple
 from re import match as regex_match
 from re import Pattern
 
@@ -61,3 +63,84 @@ class FileCrawler[T]:
             )
 
         return crawled_files
+
+    def crawl_recursively(
+        self, directory_path: PurePath, max_workers: Optional[int] = None
+    ) -> Iterator[T]:
+        """
+        Crawls the whole directory tree below the given directory and yields the
+        found filenames of every directory, in which each of the file name patterns
+        matches at least one file. The directories are listed in parallel on a
+        thread pool and the results are yielded as soon as a directory is listed,
+        so they can be processed while the crawl continues. The order of the
+        results is therefore not defined.
+
+        Directories that cannot be listed are skipped, symbolic links to
+        directories are not followed.
+        """
+        if not isdir(directory_path):
+            raise ValueError(f"Directory path {directory_path} is not a directory.")
+
+        return self._crawl_tree(directory_path, max_workers)
+
+    def _crawl_tree(
+        self, directory_path: PurePath, max_workers: Optional[int]
+    ) -> Iterator[T]:
+        # Finished listings are collected in a queue, which unlike waiting on all
+        # pending listings does not slow down as the number of directories grows
+        listings: Queue[Future[Tuple[List[str], Set[int], List[str]]]] = Queue()
+        executor = ThreadPoolExecutor(max_workers)
+
+        def list_directory(path: str) -> None:
+            executor.submit(
+                _list_directory, path, self.file_name_patterns
+            ).add_done_callback(listings.put)
+
+        try:
+            list_directory(str(directory_path))
+            pending_listings = 1
+            while pending_listings > 0:
+                crawled_files, matched_patterns, subdirectories = (
+                    listings.get().result()
+                )
+                pending_listings -= 1
+                for subdirectory in subdirectories:
+                    list_directory(subdirectory)
+                    pending_listings += 1
+
+                if len(matched_patterns) == len(self.file_name_patterns):
+                    yield self.return_type_factory(
+                        [PurePath(crawled_file) for crawled_file in crawled_files]
+                    )
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+def _list_directory(
+    directory_path: str, file_name_patterns: List[Pattern[str]]
+) -> Tuple[List[str], Set[int], List[str]]:
+    # Returns the paths of the matching files of a directory, the indices of the
+    # patterns they matched and the paths of the subdirectories. Every pattern is
+    # matched on its own, as a file may match several of them
+    crawled_files: List[str] = []
+    matched_patterns: Set[int] = set()
+    subdirectories: List[str] = []
+    try:
+        with scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                    continue
+
+                matching_patterns = {
+                    index
+                    for index, file_name_pattern in enumerate(file_name_patterns)
+                    if file_name_pattern.match(entry.name) is not None
+                }
+                if len(matching_patterns) > 0:
+                    crawled_files.append(entry.path)
+                    matched_patterns.update(matching_patterns)
+    except OSError:
+        pass
+
+    return crawled_files, matched_patterns, subdirectories
@@ -1,4 +1,6 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from napytau.import_export.factory.legacy.raw_legacy_data import RawLegacyData
 
@@ -6,8 +8,16 @@ from napytau.import_export.factory.legacy.raw_legacy_setup_data import (
     RawLegacySetupData,
 )
 from napytau.import_export.import_export_error import ImportExportError
-from napytau.import_export.model.datapoint import Datapoint
 from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.datapoint_columns import (
+    CALIBRATION,
+    DISTANCE,
+    FEEDING_SHIFTED_INTENSITY,
+    FEEDING_UNSHIFTED_INTENSITY,
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+    DatapointColumns,
+)
 from napytau.import_export.model.dataset import DataSet
 from napytau.import_export.model.relative_velocity import RelativeVelocity
 from napytau.util.model.ValueErrorPairCollection import ValueErrorPairCollection
@@ -68,131 +78,82 @@ class LegacyFactory:
         calibration_rows: List[str],
         fit_rows: List[str],
     ) -> DatapointCollection:
-        datapoints = DatapointCollection([])
-        for distance_row in distance_rows:
-            distance = LegacyFactory.parse_distance_row(distance_row)
-            datapoints.add_datapoint(Datapoint(distance))
-        for calibration_row in calibration_rows:
-            (distance_index, calibration) = LegacyFactory.parse_calibration_row(
-                calibration_row
-            )
-            datapoint = datapoints.get_datapoint_by_distance(distance_index)
-            datapoint.set_calibration(calibration)
-        for fit_row in fit_rows:
+        """
+        Parses the rows of the distance, calibration and fit files into columns.
+        The calibration and fit rows reference a datapoint by its distance, they
+        are joined to the distances at once by searching the sorted distances.
+        """
+        distance_table = LegacyFactory.parse_distance_rows(distance_rows)
+        calibration_table = LegacyFactory.parse_calibration_rows(calibration_rows)
+        fit_table = LegacyFactory.parse_fit_rows(fit_rows)
+
+        distances = distance_table[:, 0]
+        values: Dict[str, np.ndarray] = {DISTANCE: distances}
+        errors: Dict[str, np.ndarray] = {DISTANCE: distance_table[:, 1]}
+        masks: Dict[str, np.ndarray] = {}
+
+        # The feeding intensities are only merged from rows that carry them, so a
+        # later row of the same distance without them does not remove them
+        feeding_table = fit_table[~np.isnan(fit_table[:, 5])]
+        # The columns of each table holding the value of a datapoint column, its
+        # error is held by the following column
+        for table, columns in [
+            (calibration_table, {CALIBRATION: 1}),
+            (fit_table, {SHIFTED_INTENSITY: 1, UNSHIFTED_INTENSITY: 3}),
             (
-                distance_index,
-                shifted_intensity,
-                unshifted_intensity,
-                feeding_shifted_intensity,
-                feeding_unshifted_intensity,
-            ) = LegacyFactory.parse_fit_row(fit_row)
-            datapoint = datapoints.get_datapoint_by_distance(distance_index)
-            datapoint.set_intensity(shifted_intensity, unshifted_intensity)
-            if (
-                feeding_shifted_intensity is not None
-                and feeding_unshifted_intensity is not None
-            ):
-                datapoint.set_feeding_intensity(
-                    feeding_shifted_intensity, feeding_unshifted_intensity
-                )
-
-        return datapoints
+                feeding_table,
+                {FEEDING_SHIFTED_INTENSITY: 5, FEEDING_UNSHIFTED_INTENSITY: 7},
+            ),
+        ]:
+            target_rows, table_rows = _merge_by_distance(distances, table[:, 0])
+            for column, table_column in columns.items():
+                values[column] = np.full(len(distances), np.nan)
+                errors[column] = np.full(len(distances), np.nan)
+                masks[column] = np.zeros(len(distances), dtype=bool)
+                values[column][target_rows] = table[table_rows, table_column]
+                errors[column][target_rows] = table[table_rows, table_column + 1]
+                masks[column][target_rows] = True
+
+        return DatapointCollection.from_columns(DatapointColumns(values, errors, masks))
 
     @staticmethod
-    def parse_distance_row(distance_row: str) -> ValueErrorPair[float]:
-        split_row = distance_row.split(" ")
-        if len(split_row) < 3:
-            raise ValueError(
-                f"Expected at least 3 values in distance row, but got {len(split_row)}"
-            )
-
-        if len(split_row) > 3:
-            raise ValueError(
-                f"Expected at most 3 values in distance row, but got {len(split_row)}"
-            )
-
+    def parse_distance_rows(distance_rows: List[str]) -> np.ndarray:
+        """
+        Parses the distance rows into an array holding the distance and its error
+        per row. Like datapoints added to a collection, a later row with the same
+        distance replaces an earlier one, but keeps its position.
+        """
         # The first value (at index 0) is a label, however since we index by distance we can ignore it # noqa E501
-        distance = float(split_row[1])
-        distance_error = float(split_row[2])
+        table = _parse_table(distance_rows, "distance", (3,), first_column=1)
 
-        return ValueErrorPair(distance, distance_error)
+        distances = table[:, 0]
+        _, first_rows = np.unique(distances, return_index=True)
+        if len(first_rows) == len(distances):
+            return table
 
-    @staticmethod
-    def parse_calibration_row(
-        calibration_row: str,
-    ) -> Tuple[float, ValueErrorPair[float]]:
-        split_row = calibration_row.split(" ")
-        if len(split_row) < 3:
-            raise ValueError(
-                f"Expected at least 3 values in calibration row, but got {len(split_row)}"  # noqa E501
-            )
+        # Both row indices are ordered by the sorted unique distances
+        _, last_rows_reversed = np.unique(distances[::-1], return_index=True)
+        last_rows = len(distances) - 1 - last_rows_reversed
 
-        if len(split_row) > 3:
-            raise ValueError(
-                f"Expected at most 3 values in calibration row, but got {len(split_row)}"  # noqa E501
-            )
-
-        distance_index = float(split_row[0])
-        calibration = float(split_row[1])
-        calibration_error = float(split_row[2])
-
-        return distance_index, ValueErrorPair(calibration, calibration_error)
+        return table[last_rows[np.argsort(first_rows)]]
 
     @staticmethod
-    def parse_fit_row(
-        fit_row: str,
-    ) -> Tuple[
-        float,
-        ValueErrorPair[float],
-        ValueErrorPair[float],
-        Optional[ValueErrorPair[float]],
-        Optional[ValueErrorPair[float]],
-    ]:
-        split_row = fit_row.split(" ")
-        if len(split_row) < 5:
-            raise ValueError(
-                f"Expected at least 5 values in fit row, but got {len(split_row)}"
-            )
+    def parse_calibration_rows(calibration_rows: List[str]) -> np.ndarray:
+        """
+        Parses the calibration rows into an array holding the distance, the
+        calibration and its error per row.
+        """
+        return _parse_table(calibration_rows, "calibration", (3,))
 
-        distance_index = float(split_row[0])
-        shifted_intensity = float(split_row[1])
-        shifted_intensity_error = float(split_row[2])
-        unshifted_intensity = float(split_row[3])
-        unshifted_intensity_error = float(split_row[4])
-
-        if len(split_row) == 5:
-            return (
-                distance_index,
-                ValueErrorPair(shifted_intensity, shifted_intensity_error),
-                ValueErrorPair(unshifted_intensity, unshifted_intensity_error),
-                None,
-                None,
-            )
-
-        if len(split_row) < 9:
-            raise ValueError(
-                f"Expected at least 9 values in fit row, but got {len(split_row)}"
-            )
-
-        if len(split_row) > 9:
-            raise ValueError(
-                f"Expected at most 9 values in fit row, but got {len(split_row)}"
-            )
-
-        feeding_shifted_intensity = float(split_row[5])
-        feeding_shifted_intensity_error = float(split_row[6])
-        feeding_unshifted_intensity = float(split_row[7])
-        feeding_unshifted_intensity_error = float(split_row[8])
-
-        return (
-            distance_index,
-            ValueErrorPair(shifted_intensity, shifted_intensity_error),
-            ValueErrorPair(unshifted_intensity, unshifted_intensity_error),
-            ValueErrorPair(feeding_shifted_intensity, feeding_shifted_intensity_error),
-            ValueErrorPair(
-                feeding_unshifted_intensity, feeding_unshifted_intensity_error
-            ),
-        )
+    @staticmethod
+    def parse_fit_rows(fit_rows: List[str]) -> np.ndarray:
+        """
+        Parses the fit rows into an array holding the distance, the shifted and
+        unshifted intensity with their errors and, if given, the feeding shifted
+        and unshifted intensity with their errors per row. Missing feeding
+        intensities are NaN.
+        """
+        return _parse_table(fit_rows, "fit", (5, 9))
 
     @staticmethod
     def enrich_dataset(dataset: DataSet, raw_setup_data: RawLegacySetupData) -> DataSet:
@@ -286,3 +247,67 @@ class LegacyFactory:
             sampling_points.append(float(split_row[0]))
 
         return sampling_points
+
+
+def _parse_table(
+    rows: List[str],
+    name: str,
+    column_counts: Tuple[int, ...],
+    first_column: int = 0,
+) -> np.ndarray:
+    # Parses the rows, separated by any whitespace, into an array, skipping
+    # comments and empty rows. The number of values is validated for all rows at
+    # once, rows with fewer than the maximum number of values are padded with
+    # NaN. Columns before the first column are not parsed.
+    row_counts = np.fromiter(
+        (len(row.split("#", 1)[0].split()) for row in rows), dtype=int, count=len(rows)
+    )
+    counts = row_counts[row_counts != 0]
+    invalid = ~np.isin(counts, column_counts)
+    if invalid.any():
+        expected = " or ".join(str(count) for count in column_counts)
+        raise ValueError(
+            f"Expected {expected} values in {name} row, but got {counts[invalid][0]}"
+        )
+
+    table = np.full((len(counts), max(column_counts) - first_column), np.nan)
+    for column_count in column_counts:
+        selected = counts == column_count
+        if not selected.any():
+            continue
+        # Rows without values are skipped by numpy as well
+        selected_rows = (
+            rows
+            if selected.all()
+            else [row for row, count in zip(rows, row_counts) if count == column_count]
+        )
+        table[selected, : column_count - first_column] = np.loadtxt(
+            selected_rows,
+            comments="#",
+            usecols=range(first_column, column_count),
+            ndmin=2,
+        )
+
+    return table
+
+
+def _merge_by_distance(
+    distances: np.ndarray, keys: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Returns the indices of the distances matching the keys, together with the
+    # indices of the keys. If several keys match the same distance, only the last
+    # one is kept, as later rows overwrite earlier ones.
+    order = np.argsort(distances, kind="stable")
+    sorted_distances = distances[order]
+    positions = np.searchsorted(sorted_distances, keys)
+
+    found = positions < len(sorted_distances)
+    found[found] = sorted_distances[positions[found]] == keys[found]
+    if not found.all():
+        raise ValueError(f'Datapoint with distance: "{keys[~found][0]}" not found.')
+
+    target_rows = order[positions]
+    _, last_keys_reversed = np.unique(target_rows[::-1], return_index=True)
+    key_rows = len(keys) - 1 - last_keys_reversed
+
+    return target_rows[key_rows], key_rows
@@ -1,5 +1,8 @@
 import json
-import jsonschema
+from functools import lru_cache
+from typing import Any, List
+
+import numpy as np
 
 from napytau.import_export.import_export_error import ImportExportError
 from napytau.import_export.model.dataset import DataSet
@@ -194,15 +197,65 @@ class NapytauFormatJsonService:
         Validates the provided json data against the napytau json schema
         """
 
-        schema = json.loads(_SCHEMA)
+        # Imported here, as jsonschema is slow to load and only needed for validation
+        import jsonschema
 
-        try:
-            jsonschema.validate(instance=json_data, schema=schema)
-        except jsonschema.ValidationError as e:
+        error = jsonschema.exceptions.best_match(
+            _get_schema_validator().iter_errors(json_data)
+        )
+        if error is not None:
+            raise ImportExportError(
+                f"Provided json data does not match the napytau json schema: {error}"
+            )
+
+        return True
+
+    @staticmethod
+    def validate_structure(json_data: dict) -> bool:
+        """
+        Checks only the structure of the provided json data: the required keys and
+        that the datapoint values are non-negative numbers. This is much faster than
+        the validation against the schema and meant for trusted files, e.g. files
+        written by napytau itself, as it does not catch every violation of the
+        schema.
+        """
+
+        _check_required_keys([json_data], _REQUIRED_KEYS, "the json data")
+        _check_non_negative_numbers(
+            [json_data["relativeVelocity"], json_data["relativeVelocityError"]],
+            "relative velocity",
+        )
+
+        datapoints = json_data["datapoints"]
+        setups = json_data["setups"]
+        if not isinstance(datapoints, list) or not isinstance(setups, list):
             raise ImportExportError(
-                f"Provided json data does not match the napytau json schema: {e}"
+                "Provided json data does not match the napytau json schema: "
+                "datapoints and setups must be arrays"
             )
 
+        _check_required_keys(datapoints, _REQUIRED_DATAPOINT_KEYS, "a datapoint")
+        _check_required_keys(setups, _REQUIRED_SETUP_KEYS, "a setup")
+
+        # The values of all datapoints are checked at once instead of one by one
+        _check_non_negative_numbers(
+            [
+                datapoint[key]
+                for datapoint in datapoints
+                for key in _REQUIRED_DATAPOINT_KEYS
+            ],
+            "datapoint",
+        )
+        _check_non_negative_numbers(
+            [
+                datapoint[key]
+                for datapoint in datapoints
+                for key in _OPTIONAL_DATAPOINT_KEYS
+                if key in datapoint
+            ],
+            "datapoint",
+        )
+
         return True
 
     @staticmethod
@@ -291,3 +344,84 @@ class NapytauFormatJsonService:
             )
 
         return json_data
+
+
+_REQUIRED_KEYS = ["relativeVelocity", "relativeVelocityError", "datapoints", "setups"]
+
+_REQUIRED_DATAPOINT_KEYS = [
+    "distance",
+    "distanceError",
+    "calibration",
+    "calibrationError",
+    "shiftedIntensity",
+    "shiftedIntensityError",
+    "unshiftedIntensity",
+    "unshiftedIntensityError",
+]
+
+_OPTIONAL_DATAPOINT_KEYS = [
+    "feedingShiftedIntensity",
+    "feedingShiftedIntensityError",
+    "feedingUnshiftedIntensity",
+    "feedingUnshiftedIntensityError",
+]
+
+_REQUIRED_SETUP_KEYS = [
+    "name",
+    "tauFactor",
+    "polynomialCount",
+    "datapointSetups",
+    "samplingPoints",
+]
+
+
+@lru_cache(maxsize=1)
+def _get_schema_validator() -> Any:
+    """
+    Creates the validator for the napytau json schema. The schema is parsed and
+    checked only once per process, as this takes longer than validating a typical
+    file.
+    """
+    import jsonschema
+
+    schema = json.loads(_SCHEMA)
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+
+    return validator_class(schema)
+
+
+def _check_required_keys(objects: List[Any], keys: List[str], name: str) -> None:
+    for json_object in objects:
+        if not isinstance(json_object, dict):
+            raise ImportExportError(
+                "Provided json data does not match the napytau json schema: "
+                f"{name} is not an object"
+            )
+        missing_keys = [key for key in keys if key not in json_object]
+        if missing_keys:
+            raise ImportExportError(
+                "Provided json data does not match the napytau json schema: "
+                f"{name} is missing the keys {', '.join(missing_keys)}"
+            )
+
+
+def _check_non_negative_numbers(values: List[Any], name: str) -> None:
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        array = np.asarray(values, dtype=object)
+
+    if array.size == 0:
+        return
+    # Mixing booleans into numbers is not caught, which is fine for trusted files
+    if array.dtype.kind not in "iuf":
+        raise ImportExportError(
+            "Provided json data does not match the napytau json schema: "
+            f"a {name} value is not a number"
+        )
+    if np.any(array < 0):
+        raise ImportExportError(
+            "Provided json data does not match the napytau json schema: "
+            f"a {name} value is negative"
+        )
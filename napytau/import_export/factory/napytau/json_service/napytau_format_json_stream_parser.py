@@ -0,0 +1,395 @@
+import json
+import re
+from array import array
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Any, BinaryIO, Dict, Iterator, List
+
+import numpy as np
+
+from napytau.import_export.import_export_error import ImportExportError
+from napytau.import_export.model.datapoint_columns import (
+    CALIBRATION,
+    DISTANCE,
+    FEEDING_SHIFTED_INTENSITY,
+    FEEDING_UNSHIFTED_INTENSITY,
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+    DatapointColumns,
+)
+
+_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURE = re.compile(rb'[\[\]{}"]')
+_SCALAR_END = re.compile(rb"[,\]}\s]")
+# An object without nested objects or arrays, like a datapoint
+_FLAT_OBJECT_PATTERN = rb'\{[^\[\]{}"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^\[\]{}"]*)*\}'
+_FLAT_OBJECT = re.compile(_FLAT_OBJECT_PATTERN, re.DOTALL)
+_FLAT_OBJECT_RUN = re.compile(
+    _FLAT_OBJECT_PATTERN + rb"(?:[ \t\n\r]*,[ \t\n\r]*" + _FLAT_OBJECT_PATTERN + rb")*",
+    re.DOTALL,
+)
+
+# The json keys of the value and the error of each datapoint column
+_REQUIRED_DATAPOINT_COLUMNS = {
+    DISTANCE: ("distance", "distanceError"),
+    CALIBRATION: ("calibration", "calibrationError"),
+    SHIFTED_INTENSITY: ("shiftedIntensity", "shiftedIntensityError"),
+    UNSHIFTED_INTENSITY: ("unshiftedIntensity", "unshiftedIntensityError"),
+}
+
+_FEEDING_DATAPOINT_COLUMNS = {
+    FEEDING_SHIFTED_INTENSITY: (
+        "feedingShiftedIntensity",
+        "feedingShiftedIntensityError",
+    ),
+    FEEDING_UNSHIFTED_INTENSITY: (
+        "feedingUnshiftedIntensity",
+        "feedingUnshiftedIntensityError",
+    ),
+}
+
+_REQUIRED_SETUP_KEYS = [
+    "name",
+    "tauFactor",
+    "polynomialCount",
+    "datapointSetups",
+    "samplingPoints",
+]
+
+
+class NapytauSetups:
+    """
+    The setups of a napytau json file. They are not kept in memory, instead the
+    file is read again and the setups are parsed one at a time while iterating
+    over them, so finding a setup by name only parses the setups up to it.
+    """
+
+    _file_path: PurePath
+    _offset: int
+
+    def __init__(self, file_path: PurePath, offset: int):
+        self._file_path = file_path
+        self._offset = offset
+
+    def __iter__(self) -> Iterator[dict]:
+        with open(self._file_path, "rb") as file:
+            file.seek(self._offset)
+            reader = _JsonByteReader(file, self._offset)
+            for _ in reader.iterate_array():
+                setup = reader.read_value()
+                if not isinstance(setup, dict) or any(
+                    key not in setup for key in _REQUIRED_SETUP_KEYS
+                ):
+                    raise ImportExportError(
+                        f"A setup in {self._file_path} is missing required keys"
+                    )
+                yield setup
+
+
+@dataclass(frozen=True)
+class StreamedNapytauData:
+    """
+    The contents of a napytau json file as read by the stream parser.
+    """
+
+    relative_velocity: float
+    relative_velocity_error: float
+    datapoints: DatapointColumns
+    setups: NapytauSetups
+
+
+class NapytauFormatJsonStreamParser:
+    @staticmethod
+    def parse_file(file_path: PurePath) -> StreamedNapytauData:
+        """
+        Parses a napytau json file incrementally. The datapoints are read one at a
+        time straight into columns, so neither the text of the file nor the parsed
+        json objects are held in memory as a whole. The setups are only located and
+        parsed later, when they are iterated over.
+
+        Like the structural validation of the json service, only the required keys
+        and that the datapoint values are non-negative numbers are checked.
+        """
+
+        scalars: Dict[str, Any] = {}
+        datapoints = None
+        setups = None
+
+        with open(file_path, "rb") as file:
+            reader = _JsonByteReader(file)
+            for key in reader.iterate_object():
+                if key in ("relativeVelocity", "relativeVelocityError"):
+                    scalars[key] = reader.read_value()
+                elif key == "datapoints":
+                    datapoints = _parse_datapoints(reader)
+                elif key == "setups":
+                    setups = NapytauSetups(file_path, reader.tell())
+                    reader.skip_value()
+                else:
+                    reader.skip_value()
+
+        if len(scalars) != 2 or datapoints is None or setups is None:
+            raise ImportExportError(
+                f"Provided json data in {file_path} is missing required keys"
+            )
+        for value in scalars.values():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ImportExportError("The relative velocity is not a number")
+            if value < 0:
+                raise ImportExportError("The relative velocity is negative")
+
+        return StreamedNapytauData(
+            float(scalars["relativeVelocity"]),
+            float(scalars["relativeVelocityError"]),
+            datapoints,
+            setups,
+        )
+
+
+def _parse_datapoints(reader: "_JsonByteReader") -> DatapointColumns:
+    values: Dict[str, array] = {}
+    errors: Dict[str, array] = {}
+    for column in list(_REQUIRED_DATAPOINT_COLUMNS) + list(_FEEDING_DATAPOINT_COLUMNS):
+        values[column] = array("d")
+        errors[column] = array("d")
+
+    for raw_datapoints in reader.iterate_array_in_batches():
+        try:
+            for column, (value_key, error_key) in _REQUIRED_DATAPOINT_COLUMNS.items():
+                values[column].extend([raw[value_key] for raw in raw_datapoints])
+                errors[column].extend([raw[error_key] for raw in raw_datapoints])
+
+            for column, (value_key, error_key) in _FEEDING_DATAPOINT_COLUMNS.items():
+                values[column].extend(
+                    [
+                        raw[value_key] if "feedingShiftedIntensity" in raw else np.nan
+                        for raw in raw_datapoints
+                    ]
+                )
+                errors[column].extend(
+                    [
+                        raw[error_key] if "feedingShiftedIntensity" in raw else np.nan
+                        for raw in raw_datapoints
+                    ]
+                )
+        except (KeyError, TypeError) as e:
+            raise ImportExportError(
+                f"A datapoint is missing a required key or has a non-numeric value: {e}"
+            )
+
+    # The arrays are wrapped without copying them
+    value_arrays = {
+        column: np.frombuffer(column_values, dtype=float)
+        for column, column_values in values.items()
+    }
+    error_arrays = {
+        column: np.frombuffer(column_errors, dtype=float)
+        for column, column_errors in errors.items()
+    }
+    # Missing feeding intensities are NaN, which is not negative either
+    if any(
+        np.any(value_arrays[column] < 0) or np.any(error_arrays[column] < 0)
+        for column in values
+    ):
+        raise ImportExportError("A datapoint value is negative")
+
+    return DatapointColumns(value_arrays, error_arrays)
+
+
+class _JsonByteReader:
+    """
+    Reads json tokens from a binary file, holding only the part of the file in
+    memory that belongs to the value currently being read.
+    """
+
+    _file: BinaryIO
+    _buffer: bytes
+    _position: int
+    _offset: int
+    _end_of_file: bool
+
+    def __init__(self, file: BinaryIO, offset: int = 0):
+        self._file = file
+        self._buffer = b""
+        self._position = 0
+        self._offset = offset
+        self._end_of_file = False
+
+    def tell(self) -> int:
+        """The offset of the next unread byte in the file."""
+        return self._offset + self._position
+
+    def iterate_object(self) -> Iterator[str]:
+        """
+        Iterates over the keys of an object. The caller has to read or skip the
+        value of each key before continuing the iteration.
+        """
+        self._expect(b"{")
+        if self._peek() == b"}":
+            self._position += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ImportExportError("Expected a key in the provided json data")
+            self._expect(b":")
+            yield key
+            if self._is_closed_after_element(b"}"):
+                return
+
+    def iterate_array(self) -> Iterator[None]:
+        """
+        Iterates over the elements of an array. The caller has to read or skip
+        each element before continuing the iteration.
+        """
+        self._expect(b"[")
+        if self._peek() == b"]":
+            self._position += 1
+            return
+
+        while True:
+            yield
+            if self._is_closed_after_element(b"]"):
+                return
+
+    def iterate_array_in_batches(self) -> Iterator[List[Any]]:
+        """
+        Iterates over the elements of an array in batches. Consecutive flat objects
+        in the buffer are parsed at once, any other element forms its own batch.
+        """
+        for _ in self.iterate_array():
+            self._peek()
+            run = _FLAT_OBJECT_RUN.match(self._buffer, self._position)
+            if run is None:
+                yield [self.read_value()]
+                continue
+
+            self._position = run.end()
+            yield _parse_json(b"[" + run.group() + b"]")
+
+    def read_value(self) -> Any:
+        """Reads the next value and parses it."""
+        length = self._find_value_end(consume=False)
+        raw_value = self._buffer[self._position : self._position + length]
+        self._position += length
+
+        return _parse_json(raw_value)
+
+    def skip_value(self) -> None:
+        """Skips the next value without keeping it in memory."""
+        # Scanning moves the position, so it must not be read before the scan
+        length = self._find_value_end(consume=True)
+        self._position += length
+
+    def _find_value_end(self, consume: bool) -> int:
+        # Returns the length of the next value, counted from the current position.
+        # If consume is set, the position is advanced while scanning, allowing the
+        # scanned part of the value to be dropped from the buffer.
+        first_character = self._peek()
+        if first_character == b'"':
+            return self._find_string_end(0)
+
+        if first_character not in (b"{", b"["):
+            while True:
+                match = _SCALAR_END.search(self._buffer, self._position)
+                if match is not None:
+                    return match.start() - self._position
+                if not self._fill():
+                    return len(self._buffer) - self._position
+
+        # Flat objects are matched at once, which is much faster than scanning them
+        if first_character == b"{":
+            flat_object = _FLAT_OBJECT.match(self._buffer, self._position)
+            if flat_object is not None:
+                return flat_object.end() - self._position
+
+        depth = 0
+        length = 0
+        while True:
+            match = _STRUCTURE.search(self._buffer, self._position + length)
+            if match is None:
+                if consume:
+                    self._position = len(self._buffer)
+                    length = 0
+                else:
+                    length = len(self._buffer) - self._position
+                if not self._fill():
+                    raise ImportExportError("Provided json data ended unexpectedly")
+                continue
+
+            length = match.start() - self._position
+            token = match.group()
+            if token == b'"':
+                length = self._find_string_end(length)
+            else:
+                length += 1
+                depth += 1 if token in b"{[" else -1
+                if depth == 0:
+                    return length
+
+            if consume:
+                self._position += length
+                length = 0
+
+    def _find_string_end(self, length: int) -> int:
+        while True:
+            match = _STRING.match(self._buffer, self._position + length)
+            if match is not None:
+                return match.end() - self._position
+            if not self._fill():
+                raise ImportExportError("Provided json data ended unexpectedly")
+
+    def _peek(self) -> bytes:
+        while True:
+            whitespace = _WHITESPACE.match(self._buffer, self._position)
+            if whitespace is not None:
+                self._position = whitespace.end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position : self._position + 1]
+            if not self._fill():
+                raise ImportExportError("Provided json data ended unexpectedly")
+
+    def _is_closed_after_element(self, closing_character: bytes) -> bool:
+        character = self._peek()
+        if character not in (b",", closing_character):
+            raise ImportExportError(
+                f"Unexpected character {character!r} in the provided json data"
+            )
+        self._position += 1
+
+        return character == closing_character
+
+    def _expect(self, character: bytes) -> None:
+        if self._peek() != character:
+            raise ImportExportError(
+                f"Expected {character!r} in the provided json data at {self.tell()}"
+            )
+        self._position += 1
+
+    def _fill(self) -> bool:
+        # Reads the next chunk of the file and drops the part of the buffer before
+        # the current position
+        if self._end_of_file:
+            return False
+
+        chunk = self._file.read(_CHUNK_SIZE)
+        if not chunk:
+            self._end_of_file = True
+            return False
+
+        self._offset += self._position
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+
+        return True
+
+
+def _parse_json(raw_value: bytes) -> Any:
+    try:
+        return json.loads(raw_value)
+    except json.JSONDecodeError as e:
+        raise ImportExportError(f"Provided json data could not be parsed: {e}")
@@ -5,6 +5,7 @@ from napytau.import_export.factory.napytau.json_service.napytau_format_json_serv
 )
 from napytau.import_export.model.datapoint import Datapoint
 from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.datapoint_columns import DatapointColumns
 from napytau.import_export.model.dataset import DataSet
 from napytau.import_export.model.relative_velocity import RelativeVelocity
 from napytau.util.coalesce import coalesce
@@ -13,8 +14,16 @@ from napytau.util.model.value_error_pair import ValueErrorPair
 
 class NapyTauFactory:
     @staticmethod
-    def create_dataset(raw_json_data: dict) -> DataSet:
-        NapytauFormatJsonService.validate_against_schema(raw_json_data)
+    def create_dataset(raw_json_data: dict, trusted: bool = False) -> DataSet:
+        """
+        Creates a dataset from the raw json data. The data is validated against the
+        napytau json schema, unless it is trusted, in which case only its structure
+        is checked.
+        """
+        if trusted:
+            NapytauFormatJsonService.validate_structure(raw_json_data)
+        else:
+            NapytauFormatJsonService.validate_against_schema(raw_json_data)
 
         return DataSet(
             ValueErrorPair(
@@ -24,6 +33,24 @@ class NapyTauFactory:
             NapyTauFactory._parse_datapoints(raw_json_data["datapoints"]),
         )
 
+    @staticmethod
+    def create_dataset_from_columns(
+        relative_velocity: float,
+        relative_velocity_error: float,
+        datapoints: DatapointColumns,
+    ) -> DataSet:
+        """
+        Creates a dataset from datapoints that were read straight into columns, e.g.
+        by the stream parser. The columns are reused as the columns of the dataset.
+        """
+        return DataSet(
+            ValueErrorPair(
+                RelativeVelocity(relative_velocity),
+                RelativeVelocity(relative_velocity_error),
+            ),
+            DatapointCollection.from_columns(datapoints),
+        )
+
     @staticmethod
     def _parse_datapoints(
         raw_datapoints: List[dict[str, float]],
@@ -0,0 +1,212 @@
+from typing import Dict, Iterable, List, Mapping
+
+import numpy as np
+
+from napytau.import_export.import_export_error import ImportExportError
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.datapoint_columns import (
+    COLUMNS,
+    OPTIONAL_COLUMNS,
+    DatapointColumns,
+)
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+# Increased whenever the arrays of the format change incompatibly
+FORMAT_VERSION = 1
+
+FORMAT_VERSION_ARRAY = "format_version"
+RELATIVE_VELOCITY_ARRAY = "relative_velocity"
+ACTIVE_ARRAY = "active"
+SETUP_NAMES_ARRAY = "setup_names"
+SETUP_TAU_FACTORS_ARRAY = "setup_tau_factors"
+SETUP_POLYNOMIAL_COUNTS_ARRAY = "setup_polynomial_counts"
+SETUP_DATAPOINT_OFFSETS_ARRAY = "setup_datapoint_offsets"
+SETUP_DATAPOINT_DISTANCES_ARRAY = "setup_datapoint_distances"
+SETUP_DATAPOINT_ACTIVE_ARRAY = "setup_datapoint_active"
+SETUP_SAMPLING_POINT_OFFSETS_ARRAY = "setup_sampling_point_offsets"
+SETUP_SAMPLING_POINTS_ARRAY = "setup_sampling_points"
+
+
+def _values_array(column: str) -> str:
+    return f"{column}_values"
+
+
+def _errors_array(column: str) -> str:
+    return f"{column}_errors"
+
+
+def _mask_array(column: str) -> str:
+    return f"{column}_mask"
+
+
+class NumpyFactory:
+    """
+    A factory class for converting datasets from and to the numpy format. The
+    numpy format stores a dataset as a set of named arrays: the relative velocity,
+    the value, error and validity mask of every datapoint column, the active mask
+    and the setups. Setups of variable length, i.e. their datapoint setups and
+    sampling points, are stored as one flat array each, together with the offsets
+    at which the entries of each setup start.
+
+    As only plain numeric and string arrays are used, the arrays can be memory
+    mapped and are turned into a dataset without copying them.
+    """
+
+    @staticmethod
+    def create_dataset(arrays: Mapping[str, np.ndarray]) -> DataSet:
+        NumpyFactory._check_format_version(arrays)
+
+        try:
+            columns = DatapointColumns(
+                {column: arrays[_values_array(column)] for column in COLUMNS},
+                {column: arrays[_errors_array(column)] for column in COLUMNS},
+                {column: arrays[_mask_array(column)] for column in OPTIONAL_COLUMNS},
+                arrays[ACTIVE_ARRAY],
+            )
+            relative_velocity = arrays[RELATIVE_VELOCITY_ARRAY]
+        except KeyError as e:
+            raise ImportExportError(f"Missing array in the numpy format: {e}")
+        except ValueError as e:
+            raise ImportExportError(f"Invalid arrays in the numpy format: {e}")
+
+        return DataSet(
+            ValueErrorPair(
+                RelativeVelocity(float(relative_velocity[0])),
+                RelativeVelocity(float(relative_velocity[1])),
+            ),
+            DatapointCollection.from_columns(columns),
+        )
+
+    @staticmethod
+    def create_setups(arrays: Mapping[str, np.ndarray]) -> List[dict]:
+        """
+        Creates the setups in the raw form of the napytau json format, so they can
+        be read into a dataset like the setups of a napytau json file.
+        """
+        NumpyFactory._check_format_version(arrays)
+
+        try:
+            names = arrays[SETUP_NAMES_ARRAY]
+            tau_factors = arrays[SETUP_TAU_FACTORS_ARRAY]
+            polynomial_counts = arrays[SETUP_POLYNOMIAL_COUNTS_ARRAY]
+            datapoint_offsets = arrays[SETUP_DATAPOINT_OFFSETS_ARRAY]
+            datapoint_distances = arrays[SETUP_DATAPOINT_DISTANCES_ARRAY]
+            datapoint_active = arrays[SETUP_DATAPOINT_ACTIVE_ARRAY]
+            sampling_point_offsets = arrays[SETUP_SAMPLING_POINT_OFFSETS_ARRAY]
+            sampling_points = arrays[SETUP_SAMPLING_POINTS_ARRAY]
+        except KeyError as e:
+            raise ImportExportError(f"Missing array in the numpy format: {e}")
+
+        setups: List[dict] = []
+        for index in range(len(names)):
+            datapoints = slice(datapoint_offsets[index], datapoint_offsets[index + 1])
+            setups.append(
+                {
+                    "name": str(names[index]),
+                    "tauFactor": float(tau_factors[index]),
+                    "polynomialCount": int(polynomial_counts[index]),
+                    "datapointSetups": [
+                        {"distance": float(distance), "active": bool(active)}
+                        for distance, active in zip(
+                            datapoint_distances[datapoints],
+                            datapoint_active[datapoints],
+                        )
+                    ],
+                    "samplingPoints": sampling_points[
+                        sampling_point_offsets[index] : sampling_point_offsets[
+                            index + 1
+                        ]
+                    ].tolist(),
+                }
+            )
+
+        return setups
+
+    @staticmethod
+    def create_arrays(
+        dataset: DataSet, raw_setups: Iterable[dict] = ()
+    ) -> Dict[str, np.ndarray]:
+        """
+        Converts a dataset and the setups associated with it, given in the raw form
+        of the napytau json format, into the arrays of the numpy format.
+        """
+        columns = dataset.get_datapoints().get_columns()
+        relative_velocity = dataset.get_relative_velocity()
+
+        arrays: Dict[str, np.ndarray] = {
+            FORMAT_VERSION_ARRAY: np.array(FORMAT_VERSION),
+            RELATIVE_VELOCITY_ARRAY: np.array(
+                [
+                    relative_velocity.value.get_velocity(),
+                    relative_velocity.error.get_velocity(),
+                ]
+            ),
+            ACTIVE_ARRAY: columns.get_active_mask(),
+        }
+        for column in COLUMNS:
+            arrays[_values_array(column)] = columns.get_values(column)
+            arrays[_errors_array(column)] = columns.get_errors(column)
+        for column in OPTIONAL_COLUMNS:
+            arrays[_mask_array(column)] = columns.get_mask(column)
+
+        setups = list(raw_setups)
+        datapoint_setups = [setup["datapointSetups"] for setup in setups]
+        sampling_points = [setup["samplingPoints"] for setup in setups]
+        arrays.update(
+            {
+                SETUP_NAMES_ARRAY: np.array(
+                    [setup["name"] for setup in setups], dtype=str
+                ),
+                SETUP_TAU_FACTORS_ARRAY: np.array(
+                    [setup["tauFactor"] for setup in setups], dtype=float
+                ),
+                SETUP_POLYNOMIAL_COUNTS_ARRAY: np.array(
+                    [setup["polynomialCount"] for setup in setups], dtype=int
+                ),
+                SETUP_DATAPOINT_OFFSETS_ARRAY: _offsets(datapoint_setups),
+                SETUP_DATAPOINT_DISTANCES_ARRAY: np.array(
+                    [
+                        datapoint_setup["distance"]
+                        for setup in datapoint_setups
+                        for datapoint_setup in setup
+                    ],
+                    dtype=float,
+                ),
+                SETUP_DATAPOINT_ACTIVE_ARRAY: np.array(
+                    [
+                        datapoint_setup["active"]
+                        for setup in datapoint_setups
+                        for datapoint_setup in setup
+                    ],
+                    dtype=bool,
+                ),
+                SETUP_SAMPLING_POINT_OFFSETS_ARRAY: _offsets(sampling_points),
+                SETUP_SAMPLING_POINTS_ARRAY: np.array(
+                    [point for points in sampling_points for point in points],
+                    dtype=float,
+                ),
+            }
+        )
+
+        return arrays
+
+    @staticmethod
+    def _check_format_version(arrays: Mapping[str, np.ndarray]) -> None:
+        if FORMAT_VERSION_ARRAY not in arrays:
+            raise ImportExportError("The numpy format is missing its format version")
+
+        format_version = int(arrays[FORMAT_VERSION_ARRAY])
+        if format_version != FORMAT_VERSION:
+            raise ImportExportError(
+                f"Unsupported version {format_version} of the numpy format, "
+                f"expected version {FORMAT_VERSION}"
+            )
+
+
+def _offsets(groups: List[list]) -> np.ndarray:
+    offsets: np.ndarray = np.zeros(len(groups) + 1, dtype=int)
+    np.cumsum([len(group) for group in groups], out=offsets[1:])
+
+    return offsets
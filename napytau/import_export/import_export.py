@@ -1,6 +1,6 @@
 from pathlib import PurePath
 from re import compile as compile_regex
-from typing import Optional, List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from napytau.import_export.factory.legacy.legacy_factory import (
     LegacyFactory,
@@ -15,6 +15,7 @@ from napytau.import_export.factory.napytau.json_service.napytau_format_json_serv
     NapytauFormatJsonService,
 )
 from napytau.import_export.factory.napytau.napytau_factory import NapyTauFactory
+from napytau.import_export.factory.numpy.numpy_factory import NumpyFactory
 from napytau.import_export.import_export_error import ImportExportError
 from napytau.import_export.model.dataset import DataSet
 from napytau.import_export.reader.file_reader import FileReader
@@ -22,8 +23,9 @@ from napytau.import_export.writer.file_writer import FileWriter
 
 IMPORT_FORMAT_LEGACY = "legacy"
 IMPORT_FORMAT_NAPYTAU = "napytau"
+IMPORT_FORMAT_NUMPY = "numpy"
 
-IMPORT_FORMATS = [IMPORT_FORMAT_LEGACY, IMPORT_FORMAT_NAPYTAU]
+IMPORT_FORMATS = [IMPORT_FORMAT_LEGACY, IMPORT_FORMAT_NAPYTAU, IMPORT_FORMAT_NUMPY]
 
 
 def import_legacy_format_from_files(
@@ -45,6 +47,31 @@ def import_legacy_format_from_files(
 
     setup_files: LegacySetupFiles = file_crawler.crawl(directory_path)
 
+    return import_legacy_format_from_setup_files(setup_files)
+
+
+def crawl_legacy_format_setup_files(
+    directory_path: PurePath, fit_file_path: Optional[PurePath] = None
+) -> Iterator[LegacySetupFiles]:
+    """
+    Searches the whole directory tree below the directory path for datasets in
+    the Legacy format and yields the files of each dataset as soon as its
+    directory has been searched, in no particular order. Every directory
+    containing all files of the Legacy format is a dataset.
+
+    if the fit_file_path is provided, it is used as the fit file of every dataset.
+    """
+
+    file_crawler = _configure_file_crawler_for_legacy_format(fit_file_path)
+
+    return file_crawler.crawl_recursively(directory_path)
+
+
+def import_legacy_format_from_setup_files(setup_files: LegacySetupFiles) -> DataSet:
+    """
+    Ingests a dataset from the Legacy format, given the files found by the crawler.
+    """
+
     return LegacyFactory.create_dataset(
         RawLegacyData(
             FileReader.read_rows(setup_files.velocity_file),
@@ -97,16 +124,38 @@ def read_legacy_setup_data_into_data_set(
 
 def import_napytau_format_from_file(
     file_path: PurePath,
-) -> Tuple[DataSet, List[dict]]:
+    trusted: bool = False,
+) -> Tuple[DataSet, Iterable[dict]]:
     """
     Ingests a dataset from the NapyTau format. The directory path will be
     recursively searched for the following files:
     - napytau.json
 
     :param directory_path: The directory path to search for the .napytau.json files
+    :param trusted: Whether to skip the full validation against the json schema and
+    only check the structure of the file, e.g. for files written by napytau itself.
+    Trusted files are streamed, their datapoints are read straight into columns and
+    their setups are only parsed once they are iterated over.
 
     :return: A list of datasets and their corresponding raw setup data
     """
+    if trusted:
+        # Imported here, as the stream parser is only needed for trusted files
+        from napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser import (  # noqa E501
+            NapytauFormatJsonStreamParser,
+        )
+
+        streamed_data = NapytauFormatJsonStreamParser.parse_file(file_path)
+
+        return (
+            NapyTauFactory.create_dataset_from_columns(
+                streamed_data.relative_velocity,
+                streamed_data.relative_velocity_error,
+                streamed_data.datapoints,
+            ),
+            streamed_data.setups,
+        )
+
     json_data = NapytauFormatJsonService.parse_json_data(
         FileReader.read_text(file_path)
     )
@@ -117,13 +166,14 @@ def import_napytau_format_from_file(
 
 
 def read_napytau_setup_data_into_data_set(
-    dataset: DataSet, raw_setups_data: List[dict], setup_name: str
+    dataset: DataSet, raw_setups_data: Iterable[dict], setup_name: str
 ) -> DataSet:
     """
     Reads the setup data from the provided file path and adds it to the provided dataset
 
     :param dataset: The dataset to enrich
-    :param raw_setups_data: The raw json data of the datasets associated setups
+    :param raw_setups_data: The raw json data of the datasets associated setups, which
+    are only parsed up to the requested setup if they are streamed
     :param setup_name: The name of the setup to add to the dataset
 
     :return: The enriched dataset
@@ -155,3 +205,39 @@ def save_napytau_calculation_data_to_file(
     json_data = NapytauFormatJsonService.create_calculation_data_json_string(dataset)
 
     FileWriter.write_text(file_path, json_data)
+
+
+def import_numpy_format_from_directory(
+    directory_path: PurePath,
+) -> Tuple[DataSet, List[dict]]:
+    """
+    Ingests a dataset from the numpy format, a directory of .npy files. The arrays
+    are memory mapped and used as the columns of the dataset without copying them.
+
+    :param directory_path: The directory containing the .npy files
+
+    :return: The dataset and its setups in the raw form of the NapyTau format, so
+    they can be read into the dataset with read_napytau_setup_data_into_data_set
+    """
+    arrays = FileReader.read_arrays(directory_path)
+
+    return (
+        NumpyFactory.create_dataset(arrays),
+        NumpyFactory.create_setups(arrays),
+    )
+
+
+def save_numpy_format_to_directory(
+    dataset: DataSet,
+    directory_path: PurePath,
+    raw_setups_data: Iterable[dict] = (),
+) -> None:
+    """
+    Saves the dataset and its setups, given in the raw form of the NapyTau format,
+    in the numpy format. Converting a dataset once allows reopening it without
+    parsing it again.
+    """
+
+    FileWriter.write_arrays(
+        directory_path, NumpyFactory.create_arrays(dataset, raw_setups_data)
+    )
@@ -1,8 +1,15 @@
+from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from weakref import WeakSet
 
 from napytau.util.model.value_error_pair import ValueErrorPair
 
+if TYPE_CHECKING:
+    from napytau.import_export.model.datapoint_collection import (
+        DatapointCollection,
+    )
+
 
 @dataclass
 class Datapoint:
@@ -14,6 +21,12 @@ class Datapoint:
     As this class sits at the core of the entire system, it is important to take care
     when modifying it. Any changes to this class will have a ripple effect on the entire
     system.
+
+    Every datapoint knows the collections it is part of, and every modification of
+    an attribute notifies them, so they notice when their columnar representation
+    of the datapoints is outdated. Modifying a datapoint does not affect
+    collections it is not part of. ValueErrorPairs are treated as immutable,
+    replace them instead of modifying them in place.
     """
 
     distance: ValueErrorPair[float]
@@ -25,6 +38,37 @@ class Datapoint:
     tau: Optional[ValueErrorPair[float]] = None
     active: bool = True
 
+    def __setattr__(self, name: str, value: object) -> None:
+        # Attributes assigned for the first time stem from the initialization. A
+        # datapoint under construction is not part of any collection yet.
+        is_modification = name in self.__dict__
+        super().__setattr__(name, value)
+        if is_modification:
+            for collection in self.__dict__.get("_collections", ()):
+                collection.on_datapoint_modified()
+
+    def __getstate__(self) -> Dict[str, object]:
+        # A copy of the datapoint is not part of the collections of the original
+        state = self.__dict__.copy()
+        state.pop("_collections", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+
+    def add_to_collection(self, collection: DatapointCollection) -> None:
+        """
+        Registers a collection to be notified whenever the datapoint is modified.
+        The collection is only referenced weakly.
+        """
+        if "_collections" not in self.__dict__:
+            self.__dict__["_collections"] = WeakSet()
+        self.__dict__["_collections"].add(collection)
+
+    def remove_from_collection(self, collection: DatapointCollection) -> None:
+        """Stops notifying the collection of modifications of the datapoint."""
+        self.__dict__.get("_collections", set()).discard(collection)
+
     def get_distance(self) -> ValueErrorPair[float]:
         return self.distance
 
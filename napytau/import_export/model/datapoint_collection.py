@@ -1,7 +1,19 @@
 from __future__ import annotations
-from typing import Dict, List, Callable, Iterator
+from typing import Dict, List, Callable, Iterator, Optional
+
+import numpy as np
 
 from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_columns import (
+    CALIBRATION,
+    DISTANCE,
+    FEEDING_SHIFTED_INTENSITY,
+    FEEDING_UNSHIFTED_INTENSITY,
+    SHIFTED_INTENSITY,
+    TAU,
+    UNSHIFTED_INTENSITY,
+    DatapointColumns,
+)
 from napytau.util.coalesce import coalesce
 from napytau.util.model.ValueErrorPairCollection import ValueErrorPairCollection
 
@@ -13,18 +25,68 @@ class DatapointCollection:
     Internally, it uses a dictionary to store the datapoints. The key is the hash
     of the distance value of a given datapoint.
 
+    Alongside the datapoints, the collection keeps a columnar representation of
+    them (see DatapointColumns). The getters for the individual attributes are
+    served from these columns, so repeated calls return views of the same arrays
+    instead of collecting the attributes again. The datapoints notify the
+    collection of every modification, which increments its revision, and the
+    columns are rebuilt lazily once the revision changed. A collection created
+    from columns creates its datapoints only once they are accessed.
+
     This class can be iterated over, and it provides a way to access the elements
     """
 
-    elements: Dict[int, Datapoint]
+    _elements: Optional[Dict[int, Datapoint]]
+    _columns: Optional[DatapointColumns]
+    _revision: int
+    _columns_revision: int
 
     def __init__(self, raw_datapoints: List[Datapoint]):
-        self.elements = {}
+        self._elements = {}
+        self._columns = None
+        self._revision = 0
+        self._columns_revision = -1
         for datapoint in raw_datapoints:
-            self.elements[hash(datapoint.distance.value)] = datapoint
+            self._set_datapoint(datapoint)
+
+    @staticmethod
+    def from_columns(columns: DatapointColumns) -> DatapointCollection:
+        """
+        Creates a collection from an existing columnar representation. The columns
+        are reused as the collections columnar representation until a datapoint is
+        modified, and the datapoints are only created once they are accessed.
+        """
+        collection = DatapointCollection([])
+        collection._columns = columns
+
+        # Datapoints with the same distance replace each other, so the columns
+        # only represent the collection if all distances are unique
+        distances = columns.get_values(DISTANCE)
+        if len(np.unique(distances)) == len(distances):
+            collection._elements = None
+        else:
+            for datapoint in columns.to_datapoints():
+                collection._set_datapoint(datapoint)
+            collection._columns = None
+
+        return collection
+
+    @property
+    def elements(self) -> Dict[int, Datapoint]:
+        if self._elements is None:
+            self._elements = {}
+            for datapoint in coalesce(self._columns).to_datapoints():
+                self._set_datapoint(datapoint)
+            # The new datapoints match the columns they were created from
+            self._columns_revision = self._revision
+
+        return self._elements
 
     def __len__(self) -> int:
-        return len(self.elements)
+        if self._elements is None:
+            return len(coalesce(self._columns))
+
+        return len(self._elements)
 
     def __iter__(self) -> Iterator[Datapoint]:
         return iter(self.elements.values())
@@ -36,11 +98,41 @@ class DatapointCollection:
         """Return the collection as a dictionary. Keys are the hash of the distance value."""  # noqa E501
         return self.elements
 
+    def get_columns(self) -> DatapointColumns:
+        """
+        Return the columnar representation of the datapoints, in the order of the
+        collection. It is rebuilt if any datapoint was modified since it was built.
+        """
+        if self._elements is None:
+            # No datapoints were created yet, so none can have been modified
+            return coalesce(self._columns)
+
+        if self._columns is None or self._columns_revision != self._revision:
+            self._columns = DatapointColumns.from_datapoints(self._elements.values())
+            self._columns_revision = self._revision
+
+        return self._columns
+
+    def on_datapoint_modified(self) -> None:
+        """Called by the datapoints of the collection whenever one is modified."""
+        self._revision += 1
+
+    def _set_datapoint(self, datapoint: Datapoint) -> None:
+        # Adds the datapoint, replacing one with the same distance
+        elements = self.elements
+        key = hash(datapoint.distance.value)
+        replaced_datapoint = elements.get(key)
+        if replaced_datapoint is not None and replaced_datapoint is not datapoint:
+            replaced_datapoint.remove_from_collection(self)
+        elements[key] = datapoint
+        datapoint.add_to_collection(self)
+        self._revision += 1
+
     def filter(self, filter_func: Callable[[Datapoint], bool]) -> DatapointCollection:
         return DatapointCollection(list(filter(filter_func, self.elements.values())))
 
     def add_datapoint(self, datapoint: Datapoint) -> None:
-        self.elements[hash(datapoint.distance.value)] = datapoint
+        self._set_datapoint(datapoint)
 
     def get_datapoint_by_distance(self, distance: float) -> Datapoint:
         """
@@ -53,88 +145,25 @@ class DatapointCollection:
         return self.elements[hash(distance)]
 
     def get_distances(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: datapoint.distance,
-                    self.elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(DISTANCE)
 
     def get_calibrations(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: coalesce(datapoint.calibration),
-                    self.filter(
-                        lambda datapoint: datapoint.calibration is not None
-                    ).elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(CALIBRATION)
 
     def get_shifted_intensities(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: coalesce(datapoint.shifted_intensity),
-                    self.filter(
-                        lambda datapoint: datapoint.shifted_intensity is not None
-                    ).elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(SHIFTED_INTENSITY)
 
     def get_unshifted_intensities(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: coalesce(datapoint.unshifted_intensity),
-                    self.filter(
-                        lambda datapoint: datapoint.unshifted_intensity is not None
-                    ).elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(UNSHIFTED_INTENSITY)
 
     def get_feeding_shifted_intensities(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: coalesce(datapoint.feeding_shifted_intensity),
-                    self.filter(
-                        lambda datapoint: datapoint.feeding_shifted_intensity
-                        is not None
-                    ).elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(FEEDING_SHIFTED_INTENSITY)
 
     def get_feeding_unshifted_intensities(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: coalesce(datapoint.feeding_unshifted_intensity),
-                    self.filter(
-                        lambda datapoint: datapoint.feeding_unshifted_intensity
-                        is not None
-                    ).elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(FEEDING_UNSHIFTED_INTENSITY)
 
     def get_taus(self) -> ValueErrorPairCollection[float]:
-        return ValueErrorPairCollection(
-            list(
-                map(
-                    lambda datapoint: coalesce(datapoint.tau),
-                    self.filter(
-                        lambda datapoint: datapoint.tau is not None
-                    ).elements.values(),
-                )
-            )
-        )
+        return self.get_columns().get_value_error_pairs(TAU)
 
     def get_active_datapoints(self) -> DatapointCollection:
         return self.filter(lambda datapoint: datapoint.active)
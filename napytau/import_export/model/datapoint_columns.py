@@ -0,0 +1,196 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.util.model.ValueErrorPairCollection import ValueErrorPairCollection
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+DISTANCE = "distance"
+CALIBRATION = "calibration"
+SHIFTED_INTENSITY = "shifted_intensity"
+UNSHIFTED_INTENSITY = "unshifted_intensity"
+FEEDING_SHIFTED_INTENSITY = "feeding_shifted_intensity"
+FEEDING_UNSHIFTED_INTENSITY = "feeding_unshifted_intensity"
+TAU = "tau"
+
+OPTIONAL_COLUMNS = [
+    CALIBRATION,
+    SHIFTED_INTENSITY,
+    UNSHIFTED_INTENSITY,
+    FEEDING_SHIFTED_INTENSITY,
+    FEEDING_UNSHIFTED_INTENSITY,
+    TAU,
+]
+
+COLUMNS = [DISTANCE] + OPTIONAL_COLUMNS
+
+
+class DatapointColumns:
+    """
+    A columnar representation of a collection of datapoints.
+    Every value and error column is stored as a contiguous float64 array, in the
+    order of the datapoints. As all columns but the distance are optional, each
+    column is accompanied by a validity mask marking the datapoints that carry a
+    value. Entries without a value are NaN.
+
+    All arrays are read-only, which allows handing them out as views without
+    copying them.
+    """
+
+    values: Dict[str, np.ndarray]
+    errors: Dict[str, np.ndarray]
+    masks: Dict[str, np.ndarray]
+    active: np.ndarray
+    _value_error_pairs: Dict[str, ValueErrorPairCollection[float]]
+
+    def __init__(
+        self,
+        values: Dict[str, np.ndarray],
+        errors: Dict[str, np.ndarray],
+        masks: Optional[Dict[str, np.ndarray]] = None,
+        active: Optional[np.ndarray] = None,
+    ):
+        length = len(values[DISTANCE])
+        masks = masks if masks is not None else {}
+
+        self.values = {}
+        self.errors = {}
+        self.masks = {}
+        for column in COLUMNS:
+            column_values = values.get(column)
+            column_errors = errors.get(column)
+            if column_values is None or column_errors is None:
+                column_values = np.full(length, np.nan)
+                column_errors = np.full(length, np.nan)
+                column_mask = np.zeros(length, dtype=bool)
+            else:
+                column_mask = masks.get(column, ~np.isnan(column_values))
+
+            if len(column_values) != length or len(column_errors) != length:
+                raise ValueError(
+                    f'Column "{column}" has a different length than the distances.'
+                )
+
+            self.values[column] = _read_only(column_values, float)
+            self.errors[column] = _read_only(column_errors, float)
+            self.masks[column] = _read_only(column_mask, bool)
+
+        self.active = _read_only(
+            active if active is not None else np.ones(length, dtype=bool), bool
+        )
+        self._value_error_pairs = {}
+
+    @staticmethod
+    def from_datapoints(datapoints: Iterable[Datapoint]) -> DatapointColumns:
+        """Collects the attributes of the given datapoints into columns."""
+        datapoint_list: List[Datapoint] = list(datapoints)
+
+        values: Dict[str, np.ndarray] = {}
+        errors: Dict[str, np.ndarray] = {}
+        for column in COLUMNS:
+            pairs: List[Optional[ValueErrorPair[float]]] = [
+                getattr(datapoint, column) for datapoint in datapoint_list
+            ]
+            values[column] = np.array(
+                [np.nan if pair is None else pair.value for pair in pairs],
+                dtype=float,
+            )
+            errors[column] = np.array(
+                [np.nan if pair is None else pair.error for pair in pairs],
+                dtype=float,
+            )
+
+        masks: Dict[str, np.ndarray] = {
+            column: np.array(
+                [
+                    getattr(datapoint, column) is not None
+                    for datapoint in datapoint_list
+                ],
+                dtype=bool,
+            )
+            for column in OPTIONAL_COLUMNS
+        }
+
+        active: np.ndarray = np.array(
+            [datapoint.active for datapoint in datapoint_list], dtype=bool
+        )
+
+        return DatapointColumns(values, errors, masks, active)
+
+    def __len__(self) -> int:
+        return len(self.values[DISTANCE])
+
+    def get_values(self, column: str) -> np.ndarray:
+        """All values of a column, NaN for datapoints without a value."""
+        return self.values[column]
+
+    def get_errors(self, column: str) -> np.ndarray:
+        """All errors of a column, NaN for datapoints without a value."""
+        return self.errors[column]
+
+    def get_mask(self, column: str) -> np.ndarray:
+        """The mask of datapoints that carry a value in the given column."""
+        if column == DISTANCE:
+            return np.ones(len(self), dtype=bool)
+
+        return self.masks[column]
+
+    def get_active_mask(self) -> np.ndarray:
+        return self.active
+
+    def get_value_error_pairs(self, column: str) -> ValueErrorPairCollection[float]:
+        """
+        The values and errors of the datapoints that carry a value in the given
+        column. If all datapoints carry a value, the collection is backed by views
+        of the columns, otherwise the present entries are compressed once and
+        reused for subsequent calls.
+        """
+        if column not in self._value_error_pairs:
+            mask = self.get_mask(column)
+            if mask.all():
+                collection = ValueErrorPairCollection.from_arrays(
+                    self.values[column], self.errors[column]
+                )
+            else:
+                collection = ValueErrorPairCollection.from_arrays(
+                    self.values[column][mask], self.errors[column][mask]
+                )
+            self._value_error_pairs[column] = collection
+
+        return self._value_error_pairs[column]
+
+    def to_datapoints(self) -> List[Datapoint]:
+        """Creates a datapoint for every row of the columns."""
+        datapoints: List[Datapoint] = []
+        for index in range(len(self)):
+            datapoint = Datapoint(
+                ValueErrorPair(
+                    float(self.values[DISTANCE][index]),
+                    float(self.errors[DISTANCE][index]),
+                ),
+                active=bool(self.active[index]),
+            )
+            for column in OPTIONAL_COLUMNS:
+                if self.masks[column][index]:
+                    setattr(
+                        datapoint,
+                        column,
+                        ValueErrorPair(
+                            float(self.values[column][index]),
+                            float(self.errors[column][index]),
+                        ),
+                    )
+            datapoints.append(datapoint)
+
+        return datapoints
+
+
+def _read_only(array: np.ndarray, dtype: type) -> np.ndarray:
+    contiguous: np.ndarray = np.ascontiguousarray(array, dtype=dtype)
+    if contiguous is array:
+        contiguous = contiguous.view()
+    contiguous.flags.writeable = False
+
+    return contiguous
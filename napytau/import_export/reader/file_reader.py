@@ -1,6 +1,9 @@
-from os.path import isfile
+from os import listdir
+from os.path import isdir, isfile, join
 from pathlib import PurePath
-from typing import List
+from typing import Dict, List
+
+import numpy as np
 
 
 class FileReader:
@@ -28,3 +31,21 @@ class FileReader:
             text = file.read()
 
         return text
+
+    @staticmethod
+    def read_arrays(directory_path: PurePath) -> Dict[str, np.ndarray]:
+        """
+        Reads every .npy file in the directory, keyed by its name without the
+        extension. The arrays are memory mapped read-only, so their contents are
+        only read from disk once they are accessed.
+        """
+        if not isdir(directory_path):
+            raise FileNotFoundError(f"Directory not found: {directory_path}")
+
+        return {
+            file_name[: -len(".npy")]: np.load(
+                join(directory_path, file_name), mmap_mode="r", allow_pickle=False
+            )
+            for file_name in listdir(directory_path)
+            if file_name.endswith(".npy")
+        }
@@ -1,4 +1,9 @@
+from os import makedirs, replace
+from os.path import join
 from pathlib import PurePath
+from typing import Mapping
+
+import numpy as np
 
 
 class FileWriter:
@@ -13,3 +18,22 @@ class FileWriter:
     def write_text(file_path: PurePath, text: str) -> None:
         with open(file_path, "w") as file:
             file.write(text)
+
+    @staticmethod
+    def write_arrays(
+        directory_path: PurePath, arrays: Mapping[str, np.ndarray]
+    ) -> None:
+        """
+        Writes every array to a .npy file named after it in the directory, which is
+        created if it does not exist.
+
+        Every file is written next to its destination first and then moved in
+        place. Overwriting a file in place would corrupt arrays that are still
+        memory mapped from it.
+        """
+        makedirs(directory_path, exist_ok=True)
+        for name, array in arrays.items():
+            file_path = join(directory_path, f"{name}.npy")
+            with open(f"{file_path}.tmp", "wb") as file:
+                np.save(file, array, allow_pickle=False)
+            replace(f"{file_path}.tmp", file_path)
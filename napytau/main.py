@@ -1,14 +1,18 @@
-from napytau.gui.app import init as init_gui
-from napytau.headless.headless_kernel import init as init_headless
 from napytau.cli.parser import parse_cli_arguments
 
 
 def main() -> None:
     args = parse_cli_arguments()
 
+    # The kernels are imported on demand, so that a headless run does not pay for
+    # loading the GUI toolkit and vice versa
     if args.headless:
+        from napytau.headless.headless_kernel import init as init_headless
+
         init_headless(args)
     else:
+        from napytau.gui.app import init as init_gui
+
         init_gui(args)
 
 
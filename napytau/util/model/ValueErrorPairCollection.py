@@ -1,12 +1,67 @@
+from __future__ import annotations
+
 from napytau.util.model.value_error_pair import ValueErrorPair
-from dataclasses import dataclass
-from typing import List, Iterator
+from typing import List, Iterator, Optional
 import numpy as np
 
 
-@dataclass
 class ValueErrorPairCollection[T]:
-    elements: List[ValueErrorPair[T]]
+    """
+    A collection of value error pairs.
+    The collection is either backed by a list of ValueErrorPair objects or by two
+    arrays holding the values and the errors. In the latter case the arrays are
+    handed out directly by get_values and get_errors, and the ValueErrorPair
+    objects are only created if the collection is iterated over or indexed.
+    """
+
+    _elements: Optional[List[ValueErrorPair[T]]]
+    _values: Optional[np.ndarray]
+    _errors: Optional[np.ndarray]
+
+    def __init__(self, elements: List[ValueErrorPair[T]]):
+        self._elements = elements
+        self._values = None
+        self._errors = None
+
+    @staticmethod
+    def from_arrays(
+        values: np.ndarray, errors: np.ndarray
+    ) -> ValueErrorPairCollection[float]:
+        """
+        Create a collection backed by the given arrays. The arrays are not copied,
+        they are made read-only views instead.
+        """
+        if len(values) != len(errors):
+            raise ValueError(
+                f"Got {len(values)} values but {len(errors)} errors, "
+                "expected the same number of both."
+            )
+
+        collection: ValueErrorPairCollection[float] = ValueErrorPairCollection([])
+        collection._elements = None
+        collection._values = _read_only_view(values)
+        collection._errors = _read_only_view(errors)
+
+        return collection
+
+    @property
+    def elements(self) -> List[ValueErrorPair[T]]:
+        if self._elements is None:
+            self._elements = [
+                ValueErrorPair(float(value), float(error))  # type: ignore
+                for value, error in zip(
+                    self._values,  # type: ignore
+                    self._errors,  # type: ignore
+                )
+            ]
+
+        return self._elements
+
+    def __len__(self) -> int:
+        if self._values is not None:
+            return len(self._values)
+
+        return len(self.elements)
 
     def __getitem__(self, key: int) -> ValueErrorPair[T]:
         return self.elements[key]
@@ -14,7 +69,18 @@ class ValueErrorPairCollection[T]:
     def __iter__(self) -> Iterator[ValueErrorPair[T]]:
         return iter(self.elements)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ValueErrorPairCollection):
+            return NotImplemented
+        return self.elements == other.elements
+
+    def __repr__(self) -> str:
+        return f"ValueErrorPairCollection(elements={self.elements!r})"
+
     def get_values(self) -> np.ndarray:
+        if self._values is not None:
+            return self._values
+
         values: np.ndarray = np.ndarray(shape=len(self.elements), dtype=float)
 
         for i in range(len(self.elements)):
@@ -23,9 +89,19 @@ class ValueErrorPairCollection[T]:
         return values
 
     def get_errors(self) -> np.ndarray:
+        if self._errors is not None:
+            return self._errors
+
         errors: np.ndarray = np.zeros(shape=len(self.elements), dtype=float)
 
         for i in range(len(self.elements)):
             errors[i] = self.elements[i].error  # type: ignore
 
         return errors
+
+
+def _read_only_view(array: np.ndarray) -> np.ndarray:
+    view: np.ndarray = np.asarray(array, dtype=float).view()
+    view.flags.writeable = False
+
+    return view
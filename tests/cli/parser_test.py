@@ -29,7 +29,7 @@ class ParserUnitTest(unittest.TestCase):
             from napytau.cli.parser import parse_cli_arguments
 
             parse_cli_arguments()
-            self.assertEqual(len(argument_parser_mock.add_argument.mock_calls), 6)
+            self.assertEqual(len(argument_parser_mock.add_argument.mock_calls), 19)
             self.assertEqual(
                 argument_parser_mock.add_argument.mock_calls[0],
                 (
@@ -46,7 +46,7 @@ class ParserUnitTest(unittest.TestCase):
                         "default": "napytau",
                         "const": "napytau",
                         "nargs": "?",
-                        "choices": ["legacy", "napytau"],
+                        "choices": ["legacy", "napytau", "numpy"],
                         "help": "Format of the dataset to ingest",
                     },
                 ),
@@ -59,7 +59,8 @@ class ParserUnitTest(unittest.TestCase):
                     {
                         "type": str,
                         "help": """Path to the directory containing either data files or subdirectories
-        with data files""",
+        with data files, the file for NaPyTau format or the directory of .npy files
+        for numpy format""",
                     },
                 ),
             )
@@ -83,7 +84,7 @@ class ParserUnitTest(unittest.TestCase):
                     {
                         "type": str,
                         "help": """Identifier of the setup to use with the dataset, file path for legacy
-        format, or setup name for NaPyTau format""",
+        format, or setup name for NaPyTau and numpy format""",
                     },
                 ),
             )
@@ -99,6 +100,159 @@ class ParserUnitTest(unittest.TestCase):
                 ),
             )
 
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[6],
+                (
+                    ("--batch",),
+                    {
+                        "type": str,
+                        "nargs": "+",
+                        "help": """Paths, glob patterns or directory trees of datasets to process in
+        batch mode, the results are written as a CSV table""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[7],
+                (
+                    ("--workers",),
+                    {
+                        "type": int,
+                        "help": """Number of worker processes in batch mode and for the Monte Carlo
+        uncertainty, defaults to the number of CPUs""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[8],
+                (
+                    ("--results_file",),
+                    {
+                        "type": str,
+                        "help": """Path of the CSV file to write the batch results to, defaults to
+        stdout""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[9],
+                (
+                    ("--index_root",),
+                    {
+                        "type": str,
+                        "help": """Root directory of the datasets whose campaign index to query, the index
+        is stored in this directory. In batch mode, the results are recorded in it""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[10],
+                (
+                    ("--update_index",),
+                    {
+                        "action": "store_true",
+                        "help": """Search the index root for datasets and update the index before
+        querying it""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[11],
+                (
+                    ("--velocity_range",),
+                    {
+                        "type": float,
+                        "nargs": 2,
+                        "metavar": ("MIN", "MAX"),
+                        "help": """Only list indexed datasets with a relative velocity in this range""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[12],
+                (
+                    ("--stale",),
+                    {
+                        "action": "store_true",
+                        "help": """Only list indexed datasets whose results are stale""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[13],
+                (
+                    ("--cache_directory",),
+                    {
+                        "type": str,
+                        "help": """Directory of the on-disk result cache, which keeps the results of the
+        calculations across runs, so only changed datasets are recalculated""",
+                    },
+                ),
+            )
+
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[14],
+                (
+                    ("--influence",),
+                    {
+                        "action": "store_true",
+                        "help": """Also print the lifetime without each datapoint and the leverage and
+        Cook's distance of the datapoints""",
+                    },
+                ),
+            )
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[15],
+                (
+                    ("--trusted",),
+                    {
+                        "action": "store_true",
+                        "help": """Skip the validation of NaPyTau format files against the json schema
+        and stream them instead, for files written by NaPyTau itself""",
+                    },
+                ),
+            )
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[16],
+                (
+                    ("--export_numpy",),
+                    {
+                        "type": str,
+                        "help": """Directory to save the loaded dataset to in the numpy format, which is
+        opened with --dataset_format numpy without parsing the dataset again""",
+                    },
+                ),
+            )
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[17],
+                (
+                    ("--monte_carlo_samples",),
+                    {
+                        "type": int,
+                        "help": """Also print percentiles of the lifetime from this number of datasets
+        drawn from the values and errors of the dataset""",
+                    },
+                ),
+            )
+            self.assertEqual(
+                argument_parser_mock.add_argument.mock_calls[18],
+                (
+                    ("--monte_carlo_seed",),
+                    {
+                        "type": int,
+                        "help": """Seed of the random generator for the Monte Carlo uncertainty, a random
+        seed is used and printed if omitted""",
+                    },
+                ),
+            )
+
     def test_returnsACLIArgumentsInstanceFromTheParsedArguments(self):
         """Returns a CLIArguments instance from the parsed arguments"""
         argparse_module_mock, argument_parser_mock, cli_arguments_module_mock = (
@@ -1,9 +1,15 @@
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
 import numpy.testing
 import scipy as sp
+
+# The fit context stubs are created while numpy is mocked, so scipy has to load
+# the submodule they use beforehand
+import scipy.constants  # noqa: F401
 from typing import Tuple
+from napytau.core.fit_context import FitContext, create_fit_context
 from napytau.import_export.model.datapoint_collection import DatapointCollection
 from napytau.util.model.value_error_pair import ValueErrorPair
 from napytau.import_export.model.datapoint import Datapoint
@@ -34,7 +40,18 @@ def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
     )
 
 
+def _get_fit_context_stub(datapoints: DatapointCollection) -> FitContext:
+    # Contexts are cached, so repeated calls for the same datapoints return the
+    # same context
+    return create_fit_context(_get_dataset_stub(datapoints), 2)
+
+
 class ChiUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.core.chi", None)
+
     def test_CanCalculateChiForValidData(self):
         """Can calculate chi for valid data"""
         polynomials_mock, numpy_module_mock, scipy_optimize_module_mock = set_up_mocks()
@@ -91,7 +108,7 @@ class ChiUnitTest(unittest.TestCase):
 
             self.assertAlmostEqual(
                 calculate_chi_squared(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                     t_hyp,
                     weight_factor,
@@ -108,7 +125,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -129,7 +146,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -207,7 +224,7 @@ class ChiUnitTest(unittest.TestCase):
 
             self.assertEqual(
                 calculate_chi_squared(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                     t_hyp,
                     weight_factor,
@@ -224,7 +241,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                (_get_dataset_stub(datapoints)),
+                (_get_fit_context_stub(datapoints)),
             )
 
             np.testing.assert_array_equal(
@@ -245,7 +262,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                (_get_dataset_stub(datapoints)),
+                (_get_fit_context_stub(datapoints)),
             )
 
             np.testing.assert_array_equal(
@@ -335,7 +352,7 @@ class ChiUnitTest(unittest.TestCase):
 
             self.assertAlmostEqual(
                 calculate_chi_squared(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                     t_hyp,
                     weight_factor,
@@ -352,7 +369,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -373,7 +390,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -469,7 +486,7 @@ class ChiUnitTest(unittest.TestCase):
 
             self.assertAlmostEqual(
                 calculate_chi_squared(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                     t_hyp,
                     weight_factor,
@@ -486,7 +503,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -507,7 +524,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -603,7 +620,7 @@ class ChiUnitTest(unittest.TestCase):
 
             self.assertAlmostEqual(
                 calculate_chi_squared(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                     t_hyp,
                     weight_factor,
@@ -620,7 +637,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -641,7 +658,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -743,7 +760,7 @@ class ChiUnitTest(unittest.TestCase):
 
             self.assertAlmostEqual(
                 calculate_chi_squared(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                     t_hyp,
                     weight_factor,
@@ -760,7 +777,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -781,7 +798,7 @@ class ChiUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
             )
 
             np.testing.assert_array_equal(
@@ -826,13 +843,92 @@ class ChiUnitTest(unittest.TestCase):
                 2,
             )
 
-    def test_CanOptimizeTHypValue(self):
-        """Can optimize t_hyp value"""
+    def test_CanCalculateChiForManyTauFactorsAtOnce(self):
+        """Can calculate chi for many tau factors at once"""
+        with patch.dict("sys.modules"):
+            from napytau.core.chi import (
+                calculate_chi_squared,
+                calculate_chi_squared_for_tau_factors,
+            )
+
+            coefficients: np.ndarray = np.array([10.0, -3.0, 0.2])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(float(distance), 0.16),
+                        None,
+                        ValueErrorPair(10.0 - distance, 1.0),
+                        ValueErrorPair(2.0 + 0.5 * distance, 0.5 + 0.1 * distance),
+                    )
+                    for distance in range(6)
+                ]
+            )
+            context = _get_fit_context_stub(datapoints)
+            tau_factors: np.ndarray = np.linspace(-2, 2, 9)
+
+            actual_result: np.ndarray = calculate_chi_squared_for_tau_factors(
+                context, coefficients, tau_factors, 0.7
+            )
+
+            self.assertEqual(actual_result.shape, (9,))
+            np.testing.assert_allclose(
+                actual_result,
+                [
+                    calculate_chi_squared(context, coefficients, tau_factor, 0.7)
+                    for tau_factor in tau_factors
+                ],
+            )
+
+    def test_CanCalculateChiForAGridOfTauFactorsAndWeightFactors(self):
+        """Can calculate chi for a grid of tau factors and weight factors"""
+        with patch.dict("sys.modules"):
+            from napytau.core.chi import (
+                calculate_chi_squared,
+                calculate_chi_squared_for_tau_factors,
+            )
+
+            coefficients: np.ndarray = np.array([1, 1, 1])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(0.0, 0.16),
+                        None,
+                        ValueErrorPair(2, 1),
+                        ValueErrorPair(2, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(1.0, 0.16),
+                        None,
+                        ValueErrorPair(6, 1),
+                        ValueErrorPair(6, 2),
+                    ),
+                ]
+            )
+            context = _get_fit_context_stub(datapoints)
+            tau_factors: np.ndarray = np.array([0.5, 1.0, 2.8])
+            weight_factors: np.ndarray = np.array([0.0, 1.0])
+
+            actual_result: np.ndarray = calculate_chi_squared_for_tau_factors(
+                context, coefficients, tau_factors, weight_factors
+            )
+
+            self.assertEqual(actual_result.shape, (2, 3))
+            for i, weight_factor in enumerate(weight_factors):
+                for j, tau_factor in enumerate(tau_factors):
+                    self.assertAlmostEqual(
+                        actual_result[i, j],
+                        calculate_chi_squared(
+                            context, coefficients, tau_factor, weight_factor
+                        ),
+                    )
+
+    def test_CanOptimizeTHypValueIteratively(self):
+        """Can optimize t_hyp value iteratively"""
         polynomials_mock, numpy_module_mock, scipy_optimize_module_mock = set_up_mocks()
 
         # Mocked return values of called functions
         scipy_optimize_module_mock.optimize.minimize.return_value = (
-            sp.optimize.OptimizeResult(x=2.0)
+            sp.optimize.OptimizeResult(x=np.array([2.0]))
         )
 
         numpy_module_mock.mean.return_value = 0
@@ -869,10 +965,11 @@ class ChiUnitTest(unittest.TestCase):
             expected_t_hyp: float = 2.0
 
             actual_t_hyp: float = optimize_tau_factor(
-                _get_dataset_stub(datapoints),
+                _get_fit_context_stub(datapoints),
                 weight_factor,
                 initial_coefficients,
                 t_hyp_range,
+                use_iterative_optimizer=True,
             )
 
             self.assertEqual(actual_t_hyp, expected_t_hyp)
@@ -903,3 +1000,159 @@ class ChiUnitTest(unittest.TestCase):
             self.assertEqual(len(numpy_module_mock.mean.mock_calls), 1)
 
             self.assertEqual(numpy_module_mock.mean.mock_calls[0].args[0], (-5, 5))
+
+    def test_CanOptimizeTHypValueInClosedForm(self):
+        """Can optimize t_hyp value in closed form"""
+        polynomials_mock, _, _ = set_up_mocks()
+
+        # P and P' at the measuring times
+        polynomials_mock.evaluate_polynomial_at_measuring_times.return_value = np.array(
+            [2, 6]
+        )
+        polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.return_value = np.array(
+            [1, 2]
+        )
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.core.polynomials": polynomials_mock,
+            },
+        ):
+            from napytau.core.chi import (
+                calculate_chi_squared,
+                calculate_tau_factor_uncertainty,
+                optimize_tau_factor,
+            )
+
+            initial_coefficients: np.ndarray = np.array([1, 1, 1])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(0.0, 0.16),
+                        None,
+                        ValueErrorPair(2, 1),
+                        ValueErrorPair(2, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(1.0, 0.16),
+                        None,
+                        ValueErrorPair(6, 1),
+                        ValueErrorPair(6, 1),
+                    ),
+                ]
+            )
+            context = _get_fit_context_stub(datapoints)
+            weight_factor: float = 1.0
+
+            # sum(I_u * P') / sum(P'^2) = (2 + 12) / (1 + 4)
+            actual_t_hyp: float = optimize_tau_factor(
+                context,
+                weight_factor,
+                initial_coefficients,
+                (-5, 5),
+            )
+            self.assertAlmostEqual(actual_t_hyp, 2.8)
+
+            # The minimum lies outside of the range, so it is clipped to the bound
+            self.assertAlmostEqual(
+                optimize_tau_factor(
+                    context,
+                    weight_factor,
+                    initial_coefficients,
+                    (0, 1),
+                ),
+                1.0,
+            )
+
+            # chi^2 increases by one at one uncertainty away from the minimum
+            uncertainty: float = calculate_tau_factor_uncertainty(
+                context,
+                weight_factor,
+                initial_coefficients,
+            )
+            self.assertAlmostEqual(uncertainty, 1 / np.sqrt(5))
+            self.assertAlmostEqual(
+                calculate_chi_squared(
+                    context,
+                    initial_coefficients,
+                    actual_t_hyp + uncertainty,
+                    weight_factor,
+                )
+                - calculate_chi_squared(
+                    context,
+                    initial_coefficients,
+                    actual_t_hyp,
+                    weight_factor,
+                ),
+                1.0,
+            )
+
+    def test_ClosedFormOptimizationAgreesWithIterativeOptimization(self):
+        """Closed form optimization agrees with iterative optimization"""
+        with patch.dict("sys.modules"):
+            from napytau.core.chi import optimize_tau_factor
+
+            coefficients: np.ndarray = np.array([10.0, -3.0, 0.2])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(float(distance), 0.16),
+                        None,
+                        ValueErrorPair(10.0 - distance, 1.0),
+                        ValueErrorPair(2.0 + 0.5 * distance, 0.5 + 0.1 * distance),
+                    )
+                    for distance in range(6)
+                ]
+            )
+            context = _get_fit_context_stub(datapoints)
+
+            np.testing.assert_allclose(
+                optimize_tau_factor(context, 0.7, coefficients, (-10, 10)),
+                optimize_tau_factor(
+                    context,
+                    0.7,
+                    coefficients,
+                    (-10, 10),
+                    use_iterative_optimizer=True,
+                ),
+                rtol=1e-4,
+            )
+
+    def test_OptimizationReturnsTheMeanOfTheRangeIfChiDoesNotDependOnTHyp(self):
+        """Optimization returns the mean of the range if chi does not depend on t_hyp"""
+        polynomials_mock, _, _ = set_up_mocks()
+        polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.return_value = np.array(
+            [1, 2]
+        )
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.core.polynomials": polynomials_mock,
+            },
+        ):
+            from napytau.core.chi import (
+                calculate_tau_factor_uncertainty,
+                optimize_tau_factor,
+            )
+
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(0.0, 0.16),
+                        None,
+                        ValueErrorPair(2, 1),
+                        ValueErrorPair(2, 1),
+                    ),
+                ]
+            )
+            context = _get_fit_context_stub(datapoints)
+
+            self.assertEqual(
+                optimize_tau_factor(context, 0.0, np.array([1, 1]), (2, 4)), 3.0
+            )
+            self.assertEqual(
+                calculate_tau_factor_uncertainty(context, 0.0, np.array([1, 1])),
+                float("inf"),
+            )
@@ -1,3 +1,4 @@
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
@@ -11,7 +12,14 @@ from napytau.import_export.model.datapoint import Datapoint
 from napytau.import_export.model.dataset import DataSet
 
 
-def set_up_mocks() -> (MagicMock, MagicMock, MagicMock, MagicMock):
+def set_up_mocks() -> (
+    MagicMock,
+    MagicMock,
+    MagicMock,
+    MagicMock,
+    MagicMock,
+    MagicMock,
+):
     chi_mock = MagicMock()
     chi_mock.optimize_t_hyp = MagicMock()
     chi_mock.optimize_coefficients = MagicMock()
@@ -29,7 +37,17 @@ def set_up_mocks() -> (MagicMock, MagicMock, MagicMock, MagicMock):
     polynomial_mock.calculate_polynomial_coefficients_for_fit = MagicMock()
     polynomial_mock.calculate_polynomial_coefficients_for_tau_factor = MagicMock()
 
-    return chi_mock, tau_mock, delta_tau_mock, tau_final_mock, polynomial_mock
+    fit_context_mock = MagicMock()
+    fit_context_mock.create_fit_context = MagicMock()
+
+    return (
+        chi_mock,
+        tau_mock,
+        delta_tau_mock,
+        tau_final_mock,
+        polynomial_mock,
+        fit_context_mock,
+    )
 
 
 def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
@@ -40,11 +58,22 @@ def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
 
 
 class CoreUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real modules once for all their tests, while
+        # each test here imports them again with its mocks and an empty cache
+        sys.modules.pop("napytau.core.core", None)
+        sys.modules.pop("napytau.core.result_cache", None)
+
     def test_CanCalculateALifetime(self):
         """Can calculate a lifetime"""
-        chi_mock, tau_mock, delta_tau_mock, tau_final_mock, polynomial_mock = (
-            set_up_mocks()
-        )
+        (
+            chi_mock,
+            tau_mock,
+            delta_tau_mock,
+            tau_final_mock,
+            polynomial_mock,
+            fit_context_mock,
+        ) = set_up_mocks()
 
         # Mocked return values of called functions
         chi_mock.optimize_tau_factor.return_value = 2.0
@@ -62,6 +91,9 @@ class CoreUnitTest(unittest.TestCase):
 
         tau_final_mock.calculate_tau_final.return_value = (1.8, 0.18973666)
 
+        context = MagicMock()
+        fit_context_mock.create_fit_context.return_value = context
+
         with patch.dict(
             "sys.modules",
             {
@@ -70,6 +102,7 @@ class CoreUnitTest(unittest.TestCase):
                 "napytau.core.delta_tau": delta_tau_mock,
                 "napytau.core.tau_final": tau_final_mock,
                 "napytau.core.polynomials": polynomial_mock,
+                "napytau.core.fit_context": fit_context_mock,
             },
         ):
             from napytau.core.core import calculate_lifetime_for_custom_tau_factor
@@ -107,6 +140,16 @@ class CoreUnitTest(unittest.TestCase):
 
             self.assertAlmostEqual(actual_result[1], 0.18973666)
 
+            self.assertEqual(len(fit_context_mock.create_fit_context.mock_calls), 1)
+            self.assertEqual(
+                fit_context_mock.create_fit_context.mock_calls[0].args[0],
+                dataset,
+            )
+            self.assertEqual(
+                fit_context_mock.create_fit_context.mock_calls[0].args[1],
+                2,
+            )
+
             self.assertEqual(
                 len(
                     polynomial_mock.calculate_polynomial_coefficients_for_tau_factor.mock_calls
@@ -117,7 +160,7 @@ class CoreUnitTest(unittest.TestCase):
                 polynomial_mock.calculate_polynomial_coefficients_for_tau_factor.mock_calls[
                     0
                 ].args[0],
-                dataset,
+                context,
             )
             self.assertEqual(
                 polynomial_mock.calculate_polynomial_coefficients_for_tau_factor.mock_calls[
@@ -125,18 +168,12 @@ class CoreUnitTest(unittest.TestCase):
                 ].args[1],
                 1.0,
             )
-            self.assertEqual(
-                polynomial_mock.calculate_polynomial_coefficients_for_tau_factor.mock_calls[
-                    0
-                ].args[2],
-                2,
-            )
 
             self.assertEqual(len(tau_mock.calculate_tau_i_values.mock_calls), 1)
 
-            np.testing.assert_array_equal(
+            self.assertEqual(
                 tau_mock.calculate_tau_i_values.mock_calls[0].args[0],
-                dataset,
+                context,
             )
 
             np.testing.assert_array_equal(
@@ -148,9 +185,9 @@ class CoreUnitTest(unittest.TestCase):
                 len(delta_tau_mock.calculate_error_propagation_terms.mock_calls), 1
             )
 
-            np.testing.assert_array_equal(
+            self.assertEqual(
                 delta_tau_mock.calculate_error_propagation_terms.mock_calls[0].args[0],
-                dataset,
+                context,
             )
 
             np.testing.assert_array_equal(
@@ -174,3 +211,260 @@ class CoreUnitTest(unittest.TestCase):
                 tau_final_mock.calculate_tau_final.mock_calls[0].args[1],
                 np.array([0.6, 0.2]),
             )
+
+    def test_CanCalculateTheChiSquaredCurve(self):
+        """Can calculate the chi squared curve"""
+        (
+            chi_mock,
+            tau_mock,
+            delta_tau_mock,
+            tau_final_mock,
+            polynomial_mock,
+            fit_context_mock,
+        ) = set_up_mocks()
+
+        context = MagicMock()
+        fit_context_mock.create_fit_context.return_value = context
+        polynomial_mock.calculate_polynomial_coefficients_for_fit.return_value = (
+            np.array([2, 3, 1])
+        )
+        chi_mock.calculate_chi_squared_for_tau_factors.return_value = np.array(
+            [3.0, 1.0, 2.0]
+        )
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.core.chi": chi_mock,
+                "napytau.core.tau": tau_mock,
+                "napytau.core.delta_tau": delta_tau_mock,
+                "napytau.core.tau_final": tau_final_mock,
+                "napytau.core.polynomials": polynomial_mock,
+                "napytau.core.fit_context": fit_context_mock,
+            },
+        ):
+            from napytau.core.core import calculate_chi_squared_curve
+
+            dataset = _get_dataset_stub(DatapointCollection([]))
+            tau_factors: np.ndarray = np.array([0.5, 1.0, 1.5])
+
+            np.testing.assert_array_equal(
+                calculate_chi_squared_curve(dataset, tau_factors, 0.5, 2),
+                np.array([3.0, 1.0, 2.0]),
+            )
+
+            self.assertEqual(
+                fit_context_mock.create_fit_context.mock_calls[0].args, (dataset, 2)
+            )
+            self.assertEqual(
+                polynomial_mock.calculate_polynomial_coefficients_for_fit.mock_calls[
+                    0
+                ].args[0],
+                context,
+            )
+
+            calls = chi_mock.calculate_chi_squared_for_tau_factors.mock_calls
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(calls[0].args[0], context)
+            np.testing.assert_array_equal(calls[0].args[1], np.array([2, 3, 1]))
+            np.testing.assert_array_equal(calls[0].args[2], tau_factors)
+            self.assertEqual(calls[0].args[3], 0.5)
+
+    def test_ReusesTheFitAndTheResultsForUnchangedDatasets(self):
+        """Reuses the fit and the results for unchanged datasets"""
+        (
+            chi_mock,
+            tau_mock,
+            delta_tau_mock,
+            tau_final_mock,
+            polynomial_mock,
+            fit_context_mock,
+        ) = set_up_mocks()
+
+        fit_context_mock.create_fit_context.return_value = MagicMock()
+        chi_mock.optimize_tau_factor.return_value = 0.5
+        tau_final_mock.calculate_tau_final.return_value = (1.8, 0.2)
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.core.chi": chi_mock,
+                "napytau.core.tau": tau_mock,
+                "napytau.core.delta_tau": delta_tau_mock,
+                "napytau.core.tau_final": tau_final_mock,
+                "napytau.core.polynomials": polynomial_mock,
+                "napytau.core.fit_context": fit_context_mock,
+            },
+        ):
+            from napytau.core.core import (
+                calculate_lifetime_for_fit,
+                calculate_optimal_tau_factor,
+            )
+            from napytau.core.result_cache import get_result_cache
+
+            dataset = _get_dataset_stub(
+                DatapointCollection(
+                    [Datapoint(ValueErrorPair(1.0, 0.1), None, None, None)]
+                )
+            )
+
+            self.assertEqual(calculate_lifetime_for_fit(dataset, 2), (1.8, 0.2))
+            self.assertEqual(
+                calculate_optimal_tau_factor(dataset, (0.1, 1.0), 1.0, 2), 0.5
+            )
+            self.assertEqual(calculate_lifetime_for_fit(dataset, 2), (1.8, 0.2))
+
+            # The coefficients of the fit are shared by both calculations
+            self.assertEqual(
+                len(
+                    polynomial_mock.calculate_polynomial_coefficients_for_fit.mock_calls
+                ),
+                1,
+            )
+            self.assertEqual(len(tau_final_mock.calculate_tau_final.mock_calls), 1)
+            self.assertEqual(get_result_cache().get_statistics().hits, 1)
+
+            dataset.get_datapoints()[0].set_active(False)
+            calculate_lifetime_for_fit(dataset, 2)
+
+            self.assertEqual(len(tau_final_mock.calculate_tau_final.mock_calls), 2)
+
+    def test_CanCalculateTheLifetimesForSeveralTauFactors(self):
+        """Can calculate the lifetimes for several tau factors"""
+        with patch.dict("sys.modules"):
+            from napytau.core.core import (
+                calculate_lifetime_for_custom_tau_factor,
+                calculate_lifetimes_for_tau_factors,
+            )
+
+            dataset = _get_dataset_stub(
+                DatapointCollection(
+                    [
+                        Datapoint(
+                            ValueErrorPair(float(distance), 0.16),
+                            None,
+                            ValueErrorPair(10 * np.exp(-distance / 3), 0.3),
+                            ValueErrorPair(3 + 0.5 * distance, 0.2),
+                        )
+                        for distance in range(1, 7)
+                    ]
+                )
+            )
+            tau_factors: np.ndarray = np.array([0.5, 1.0, 2.0])
+
+            # For a linear polynomial the coefficients for a tau factor are unique,
+            # so warm starting the solves does not change the result
+            lifetimes, uncertainties = calculate_lifetimes_for_tau_factors(
+                dataset, tau_factors, 1
+            )
+
+            self.assertEqual(lifetimes.shape, (3,))
+            self.assertEqual(uncertainties.shape, (3,))
+            for index, tau_factor in enumerate(tau_factors):
+                expected_result: Tuple[float, float] = (
+                    calculate_lifetime_for_custom_tau_factor(dataset, tau_factor, 1)
+                )
+                np.testing.assert_allclose(
+                    [lifetimes[index], uncertainties[index]],
+                    expected_result,
+                    rtol=1e-6,
+                )
+
+    def test_ExcludesInactiveDatapointsLikeAFilteredCopy(self):
+        """Excludes inactive datapoints like a filtered copy of the dataset"""
+        with patch.dict("sys.modules"):
+            from napytau.core.core import (
+                calculate_lifetime_for_custom_tau_factor,
+                calculate_lifetime_for_fit,
+            )
+
+            datapoints = [
+                Datapoint(
+                    ValueErrorPair(float(distance), 0.16),
+                    None,
+                    ValueErrorPair(10 * np.exp(-distance / 3), 0.3),
+                    ValueErrorPair(3 + 0.5 * distance, 0.2),
+                )
+                for distance in range(1, 9)
+            ]
+            dataset = _get_dataset_stub(DatapointCollection(datapoints))
+            datapoints[2].set_active(False)
+            datapoints[5].set_active(False)
+            filtered_dataset = _get_dataset_stub(
+                DatapointCollection(
+                    [datapoint for datapoint in datapoints if datapoint.active]
+                )
+            )
+            mask = np.array([datapoint.active for datapoint in datapoints])
+
+            expected_result = calculate_lifetime_for_custom_tau_factor(
+                filtered_dataset, 2.0, 1
+            )
+            np.testing.assert_allclose(
+                calculate_lifetime_for_custom_tau_factor(dataset, 2.0, 1),
+                expected_result,
+            )
+
+            # Explicit masks are honoured instead of the active datapoints
+            for datapoint in datapoints:
+                datapoint.set_active(True)
+            np.testing.assert_allclose(
+                calculate_lifetime_for_custom_tau_factor(
+                    dataset, 2.0, 1, fitting_mask=mask, calculation_mask=mask
+                ),
+                expected_result,
+            )
+            np.testing.assert_allclose(
+                calculate_lifetime_for_fit(
+                    dataset, 2, fitting_mask=mask, calculation_mask=mask
+                ),
+                calculate_lifetime_for_fit(filtered_dataset, 2),
+            )
+
+    def test_CalculatesTheLifetimeForOtherDatapointsThanTheFit(self):
+        """Calculates the lifetime for other datapoints than the fit"""
+        with patch.dict("sys.modules"):
+            from napytau.core.core import calculate_lifetime_for_fit
+            from napytau.core.delta_tau import calculate_error_propagation_terms
+            from napytau.core.fit_context import create_fit_context
+            from napytau.core.polynomials import (
+                calculate_polynomial_coefficients_for_fit,
+            )
+            from napytau.core.tau import calculate_tau_i_values
+            from napytau.core.tau_final import calculate_tau_final
+
+            dataset = _get_dataset_stub(
+                DatapointCollection(
+                    [
+                        Datapoint(
+                            ValueErrorPair(float(distance), 0.16),
+                            None,
+                            ValueErrorPair(10 * np.exp(-distance / 3), 0.3),
+                            ValueErrorPair(3 + 0.5 * distance, 0.2),
+                        )
+                        for distance in range(1, 9)
+                    ]
+                )
+            )
+            calculation_mask = np.array([1, 1, 0, 1, 1, 0, 1, 1], dtype=bool)
+
+            # Restricting the calculation leaves the fit to all datapoints unchanged,
+            # so the lifetimes and errors of the remaining datapoints are kept
+            context = create_fit_context(dataset, 2)
+            coefficients = calculate_polynomial_coefficients_for_fit(context)
+            expected_result = calculate_tau_final(
+                calculate_tau_i_values(context, coefficients)[calculation_mask],
+                calculate_error_propagation_terms(context, coefficients, 0)[
+                    calculation_mask
+                ],
+            )
+
+            np.testing.assert_allclose(
+                calculate_lifetime_for_fit(
+                    dataset, 2, calculation_mask=calculation_mask
+                ),
+                expected_result,
+            )
+            self.assertNotAlmostEqual(
+                calculate_lifetime_for_fit(dataset, 2)[0], expected_result[0]
+            )
@@ -1,7 +1,9 @@
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
 
+from napytau.core.fit_context import FitContext, create_fit_context
 from napytau.import_export.model.datapoint_collection import DatapointCollection
 from napytau.util.model.value_error_pair import ValueErrorPair
 from napytau.import_export.model.datapoint import Datapoint
@@ -37,62 +39,82 @@ def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
     )
 
 
+def _get_fit_context_stub(
+    datapoints: DatapointCollection, polynomial_degree: int = 2
+) -> FitContext:
+    return create_fit_context(_get_dataset_stub(datapoints), polynomial_degree)
+
+
 class DeltaTauUnitTests(unittest.TestCase):
-    @staticmethod
-    def test_canCalculateAJacobianMatrixFromDistancesAndCoefficients():
-        """Can calculate a Jacobian matrix from distances and coefficients."""
-        polynomial_module_mock, zeros_mock, numpy_module_mock = set_up_mocks()
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.core.delta_tau", None)
 
-        zeros_mock.return_value = np.array([[0, 0], [0, 0], [0, 0]])
-        polynomial_module_mock.evaluate_polynomial_at_measuring_times.side_effect = [
-            6,
-            3,
-            2,
-            1,
-        ]
+    def test_canCalculateAJacobianMatrixFromDistancesAndCoefficients(self):
+        """Can calculate a Jacobian matrix from distances and coefficients."""
+        polynomial_module_mock, _, _ = set_up_mocks()
 
         with patch.dict(
             "sys.modules",
             {
                 "napytau.core.polynomials": polynomial_module_mock,
-                "numpy": numpy_module_mock,
             },
         ):
             from napytau.core.delta_tau import calculate_jacobian_matrix
 
-            coefficients = np.array([5, 4])
+            coefficients = np.array([5, 4, 3])
             datapoints = DatapointCollection(
                 [
-                    Datapoint(ValueErrorPair(0, 0.16)),
-                    Datapoint(ValueErrorPair(1, 0.16)),
-                    Datapoint(ValueErrorPair(2, 0.16)),
+                    Datapoint(
+                        ValueErrorPair(0, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(1, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(2, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
                 ]
             )
 
-            jacobian_matrix = np.array(
-                [[3000000, 1000000], [3000000, 1000000], [3000000, 1000000]]
-            )
+            # Column k holds the k-th power of the measuring times
+            jacobian_matrix = np.array([[1, 0, 0], [1, 1, 1], [1, 2, 4]])
 
-            np.testing.assert_array_equal(
-                calculate_jacobian_matrix(_get_dataset_stub(datapoints), coefficients),
+            np.testing.assert_allclose(
+                calculate_jacobian_matrix(
+                    _get_fit_context_stub(datapoints), coefficients
+                ),
                 jacobian_matrix,
             )
 
-    def test_canCalculateACovarianceMatrixFromTimesAndCoefficients(self):
-        """Can calculate a Covariance matrix from times and coefficients."""
+            # The closed form does not need to evaluate the polynomial at all
+            self.assertEqual(
+                len(
+                    polynomial_module_mock.evaluate_polynomial_at_measuring_times.mock_calls
+                ),
+                0,
+            )
+
+    def test_canCalculateAJacobianMatrixByFiniteDifferences(self):
+        """Can calculate a Jacobian matrix by finite differences."""
         polynomial_module_mock, zeros_mock, numpy_module_mock = set_up_mocks()
 
         zeros_mock.return_value = np.array([[0, 0], [0, 0], [0, 0]])
-        polynomial_module_mock.evaluate_polynomial_at_measuring_times.side_effect = (
-            lambda datapoints, coefficients: (np.array([6, 3, 2]))
-        )
-        numpy_module_mock.power.return_value = np.array([4, 9, 16])
-        numpy_module_mock.diag.return_value = np.array(
-            [[1 / 4, 0, 0], [0, 1 / 9, 0], [0, 0, 1 / 16]]
-        )
-        numpy_module_mock.linalg.inv.return_value = np.array(
-            [[-0.13826047, 0.41478141], [0.41478141, -1.24434423]]
-        )
+        polynomial_module_mock.evaluate_polynomial_at_measuring_times.side_effect = [
+            6,
+            9,
+            7,
+        ]
 
         with patch.dict(
             "sys.modules",
@@ -101,274 +123,255 @@ class DeltaTauUnitTests(unittest.TestCase):
                 "numpy": numpy_module_mock,
             },
         ):
-            from napytau.core.delta_tau import calculate_covariance_matrix
+            from napytau.core.delta_tau import calculate_jacobian_matrix
 
+            coefficients = np.array([5, 4])
             datapoints = DatapointCollection(
                 [
-                    Datapoint(ValueErrorPair(0, 0.16), None, ValueErrorPair(0, 2)),
-                    Datapoint(ValueErrorPair(1, 0.16), None, ValueErrorPair(0, 3)),
-                    Datapoint(ValueErrorPair(2, 0.16), None, ValueErrorPair(0, 4)),
+                    Datapoint(
+                        ValueErrorPair(0, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(1, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(2, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
                 ]
             )
-            coefficients = np.array([5, 4])
+
+            jacobian_matrix = np.array(
+                [[3000000, 1000000], [3000000, 1000000], [3000000, 1000000]]
+            )
 
             np.testing.assert_array_equal(
-                calculate_covariance_matrix(
-                    _get_dataset_stub(datapoints), coefficients
+                calculate_jacobian_matrix(
+                    _get_fit_context_stub(datapoints),
+                    coefficients,
+                    use_finite_differences=True,
                 ),
-                np.array([[-0.13826047, 0.41478141], [0.41478141, -1.24434423]]),
+                jacobian_matrix,
             )
 
-            self.assertEqual(zeros_mock.mock_calls[0].args[0], (3, 2))
-
-            self.assertIsInstance(
-                polynomial_module_mock.evaluate_polynomial_at_measuring_times.mock_calls[
-                    0
-                ].args[0],
-                DataSet,
+            # The undisturbed polynomial is evaluated only once
+            self.assertEqual(
+                len(
+                    polynomial_module_mock.evaluate_polynomial_at_measuring_times.mock_calls
+                ),
+                3,
             )
-            np.testing.assert_array_equal(
-                polynomial_module_mock.evaluate_polynomial_at_measuring_times.mock_calls[
-                    0
+
+    def test_analyticAndFiniteDifferenceJacobianMatricesAgree(self):
+        """Analytic and finite difference Jacobian matrices agree."""
+        with patch.dict("sys.modules"):
+            from napytau.core.delta_tau import calculate_jacobian_matrix
+
+            coefficients = np.array([5.0, 4.0, 3.0])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(0.5, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(1.0, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(2.0, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(3.5, 0.16),
+                        None,
+                        ValueErrorPair(1, 1),
+                        ValueErrorPair(1, 1),
+                    ),
                 ]
-                .args[0]
-                .get_datapoints()
-                .get_distances()
-                .get_values(),
-                np.array([0, 1, 2]),
             )
+            context = _get_fit_context_stub(datapoints)
 
-    def test_CanCalculateTheErrorPropagation(self):
-        """Can calculate the error propagation"""
-        polynomial_module_mock, zeros_mock, numpy_module_mock = set_up_mocks()
+            np.testing.assert_allclose(
+                calculate_jacobian_matrix(context, coefficients),
+                calculate_jacobian_matrix(
+                    context, coefficients, use_finite_differences=True
+                ),
+                rtol=1e-4,
+            )
 
-        zeros_mock.side_effect = [
-            np.array([0, 0, 0]),
-            np.array([[0, 0], [0, 0], [0, 0]]),
-        ]
-        polynomial_module_mock.evaluate_polynomial_at_measuring_times.side_effect = [
-            6,
-            3,
-            2,
-            1,
-        ]
-        numpy_module_mock.power.return_value = np.array([4, 9, 16])
-        numpy_module_mock.diag.return_value = np.array(
-            [[1 / 4, 0, 0], [0, 1 / 9, 0], [0, 0, 1 / 16]]
-        )
-        numpy_module_mock.linalg.inv.return_value = np.array(
-            [[-0.13826047, 0.41478141], [0.41478141, -1.24434423]]
-        )
-
-        numpy_module_mock.power.side_effect = [
-            np.array([25, 36, 49]),
-            np.array([16, 16, 16]),
-            np.array([4, 9, 16]),
-            np.array([1, 1, 1]),
-            np.array([1, 1, 1]),
-            np.array([1, 1, 1]),
-            np.array([0, 1, 2]),
-            np.array([0, 1, 2]),
-            np.array([1, 1, 1]),
-            np.array([0, 1, 2]),
-            np.array([0, 1, 2]),
-            np.array([16, 25, 36]),
-            np.array([256, 256, 256]),
-            np.array([2.60475853e26, 2.60475853e26, 2.60475853e26]),
-            np.array([64, 64, 64]),
-        ]
+    def test_canCalculateACovarianceMatrixFromTimesAndCoefficients(self):
+        """Can calculate a Covariance matrix from times and coefficients."""
+        with patch.dict("sys.modules"):
+            from napytau.core.delta_tau import calculate_covariance_matrix
+
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(0, 0.16),
+                        None,
+                        ValueErrorPair(0, 2),
+                        ValueErrorPair(0, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(1, 0.16),
+                        None,
+                        ValueErrorPair(0, 3),
+                        ValueErrorPair(0, 1),
+                    ),
+                    Datapoint(
+                        ValueErrorPair(2, 0.16),
+                        None,
+                        ValueErrorPair(0, 4),
+                        ValueErrorPair(0, 1),
+                    ),
+                ]
+            )
+            coefficients = np.array([5, 4])
 
-        polynomial_module_mock.evaluate_differentiated_polynomial_at_measuring_times.return_value = np.array(
-            [4, 4, 4]
-        )
+            np.testing.assert_allclose(
+                calculate_covariance_matrix(
+                    _get_fit_context_stub(datapoints), coefficients
+                ),
+                np.array([[3.71428571, -2.42857143], [-2.42857143, 4.35714286]]),
+            )
 
-        with patch.dict(
-            "sys.modules",
-            {
-                "napytau.core.polynomials": polynomial_module_mock,
-                "numpy": numpy_module_mock,
-            },
-        ):
+    def test_CanCalculateTheErrorPropagation(self):
+        """Can calculate the error propagation"""
+        with patch.dict("sys.modules"):
             from napytau.core.delta_tau import (
                 calculate_error_propagation_terms,
             )
 
-            coefficients: np.array = np.array([5, 4])
+            # P(t) = 5 + 4t - 0.5t^2, so P'(t) = 4 - t is non-zero at all times
+            coefficients: np.array = np.array([5, 4, -0.5])
             taufactor = 0.4
             datapoints = DatapointCollection(
                 [
                     Datapoint(
                         ValueErrorPair(0.0, 0.16),
                         None,
-                        ValueErrorPair(0, 2),
+                        ValueErrorPair(10, 2),
                         ValueErrorPair(4, 5),
                     ),
                     Datapoint(
                         ValueErrorPair(1.0, 0.16),
                         None,
-                        ValueErrorPair(0, 3),
+                        ValueErrorPair(8, 3),
                         ValueErrorPair(5, 6),
                     ),
                     Datapoint(
                         ValueErrorPair(2.0, 0.16),
                         None,
-                        ValueErrorPair(0, 4),
+                        ValueErrorPair(7, 4),
                         ValueErrorPair(6, 7),
                     ),
+                    Datapoint(
+                        ValueErrorPair(3.0, 0.16),
+                        None,
+                        ValueErrorPair(5, 2),
+                        ValueErrorPair(5, 3),
+                    ),
                 ]
             )
 
-            calculated_error_propagation_terms = calculate_error_propagation_terms(
-                _get_dataset_stub(datapoints),
-                coefficients,
-                taufactor,
+            np.testing.assert_allclose(
+                calculate_error_propagation_terms(
+                    _get_fit_context_stub(datapoints),
+                    coefficients,
+                    taufactor,
+                ),
+                np.array([2.6267432165, 15.0742629928, 98.1243682907, 403.2466431279]),
             )
 
-            self.assertEqual(
-                polynomial_module_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
-                    0
-                ].args[0],
-                _get_dataset_stub(datapoints),
-            )
-            np.testing.assert_array_equal(
-                polynomial_module_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
-                    0
-                ].args[1],
-                np.array([5, 4]),
+    def test_CanCalculateTheErrorPropagationForSeveralTauFactors(self):
+        """Can calculate the error propagation for several tau factors"""
+        with patch.dict("sys.modules"):
+            from napytau.core.delta_tau import (
+                calculate_error_propagation_terms,
+                calculate_error_propagation_terms_for_tau_factors,
             )
 
-            self.assertEqual(
-                len(numpy_module_mock.power.mock_calls),
-                15,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[0].args[0],
-                np.array([5, 6, 7]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[0].args[1],
-                2,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[1].args[0],
-                np.array([4, 4, 4]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[1].args[1],
-                2,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[2].args[0],
-                np.array([2, 3, 4]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[2].args[1],
-                2,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[3].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[3].args[1],
-                0,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[4].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[4].args[1],
-                0,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[5].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[5].args[1],
-                0,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[6].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[6].args[1],
-                1,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[7].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[7].args[1],
-                1,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[8].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[8].args[1],
-                0,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[9].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[9].args[1],
-                1,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[10].args[0],
-                np.array([0, 1, 2]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[10].args[1],
-                1,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[11].args[0],
-                np.array([4, 5, 6]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[11].args[1],
-                2,
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[12].args[0],
-                np.array([4, 4, 4]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[12].args[1],
-                4,
-            )
-            np.testing.assert_allclose(
-                numpy_module_mock.power.mock_calls[13].args[0],
-                np.array([-0.13826, -0.553042, -3.456512]),
-            )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[13].args[1],
-                2,
+            coefficients: np.ndarray = np.array([[5, 4, -0.5], [6, 5, -0.25]])
+            taufactors: np.ndarray = np.array([0.4, 1.5])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(float(distance), 0.16),
+                        None,
+                        ValueErrorPair(10 - distance, 2),
+                        ValueErrorPair(4 + distance, 5),
+                    )
+                    for distance in range(4)
+                ]
             )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[14].args[0],
-                np.array([4, 4, 4]),
+            context = _get_fit_context_stub(datapoints)
+
+            actual_result: np.ndarray = (
+                calculate_error_propagation_terms_for_tau_factors(
+                    context, coefficients, taufactors
+                )
             )
-            np.testing.assert_array_equal(
-                numpy_module_mock.power.mock_calls[14].args[1],
-                3,
+
+            self.assertEqual(actual_result.shape, (2, 4))
+            for row in range(2):
+                np.testing.assert_allclose(
+                    actual_result[row],
+                    calculate_error_propagation_terms(
+                        context, coefficients[row], taufactors[row]
+                    ),
+                )
+
+    def test_PropagatesTheUncertaintyOfAFitToOtherDatapoints(self):
+        """Propagates the uncertainty of a fit to other datapoints"""
+        with patch.dict("sys.modules"):
+            from napytau.core.delta_tau import (
+                calculate_error_propagation_terms,
             )
 
-            gaussian_error_propagation_terms = np.array(
-                [1.627974e25, 2.543710e25, 3.662942e25]
+            coefficients: np.ndarray = np.array([5, 4, -0.25])
+            datapoints = DatapointCollection(
+                [
+                    Datapoint(
+                        ValueErrorPair(float(distance), 0.16),
+                        None,
+                        ValueErrorPair(10 - distance, 1 + distance % 3),
+                        ValueErrorPair(4 + distance, 5),
+                    )
+                    for distance in range(6)
+                ]
             )
+            dataset = _get_dataset_stub(datapoints)
+            calculation_mask = np.array([True, False, True, True, False, True])
+            fitting_context = create_fit_context(dataset, 2)
+            calculation_context = create_fit_context(dataset, 2, mask=calculation_mask)
 
+            # The covariance of the coefficients is determined by all datapoints,
+            # the errors are only calculated for the datapoints of the mask
             np.testing.assert_allclose(
-                calculated_error_propagation_terms,
-                gaussian_error_propagation_terms,
+                calculate_error_propagation_terms(
+                    calculation_context,
+                    coefficients,
+                    0.4,
+                    fitting_context=fitting_context,
+                ),
+                calculate_error_propagation_terms(fitting_context, coefficients, 0.4)[
+                    calculation_mask
+                ],
             )
 
 
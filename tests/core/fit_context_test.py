@@ -0,0 +1,124 @@
+import unittest
+import numpy as np
+
+from napytau.core.errors.fit_context_error import FitContextError
+from napytau.core.fit_context import create_fit_context
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.util.model.value_error_pair import ValueErrorPair
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+
+
+def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
+    return DataSet(
+        ValueErrorPair(RelativeVelocity(1 / 299792458), RelativeVelocity(0)),
+        datapoints,
+    )
+
+
+def _get_datapoints_stub() -> DatapointCollection:
+    return DatapointCollection(
+        [
+            Datapoint(
+                ValueErrorPair(1.0, 0.16),
+                None,
+                ValueErrorPair(10, 1),
+                ValueErrorPair(4, 2),
+            ),
+            Datapoint(
+                ValueErrorPair(2.0, 0.16),
+                None,
+                ValueErrorPair(8, 1),
+                ValueErrorPair(5, 2),
+            ),
+            # Without intensities, this datapoint cannot be part of the fit
+            Datapoint(ValueErrorPair(3.0, 0.16)),
+            Datapoint(
+                ValueErrorPair(4.0, 0.16),
+                None,
+                ValueErrorPair(6, 1),
+                ValueErrorPair(7, 2),
+            ),
+        ]
+    )
+
+
+class FitContextUnitTest(unittest.TestCase):
+    def test_CanPrepareTheInputsOfTheCoreCalculations(self):
+        """Can prepare the inputs of the core calculations"""
+        context = create_fit_context(_get_dataset_stub(_get_datapoints_stub()), 2)
+
+        self.assertEqual(len(context), 3)
+        np.testing.assert_array_almost_equal(context.times, np.array([1, 2, 4]))
+        np.testing.assert_array_equal(context.mask, np.array([1, 1, 0, 1], bool))
+        np.testing.assert_array_equal(context.shifted_intensities, [10, 8, 6])
+        np.testing.assert_array_equal(context.shifted_intensity_errors, [1, 1, 1])
+        np.testing.assert_array_equal(context.unshifted_intensities, [4, 5, 7])
+        np.testing.assert_array_equal(context.unshifted_intensity_errors, [2, 2, 2])
+        np.testing.assert_array_almost_equal(
+            context.get_power_basis(3),
+            np.array([[1, 1, 1], [1, 2, 4], [1, 4, 16]]),
+        )
+        np.testing.assert_array_almost_equal(
+            context.get_derivative_basis(3),
+            np.array([[0, 1, 2], [0, 1, 4], [0, 1, 8]]),
+        )
+
+    def test_CanProvideBasesWithMoreColumnsThanPrepared(self):
+        """Can provide bases with more columns than prepared"""
+        context = create_fit_context(_get_dataset_stub(_get_datapoints_stub()), 1)
+
+        np.testing.assert_array_almost_equal(
+            context.get_power_basis(4)[:, 3], np.array([1, 8, 64])
+        )
+        np.testing.assert_array_almost_equal(
+            context.get_derivative_basis(4)[:, 3], np.array([3, 12, 48])
+        )
+
+    def test_CanRestrictTheContextToAMask(self):
+        """Can restrict the context to a mask"""
+        context = create_fit_context(
+            _get_dataset_stub(_get_datapoints_stub()),
+            2,
+            np.array([False, True, True, True]),
+        )
+
+        np.testing.assert_array_almost_equal(context.times, np.array([2, 4]))
+        np.testing.assert_array_equal(context.shifted_intensities, [8, 6])
+
+    def test_ReusesTheContextForUnchangedData(self):
+        """Reuses the context for unchanged data"""
+        datapoints = _get_datapoints_stub()
+
+        context = create_fit_context(_get_dataset_stub(datapoints), 2)
+
+        self.assertIs(create_fit_context(_get_dataset_stub(datapoints), 2), context)
+        self.assertIsNot(create_fit_context(_get_dataset_stub(datapoints), 3), context)
+
+    def test_CreatesANewContextIfADatapointChanged(self):
+        """Creates a new context if a datapoint changed"""
+        datapoints = _get_datapoints_stub()
+        context = create_fit_context(_get_dataset_stub(datapoints), 2)
+
+        datapoints[0].shifted_intensity = ValueErrorPair(12.0, 1.0)
+
+        updated_context = create_fit_context(_get_dataset_stub(datapoints), 2)
+        self.assertIsNot(updated_context, context)
+        np.testing.assert_array_equal(updated_context.shifted_intensities, [12, 8, 6])
+
+    def test_RaisesAFitContextErrorForAMaskOfTheWrongLength(self):
+        """Raises a fit context error for a mask of the wrong length"""
+        with self.assertRaises(FitContextError):
+            create_fit_context(
+                _get_dataset_stub(_get_datapoints_stub()), 2, np.array([True])
+            )
+
+    def test_RaisesAFitContextErrorForANegativePolynomialDegree(self):
+        """Raises a fit context error for a negative polynomial degree"""
+        with self.assertRaises(FitContextError):
+            create_fit_context(_get_dataset_stub(_get_datapoints_stub()), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+
+def _get_points_stub() -> (np.ndarray, np.ndarray, np.ndarray):
+    x_values = np.linspace(1.0, 60.0, 40)
+    y_values = 100 * np.exp(-x_values / 20) + np.sin(x_values)
+    weights = 1 + np.cos(x_values) ** 2
+    return x_values, y_values, weights
+
+
+class IncrementalPolynomialFitUnitTest(unittest.TestCase):
+    def test_MatchesAFullFitAfterTogglingDatapoints(self):
+        """Matches a full fit after toggling datapoints"""
+        with patch.dict("sys.modules"):
+            from napytau.core.incremental_fit import IncrementalPolynomialFit
+
+            x_values, y_values, weights = _get_points_stub()
+            fit = IncrementalPolynomialFit(x_values, y_values, 3, weights=weights)
+            active = np.ones(len(x_values), dtype=bool)
+
+            for index in [3, 17, 17, 5, 30, 3, 39]:
+                active[index] = not active[index]
+                fit.set_active(index, bool(active[index]))
+
+                # Polynomial.fit weights the residuals, not their squares
+                expected_coefficients = (
+                    np.polynomial.Polynomial.fit(
+                        x_values[active],
+                        y_values[active],
+                        3,
+                        w=np.sqrt(weights[active]),
+                    )
+                    .convert()
+                    .coef
+                )
+                np.testing.assert_allclose(
+                    fit.get_coefficients(), expected_coefficients, rtol=1e-9
+                )
+
+            self.assertEqual(fit.refit_count, 1)
+            np.testing.assert_array_equal(fit.get_active_mask(), active)
+
+    def test_RefitsWhenTheRemainingDatapointsNoLongerDetermineTheFit(self):
+        """Refits when the remaining datapoints no longer determine the fit"""
+        with patch.dict("sys.modules"):
+            from napytau.core.incremental_fit import IncrementalPolynomialFit
+
+            x_values, y_values, _ = _get_points_stub()
+            active = np.zeros(len(x_values), dtype=bool)
+            active[:4] = True
+            fit = IncrementalPolynomialFit(x_values, y_values, 3, active=active)
+
+            fit.set_active(0, False)
+
+            self.assertEqual(fit.refit_count, 2)
+            # The minimum norm solution still passes through the remaining points
+            np.testing.assert_allclose(fit.evaluate(x_values[1:4]), y_values[1:4])
+
+    def test_RefitsWhenManyDatapointsChangeAtOnce(self):
+        """Refits when many datapoints change at once"""
+        with patch.dict("sys.modules"):
+            from napytau.core.incremental_fit import IncrementalPolynomialFit
+
+            x_values, y_values, _ = _get_points_stub()
+            fit = IncrementalPolynomialFit(x_values, y_values, 2, max_updates=4)
+            active = np.ones(len(x_values), dtype=bool)
+
+            active[[1, 2]] = False
+            fit.set_active_mask(active)
+            self.assertEqual(fit.refit_count, 1)
+
+            active[10:20] = False
+            fit.set_active_mask(active)
+            self.assertEqual(fit.refit_count, 2)
+
+            np.testing.assert_allclose(
+                fit.evaluate(x_values),
+                np.polyval(np.polyfit(x_values[active], y_values[active], 2), x_values),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+
+import numpy as np
+
+from napytau.core.core import calculate_lifetime_for_fit
+from napytau.core.influence import calculate_datapoint_influences
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+
+def _get_dataset_stub() -> DataSet:
+    return DataSet(
+        ValueErrorPair(RelativeVelocity(1 / 299792458), RelativeVelocity(0)),
+        DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(float(distance), 0.16),
+                    None,
+                    ValueErrorPair(
+                        10 * np.exp(-distance / 3) + 0.2 * np.sin(distance),
+                        0.2 + 0.05 * distance,
+                    ),
+                    ValueErrorPair(3 + 0.5 * distance, 0.2),
+                )
+                for distance in range(1, 10)
+            ]
+        ),
+    )
+
+
+class InfluenceUnitTest(unittest.TestCase):
+    def test_MatchesTheLifetimesOfFitsWithoutEachDatapoint(self):
+        """Matches the lifetimes of fits without each datapoint"""
+        dataset = _get_dataset_stub()
+        dataset.get_datapoints()[4].set_active(False)
+        active_mask = dataset.get_datapoints().get_columns().get_active_mask()
+
+        influences = calculate_datapoint_influences(dataset, 2)
+
+        np.testing.assert_array_equal(influences.indices, [0, 1, 2, 3, 5, 6, 7, 8])
+        np.testing.assert_allclose(
+            [influences.lifetime, influences.lifetime_error],
+            calculate_lifetime_for_fit(dataset, 2),
+            rtol=1e-9,
+        )
+        for position, index in enumerate(influences.indices):
+            mask = active_mask.copy()
+            mask[index] = False
+            np.testing.assert_allclose(
+                [
+                    influences.lifetimes[position],
+                    influences.lifetime_errors[position],
+                ],
+                calculate_lifetime_for_fit(
+                    dataset, 2, fitting_mask=mask, calculation_mask=mask
+                ),
+                rtol=1e-8,
+            )
+
+    def test_CalculatesTheLeveragesAndCooksDistances(self):
+        """Calculates the leverages and Cook's distances"""
+        dataset = _get_dataset_stub()
+        influences = calculate_datapoint_influences(dataset, 2)
+
+        # Cook's distance is the change of the fitted values without the
+        # datapoint, relative to the residual variance of the full fit
+        times = np.arange(1.0, 10.0)
+        intensities = dataset.get_datapoints().get_shifted_intensities().get_values()
+        fitted_values = np.polyval(np.polyfit(times, intensities, 2), times)
+        residual_variance = np.sum((intensities - fitted_values) ** 2) / (9 - 3)
+        for index in range(9):
+            mask = np.arange(9) != index
+            left_out_fitted_values = np.polyval(
+                np.polyfit(times[mask], intensities[mask], 2), times
+            )
+            self.assertAlmostEqual(
+                influences.cooks_distances[index],
+                np.sum((fitted_values - left_out_fitted_values) ** 2)
+                / (3 * residual_variance),
+            )
+
+        self.assertAlmostEqual(np.sum(influences.leverages), 3)
+        self.assertTrue(np.all(influences.leverages < 1))
+
+    def test_AnalysesDatapointsThatAreOnlyFittedOrOnlyCalculated(self):
+        """Analyses datapoints that are only fitted or only calculated"""
+        dataset = _get_dataset_stub()
+        fitting_mask = np.ones(9, dtype=bool)
+        fitting_mask[[0, 8]] = False
+        calculation_mask = np.ones(9, dtype=bool)
+        calculation_mask[3] = False
+
+        influences = calculate_datapoint_influences(
+            dataset, 1, fitting_mask, calculation_mask
+        )
+
+        self.assertEqual(len(influences), 9)
+        self.assertTrue(np.isnan(influences.leverages[[0, 8]]).all())
+        self.assertTrue(np.isnan(influences.cooks_distances[[0, 8]]).all())
+        for index in [0, 3]:
+            left_out_fitting_mask = fitting_mask.copy()
+            left_out_fitting_mask[index] = False
+            left_out_calculation_mask = calculation_mask.copy()
+            left_out_calculation_mask[index] = False
+            np.testing.assert_allclose(
+                [influences.lifetimes[index], influences.lifetime_errors[index]],
+                calculate_lifetime_for_fit(
+                    dataset,
+                    1,
+                    fitting_mask=left_out_fitting_mask,
+                    calculation_mask=left_out_calculation_mask,
+                ),
+                rtol=1e-8,
+            )
+        self.assertGreater(influences.get_jackknife_error(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+
+from napytau.core.core import calculate_lifetime_for_custom_tau_factor
+from napytau.core.lifetime_table import calculate_lifetime_table
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+
+def _get_dataset_stub() -> DataSet:
+    return DataSet(
+        ValueErrorPair(RelativeVelocity(1 / 299792458), RelativeVelocity(0)),
+        DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(float(distance), 0.16),
+                    None,
+                    ValueErrorPair(10 * np.exp(-distance / 3), 0.3),
+                    ValueErrorPair(3 + 0.5 * distance, 0.2),
+                )
+                for distance in range(1, 7)
+            ]
+        ),
+    )
+
+
+class LifetimeTableUnitTest(unittest.TestCase):
+    def test_InterpolatesLifetimesWithinTheEstimatedInterpolationErrors(self):
+        """Interpolates lifetimes within the estimated interpolation errors"""
+        dataset = _get_dataset_stub()
+        table = calculate_lifetime_table(dataset, 1, (0.1, 10.0))
+
+        self.assertEqual(table.tau_factors[0], 0.1)
+        self.assertEqual(table.tau_factors[-1], 10.0)
+        for tau_factor in [0.1, 0.37, 1.0, 4.2, 10.0]:
+            (
+                lifetime,
+                lifetime_error,
+                lifetime_interpolation_error,
+                lifetime_error_interpolation_error,
+            ) = table.interpolate(tau_factor)
+            expected_lifetime, expected_lifetime_error = (
+                calculate_lifetime_for_custom_tau_factor(dataset, tau_factor, 1)
+            )
+
+            self.assertLessEqual(
+                abs(lifetime - expected_lifetime),
+                lifetime_interpolation_error + 1e-9,
+            )
+            self.assertLessEqual(
+                abs(lifetime_error - expected_lifetime_error),
+                lifetime_error_interpolation_error + 1e-9,
+            )
+            np.testing.assert_allclose(
+                [lifetime, lifetime_error],
+                [expected_lifetime, expected_lifetime_error],
+                rtol=1e-3,
+            )
+
+    def test_RefinesTheGridOnlyUntilItReachedItsMaximumSize(self):
+        """Refines the grid only until it reached its maximum size"""
+        table = calculate_lifetime_table(
+            _get_dataset_stub(),
+            1,
+            relative_tolerance=0.0,
+            initial_size=5,
+            max_size=20,
+        )
+
+        self.assertEqual(len(table.tau_factors), 20)
+        self.assertTrue(np.all(np.diff(table.tau_factors) > 0))
+        self.assertEqual(
+            len(table.lifetime_interpolation_errors), len(table.tau_factors) - 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+
+import numpy as np
+
+from napytau.core.core import calculate_lifetime_for_fit
+from napytau.core.monte_carlo import (
+    MonteCarloLifetimes,
+    calculate_monte_carlo_lifetimes,
+)
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+_VELOCITY = ValueErrorPair(0.03, 0.0006)
+_DISTANCES = ValueErrorPair(np.arange(1.0, 10.0), np.full(9, 0.05))
+_SHIFTED_INTENSITIES = ValueErrorPair(
+    100 * np.exp(-np.arange(1.0, 10.0) / 4), 0.5 + 0.1 * np.arange(1.0, 10.0)
+)
+_UNSHIFTED_INTENSITIES = ValueErrorPair(
+    100 - 100 * np.exp(-np.arange(1.0, 10.0) / 4), np.full(9, 0.8)
+)
+
+
+def _create_dataset(
+    velocity: float,
+    distances: np.ndarray,
+    shifted_intensities: np.ndarray,
+    unshifted_intensities: np.ndarray,
+) -> DataSet:
+    return DataSet(
+        ValueErrorPair(RelativeVelocity(velocity), RelativeVelocity(_VELOCITY.error)),
+        DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(distances[index], _DISTANCES.error[index]),
+                    None,
+                    ValueErrorPair(
+                        shifted_intensities[index],
+                        _SHIFTED_INTENSITIES.error[index],
+                    ),
+                    ValueErrorPair(
+                        unshifted_intensities[index],
+                        _UNSHIFTED_INTENSITIES.error[index],
+                    ),
+                )
+                for index in range(len(distances))
+            ]
+        ),
+    )
+
+
+def _get_dataset_stub() -> DataSet:
+    return _create_dataset(
+        _VELOCITY.value,
+        _DISTANCES.value,
+        _SHIFTED_INTENSITIES.value,
+        _UNSHIFTED_INTENSITIES.value,
+    )
+
+
+class MonteCarloUnitTest(unittest.TestCase):
+    def test_MatchesTheLifetimesOfTheDrawnDatasets(self):
+        """Matches the lifetimes of the drawn datasets"""
+        result = calculate_monte_carlo_lifetimes(
+            _get_dataset_stub(), 2, 5, seed=7, max_workers=1
+        )
+
+        # The single chunk draws the velocities, distances, shifted and
+        # unshifted intensities in this order
+        random = np.random.default_rng(np.random.SeedSequence(7).spawn(1)[0])
+        velocities = _VELOCITY.value + _VELOCITY.error * random.standard_normal(5)
+        distances, shifted_intensities, unshifted_intensities = [
+            pair.value + pair.error * random.standard_normal((5, 9))
+            for pair in [_DISTANCES, _SHIFTED_INTENSITIES, _UNSHIFTED_INTENSITIES]
+        ]
+
+        self.assertEqual(result.seed, 7)
+        for sample in range(5):
+            tau, _ = calculate_lifetime_for_fit(
+                _create_dataset(
+                    velocities[sample],
+                    distances[sample],
+                    shifted_intensities[sample],
+                    unshifted_intensities[sample],
+                ),
+                2,
+            )
+            self.assertAlmostEqual(result.lifetimes[sample] / tau, 1.0, places=8)
+
+    def test_YieldsTheSameLifetimesForAnyNumberOfWorkers(self):
+        """Yields the same lifetimes for any number of workers"""
+        dataset = _get_dataset_stub()
+        result = calculate_monte_carlo_lifetimes(
+            dataset, 2, 10, seed=3, chunk_size=3, max_workers=1
+        )
+
+        self.assertEqual(len(result), 10)
+        np.testing.assert_array_equal(
+            calculate_monte_carlo_lifetimes(
+                dataset, 2, 10, seed=3, chunk_size=3, max_workers=2
+            ).lifetimes,
+            result.lifetimes,
+        )
+        self.assertFalse(
+            np.array_equal(
+                calculate_monte_carlo_lifetimes(
+                    dataset, 2, 10, seed=4, chunk_size=3, max_workers=1
+                ).lifetimes,
+                result.lifetimes,
+            )
+        )
+
+        # Without a seed, the recorded seed reproduces the lifetimes
+        random_result = calculate_monte_carlo_lifetimes(
+            dataset, 2, 10, chunk_size=3, max_workers=1
+        )
+        np.testing.assert_array_equal(
+            calculate_monte_carlo_lifetimes(
+                dataset, 2, 10, seed=random_result.seed, chunk_size=3
+            ).lifetimes,
+            random_result.lifetimes,
+        )
+
+    def test_RejectsANonPositiveNumberOfSamplesOrChunkSize(self):
+        """Rejects a non-positive number of samples or chunk size"""
+        dataset = _get_dataset_stub()
+        with self.assertRaises(ValueError):
+            calculate_monte_carlo_lifetimes(dataset, 2, 0, seed=1)
+        with self.assertRaises(ValueError):
+            calculate_monte_carlo_lifetimes(dataset, 2, 10, seed=1, chunk_size=0)
+
+    def test_SummarizesOnlyTheDefinedLifetimes(self):
+        """Summarizes only the defined lifetimes"""
+        result = MonteCarloLifetimes(
+            lifetimes=np.array([3.0, np.nan, 1.0, 5.0, 2.0, 4.0]), seed=0
+        )
+
+        self.assertEqual(result.get_invalid_sample_count(), 1)
+        np.testing.assert_allclose(
+            result.get_percentiles([0, 50, 75, 100]), [1.0, 3.0, 4.0, 5.0]
+        )
+        self.assertAlmostEqual(result.get_mean(), 3.0)
+        self.assertAlmostEqual(result.get_standard_deviation(), np.sqrt(2.5))
+        self.assertTrue(
+            np.isnan(MonteCarloLifetimes(np.array([np.nan]), 0).get_percentiles()).all()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,12 @@
 import unittest
-from unittest.mock import MagicMock, patch
 from napytau.core.errors.polynomial_coefficient_error import (
     PolynomialCoefficientError,
 )
 
 import numpy as np
+import scipy as sp
 
+from napytau.core.fit_context import FitContext, create_fit_context
 from napytau.import_export.model.datapoint_collection import DatapointCollection
 from napytau.util.model.value_error_pair import ValueErrorPair
 from napytau.import_export.model.datapoint import Datapoint
@@ -13,14 +14,6 @@ from napytau.import_export.model.dataset import DataSet
 from napytau.import_export.model.relative_velocity import RelativeVelocity
 
 
-def set_up_mocks() -> MagicMock:
-    numpy_module_mock = MagicMock()
-    numpy_module_mock.power = MagicMock()
-    numpy_module_mock.zeros_like = MagicMock()
-
-    return numpy_module_mock
-
-
 def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
     return DataSet(
         ValueErrorPair(RelativeVelocity(1 / 299792458), RelativeVelocity(0)),
@@ -28,220 +21,152 @@ def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
     )
 
 
+def _get_fit_context_stub(
+    datapoints: DatapointCollection, polynomial_degree: int = 2
+) -> FitContext:
+    return create_fit_context(_get_dataset_stub(datapoints), polynomial_degree)
+
+
+def _get_datapoints_stub(distances: list) -> DatapointCollection:
+    return DatapointCollection(
+        [
+            Datapoint(
+                ValueErrorPair(distance, 0.16),
+                None,
+                ValueErrorPair(0, 2),
+                ValueErrorPair(4, 5),
+            )
+            for distance in distances
+        ]
+    )
+
+
 class PolynomialsUnitTest(unittest.TestCase):
     @staticmethod
     def test_CanEvaluateAValidPolynomialAtMeasuringDistances():
         """Can evaluate a valid polynomial at measuring distances."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [
-            np.array([1, 1, 1]),
-            np.array([1, 2, 3]),
-            np.array([1, 4, 9]),
-        ]
-        numpy_module_mock.zeros_like.return_value = np.array([0, 0, 0])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_polynomial_at_measuring_times,
-            )
-
-            # Test for a simple quadratic polynomial: 2 + 3x + 4x^2
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(0.0, 0.16),
-                        None,
-                        ValueErrorPair(0, 2),
-                        ValueErrorPair(4, 5),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(1.0, 0.16),
-                        None,
-                        ValueErrorPair(0, 3),
-                        ValueErrorPair(5, 6),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(2.0, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
+        from napytau.core.polynomials import (
+            evaluate_polynomial_at_measuring_times,
+        )
 
-            coefficients: np.ndarray = np.array([2, 3, 4])
-            # At x = 1: 2 + 3(1) + 4(1^2) = 9
-            # At x = 2: 2 + 3(2) + 4(2^2) = 2 + 6 + 16 = 24
-            # At x = 3: 2 + 3(3) + 4(3^2) = 2 + 9 + 36 = 47
-            expected_result: np.ndarray = np.array([9, 24, 47])
-            np.testing.assert_array_equal(
-                evaluate_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints),
-                    coefficients,
-                ),
-                expected_result,
-            )
+        # Test for a simple quadratic polynomial: 2 + 3x + 4x^2
+        datapoints = _get_datapoints_stub([1.0, 2.0, 3.0])
+
+        coefficients: np.ndarray = np.array([2, 3, 4])
+        # At x = 1: 2 + 3(1) + 4(1^2) = 9
+        # At x = 2: 2 + 3(2) + 4(2^2) = 2 + 6 + 16 = 24
+        # At x = 3: 2 + 3(3) + 4(3^2) = 2 + 9 + 36 = 47
+        expected_result: np.ndarray = np.array([9, 24, 47])
+        np.testing.assert_array_almost_equal(
+            evaluate_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints),
+                coefficients,
+            ),
+            expected_result,
+        )
 
     @staticmethod
     def test_CanEvaluateAPolynomialAtMeasuringDistancesForEmptyDistanceInput():
         """Can evaluate a polynomial at measuring distances for empty distance input."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [np.array([]), np.array([]), np.array([])]
-        numpy_module_mock.zeros_like.return_value = np.array([])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_polynomial_at_measuring_times,
-            )
+        from napytau.core.polynomials import (
+            evaluate_polynomial_at_measuring_times,
+        )
 
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(0, 0.16),
-                        None,
-                        ValueErrorPair(0, 2),
-                        ValueErrorPair(4, 5),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(1, 0.16),
-                        None,
-                        ValueErrorPair(0, 3),
-                        ValueErrorPair(5, 6),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([2, 3, 4])
-            # With an empty input array, the result should also be an empty array
-            expected_result: np.ndarray = np.array([])
-            np.testing.assert_array_equal(
-                evaluate_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints),
-                    coefficients,
-                ),
-                expected_result,
-            )
+        datapoints = _get_datapoints_stub([])
+        coefficients: np.ndarray = np.array([2, 3, 4])
+        # With an empty input array, the result should also be an empty array
+        expected_result: np.ndarray = np.array([])
+        np.testing.assert_array_equal(
+            evaluate_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints),
+                coefficients,
+            ),
+            expected_result,
+        )
 
     @staticmethod
     def test_CanEvaluateAPolynomialAtMeasuringDistancesForASingleDistance():
         """Can evaluate a polynomial at measuring distances for a single distance."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [
-            np.array([1]),
-            np.array([2]),
-            np.array([4]),
-        ]
-        numpy_module_mock.zeros_like.return_value = np.array([0])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_polynomial_at_measuring_times,
-            )
+        from napytau.core.polynomials import (
+            evaluate_polynomial_at_measuring_times,
+        )
 
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([1, 2])
-            # Polynomial: f(x) = 1 + 2x
-            # At x = 2: 1 + 2(2) = 5
-            expected_result: np.ndarray = np.array([5])
-            np.testing.assert_array_equal(
-                evaluate_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints),
-                    coefficients,
-                ),
-                expected_result,
-            )
+        datapoints = _get_datapoints_stub([2.0])
+        coefficients: np.ndarray = np.array([1, 2])
+        # Polynomial: f(x) = 1 + 2x
+        # At x = 2: 1 + 2(2) = 5
+        expected_result: np.ndarray = np.array([5])
+        np.testing.assert_array_almost_equal(
+            evaluate_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints, 1),
+                coefficients,
+            ),
+            expected_result,
+        )
 
     @staticmethod
     def test_CanEvaluateAPolynomialOfDegreeZeroAtMeasuringDistances():
         """Can evaluate a polynomial of degree zero at measuring distances."""
-        numpy_module_mock = set_up_mocks()
+        from napytau.core.polynomials import (
+            evaluate_polynomial_at_measuring_times,
+        )
 
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [
-            np.array([1, 1, 1]),
-            np.array([1, 2, 3]),
-            np.array([1, 4, 9]),
-        ]
-        numpy_module_mock.zeros_like.return_value = np.array([0, 0, 0])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_polynomial_at_measuring_times,
-            )
+        datapoints = _get_datapoints_stub([0.0, 1.0, 2.0])
+        coefficients: np.ndarray = np.array([5])
+        # Constant polynomial: f(x) = 5
+        # All values should be 5
+        expected_result: np.ndarray = np.array([5, 5, 5])
+        np.testing.assert_array_equal(
+            evaluate_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints, 0),
+                coefficients,
+            ),
+            expected_result,
+        )
 
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(0, 0.16),
-                        None,
-                        ValueErrorPair(0, 2),
-                        ValueErrorPair(4, 5),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(1, 0.16),
-                        None,
-                        ValueErrorPair(0, 3),
-                        ValueErrorPair(5, 6),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([5])
-            # Constant polynomial: f(x) = 5
-            # All values should be 5
-            expected_result: np.ndarray = np.array([5, 5, 5])
-            np.testing.assert_array_equal(
-                evaluate_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints),
-                    coefficients,
-                ),
-                expected_result,
-            )
+    @staticmethod
+    def test_CanEvaluateAPolynomialWithMoreCoefficientsThanTheContextDegree():
+        """Can evaluate a polynomial with more coefficients than the context degree."""
+        from napytau.core.polynomials import (
+            evaluate_polynomial_at_measuring_times,
+        )
+
+        datapoints = _get_datapoints_stub([1.0, 2.0])
+        coefficients: np.ndarray = np.array([1, 1, 1, 1])
+        # 1 + x + x^2 + x^3
+        expected_result: np.ndarray = np.array([4, 15])
+        np.testing.assert_array_almost_equal(
+            evaluate_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints, 1),
+                coefficients,
+            ),
+            expected_result,
+        )
+
+    @staticmethod
+    def test_CanEvaluateSeveralPolynomialsAtMeasuringDistancesAtOnce():
+        """Can evaluate several polynomials at measuring distances at once."""
+        from napytau.core.polynomials import (
+            evaluate_differentiated_polynomial_at_measuring_times,
+            evaluate_polynomial_at_measuring_times,
+        )
+
+        datapoints = _get_datapoints_stub([1.0, 2.0, 3.0])
+        # 2 + 3x + 4x^2 and 1 - x
+        coefficients: np.ndarray = np.array([[2, 3, 4], [1, -1, 0]])
+        np.testing.assert_array_almost_equal(
+            evaluate_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints), coefficients
+            ),
+            np.array([[9, 24, 47], [0, -1, -2]]),
+        )
+        # 3 + 8x and -1
+        np.testing.assert_array_almost_equal(
+            evaluate_differentiated_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints), coefficients
+            ),
+            np.array([[11, 19, 27], [-1, -1, -1]]),
+        )
 
     def test_EvaluatePolynomialRaisesAPolynomialCoefficientErrorForAnEmptyCoefficientArray(
         self,
@@ -250,29 +175,14 @@ class PolynomialsUnitTest(unittest.TestCase):
 
         from napytau.core.polynomials import evaluate_polynomial_at_measuring_times
 
-        datapoints = DatapointCollection(
-            [
-                Datapoint(
-                    ValueErrorPair(1, 0.16),
-                    None,
-                    ValueErrorPair(0, 3),
-                    ValueErrorPair(5, 6),
-                ),
-                Datapoint(
-                    ValueErrorPair(2, 0.16),
-                    None,
-                    ValueErrorPair(0, 4),
-                    ValueErrorPair(6, 7),
-                ),
-            ]
-        )
+        datapoints = _get_datapoints_stub([1.0, 2.0])
         coefficients: np.ndarray = np.array([])
         # With an empty coefficients array, the function should throw a polynomial
         # coefficient error.
         with self.assertRaises(PolynomialCoefficientError):
             (
                 evaluate_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints),
+                    _get_fit_context_stub(datapoints),
                     coefficients,
                 ),
             )
@@ -280,200 +190,80 @@ class PolynomialsUnitTest(unittest.TestCase):
     @staticmethod
     def test_CanEvaluateAValidDifferentiatedPolynomialAtMeasuringDistances():
         """Can evaluate a valid differentiated polynomial at measuring distances."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [np.array([1, 1, 1]), np.array([1, 2, 3])]
-        numpy_module_mock.zeros_like.return_value = np.array([0, 0, 0])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_differentiated_polynomial_at_measuring_times,
-            )
+        from napytau.core.polynomials import (
+            evaluate_differentiated_polynomial_at_measuring_times,
+        )
 
-            # Test for a simple quadratic polynomial: 2 + 3x + 4x^2
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(0, 0.16),
-                        None,
-                        ValueErrorPair(0, 2),
-                        ValueErrorPair(4, 5),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(1, 0.16),
-                        None,
-                        ValueErrorPair(0, 3),
-                        ValueErrorPair(5, 6),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([2, 3, 4])
-            # The differentiated polynomial should be: 3 + 8x
-            # At x = 1: 3 + 8(1) = 3 + 8 = 11
-            # At x = 2: 3 + 8(2) = 3 + 16 = 19
-            # At x = 3: 3 + 8(3) = 3 + 24 = 27
-            expected_result: np.ndarray = np.array([11, 19, 27])
-            np.testing.assert_array_equal(
-                evaluate_differentiated_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints), coefficients
-                ),
-                expected_result,
-            )
+        # Test for a simple quadratic polynomial: 2 + 3x + 4x^2
+        datapoints = _get_datapoints_stub([1.0, 2.0, 3.0])
+        coefficients: np.ndarray = np.array([2, 3, 4])
+        # The differentiated polynomial should be: 3 + 8x
+        # At x = 1: 3 + 8(1) = 3 + 8 = 11
+        # At x = 2: 3 + 8(2) = 3 + 16 = 19
+        # At x = 3: 3 + 8(3) = 3 + 24 = 27
+        expected_result: np.ndarray = np.array([11, 19, 27])
+        np.testing.assert_array_almost_equal(
+            evaluate_differentiated_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints), coefficients
+            ),
+            expected_result,
+        )
 
     @staticmethod
     def test_CanEvaluateADifferentiatedPolynomialAtMeasuringDistancesForEmptyDistanceInput():
         """Can evaluate a differentiated polynomial at measuring distances for empty distance input."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [np.array([]), np.array([])]
-        numpy_module_mock.zeros_like.return_value = np.array([])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_differentiated_polynomial_at_measuring_times,
-            )
+        from napytau.core.polynomials import (
+            evaluate_differentiated_polynomial_at_measuring_times,
+        )
 
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(0, 0.16),
-                        None,
-                        ValueErrorPair(0, 2),
-                        ValueErrorPair(4, 5),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(1, 0.16),
-                        None,
-                        ValueErrorPair(0, 3),
-                        ValueErrorPair(5, 6),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([2, 3, 4])
-            # With an empty input array, the result should also be an empty array
-            expected_result: np.ndarray = np.array([])
-            np.testing.assert_array_equal(
-                evaluate_differentiated_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints), coefficients
-                ),
-                expected_result,
-            )
+        datapoints = _get_datapoints_stub([])
+        coefficients: np.ndarray = np.array([2, 3, 4])
+        # With an empty input array, the result should also be an empty array
+        expected_result: np.ndarray = np.array([])
+        np.testing.assert_array_equal(
+            evaluate_differentiated_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints), coefficients
+            ),
+            expected_result,
+        )
 
     @staticmethod
     def test_CanEvaluateADifferentiatedPolynomialAtMeasuringDistancesForSingleDistanceMeasurement():
         """Can evaluate a differentiated polynomial at measuring distances for single distance measurement."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [np.array([1]), np.array([2])]
-        numpy_module_mock.zeros_like.return_value = np.array([0])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_differentiated_polynomial_at_measuring_times,
-            )
+        from napytau.core.polynomials import (
+            evaluate_differentiated_polynomial_at_measuring_times,
+        )
 
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([1, 2])
-            # The differentiated polynomial should be: 2
-            # At x = 2: 2
-            expected_result: np.ndarray = np.array([2])
-            np.testing.assert_array_equal(
-                evaluate_differentiated_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints), coefficients
-                ),
-                expected_result,
-            )
+        datapoints = _get_datapoints_stub([2.0])
+        coefficients: np.ndarray = np.array([1, 2])
+        # The differentiated polynomial should be: 2
+        # At x = 2: 2
+        expected_result: np.ndarray = np.array([2])
+        np.testing.assert_array_equal(
+            evaluate_differentiated_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints, 1), coefficients
+            ),
+            expected_result,
+        )
 
     @staticmethod
     def test_CanEvaluateADifferentiatedPolynomialOfDegreeZeroAtMeasuringDistances():
         """Can evaluate a differentiated polynomial of degree zero at measuring distances."""
-        numpy_module_mock = set_up_mocks()
-
-        # Mocked return values of called functions
-        numpy_module_mock.power.side_effect = [np.array([1, 1, 1]), np.array([1, 2, 3])]
-        numpy_module_mock.zeros_like.return_value = np.array([0, 0, 0])
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "numpy": numpy_module_mock,
-            },
-        ):
-            from napytau.core.polynomials import (
-                evaluate_differentiated_polynomial_at_measuring_times,
-            )
+        from napytau.core.polynomials import (
+            evaluate_differentiated_polynomial_at_measuring_times,
+        )
 
-            datapoints = DatapointCollection(
-                [
-                    Datapoint(
-                        ValueErrorPair(0, 0.16),
-                        None,
-                        ValueErrorPair(0, 2),
-                        ValueErrorPair(4, 5),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(1, 0.16),
-                        None,
-                        ValueErrorPair(0, 3),
-                        ValueErrorPair(5, 6),
-                    ),
-                    Datapoint(
-                        ValueErrorPair(2, 0.16),
-                        None,
-                        ValueErrorPair(0, 4),
-                        ValueErrorPair(6, 7),
-                    ),
-                ]
-            )
-            coefficients: np.ndarray = np.array([5])
-            # The differentiated polynomial should be: 0
-            # All values should therefore be 0
-            expected_result: np.ndarray = np.array([0, 0, 0])
-            np.testing.assert_array_equal(
-                evaluate_differentiated_polynomial_at_measuring_times(
-                    _get_dataset_stub(datapoints), coefficients
-                ),
-                expected_result,
-            )
+        datapoints = _get_datapoints_stub([0.0, 1.0, 2.0])
+        coefficients: np.ndarray = np.array([5])
+        # The differentiated polynomial should be: 0
+        # All values should therefore be 0
+        expected_result: np.ndarray = np.array([0, 0, 0])
+        np.testing.assert_array_equal(
+            evaluate_differentiated_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints, 0), coefficients
+            ),
+            expected_result,
+        )
 
     def test_EvaluateDifferentiatedPolynomialRaisesAPolynomialCoefficientErrorForAnEmptyCoefficientArray(
         self,
@@ -483,29 +273,178 @@ class PolynomialsUnitTest(unittest.TestCase):
             evaluate_differentiated_polynomial_at_measuring_times,
         )
 
+        datapoints = _get_datapoints_stub([1.0, 2.0])
+        coefficients: np.ndarray = np.array([])
+        # With an empty coefficients array, the function should throw a polynomial
+        # coefficient error.
+        with self.assertRaises(PolynomialCoefficientError):
+            evaluate_differentiated_polynomial_at_measuring_times(
+                _get_fit_context_stub(datapoints), coefficients
+            )
+
+    def test_CanCalculateThePolynomialCoefficientsForTheFit(self):
+        """Can calculate the polynomial coefficients for the fit."""
+        from napytau.core.polynomials import calculate_polynomial_coefficients_for_fit
+
         datapoints = DatapointCollection(
             [
                 Datapoint(
-                    ValueErrorPair(1, 0.16),
+                    ValueErrorPair(distance, 0.16),
                     None,
-                    ValueErrorPair(0, 3),
-                    ValueErrorPair(5, 6),
-                ),
+                    ValueErrorPair(2 + 3 * distance + 4 * distance**2, 1),
+                    ValueErrorPair(4, 5),
+                )
+                for distance in [0.0, 1.0, 2.0, 3.0]
+            ]
+        )
+
+        np.testing.assert_allclose(
+            calculate_polynomial_coefficients_for_fit(
+                _get_fit_context_stub(datapoints, 2)
+            ),
+            np.array([2, 3, 4]),
+            atol=1e-9,
+        )
+
+    def test_CanCalculateThePolynomialCoefficientsForATauFactor(self):
+        """Can calculate the polynomial coefficients for a tau factor."""
+        from napytau.core.polynomials import (
+            calculate_polynomial_coefficients_for_tau_factor,
+        )
+
+        datapoints = DatapointCollection(
+            [
                 Datapoint(
-                    ValueErrorPair(2, 0.16),
+                    ValueErrorPair(distance, 0.16),
                     None,
-                    ValueErrorPair(0, 4),
-                    ValueErrorPair(6, 7),
-                ),
+                    ValueErrorPair(intensity, 1),
+                    ValueErrorPair(4, 5),
+                )
+                for distance, intensity in [(1.0, 10 / 3), (2.0, 16 / 3), (4.0, 28 / 3)]
             ]
         )
-        coefficients: np.ndarray = np.array([])
-        # With an empty coefficients array, the function should throw a polynomial
-        # coefficient error.
-        with self.assertRaises(PolynomialCoefficientError):
-            evaluate_differentiated_polynomial_at_measuring_times(
-                _get_dataset_stub(datapoints), coefficients
+        # For P(t) = a_0 + a_1*t the residual is a_0/a_1 + t_i - tau_factor, which
+        # is minimized by a_0/a_1 = tau_factor - mean(t) = 3 - 7/3 = 2/3. The
+        # scale of P = s * (2/3 + t) is then fitted to the shifted intensities,
+        # which are 2 * (2/3 + t), so s = 2.
+        np.testing.assert_allclose(
+            calculate_polynomial_coefficients_for_tau_factor(
+                _get_fit_context_stub(datapoints, 1), 3.0
+            ),
+            np.array([4 / 3, 2]),
+            rtol=1e-6,
+        )
+
+    def test_SolverForATauFactorReportsItsStatistics(self):
+        """Solver for a tau factor reports its statistics."""
+        from napytau.core.polynomials import (
+            solve_polynomial_coefficients_for_tau_factor,
+        )
+
+        datapoints = DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(distance, 0.16),
+                    None,
+                    ValueErrorPair(10 * np.exp(-distance / 3), 0.3),
+                    ValueErrorPair(4, 5),
+                )
+                for distance in [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+            ]
+        )
+        context = _get_fit_context_stub(datapoints, 2)
+
+        result = solve_polynomial_coefficients_for_tau_factor(context, -3.0)
+
+        self.assertTrue(result.converged)
+        self.assertGreater(result.iterations, 0)
+        self.assertGreater(result.evaluations, result.iterations)
+        self.assertEqual(len(result.coefficients), 3)
+
+        # The reported cost belongs to the returned coefficients
+        residuals: np.ndarray = (context.get_power_basis(3) @ result.coefficients) / (
+            context.get_derivative_basis(3) @ result.coefficients
+        ) + 3.0
+        self.assertAlmostEqual(result.cost, 0.5 * np.sum(residuals**2))
+
+        # The residual of P/P' + 3 = 0 is at most that of a generic solver
+        reference = sp.optimize.least_squares(
+            lambda coefficients: (
+                (context.get_power_basis(3) @ coefficients)
+                / (context.get_derivative_basis(3) @ coefficients)
+                + 3.0
+            ),
+            np.ones(3),
+        )
+        self.assertLessEqual(result.cost, reference.cost * (1 + 1e-6))
+
+    def test_SolverForATauFactorDoesNotDependOnTheScaleOfTheWarmStart(self):
+        """Solver for a tau factor does not depend on the scale of the warm start."""
+        from napytau.core.polynomials import (
+            calculate_polynomial_coefficients_for_tau_factor,
+        )
+
+        datapoints = DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(distance, 0.16),
+                    None,
+                    ValueErrorPair(intensity, 1),
+                    ValueErrorPair(4, 5),
+                )
+                for distance, intensity in [(1.0, 5.0), (2.0, 6.0), (4.0, 9.0)]
+            ]
+        )
+        context = _get_fit_context_stub(datapoints, 1)
+
+        np.testing.assert_allclose(
+            calculate_polynomial_coefficients_for_tau_factor(
+                context, 3.0, np.array([1.0, 1.0])
+            ),
+            calculate_polynomial_coefficients_for_tau_factor(
+                context, 3.0, np.array([100.0, 100.0])
+            ),
+            rtol=1e-6,
+        )
+
+    def test_CanCalculateThePolynomialCoefficientsForSeveralTauFactors(self):
+        """Can calculate the polynomial coefficients for several tau factors."""
+        from napytau.core.polynomials import (
+            calculate_polynomial_coefficients_for_tau_factor,
+            calculate_polynomial_coefficients_for_tau_factors,
+        )
+
+        datapoints = DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(distance, 0.16),
+                    None,
+                    ValueErrorPair(intensity, 1),
+                    ValueErrorPair(4, 5),
+                )
+                for distance, intensity in [(1.0, 5.0), (2.0, 6.0), (4.0, 9.0)]
+            ]
+        )
+        context = _get_fit_context_stub(datapoints, 1)
+        tau_factors: np.ndarray = np.array([3.0, 4.0, 6.0])
+
+        coefficients: np.ndarray = calculate_polynomial_coefficients_for_tau_factors(
+            context, tau_factors
+        )
+
+        self.assertEqual(coefficients.shape, (3, 2))
+        for index, tau_factor in enumerate(tau_factors):
+            np.testing.assert_allclose(
+                coefficients[index],
+                calculate_polynomial_coefficients_for_tau_factor(context, tau_factor),
+                rtol=1e-6,
             )
+        self.assertEqual(
+            calculate_polynomial_coefficients_for_tau_factors(
+                context, np.array([])
+            ).shape,
+            (0, 2),
+        )
 
 
 if __name__ == "__main__":
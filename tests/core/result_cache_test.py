@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+
+def _get_dataset_stub() -> DataSet:
+    return DataSet(
+        ValueErrorPair(RelativeVelocity(0.01), RelativeVelocity(0.001)),
+        DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(distance, 0.1),
+                    ValueErrorPair(1.0, 0.1),
+                    ValueErrorPair(10 - distance, 1.0),
+                    ValueErrorPair(2 + distance, 1.0),
+                )
+                for distance in [1.0, 2.0, 3.0]
+            ]
+        ),
+    )
+
+
+class ResultCacheUnitTest(unittest.TestCase):
+    def test_ComputesAResultOnlyOnceAndCountsHitsAndMisses(self):
+        """Computes a result only once and counts hits and misses"""
+        with patch.dict("sys.modules"):
+            from napytau.core.result_cache import CacheStatistics, ResultCache
+
+            cache = ResultCache()
+            compute = MagicMock(return_value=(1.0, 0.1))
+
+            self.assertEqual(cache.get_or_compute(("key", 1), compute), (1.0, 0.1))
+            self.assertEqual(cache.get_or_compute(("key", 1), compute), (1.0, 0.1))
+            self.assertEqual(cache.get_or_compute(("key", 2), compute), (1.0, 0.1))
+
+            self.assertEqual(len(compute.mock_calls), 2)
+            self.assertEqual(
+                cache.get_statistics(), CacheStatistics(memory_hits=1, misses=2)
+            )
+
+    def test_EvictsTheLeastRecentlyUsedResultFromMemory(self):
+        """Evicts the least recently used result from memory"""
+        with patch.dict("sys.modules"):
+            from napytau.core.result_cache import ResultCache
+
+            cache = ResultCache(max_entries=2)
+            cache.get_or_compute(("first",), lambda: 1.0)
+            cache.get_or_compute(("second",), lambda: 2.0)
+            cache.get_or_compute(("first",), lambda: 1.0)
+            cache.get_or_compute(("third",), lambda: 3.0)
+
+            compute = MagicMock(return_value=2.0)
+            cache.get_or_compute(("first",), compute)
+            cache.get_or_compute(("second",), compute)
+
+            self.assertEqual(len(compute.mock_calls), 1)
+
+    def test_SharesResultsOnDiskBetweenCaches(self):
+        """Shares results on disk between caches"""
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict("sys.modules"):
+                from napytau.core.result_cache import ResultCache
+
+                ResultCache(directory=directory).get_or_compute(
+                    ("key",), lambda: (1.0, 0.1)
+                )
+
+                cache = ResultCache(directory=directory)
+                compute = MagicMock()
+
+                self.assertEqual(cache.get_or_compute(("key",), compute), (1.0, 0.1))
+                self.assertEqual(len(compute.mock_calls), 0)
+                self.assertEqual(cache.get_statistics().disk_hits, 1)
+
+    def test_DoesNotShareResultsOnDiskWithAnotherCacheFormatVersion(self):
+        """Does not share results on disk with another cache format version"""
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict("sys.modules"):
+                from napytau.core.result_cache import ResultCache
+
+                ResultCache(directory=directory).get_or_compute(
+                    ("key",), lambda: (1.0, 0.1)
+                )
+
+                module_globals = ResultCache.get_or_compute.__globals__
+                with patch.dict(
+                    module_globals,
+                    {
+                        "_CACHE_FORMAT_VERSION": module_globals["_CACHE_FORMAT_VERSION"]
+                        + 1
+                    },
+                ):
+                    cache = ResultCache(directory=directory)
+                    self.assertEqual(
+                        cache.get_or_compute(("key",), lambda: (2.0, 0.2)), (2.0, 0.2)
+                    )
+                    self.assertEqual(cache.get_statistics().misses, 1)
+
+    def test_EvictsTheLeastRecentlyUsedResultsFromDiskWhenItExceedsItsSize(self):
+        """Evicts the least recently used results from disk when it exceeds its size"""
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict("sys.modules"):
+                from napytau.core.result_cache import ResultCache
+
+                cache = ResultCache(directory=directory, max_disk_bytes=100)
+                for index in range(20):
+                    cache.get_or_compute((index,), lambda: (1.0, 0.1))
+
+                entries = [
+                    os.path.getsize(os.path.join(directory, file_name))
+                    for file_name in os.listdir(directory)
+                ]
+                self.assertLessEqual(sum(entries), 100)
+                self.assertGreater(len(entries), 0)
+
+    def test_DoesNotCacheErrors(self):
+        """Does not cache errors"""
+        with patch.dict("sys.modules"):
+            from napytau.core.result_cache import ResultCache
+
+            cache = ResultCache()
+            with self.assertRaises(ValueError):
+                cache.get_or_compute(("key",), MagicMock(side_effect=ValueError()))
+
+            self.assertEqual(cache.get_or_compute(("key",), lambda: 1.0), 1.0)
+
+    def test_HashesTheDatasetContentsTheCalculationsDependOn(self):
+        """Hashes the dataset contents the calculations depend on"""
+        with patch.dict("sys.modules"):
+            from napytau.core.result_cache import hash_dataset_contents
+
+            dataset = _get_dataset_stub()
+            content_hash = hash_dataset_contents(dataset)
+
+            self.assertEqual(hash_dataset_contents(_get_dataset_stub()), content_hash)
+
+            dataset.get_datapoints()[0].set_calibration(ValueErrorPair(5.0, 0.5))
+            self.assertEqual(hash_dataset_contents(dataset), content_hash)
+
+            dataset.get_datapoints()[0].set_active(False)
+            self.assertNotEqual(hash_dataset_contents(dataset), content_hash)
+
+            other_dataset = _get_dataset_stub()
+            other_dataset.get_datapoints()[1].set_intensity(
+                ValueErrorPair(1.0, 0.1), ValueErrorPair(1.0, 0.1)
+            )
+            self.assertNotEqual(hash_dataset_contents(other_dataset), content_hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
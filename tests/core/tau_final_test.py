@@ -1,3 +1,4 @@
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
@@ -12,6 +13,11 @@ def set_up_mocks() -> MagicMock:
 
 
 class TauFinalUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.core.tau_final", None)
+
     def test_calculateTauFinalForValidData(self):
         """Calculate tau_final for valid data."""
         numpy_module_mock = set_up_mocks()
@@ -93,3 +99,39 @@ class TauFinalUnitTest(unittest.TestCase):
 
             self.assertEqual(tau_final[0], expected_tau_final)
             self.assertEqual(tau_final[1], expected_uncertainty)
+
+    def test_calculateTauFinalForSeveralTauFactors(self):
+        """Calculate tau_final for several tau factors."""
+        with patch.dict("sys.modules"):
+            from napytau.core.tau_final import (
+                calculate_tau_final,
+                calculate_tau_final_for_tau_factors,
+            )
+
+            tau_i: np.ndarray = np.array([[2, 4], [3, 3], [1, 5]])
+            delta_tau_i: np.ndarray = np.array([[1, 2], [1, 1], [2, 0.5]])
+
+            tau_finals, uncertainties = calculate_tau_final_for_tau_factors(
+                tau_i, delta_tau_i
+            )
+
+            np.testing.assert_allclose(tau_finals[0], 2.4)
+            np.testing.assert_allclose(uncertainties[0], 0.894427191)
+            for row in range(3):
+                expected_tau_final, expected_uncertainty = calculate_tau_final(
+                    tau_i[row], delta_tau_i[row]
+                )
+                self.assertAlmostEqual(tau_finals[row], expected_tau_final)
+                self.assertAlmostEqual(uncertainties[row], expected_uncertainty)
+
+    def test_calculateTauFinalForSeveralTauFactorsForEmptyInput(self):
+        """Calculate tau_final for several tau factors for empty input."""
+        with patch.dict("sys.modules"):
+            from napytau.core.tau_final import calculate_tau_final_for_tau_factors
+
+            tau_finals, uncertainties = calculate_tau_final_for_tau_factors(
+                np.empty((2, 0)), np.empty((2, 0))
+            )
+
+            np.testing.assert_array_equal(tau_finals, np.array([-1, -1]))
+            np.testing.assert_array_equal(uncertainties, np.array([-1, -1]))
@@ -1,7 +1,9 @@
+import sys
 import unittest
 from random import random
 from unittest.mock import MagicMock, patch
 import numpy as np
+from napytau.core.fit_context import FitContext, create_fit_context
 from napytau.import_export.model.datapoint_collection import DatapointCollection
 from napytau.import_export.model.dataset import DataSet
 from napytau.import_export.model.relative_velocity import RelativeVelocity
@@ -23,14 +25,16 @@ def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
     )
 
 
-def _get_dataset_stub(datapoints: DatapointCollection) -> DataSet:
-    return DataSet(
-        ValueErrorPair(RelativeVelocity(random()), RelativeVelocity(random())),
-        datapoints,
-    )
+def _get_fit_context_stub(datapoints: DatapointCollection) -> FitContext:
+    return create_fit_context(_get_dataset_stub(datapoints), 2)
 
 
 class TauUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.core.tau", None)
+
     def test_CanCalculateTau(self):
         """Can calculate tau"""
         polynomials_mock = set_up_mocks()
@@ -64,14 +68,14 @@ class TauUnitTest(unittest.TestCase):
                     ),
                 ]
             )
-            dataset = _get_dataset_stub(datapoints)
+            context = _get_fit_context_stub(datapoints)
 
             # Expected result
             expected_tau: np.ndarray = np.array([3, 1.6666667])
 
             np.testing.assert_array_almost_equal(
                 calculate_tau_i_values(
-                    dataset,
+                    context,
                     initial_coefficients,
                 ),
                 expected_tau,
@@ -88,7 +92,7 @@ class TauUnitTest(unittest.TestCase):
                 polynomials_mock.evaluate_differentiated_polynomial_at_measuring_times.mock_calls[
                     0
                 ].args[0],
-                dataset,
+                context,
             )
 
             np.testing.assert_array_equal(
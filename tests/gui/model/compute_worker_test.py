@@ -0,0 +1,161 @@
+import threading
+import time
+import unittest
+from typing import Callable, List
+
+from napytau.gui.model.compute_worker import ComputeWorker
+
+_TIMEOUT_SECONDS = 5.0
+
+
+class _WidgetStub:
+    """Records the callbacks scheduled with after() instead of running them."""
+
+    def __init__(self) -> None:
+        self.callbacks: List[Callable[[], None]] = []
+
+    def after(self, _: int, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+    def run_callbacks(self) -> None:
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def _wait_until(condition: Callable[[], bool]) -> bool:
+    deadline = time.monotonic() + _TIMEOUT_SECONDS
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+class ComputeWorkerUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.widget = _WidgetStub()
+        self.worker = ComputeWorker(self.widget)
+        self.results = []
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_dropsAPendingRequestThatIsSuperseded(self):
+        """Drops a pending request that is superseded"""
+        computed = []
+
+        def compute(value):
+            computed.append(value)
+            return value
+
+        self.worker.submit(
+            "lifetime", lambda: compute(1), self.results.append, debounce_seconds=0.2
+        )
+        self.worker.submit(
+            "lifetime", lambda: compute(2), self.results.append, debounce_seconds=0.2
+        )
+
+        self.assertTrue(_wait_until(lambda: not self.worker.is_busy("lifetime")))
+        self.widget.run_callbacks()
+
+        self.assertEqual(computed, [2])
+        self.assertEqual(self.results, [2])
+
+    def test_discardsTheResultOfACancelledCalculation(self):
+        """Discards the result of a cancelled calculation"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute():
+            started.set()
+            release.wait(_TIMEOUT_SECONDS)
+            return 1
+
+        self.worker.submit("lifetime", compute, self.results.append)
+        self.assertTrue(started.wait(_TIMEOUT_SECONDS))
+        self.worker.cancel("lifetime")
+        release.set()
+
+        self.assertTrue(_wait_until(lambda: not self.worker.is_busy("lifetime")))
+        self.widget.run_callbacks()
+
+        self.assertEqual(self.results, [])
+
+        # Later requests of the channel are delivered again
+        self.worker.submit("lifetime", lambda: 2, self.results.append)
+        self.assertTrue(_wait_until(lambda: not self.worker.is_busy("lifetime")))
+        self.widget.run_callbacks()
+
+        self.assertEqual(self.results, [2])
+
+    def test_isBusyWhileARequestIsPendingOrCalculated(self):
+        """Is busy while a request is pending or calculated"""
+        release = threading.Event()
+
+        self.assertFalse(self.worker.is_busy("lifetime"))
+
+        self.worker.submit(
+            "lifetime",
+            lambda: release.wait(_TIMEOUT_SECONDS),
+            self.results.append,
+            debounce_seconds=0.05,
+        )
+
+        self.assertTrue(self.worker.is_busy("lifetime"))
+        self.assertFalse(self.worker.is_busy("table"))
+
+        release.set()
+        self.assertTrue(_wait_until(lambda: not self.worker.is_busy("lifetime")))
+        self.widget.run_callbacks()
+
+        self.assertEqual(self.results, [True])
+
+    def test_passesErrorsToTheErrorCallback(self):
+        """Passes errors to the error callback"""
+        errors = []
+
+        def compute():
+            raise ValueError("broken")
+
+        self.worker.submit("lifetime", compute, self.results.append, errors.append)
+
+        self.assertTrue(_wait_until(lambda: not self.worker.is_busy("lifetime")))
+        self.widget.run_callbacks()
+
+        self.assertEqual(self.results, [])
+        self.assertEqual([str(error) for error in errors], ["broken"])
+
+    def test_stopsTheThreadsOfTheChannelsWhenShutDown(self):
+        """Stops the threads of the channels when shut down"""
+        self.worker.submit("lifetime", lambda: 1, self.results.append)
+        self.worker.submit("table", lambda: 2, self.results.append)
+        self.assertTrue(
+            _wait_until(
+                lambda: (
+                    not self.worker.is_busy("lifetime")
+                    and not self.worker.is_busy("table")
+                )
+            )
+        )
+
+        def get_channel_threads():
+            return [
+                thread
+                for thread in threading.enumerate()
+                if thread.name in ("napytau-compute-lifetime", "napytau-compute-table")
+            ]
+
+        self.assertEqual(len(get_channel_threads()), 2)
+
+        self.worker.shutdown()
+
+        self.assertTrue(_wait_until(lambda: len(get_channel_threads()) == 0))
+
+        # No further requests are accepted
+        self.worker.submit("lifetime", lambda: 3, self.results.append)
+        self.assertFalse(self.worker.is_busy("lifetime"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# The worker processes receive their tasks pickled, which requires the executor
+# module to outlive the sys.modules patches of the tests
+import concurrent.futures.process  # noqa: F401
+
+
+def _write_napytau_file(file_path: str, velocity: float) -> None:
+    with open(file_path, "w") as file:
+        json.dump(
+            {
+                "relativeVelocity": velocity,
+                "relativeVelocityError": 0.001,
+                "datapoints": [
+                    {
+                        "distance": distance,
+                        "distanceError": 0.1,
+                        "calibration": 1.0,
+                        "calibrationError": 0.1,
+                        "shiftedIntensity": 10 - distance,
+                        "shiftedIntensityError": 1.0,
+                        "unshiftedIntensity": 2 + distance,
+                        "unshiftedIntensityError": 1.0,
+                    }
+                    for distance in [1.0, 2.0, 3.0, 4.0, 5.0]
+                ],
+                "setups": [],
+            },
+            file,
+        )
+
+
+class BatchUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.directory.name, "run_1", "nested"))
+        os.makedirs(os.path.join(self.directory.name, "run_2"))
+        _write_napytau_file(os.path.join(self.directory.name, "run_1", "a.json"), 0.03)
+        _write_napytau_file(
+            os.path.join(self.directory.name, "run_1", "nested", "b.json"), 0.04
+        )
+        with open(os.path.join(self.directory.name, "run_2", "broken.json"), "w") as f:
+            f.write("{ not json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_CollectsTheDatasetsOfADirectoryTree(self):
+        """Collects the datasets of a directory tree"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import (
+                collect_batch_jobs,
+            )
+
+            jobs = collect_batch_jobs(
+                [self.directory.name], "napytau", t_hyp_estimate=0.5
+            )
+
+            self.assertEqual(
+                [
+                    os.path.relpath(job.data_files_path, self.directory.name)
+                    for job in jobs
+                ],
+                [
+                    os.path.join("run_1", "a.json"),
+                    os.path.join("run_1", "nested", "b.json"),
+                    os.path.join("run_2", "broken.json"),
+                ],
+            )
+            self.assertTrue(all(job.t_hyp_estimate == 0.5 for job in jobs))
+
+    def test_CollectsTheDatasetsMatchingAGlobPatternOnlyOnce(self):
+        """Collects the datasets matching a glob pattern only once"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import (
+                collect_batch_jobs,
+            )
+
+            jobs = collect_batch_jobs(
+                [
+                    os.path.join(self.directory.name, "run_1", "*.json"),
+                    os.path.join(self.directory.name, "run_1", "a.json"),
+                ],
+                "napytau",
+            )
+
+            self.assertEqual(
+                [job.data_files_path for job in jobs],
+                [os.path.join(self.directory.name, "run_1", "a.json")],
+            )
+
+    def test_CollectsOnlyDirectoriesWithAllFilesOfTheLegacyFormat(self):
+        """Collects only directories with all files of the legacy format"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import collect_batch_jobs
+
+            for run_directory, file_names in [
+                ("complete", ["v_c", "distances.dat", "norm.fac", "run.fit"]),
+                ("without_fit", ["v_c", "distances.dat", "norm.fac"]),
+                ("only_velocity", ["v_c"]),
+            ]:
+                os.makedirs(os.path.join(self.directory.name, run_directory))
+                for file_name in file_names:
+                    with open(
+                        os.path.join(self.directory.name, run_directory, file_name), "w"
+                    ):
+                        pass
+
+            def collect_directories(fit_file_path):
+                return [
+                    os.path.relpath(job.data_files_path, self.directory.name)
+                    for job in collect_batch_jobs(
+                        [self.directory.name], "legacy", fit_file_path
+                    )
+                ]
+
+            self.assertEqual(collect_directories(None), ["complete"])
+            self.assertEqual(
+                collect_directories(
+                    os.path.join(self.directory.name, "complete", "run.fit")
+                ),
+                ["complete", "without_fit"],
+            )
+
+    def test_AFailingDatasetDoesNotAbortTheOtherDatasets(self):
+        """A failing dataset does not abort the other datasets"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import (
+                collect_batch_jobs,
+                run_batch,
+            )
+
+            results = run_batch(
+                collect_batch_jobs([self.directory.name], "napytau"), max_workers=1
+            )
+
+            self.assertEqual(len(results), 3)
+            self.assertIsNone(results[0].error)
+            self.assertTrue(np.isfinite(results[0].tau_fit))
+            self.assertIsNotNone(results[0].tau_factor)
+            self.assertIsNone(results[1].error)
+            self.assertIn("ImportExportError", results[2].error)
+            self.assertIsNone(results[2].tau_fit)
+
+    def test_StreamsTrustedDatasetsWithTheSameResults(self):
+        """Streams trusted datasets with the same results"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import (
+                collect_batch_jobs,
+                run_batch,
+            )
+
+            trusted_jobs = collect_batch_jobs(
+                [self.directory.name], "napytau", trusted=True
+            )
+            trusted_results = run_batch(trusted_jobs, max_workers=1)
+            results = run_batch(
+                collect_batch_jobs([self.directory.name], "napytau"), max_workers=1
+            )
+
+            self.assertTrue(all(job.trusted for job in trusted_jobs))
+            self.assertEqual(trusted_results[:2], results[:2])
+            self.assertIn("ImportExportError", trusted_results[2].error)
+
+    def test_WorkerProcessesYieldTheSameResultsAsASingleProcess(self):
+        """Worker processes yield the same results as a single process"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import (
+                collect_batch_jobs,
+                run_batch,
+            )
+
+            jobs = collect_batch_jobs([self.directory.name], "napytau")
+
+            self.assertEqual(
+                run_batch(jobs, max_workers=2), run_batch(jobs, max_workers=1)
+            )
+
+    def test_WritesTheResultsAsACSVTable(self):
+        """Writes the results as a CSV table"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import (
+                BatchResult,
+                write_batch_results,
+            )
+
+            output = io.StringIO()
+            write_batch_results(
+                [
+                    BatchResult("a.json", 1.0, 0.1, 0.5, 2.0, 0.2),
+                    BatchResult("b.json", error="ValueError: broken"),
+                ],
+                output,
+            )
+
+            self.assertEqual(
+                output.getvalue().splitlines(),
+                [
+                    "data_files_path,tau_fit,tau_fit_error,tau_factor,tau_custom,"
+                    "tau_custom_error,error",
+                    "a.json,1.0,0.1,0.5,2.0,0.2,",
+                    "b.json,,,,,,ValueError: broken",
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+def _write_napytau_file(file_path: str, velocity: float) -> None:
+    with open(file_path, "w") as file:
+        json.dump(
+            {
+                "relativeVelocity": velocity,
+                "relativeVelocityError": 0.001,
+                "datapoints": [
+                    {
+                        "distance": distance,
+                        "distanceError": 0.1,
+                        "calibration": 1.0,
+                        "calibrationError": 0.1,
+                        "shiftedIntensity": 10 - distance,
+                        "shiftedIntensityError": 1.0,
+                        "unshiftedIntensity": 2 + distance,
+                        "unshiftedIntensityError": 1.0,
+                    }
+                    for distance in [1.0, 2.0, 3.0, 4.0, 5.0]
+                ],
+                "setups": [
+                    {
+                        "name": "first",
+                        "tauFactor": 0.5,
+                        "polynomialCount": 2,
+                        "datapointSetups": [],
+                        "samplingPoints": [],
+                    }
+                ],
+            },
+            file,
+        )
+
+
+class CampaignIndexUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.directory.name, "run_1"))
+        os.makedirs(os.path.join(self.directory.name, "run_2"))
+        self.first_path = os.path.join(self.directory.name, "run_1", "a.json")
+        self.second_path = os.path.join(self.directory.name, "run_2", "b.json")
+        _write_napytau_file(self.first_path, 0.03)
+        _write_napytau_file(self.second_path, 0.05)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_RecordsTheVelocityDatapointCountAndSetupsOfEveryDataset(self):
+        """Records the velocity, datapoint count and setups of every dataset"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.campaign_index import CampaignIndex, IndexUpdate
+
+            with CampaignIndex(self.directory.name) as index:
+                self.assertEqual(index.update("napytau"), IndexUpdate(added=2))
+                datasets = index.find_datasets()
+
+            self.assertEqual(
+                [dataset.path for dataset in datasets],
+                [self.first_path, self.second_path],
+            )
+            self.assertEqual(datasets[0].relative_velocity, 0.03)
+            self.assertEqual(datasets[0].datapoint_count, 5)
+            self.assertEqual(datasets[0].setups, ("first",))
+            self.assertTrue(datasets[0].results_stale)
+
+    def test_ReadsOnlyTheDatasetsWhoseFilesChanged(self):
+        """Reads only the datasets whose files changed"""
+        with patch.dict("sys.modules"):
+            from napytau.headless import campaign_index
+
+            with campaign_index.CampaignIndex(self.directory.name) as index:
+                index.update("napytau")
+
+                with patch.object(
+                    campaign_index,
+                    "_read_dataset",
+                    side_effect=campaign_index._read_dataset,
+                ) as read_dataset_mock:
+                    # Touching a file does not change its contents
+                    os.utime(self.first_path, ns=(0, 0))
+                    _write_napytau_file(self.second_path, 0.06)
+
+                    self.assertEqual(
+                        index.update("napytau"),
+                        campaign_index.IndexUpdate(updated=1, unchanged=1),
+                    )
+                    self.assertEqual(
+                        [call.args[1] for call in read_dataset_mock.mock_calls],
+                        [self.second_path],
+                    )
+
+                self.assertEqual(
+                    index.find_datasets()[1].relative_velocity,
+                    0.06,
+                )
+
+    def test_RemovesDatasetsThatNoLongerExist(self):
+        """Removes datasets that no longer exist"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.campaign_index import CampaignIndex, IndexUpdate
+
+            with CampaignIndex(self.directory.name) as index:
+                index.update("napytau")
+                os.remove(self.first_path)
+
+                self.assertEqual(
+                    index.update("napytau"), IndexUpdate(unchanged=1, removed=1)
+                )
+                self.assertEqual(
+                    [dataset.path for dataset in index.find_datasets()],
+                    [self.second_path],
+                )
+
+    def test_FindsTheDatasetsWithAVelocityInTheGivenRange(self):
+        """Finds the datasets with a velocity in the given range"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.campaign_index import CampaignIndex
+
+            with CampaignIndex(self.directory.name) as index:
+                index.update("napytau")
+
+                self.assertEqual(
+                    [
+                        dataset.path
+                        for dataset in index.find_datasets(velocity_range=(0.04, 0.1))
+                    ],
+                    [self.second_path],
+                )
+                self.assertEqual(
+                    index.find_datasets(velocity_range=(0.04, 0.1), stale=False), []
+                )
+
+    def test_KeepsTheResultsOfChangedDatasetsButMarksThemAsStale(self):
+        """Keeps the results of changed datasets, but marks them as stale"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import BatchJob, BatchResult
+            from napytau.headless.campaign_index import CampaignIndex
+
+            with CampaignIndex(self.directory.name) as index:
+                index.update("napytau")
+                self.assertEqual(
+                    index.record_results(
+                        [
+                            BatchJob(
+                                "napytau",
+                                path,
+                                content_hash=index.hash_dataset(path),
+                            )
+                            for path in [
+                                self.first_path,
+                                self.second_path,
+                                "not_indexed.json",
+                            ]
+                        ],
+                        [
+                            BatchResult(self.first_path, 1.0, 0.1, 0.5, 2.0, 0.2),
+                            BatchResult(self.second_path, 3.0, 0.3, 0.5, 4.0, 0.4),
+                            BatchResult("not_indexed.json", error="Error"),
+                        ],
+                    ),
+                    2,
+                )
+                _write_napytau_file(self.first_path, 0.04)
+                index.update("napytau")
+
+                self.assertEqual(
+                    [dataset.path for dataset in index.find_datasets(stale=True)],
+                    [self.first_path],
+                )
+                first_dataset = index.find_datasets()[0]
+                self.assertEqual(first_dataset.tau_fit, 1.0)
+                self.assertEqual(first_dataset.relative_velocity, 0.04)
+
+    def test_TiesTheResultsToTheContentsTheyWereComputedFrom(self):
+        """Ties the results to the contents they were computed from"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import BatchJob, BatchResult
+            from napytau.headless.campaign_index import CampaignIndex
+
+            with CampaignIndex(self.directory.name) as index:
+                job = BatchJob(
+                    "napytau",
+                    self.first_path,
+                    content_hash=index.hash_dataset(self.first_path),
+                )
+                # The dataset changes while it is processed, before the index is
+                # updated
+                _write_napytau_file(self.first_path, 0.04)
+                index.update("napytau")
+                index.record_results([job], [BatchResult(self.first_path, 1.0)])
+
+                self.assertEqual(
+                    [dataset.path for dataset in index.find_datasets(stale=True)],
+                    [self.first_path, self.second_path],
+                )
+
+    def test_MarksResultsComputedWithOtherParametersAsStale(self):
+        """Marks results computed with other parameters as stale"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.batch import BatchJob, BatchResult
+            from napytau.headless.campaign_index import CampaignIndex
+
+            with CampaignIndex(self.directory.name) as index:
+                index.update("napytau")
+                index.record_results(
+                    [
+                        BatchJob(
+                            "napytau",
+                            self.first_path,
+                            setup_identifier="first",
+                            t_hyp_estimate=0.5,
+                            content_hash=index.hash_dataset(self.first_path),
+                        )
+                    ],
+                    [BatchResult(self.first_path, 1.0)],
+                )
+
+                self.assertEqual(
+                    [
+                        dataset.path
+                        for dataset in index.find_datasets(
+                            stale=False, setup_identifier="first", t_hyp_estimate=0.5
+                        )
+                    ],
+                    [self.first_path],
+                )
+                self.assertEqual(index.find_datasets(stale=False), [])
+                self.assertEqual(
+                    index.find_datasets(
+                        stale=False, setup_identifier="first", t_hyp_estimate=0.6
+                    ),
+                    [],
+                )
+                self.assertEqual(index.find_datasets()[0].setup_identifier, "first")
+
+    def test_WritesTheDatasetsAsACSVTable(self):
+        """Writes the datasets as a CSV table"""
+        with patch.dict("sys.modules"):
+            from napytau.headless.campaign_index import (
+                CampaignIndex,
+                write_indexed_datasets,
+            )
+
+            with CampaignIndex(self.directory.name) as index:
+                index.update("napytau")
+                output = io.StringIO()
+                write_indexed_datasets(index.find_datasets(), output)
+
+            rows = output.getvalue().splitlines()
+            self.assertEqual(len(rows), 3)
+            self.assertTrue(rows[0].startswith("path,dataset_format,content_hash"))
+            self.assertIn(",first,", rows[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import PurePath
+
+from napytau.core.core import calculate_lifetime_for_fit
+from napytau.headless.headless_kernel import load_dataset, load_dataset_with_raw_setups
+from napytau.import_export.import_export import save_numpy_format_to_directory
+
+
+def _write_napytau_file(file_path: str) -> None:
+    with open(file_path, "w") as file:
+        json.dump(
+            {
+                "relativeVelocity": 0.03,
+                "relativeVelocityError": 0.001,
+                "datapoints": [
+                    {
+                        "distance": distance,
+                        "distanceError": 0.1,
+                        "calibration": 1.0,
+                        "calibrationError": 0.1,
+                        "shiftedIntensity": 10 - distance,
+                        "shiftedIntensityError": 1.0,
+                        "unshiftedIntensity": 2 + distance,
+                        "unshiftedIntensityError": 1.0,
+                    }
+                    for distance in [1.0, 2.0, 3.0, 4.0, 5.0]
+                ],
+                "setups": [
+                    {
+                        "name": "setup",
+                        "tauFactor": 0.5,
+                        "polynomialCount": 2,
+                        "datapointSetups": [{"distance": 2.0, "active": False}],
+                        "samplingPoints": [1.5],
+                    }
+                ],
+            },
+            file,
+        )
+
+
+class HeadlessKernelUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "dataset.json")
+        _write_napytau_file(self.file_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ExportsADatasetThatReopensInTheNumpyFormat(self):
+        """Exports a dataset that reopens in the numpy format"""
+        for trusted in [False, True]:
+            numpy_directory = os.path.join(self.directory.name, f"{trusted}")
+            (dataset, raw_setups) = load_dataset_with_raw_setups(
+                "napytau", self.file_path, None, None, trusted=trusted
+            )
+            save_numpy_format_to_directory(
+                dataset, PurePath(numpy_directory), raw_setups
+            )
+
+            exported_dataset = load_dataset("numpy", numpy_directory, None, "setup")
+            expected_dataset = load_dataset("napytau", self.file_path, None, "setup")
+
+            self.assertEqual(exported_dataset.get_tau_factor(), 0.5)
+            self.assertEqual(
+                calculate_lifetime_for_fit(exported_dataset, 2),
+                calculate_lifetime_for_fit(expected_dataset, 2),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
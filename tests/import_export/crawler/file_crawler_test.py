@@ -1,3 +1,6 @@
+import sys
+import os
+import tempfile
 import unittest
 from pathlib import PurePath
 from re import compile
@@ -36,6 +39,11 @@ def set_up_mocks() -> (
 
 
 class FileCrawlerUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.import_export.crawler.file_crawler", None)
+
     def test_raisesErrorIfProvidedPathIsNotADirectory(self):
         """Raises an error if the provided path is not a directory"""
         os_module_mock, re_module_mock, _, path_mock, isdir_mock, _ = set_up_mocks()
@@ -118,6 +126,76 @@ class FileCrawlerUnitTest(unittest.TestCase):
                 factory_mock.mock_calls[0].args, ([PurePath("some/directory/file2")],)
             )
 
+    def test_yieldsTheFilesOfEveryDirectoryInTheTreeContainingAllPatterns(self):
+        """Yields the files of every directory in the tree containing all patterns"""
+        with tempfile.TemporaryDirectory() as directory:
+            for run_directory, file_names in [
+                ("", ["file1", "file2"]),
+                ("campaign/run1", ["file1", "file2", "other"]),
+                ("campaign/run2", ["file1"]),
+                ("campaign/run2/nested", ["file2", "file1"]),
+            ]:
+                os.makedirs(os.path.join(directory, run_directory), exist_ok=True)
+                for file_name in file_names:
+                    with open(os.path.join(directory, run_directory, file_name), "w"):
+                        pass
+
+            with patch.dict("sys.modules"):
+                from napytau.import_export.crawler.file_crawler import FileCrawler
+
+                file_crawler = FileCrawler(
+                    [compile("file1"), compile("file2")],
+                    lambda files: (
+                        sorted(file.name for file in files)
+                        + [os.path.relpath(files[0].parent, directory)]
+                    ),
+                )
+
+                self.assertEqual(
+                    sorted(file_crawler.crawl_recursively(PurePath(directory), 2)),
+                    [
+                        ["file1", "file2", "."],
+                        ["file1", "file2", os.path.join("campaign", "run1")],
+                        [
+                            "file1",
+                            "file2",
+                            os.path.join("campaign", "run2", "nested"),
+                        ],
+                    ],
+                )
+
+    def test_matchesEveryPatternOnItsOwnWhenCrawlingRecursively(self):
+        """Matches every pattern on its own when crawling recursively"""
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name in ["v_c", "v_c.fit"]:
+                with open(os.path.join(directory, file_name), "w"):
+                    pass
+
+            with patch.dict("sys.modules"):
+                from napytau.import_export.crawler.file_crawler import FileCrawler
+
+                file_crawler = FileCrawler(
+                    [compile("v_c"), compile(".*.fit")],
+                    lambda files: sorted(file.name for file in files),
+                )
+
+                self.assertEqual(
+                    list(file_crawler.crawl_recursively(PurePath(directory))),
+                    [["v_c", "v_c.fit"]],
+                )
+
+    def test_raisesErrorIfProvidedPathIsNotADirectoryWhenCrawlingRecursively(self):
+        """Raises an error if the provided path is not a directory when crawling recursively"""  # noqa: E501
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict("sys.modules"):
+                from napytau.import_export.crawler.file_crawler import FileCrawler
+
+                file_crawler = FileCrawler([compile("file1")], lambda x: x)
+                with self.assertRaises(ValueError):
+                    file_crawler.crawl_recursively(
+                        PurePath(os.path.join(directory, "missing"))
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -244,6 +244,64 @@ class LegacyFactoryUnitTest(unittest.TestCase):
         self.assertEqual(dataset.relative_velocity.error.get_velocity(), 1)
         self.assertEqual(len(dataset.datapoints.as_dict()), 1)
 
+    def test_toleratesCommentsEmptyRowsAndArbitraryWhitespace(self):
+        """Tolerates comments, empty rows and arbitrary whitespace"""
+        dataset = LegacyFactory.create_dataset(
+            RawLegacyData(
+                ["1"],
+                ["# label distance error\n", "a  1\t0.1\n", "\n", " b 2 0.2 # last\n"],
+                ["1 3 0.3 4 0.4\n", "2\t5 0.5 6 0.6 7 0.7 8 0.8\n"],
+                ["# distance calibration error\n", "1   9 0.9\n", "2 10 1.0\n"],
+            )
+        )
+
+        self.assertEqual(len(dataset.datapoints), 2)
+        first_datapoint = dataset.datapoints.get_datapoint_by_distance(1)
+        self.assertEqual(first_datapoint.distance.error, 0.1)
+        self.assertEqual(first_datapoint.calibration.value, 9)
+        self.assertEqual(first_datapoint.unshifted_intensity.error, 0.4)
+        self.assertIsNone(first_datapoint.feeding_shifted_intensity)
+        second_datapoint = dataset.datapoints.get_datapoint_by_distance(2)
+        self.assertEqual(second_datapoint.distance.error, 0.2)
+        self.assertEqual(second_datapoint.shifted_intensity.value, 5)
+        self.assertEqual(second_datapoint.feeding_unshifted_intensity.error, 0.8)
+
+    def test_joinsCalibrationAndFitRowsToTheDistancesInAnyOrder(self):
+        """Joins calibration and fit rows to the distances in any order"""
+        dataset = LegacyFactory.create_dataset(
+            RawLegacyData(
+                ["1"],
+                ["a 3 0.3", "b 1 0.1", "c 2 0.2"],
+                ["2 20 0 0 0", "3 30 0 0 0", "1 10 0 0 0"],
+                ["1 100 0", "3 300 0", "2 200 0", "1 101 0"],
+            )
+        )
+
+        self.assertEqual(
+            [datapoint.distance.value for datapoint in dataset.datapoints], [3, 1, 2]
+        )
+        self.assertEqual(
+            [datapoint.shifted_intensity.value for datapoint in dataset.datapoints],
+            [30, 10, 20],
+        )
+        # Later rows for the same distance replace earlier ones
+        self.assertEqual(
+            [datapoint.calibration.value for datapoint in dataset.datapoints],
+            [300, 101, 200],
+        )
+
+    def test_raisesAnExceptionIfARowReferencesAnUnknownDistance(self):
+        """Raises an exception if a row references an unknown distance"""
+        with self.assertRaises(ValueError):
+            LegacyFactory.create_dataset(
+                RawLegacyData(
+                    ["1"],
+                    ["a 1 1"],
+                    ["1 1 1 1 1"],
+                    ["2 1 1"],
+                )
+            )
+
     def test_raisesAnErrorIfTheProvidedSetupDataIsInvalidWhenEnrichingADataSet(self):
         """Raises an error if the provided setup data is invalid when enriching a dataset"""
         dataset = create_dummy_dataset()
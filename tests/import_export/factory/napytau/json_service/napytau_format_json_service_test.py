@@ -1,3 +1,4 @@
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -15,11 +16,49 @@ def set_up_mocks() -> (MagicMock, MagicMock):
     jsonschema_module_mock = MagicMock()
     jsonschema_module_mock.validate = MagicMock()
     jsonschema_module_mock.ValidationError = BaseException
+    jsonschema_module_mock.exceptions.best_match.return_value = None
 
     return json_module_mock, jsonschema_module_mock
 
 
+def _get_structurally_valid_json_data() -> dict:
+    return {
+        "relativeVelocity": 0.01,
+        "relativeVelocityError": 0.001,
+        "datapoints": [
+            {
+                "distance": distance,
+                "distanceError": 0.1,
+                "calibration": 1,
+                "calibrationError": 0.1,
+                "shiftedIntensity": 10.0,
+                "shiftedIntensityError": 1.0,
+                "unshiftedIntensity": 5.0,
+                "unshiftedIntensityError": 1.0,
+            }
+            for distance in [1.0, 2.0, 3.0]
+        ],
+        "setups": [
+            {
+                "name": "setup",
+                "tauFactor": 1.0,
+                "polynomialCount": 2,
+                "datapointSetups": [],
+                "samplingPoints": [],
+            }
+        ],
+    }
+
+
 class NapytauFormatJsonServiceUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop(
+            "napytau.import_export.factory.napytau.json_service.napytau_format_json_service",
+            None,
+        )
+
     def test_raisesAnImportExportErrorWhenTheRawDataCanNotBeParsed(self):
         """Raises an ImportExportError when the raw data can not be parsed."""
         json_module_mock, jsonschema_module_mock = set_up_mocks()
@@ -77,15 +116,18 @@ class NapytauFormatJsonServiceUnitTest(unittest.TestCase):
             from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
                 NapytauFormatJsonService,
                 _SCHEMA,
+                _get_schema_validator,
             )  # noqa E501
 
+            _get_schema_validator.cache_clear()
             NapytauFormatJsonService.validate_against_schema({})
             json_module_mock.loads.assert_called_once_with(_SCHEMA)
+            _get_schema_validator.cache_clear()
 
     def test_raisesAnImportExportErrorWhenTheRawDataDoesNotMatchTheSchema(self):
         """Raises an ImportExportError when the raw data does not match the schema."""
         json_module_mock, jsonschema_module_mock = set_up_mocks()
-        jsonschema_module_mock.validate.side_effect = BaseException("error")
+        jsonschema_module_mock.exceptions.best_match.return_value = "error"
 
         with patch.dict(
             "sys.modules",
@@ -96,17 +138,23 @@ class NapytauFormatJsonServiceUnitTest(unittest.TestCase):
         ):
             from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
                 NapytauFormatJsonService,
+                _get_schema_validator,
             )  # noqa E501
 
+            _get_schema_validator.cache_clear()
             with self.assertRaises(ImportExportError):
                 NapytauFormatJsonService.validate_against_schema({})
+            _get_schema_validator.cache_clear()
 
     def test_usesTheJsonSchemaModuleToValidateTheRawData(self):
         """Uses the json schema module to validate the raw data."""
         json_module_mock, jsonschema_module_mock = set_up_mocks()
 
         json_module_mock.loads.return_value = {}
-        jsonschema_module_mock.validate.return_value = None
+        validator_class_mock = MagicMock()
+        jsonschema_module_mock.validators.validator_for.return_value = (
+            validator_class_mock
+        )
 
         with patch.dict(
             "sys.modules",
@@ -117,13 +165,101 @@ class NapytauFormatJsonServiceUnitTest(unittest.TestCase):
         ):
             from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
                 NapytauFormatJsonService,
+                _get_schema_validator,
             )  # noqa E501
 
+            _get_schema_validator.cache_clear()
             self.assertTrue(NapytauFormatJsonService.validate_against_schema({}))
-            jsonschema_module_mock.validate.assert_called_once_with(
-                instance={},
-                schema={},
+            validator_class_mock.check_schema.assert_called_once_with({})
+            validator_class_mock.return_value.iter_errors.assert_called_once_with({})
+            _get_schema_validator.cache_clear()
+
+    def test_createsTheSchemaValidatorOnlyOnce(self):
+        """Creates the schema validator only once."""
+        json_module_mock, jsonschema_module_mock = set_up_mocks()
+
+        json_module_mock.loads.return_value = {}
+        validator_class_mock = MagicMock()
+        jsonschema_module_mock.validators.validator_for.return_value = (
+            validator_class_mock
+        )
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "json": json_module_mock,
+                "jsonschema": jsonschema_module_mock,
+            },
+        ):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
+                NapytauFormatJsonService,
+                _get_schema_validator,
+            )  # noqa E501
+
+            _get_schema_validator.cache_clear()
+            NapytauFormatJsonService.validate_against_schema({})
+            NapytauFormatJsonService.validate_against_schema({})
+
+            self.assertEqual(len(json_module_mock.loads.mock_calls), 1)
+            self.assertEqual(len(validator_class_mock.check_schema.mock_calls), 1)
+            self.assertEqual(
+                len(validator_class_mock.return_value.iter_errors.mock_calls), 2
             )
+            _get_schema_validator.cache_clear()
+
+    def test_acceptsStructurallyValidJsonData(self):
+        """Accepts structurally valid json data."""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
+                NapytauFormatJsonService,
+            )  # noqa E501
+
+            self.assertTrue(
+                NapytauFormatJsonService.validate_structure(
+                    _get_structurally_valid_json_data()
+                )
+            )
+
+    def test_raisesAnImportExportErrorWhenARequiredKeyIsMissing(self):
+        """Raises an ImportExportError when a required key is missing."""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
+                NapytauFormatJsonService,
+            )  # noqa E501
+
+            json_data = _get_structurally_valid_json_data()
+            del json_data["datapoints"][1]["shiftedIntensityError"]
+
+            with self.assertRaises(ImportExportError):
+                NapytauFormatJsonService.validate_structure(json_data)
+
+            json_data = _get_structurally_valid_json_data()
+            del json_data["setups"]
+
+            with self.assertRaises(ImportExportError):
+                NapytauFormatJsonService.validate_structure(json_data)
+
+    def test_raisesAnImportExportErrorWhenADatapointValueIsNotANonNegativeNumber(
+        self,
+    ):
+        """Raises an ImportExportError when a datapoint value is not a non-negative number."""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_service import (
+                NapytauFormatJsonService,
+            )  # noqa E501
+
+            for value in ["1.0", None, [1.0, 2.0], -1.0]:
+                json_data = _get_structurally_valid_json_data()
+                json_data["datapoints"][1]["distance"] = value
+
+                with self.assertRaises(ImportExportError):
+                    NapytauFormatJsonService.validate_structure(json_data)
+
+            json_data = _get_structurally_valid_json_data()
+            json_data["datapoints"][0]["feedingShiftedIntensity"] = -1.0
+
+            with self.assertRaises(ImportExportError):
+                NapytauFormatJsonService.validate_structure(json_data)
 
     def test_raisesAnImportExportErrorWhenTheProvidedDatasetCanNotBeConvertedToJSON(
         self,
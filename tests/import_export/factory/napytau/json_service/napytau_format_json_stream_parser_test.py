@@ -0,0 +1,213 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import PurePath
+from unittest.mock import patch
+
+import numpy as np
+
+from napytau.import_export.import_export_error import ImportExportError
+
+
+def _get_json_data() -> dict:
+    return {
+        # The keys may appear in any order, unknown keys are skipped
+        "setups": [
+            {
+                "name": "first",
+                "tauFactor": 0.5,
+                "polynomialCount": 2,
+                "datapointSetups": [{"distance": 1.0, "active": False}],
+                "samplingPoints": [],
+                "comment": 'nested "quotes" and ]} brackets',
+            },
+            {
+                "name": "second",
+                "tauFactor": 0.7,
+                "polynomialCount": 3,
+                "datapointSetups": [],
+                "samplingPoints": [1.0, 2.0],
+            },
+        ],
+        "relativeVelocity": 0.01,
+        "comment": {"nested": [1, {"object": "}"}]},
+        "datapoints": [
+            {
+                "distance": 1.0,
+                "distanceError": 0.1,
+                "calibration": 2.0,
+                "calibrationError": 0.2,
+                "shiftedIntensity": 10,
+                "shiftedIntensityError": 1,
+                "unshiftedIntensity": 5.0,
+                "unshiftedIntensityError": 0.5,
+            },
+            {
+                "distance": 2.0,
+                "distanceError": 0.1,
+                "calibration": 3.0,
+                "calibrationError": 0.3,
+                "shiftedIntensity": 8.0,
+                "shiftedIntensityError": 1.0,
+                "unshiftedIntensity": 6.0,
+                "unshiftedIntensityError": 0.6,
+                "feedingShiftedIntensity": 1.5,
+                "feedingShiftedIntensityError": 0.15,
+                "feedingUnshiftedIntensity": 2.5,
+                "feedingUnshiftedIntensityError": 0.25,
+            },
+        ],
+        "relativeVelocityError": 0.001,
+    }
+
+
+class NapytauFormatJsonStreamParserUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_file(self, content: str) -> PurePath:
+        file_path = os.path.join(self.directory.name, "data.json")
+        with open(file_path, "w") as file:
+            file.write(content)
+
+        return PurePath(file_path)
+
+    def test_canParseTheDatapointsIntoColumns(self):
+        """Can parse the datapoints into columns"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser import (  # noqa E501
+                NapytauFormatJsonStreamParser,
+            )
+
+            streamed_data = NapytauFormatJsonStreamParser.parse_file(
+                self._write_file(json.dumps(_get_json_data(), indent=2))
+            )
+
+            self.assertEqual(streamed_data.relative_velocity, 0.01)
+            self.assertEqual(streamed_data.relative_velocity_error, 0.001)
+            columns = streamed_data.datapoints
+            np.testing.assert_array_equal(columns.get_values("distance"), [1, 2])
+            np.testing.assert_array_equal(
+                columns.get_errors("unshifted_intensity"), [0.5, 0.6]
+            )
+            np.testing.assert_array_equal(
+                columns.get_mask("feeding_shifted_intensity"), [False, True]
+            )
+            np.testing.assert_array_equal(
+                columns.get_value_error_pairs(
+                    "feeding_unshifted_intensity"
+                ).get_errors(),
+                [0.25],
+            )
+            np.testing.assert_array_equal(columns.get_mask("tau"), [False, False])
+
+    def test_canParseFilesReadInManySmallChunks(self):
+        """Can parse files read in many small chunks"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service import (
+                napytau_format_json_stream_parser,
+            )
+
+            file_path = self._write_file(json.dumps(_get_json_data(), indent=2))
+            expected_data = napytau_format_json_stream_parser.NapytauFormatJsonStreamParser.parse_file(
+                file_path
+            )
+
+            with patch.object(napytau_format_json_stream_parser, "_CHUNK_SIZE", 3):
+                streamed_data = napytau_format_json_stream_parser.NapytauFormatJsonStreamParser.parse_file(
+                    file_path
+                )
+
+                for column in ["distance", "calibration", "feeding_shifted_intensity"]:
+                    np.testing.assert_array_equal(
+                        streamed_data.datapoints.get_values(column),
+                        expected_data.datapoints.get_values(column),
+                    )
+                self.assertEqual(list(streamed_data.setups), list(expected_data.setups))
+
+    def test_parsesTheSetupsOnlyWhenIteratingOverThem(self):
+        """Parses the setups only when iterating over them"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser import (  # noqa E501
+                NapytauFormatJsonStreamParser,
+            )
+
+            streamed_data = NapytauFormatJsonStreamParser.parse_file(
+                self._write_file(json.dumps(_get_json_data()))
+            )
+
+            with patch("json.loads", side_effect=json.loads) as loads_mock:
+                setup = next(
+                    setup for setup in streamed_data.setups if setup["name"] == "first"
+                )
+
+                self.assertEqual(setup, _get_json_data()["setups"][0])
+                self.assertEqual(len(loads_mock.mock_calls), 1)
+
+            self.assertEqual(
+                [setup["name"] for setup in streamed_data.setups], ["first", "second"]
+            )
+
+    def test_raisesAnImportExportErrorWhenADatapointIsMissingARequiredKey(self):
+        """Raises an ImportExportError when a datapoint is missing a required key"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser import (  # noqa E501
+                NapytauFormatJsonStreamParser,
+            )
+
+            json_data = _get_json_data()
+            del json_data["datapoints"][1]["calibrationError"]
+
+            with self.assertRaises(ImportExportError):
+                NapytauFormatJsonStreamParser.parse_file(
+                    self._write_file(json.dumps(json_data))
+                )
+
+    def test_raisesAnImportExportErrorWhenADatapointValueIsNotANonNegativeNumber(
+        self,
+    ):
+        """Raises an ImportExportError when a datapoint value is not a non-negative number"""  # noqa E501
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser import (  # noqa E501
+                NapytauFormatJsonStreamParser,
+            )
+
+            for value in ["1.0", None, -1.0]:
+                json_data = _get_json_data()
+                json_data["datapoints"][0]["shiftedIntensity"] = value
+
+                with self.assertRaises(ImportExportError):
+                    NapytauFormatJsonStreamParser.parse_file(
+                        self._write_file(json.dumps(json_data))
+                    )
+
+    def test_raisesAnImportExportErrorWhenTheFileIsIncomplete(self):
+        """Raises an ImportExportError when the file is incomplete"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser import (  # noqa E501
+                NapytauFormatJsonStreamParser,
+            )
+
+            content = json.dumps(_get_json_data())
+
+            for length in [0, len(content) // 2, len(content) - 1]:
+                with self.assertRaises(ImportExportError):
+                    NapytauFormatJsonStreamParser.parse_file(
+                        self._write_file(content[:length])
+                    )
+
+            json_data = _get_json_data()
+            del json_data["setups"]
+
+            with self.assertRaises(ImportExportError):
+                NapytauFormatJsonStreamParser.parse_file(
+                    self._write_file(json.dumps(json_data))
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
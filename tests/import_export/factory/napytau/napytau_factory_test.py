@@ -1,3 +1,4 @@
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -9,6 +10,11 @@ from napytau.util.model.value_error_pair import ValueErrorPair
 
 
 class NapytauFactoryUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.import_export.factory.napytau.napytau_factory", None)
+
     def test_usesTheJsonFormatServiceToValidateTheDataWhenCreatingADataset(self):
         """Uses the JSON format service to validate the data when creating a dataset"""
         napytau_format_json_service_module_mock = MagicMock()
@@ -44,6 +50,37 @@ class NapytauFactoryUnitTest(unittest.TestCase):
                 },
             )
 
+    def test_onlyChecksTheStructureOfTrustedDataWhenCreatingADataset(self):
+        """Only checks the structure of trusted data when creating a dataset"""
+        napytau_format_json_service_module_mock = MagicMock()
+        napytau_format_json_service_mock = MagicMock()
+        napytau_format_json_service_module_mock.NapytauFormatJsonService = (
+            napytau_format_json_service_mock
+        )
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.import_export.factory.napytau.json_service.napytau_format_json_service": napytau_format_json_service_module_mock,
+            },
+        ):
+            from napytau.import_export.factory.napytau.napytau_factory import (
+                NapyTauFactory,
+            )
+
+            raw_json_data = {
+                "relativeVelocity": 1,
+                "relativeVelocityError": 0.1,
+                "datapoints": [],
+            }
+
+            NapyTauFactory.create_dataset(raw_json_data, trusted=True)
+
+            napytau_format_json_service_mock.validate_structure.assert_called_once_with(
+                raw_json_data
+            )
+            napytau_format_json_service_mock.validate_against_schema.assert_not_called()
+
     def test_canCreateADatasetFromDataWithoutFeedingIntensities(self):
         """Can create a dataset from data without feeding intensities"""
 
@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from napytau.import_export.import_export_error import ImportExportError
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.dataset import DataSet
+from napytau.import_export.model.relative_velocity import RelativeVelocity
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+
+def _get_dataset_stub() -> DataSet:
+    return DataSet(
+        ValueErrorPair(RelativeVelocity(0.01), RelativeVelocity(0.001)),
+        DatapointCollection(
+            [
+                Datapoint(
+                    ValueErrorPair(1.0, 0.1),
+                    ValueErrorPair(2.0, 0.2),
+                    ValueErrorPair(10.0, 1.0),
+                    ValueErrorPair(5.0, 0.5),
+                ),
+                Datapoint(
+                    ValueErrorPair(2.0, 0.1),
+                    ValueErrorPair(3.0, 0.3),
+                    ValueErrorPair(8.0, 1.0),
+                    ValueErrorPair(6.0, 0.6),
+                    ValueErrorPair(1.5, 0.15),
+                    ValueErrorPair(2.5, 0.25),
+                    ValueErrorPair(4.0, 0.4),
+                    active=False,
+                ),
+            ]
+        ),
+    )
+
+
+def _get_raw_setups_stub() -> list:
+    return [
+        {
+            "name": "first",
+            "tauFactor": 0.5,
+            "polynomialCount": 2,
+            "datapointSetups": [
+                {"distance": 1.0, "active": False},
+                {"distance": 2.0, "active": True},
+            ],
+            "samplingPoints": [],
+        },
+        {
+            "name": "second",
+            "tauFactor": 0.7,
+            "polynomialCount": 3,
+            "datapointSetups": [],
+            "samplingPoints": [1.0, 2.0],
+        },
+    ]
+
+
+class NumpyFactoryUnitTest(unittest.TestCase):
+    def test_canConvertADatasetToArraysAndBack(self):
+        """Can convert a dataset to arrays and back"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.numpy.numpy_factory import NumpyFactory
+
+            dataset = _get_dataset_stub()
+
+            arrays = NumpyFactory.create_arrays(dataset)
+            created_dataset = NumpyFactory.create_dataset(arrays)
+
+            self.assertEqual(
+                created_dataset.get_relative_velocity(),
+                dataset.get_relative_velocity(),
+            )
+            self.assertEqual(
+                list(created_dataset.get_datapoints()),
+                list(dataset.get_datapoints()),
+            )
+            np.testing.assert_array_equal(
+                created_dataset.get_datapoints().get_columns().get_active_mask(),
+                [True, False],
+            )
+
+    def test_canConvertSetupsToArraysAndBack(self):
+        """Can convert setups to arrays and back"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.numpy.numpy_factory import NumpyFactory
+
+            arrays = NumpyFactory.create_arrays(
+                _get_dataset_stub(), _get_raw_setups_stub()
+            )
+
+            self.assertEqual(NumpyFactory.create_setups(arrays), _get_raw_setups_stub())
+            self.assertEqual(
+                NumpyFactory.create_setups(
+                    NumpyFactory.create_arrays(_get_dataset_stub())
+                ),
+                [],
+            )
+
+    def test_usesOnlyArraysThatCanBeLoadedWithoutPickling(self):
+        """Uses only arrays that can be loaded without pickling"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.numpy.numpy_factory import NumpyFactory
+
+            arrays = NumpyFactory.create_arrays(
+                _get_dataset_stub(), _get_raw_setups_stub()
+            )
+
+            for array in arrays.values():
+                self.assertFalse(array.dtype.hasobject)
+
+    def test_raisesAnImportExportErrorForAnUnsupportedFormatVersion(self):
+        """Raises an ImportExportError for an unsupported format version"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.numpy.numpy_factory import (
+                FORMAT_VERSION,
+                FORMAT_VERSION_ARRAY,
+                NumpyFactory,
+            )
+
+            arrays = NumpyFactory.create_arrays(_get_dataset_stub())
+            arrays[FORMAT_VERSION_ARRAY] = np.array(FORMAT_VERSION + 1)
+
+            with self.assertRaises(ImportExportError):
+                NumpyFactory.create_dataset(arrays)
+
+            del arrays[FORMAT_VERSION_ARRAY]
+
+            with self.assertRaises(ImportExportError):
+                NumpyFactory.create_setups(arrays)
+
+    def test_raisesAnImportExportErrorForAMissingArray(self):
+        """Raises an ImportExportError for a missing array"""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.factory.numpy.numpy_factory import NumpyFactory
+
+            arrays = NumpyFactory.create_arrays(_get_dataset_stub())
+            del arrays["calibration_values"]
+
+            with self.assertRaises(ImportExportError):
+                NumpyFactory.create_dataset(arrays)
+
+
+if __name__ == "__main__":
+    unittest.main()
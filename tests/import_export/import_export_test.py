@@ -1,3 +1,5 @@
+import sys
+import tempfile
 import unittest
 from pathlib import PurePath
 from unittest.mock import MagicMock, patch
@@ -69,6 +71,11 @@ def set_up_mocks() -> (
 
 
 class IngestUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real module once for all their tests, while
+        # each test here imports it again with its mocks
+        sys.modules.pop("napytau.import_export.import_export", None)
+
     def test_instantiatesTheFileCrawlerWithAFitPatternIfNoFitFileIsProvided(self):
         """Instantiates the file crawler with a fit pattern if no fit file is provided."""
         (
@@ -164,6 +171,50 @@ class IngestUnitTest(unittest.TestCase):
             import_legacy_format_from_files(PurePath("test_directory"))
             file_crawler_module_mock.FileCrawler.mock_calls[0].crawl("test_directory")
 
+    def test_crawlsTheDirectoryTreeRecursivelyForLegacyDatasets(self):
+        """Crawls the directory tree recursively for legacy datasets."""
+        (
+            legacy_factory_module_mock,
+            file_crawler_module_mock,
+            file_reader_module_mock,
+            regex_module_mock,
+            naptau_format_json_service_module_mock,
+            _,
+            _,
+        ) = set_up_mocks()
+        regex_module_mock.compile = lambda x: x
+        file_crawler_module_mock.FileCrawler.crawl_recursively.return_value = iter(
+            ["setup_files"]
+        )
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.import_export.factory.legacy.legacy_factory": legacy_factory_module_mock,
+                "napytau.import_export.crawler.file_crawler": file_crawler_module_mock,
+                "napytau.import_export.reader.file_reader": file_reader_module_mock,
+                "re": regex_module_mock,
+                "napytau.import_export.factory.napytau.json_service.napytau_format_json_service": naptau_format_json_service_module_mock,
+            },
+        ):
+            from napytau.import_export.import_export import (
+                crawl_legacy_format_setup_files,
+            )
+
+            self.assertEqual(
+                list(crawl_legacy_format_setup_files(PurePath("test_directory"))),
+                ["setup_files"],
+            )
+            self.assertEqual(
+                file_crawler_module_mock.FileCrawler.mock_calls[0].args[0],
+                ["v_c", "distances.dat", "norm.fac", ".*.fit"],
+            )
+            self.assertEqual(
+                file_crawler_module_mock.FileCrawler.crawl_recursively.mock_calls[
+                    0
+                ].args,
+                (PurePath("test_directory"),),
+            )
+
     def test_readsEveryFileReturnedByTheFileCrawler(self):
         """Reads every file returned by the file crawler."""
         (
@@ -604,6 +655,51 @@ class IngestUnitTest(unittest.TestCase):
                 ["setup1", "setup2"],
             )
 
+    def test_streamsTrustedFilesIntoColumns(self):
+        """Streams trusted files into columns."""
+        (
+            legacy_factory_module_mock,
+            file_crawler_module_mock,
+            file_reader_module_mock,
+            regex_module_mock,
+            naptau_format_json_service_module_mock,
+            napytau_factory_module_mock,
+            _,
+        ) = set_up_mocks()
+        stream_parser_module_mock = MagicMock()
+        streamed_data = stream_parser_module_mock.NapytauFormatJsonStreamParser.parse_file.return_value
+        streamed_data.relative_velocity = 1
+        streamed_data.relative_velocity_error = 0.1
+
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.import_export.factory.legacy.legacy_factory": legacy_factory_module_mock,
+                "napytau.import_export.crawler.file_crawler": file_crawler_module_mock,
+                "napytau.import_export.reader.file_reader": file_reader_module_mock,
+                "re": regex_module_mock,
+                "napytau.import_export.factory.napytau.json_service.napytau_format_json_service": naptau_format_json_service_module_mock,
+                "napytau.import_export.factory.napytau.json_service.napytau_format_json_stream_parser": stream_parser_module_mock,
+                "napytau.import_export.factory.napytau.napytau_factory": napytau_factory_module_mock,
+            },
+        ):
+            from napytau.import_export.import_export import (
+                import_napytau_format_from_file,
+            )
+
+            result = import_napytau_format_from_file(
+                PurePath("test.napytau.json"), trusted=True
+            )
+
+            stream_parser_module_mock.NapytauFormatJsonStreamParser.parse_file.assert_called_once_with(
+                PurePath("test.napytau.json")
+            )
+            napytau_factory_module_mock.NapyTauFactory.create_dataset_from_columns.assert_called_once_with(
+                1, 0.1, streamed_data.datapoints
+            )
+            file_reader_module_mock.FileReader.read_text.assert_not_called()
+            self.assertEqual(result[1], streamed_data.setups)
+
     def test_raisesAnExceptionIfTheSetupWithTheGivenNameIsNotFoundInTheProvidedRawSetups(
         self,
     ):
@@ -797,6 +893,66 @@ class IngestUnitTest(unittest.TestCase):
                 "test_calculation_data_string",
             )
 
+    def test_canSaveADatasetInTheNumpyFormatAndImportItAgain(self):
+        """Can save a dataset in the numpy format and import it again."""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.import_export import (
+                import_numpy_format_from_directory,
+                read_napytau_setup_data_into_data_set,
+                save_numpy_format_to_directory,
+            )
+            from napytau.import_export.model.datapoint import Datapoint
+
+            dataset = DataSet(
+                ValueErrorPair(RelativeVelocity(0.01), RelativeVelocity(0.001)),
+                DatapointCollection(
+                    [
+                        Datapoint(
+                            ValueErrorPair(1.0, 0.1),
+                            ValueErrorPair(2.0, 0.2),
+                            ValueErrorPair(10.0, 1.0),
+                            ValueErrorPair(5.0, 0.5),
+                        ),
+                        Datapoint(
+                            ValueErrorPair(2.0, 0.1),
+                            ValueErrorPair(3.0, 0.3),
+                            ValueErrorPair(8.0, 1.0),
+                            ValueErrorPair(6.0, 0.6),
+                        ),
+                    ]
+                ),
+            )
+            raw_setups = [
+                {
+                    "name": "setup",
+                    "tauFactor": 0.5,
+                    "polynomialCount": 2,
+                    "datapointSetups": [{"distance": 2.0, "active": False}],
+                    "samplingPoints": [1.5],
+                }
+            ]
+
+            with tempfile.TemporaryDirectory() as directory:
+                save_numpy_format_to_directory(dataset, PurePath(directory), raw_setups)
+                (imported_dataset, imported_setups) = (
+                    import_numpy_format_from_directory(PurePath(directory))
+                )
+                read_napytau_setup_data_into_data_set(
+                    imported_dataset, imported_setups, "setup"
+                )
+
+                self.assertEqual(imported_setups, raw_setups)
+                self.assertEqual(imported_dataset.get_tau_factor(), 0.5)
+                self.assertEqual(
+                    imported_dataset.get_datapoints().get_shifted_intensities(),
+                    dataset.get_datapoints().get_shifted_intensities(),
+                )
+                self.assertFalse(
+                    imported_dataset.get_datapoints()
+                    .get_datapoint_by_distance(2.0)
+                    .active
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
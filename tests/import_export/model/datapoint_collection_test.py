@@ -1,7 +1,10 @@
 import unittest
 
+import numpy as np
+
 from napytau.import_export.model.datapoint import Datapoint
 from napytau.import_export.model.datapoint_collection import DatapointCollection
+from napytau.import_export.model.datapoint_columns import DISTANCE, DatapointColumns
 from napytau.util.model.ValueErrorPairCollection import ValueErrorPairCollection
 from napytau.util.model.value_error_pair import ValueErrorPair
 
@@ -351,6 +354,147 @@ class DatapointCollectionUnitTest(unittest.TestCase):
             [collection.elements[hash(12.12)], collection.elements[hash(12.14)]],
         )
 
+    def test_servesRepeatedGetterCallsFromTheSameColumns(self):
+        """Serves repeated getter calls from the same columns"""
+        collection = DatapointCollection(
+            [
+                Datapoint(
+                    distance=ValueErrorPair(12.12, 0.1),
+                ),
+                Datapoint(
+                    distance=ValueErrorPair(12.13, 0.1),
+                ),
+            ]
+        )
+
+        distances = collection.get_distances().get_values()
+
+        self.assertIs(collection.get_distances().get_values(), distances)
+        self.assertFalse(distances.flags.writeable)
+
+    def test_rebuildsItsColumnsWhenADatapointIsModified(self):
+        """Rebuilds its columns when a datapoint is modified"""
+        datapoint = Datapoint(
+            distance=ValueErrorPair(12.12, 0.1),
+        )
+        collection = DatapointCollection([datapoint])
+
+        self.assertEqual(len(collection.get_shifted_intensities().get_values()), 0)
+
+        datapoint.set_intensity(ValueErrorPair(1.0, 0.1), ValueErrorPair(2.0, 0.2))
+
+        np.testing.assert_array_equal(
+            collection.get_shifted_intensities().get_values(), np.array([1.0])
+        )
+        np.testing.assert_array_equal(
+            collection.get_columns().get_active_mask(), np.array([True])
+        )
+
+        datapoint.active = False
+
+        np.testing.assert_array_equal(
+            collection.get_columns().get_active_mask(), np.array([False])
+        )
+
+    def test_keepsItsColumnsWhenADatapointOfAnotherCollectionIsModified(self):
+        """Keeps its columns when a datapoint of another collection is modified"""
+        collection = DatapointCollection(
+            [Datapoint(distance=ValueErrorPair(12.12, 0.1))]
+        )
+        other_datapoint = Datapoint(distance=ValueErrorPair(12.13, 0.1))
+        other_collection = DatapointCollection([other_datapoint])
+        columns = collection.get_columns()
+        other_columns = other_collection.get_columns()
+
+        other_datapoint.active = False
+
+        self.assertIs(collection.get_columns(), columns)
+        self.assertIsNot(other_collection.get_columns(), other_columns)
+
+    def test_rebuildsItsColumnsWhenADatapointIsAdded(self):
+        """Rebuilds its columns when a datapoint is added"""
+        collection = DatapointCollection([])
+        self.assertEqual(len(collection.get_columns()), 0)
+
+        collection.add_datapoint(Datapoint(distance=ValueErrorPair(12.12, 0.1)))
+
+        np.testing.assert_array_equal(
+            collection.get_distances().get_values(), np.array([12.12])
+        )
+
+    def test_stopsFollowingADatapointItReplaced(self):
+        """Stops following a datapoint it replaced"""
+        replaced_datapoint = Datapoint(distance=ValueErrorPair(12.12, 0.1))
+        collection = DatapointCollection([replaced_datapoint])
+        collection.add_datapoint(Datapoint(distance=ValueErrorPair(12.12, 0.2)))
+        columns = collection.get_columns()
+
+        replaced_datapoint.active = False
+
+        self.assertIs(collection.get_columns(), columns)
+
+    def test_rebuildsColumnsItWasCreatedFromWhenADatapointIsModified(self):
+        """Rebuilds the columns it was created from when a datapoint is modified"""
+        columns = DatapointColumns(
+            {DISTANCE: np.array([12.12, 12.13])},
+            {DISTANCE: np.array([0.1, 0.2])},
+        )
+        collection = DatapointCollection.from_columns(columns)
+
+        collection.get_datapoint_by_distance(12.13).active = False
+
+        self.assertIsNot(collection.get_columns(), columns)
+        np.testing.assert_array_equal(
+            collection.get_columns().get_active_mask(), np.array([True, False])
+        )
+
+    def test_canBeCreatedFromColumns(self):
+        """Can be created from columns"""
+        columns = DatapointColumns(
+            {DISTANCE: np.array([12.12, 12.13])},
+            {DISTANCE: np.array([0.1, 0.2])},
+        )
+
+        collection = DatapointCollection.from_columns(columns)
+
+        self.assertIs(collection.get_columns(), columns)
+        self.assertEqual(
+            collection.get_datapoint_by_distance(12.13).distance,
+            ValueErrorPair(12.13, 0.2),
+        )
+
+    def test_createsTheDatapointsOfColumnsOnlyOnceTheyAreAccessed(self):
+        """Creates the datapoints of columns only once they are accessed"""
+        columns = DatapointColumns(
+            {DISTANCE: np.array([12.12, 12.13])},
+            {DISTANCE: np.array([0.1, 0.2])},
+        )
+
+        collection = DatapointCollection.from_columns(columns)
+        Datapoint(distance=ValueErrorPair(1.0, 0.1)).set_active(False)
+
+        self.assertEqual(len(collection), 2)
+        self.assertIs(collection.get_columns(), columns)
+        self.assertIsNone(collection._elements)
+
+        collection[0].set_active(False)
+
+        np.testing.assert_array_equal(
+            collection.get_columns().get_active_mask(), np.array([False, True])
+        )
+
+    def test_keepsOnlyOneDatapointPerDistanceWhenCreatedFromColumns(self):
+        """Keeps only one datapoint per distance when created from columns"""
+        columns = DatapointColumns(
+            {DISTANCE: np.array([12.12, 12.12])},
+            {DISTANCE: np.array([0.1, 0.2])},
+        )
+
+        collection = DatapointCollection.from_columns(columns)
+
+        self.assertEqual(len(collection), 1)
+        self.assertEqual(len(collection.get_columns()), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
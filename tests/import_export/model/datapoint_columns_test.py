@@ -0,0 +1,142 @@
+import unittest
+
+import numpy as np
+
+from napytau.import_export.model.datapoint import Datapoint
+from napytau.import_export.model.datapoint_columns import (
+    CALIBRATION,
+    DISTANCE,
+    SHIFTED_INTENSITY,
+    TAU,
+    DatapointColumns,
+)
+from napytau.util.model.ValueErrorPairCollection import ValueErrorPairCollection
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+
+class DatapointColumnsUnitTest(unittest.TestCase):
+    def test_canBeCreatedFromDatapoints(self):
+        """Can be created from datapoints"""
+        columns = DatapointColumns.from_datapoints(
+            [
+                Datapoint(
+                    distance=ValueErrorPair(12.12, 0.1),
+                    calibration=ValueErrorPair(1.0, 0.2),
+                ),
+                Datapoint(
+                    distance=ValueErrorPair(12.13, 0.3),
+                    active=False,
+                ),
+            ]
+        )
+
+        self.assertEqual(len(columns), 2)
+        np.testing.assert_array_equal(
+            columns.get_values(DISTANCE), np.array([12.12, 12.13])
+        )
+        np.testing.assert_array_equal(
+            columns.get_errors(DISTANCE), np.array([0.1, 0.3])
+        )
+        np.testing.assert_array_equal(
+            columns.get_values(CALIBRATION), np.array([1.0, np.nan])
+        )
+        np.testing.assert_array_equal(
+            columns.get_mask(CALIBRATION), np.array([True, False])
+        )
+        np.testing.assert_array_equal(columns.get_mask(TAU), np.array([False, False]))
+        np.testing.assert_array_equal(
+            columns.get_active_mask(), np.array([True, False])
+        )
+
+    def test_storesContiguousReadOnlyFloatArrays(self):
+        """Stores contiguous read-only float arrays"""
+        columns = DatapointColumns.from_datapoints(
+            [Datapoint(distance=ValueErrorPair(1, 0))]
+        )
+
+        distances = columns.get_values(DISTANCE)
+        self.assertEqual(distances.dtype, np.float64)
+        self.assertTrue(distances.flags.c_contiguous)
+        self.assertFalse(distances.flags.writeable)
+        with self.assertRaises(ValueError):
+            distances[0] = 2.0
+
+    def test_canBeCreatedFromArraysWithoutCopyingThem(self):
+        """Can be created from arrays without copying them"""
+        distances = np.array([1.0, 2.0, 3.0])
+        columns = DatapointColumns(
+            {DISTANCE: distances, SHIFTED_INTENSITY: np.array([4.0, np.nan, 6.0])},
+            {DISTANCE: np.zeros(3), SHIFTED_INTENSITY: np.ones(3)},
+        )
+
+        self.assertTrue(np.shares_memory(columns.get_values(DISTANCE), distances))
+        # Without an explicit mask, NaN values mark missing entries
+        np.testing.assert_array_equal(
+            columns.get_mask(SHIFTED_INTENSITY), np.array([True, False, True])
+        )
+        np.testing.assert_array_equal(
+            columns.get_mask(CALIBRATION), np.array([False, False, False])
+        )
+        np.testing.assert_array_equal(
+            columns.get_active_mask(), np.array([True, True, True])
+        )
+
+    def test_raisesAnErrorForColumnsOfDifferentLengths(self):
+        """Raises an error for columns of different lengths"""
+        with self.assertRaises(ValueError):
+            DatapointColumns(
+                {DISTANCE: np.zeros(3), SHIFTED_INTENSITY: np.zeros(2)},
+                {DISTANCE: np.zeros(3), SHIFTED_INTENSITY: np.zeros(2)},
+            )
+
+    def test_providesTheValueErrorPairsOfPresentEntries(self):
+        """Provides the value error pairs of present entries"""
+        columns = DatapointColumns.from_datapoints(
+            [
+                Datapoint(
+                    distance=ValueErrorPair(1.0, 0.1),
+                    calibration=ValueErrorPair(1.0, 0.2),
+                ),
+                Datapoint(distance=ValueErrorPair(2.0, 0.1)),
+            ]
+        )
+
+        self.assertEqual(
+            columns.get_value_error_pairs(CALIBRATION),
+            ValueErrorPairCollection([ValueErrorPair(1.0, 0.2)]),
+        )
+        # Complete columns are handed out as views
+        self.assertTrue(
+            np.shares_memory(
+                columns.get_value_error_pairs(DISTANCE).get_values(),
+                columns.get_values(DISTANCE),
+            )
+        )
+        self.assertIs(
+            columns.get_value_error_pairs(CALIBRATION),
+            columns.get_value_error_pairs(CALIBRATION),
+        )
+
+    def test_canBeTurnedBackIntoDatapoints(self):
+        """Can be turned back into datapoints"""
+        datapoints = [
+            Datapoint(
+                distance=ValueErrorPair(12.12, 0.1),
+                calibration=ValueErrorPair(1.0, 0.2),
+                shifted_intensity=ValueErrorPair(3.0, 0.3),
+                unshifted_intensity=ValueErrorPair(4.0, 0.4),
+            ),
+            Datapoint(
+                distance=ValueErrorPair(12.13, 0.1),
+                tau=ValueErrorPair(5.0, 0.5),
+                active=False,
+            ),
+        ]
+
+        self.assertEqual(
+            DatapointColumns.from_datapoints(datapoints).to_datapoints(), datapoints
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
+import sys
+import tempfile
 import unittest
 from pathlib import PurePath
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 
 def set_up_mocks() -> (MagicMock, MagicMock):
     path_mock = MagicMock()
@@ -11,6 +15,12 @@ def set_up_mocks() -> (MagicMock, MagicMock):
 
 
 class FileReaderUnitTest(unittest.TestCase):
+    def setUp(self):
+        # Other tests import the real modules once for all their tests, while
+        # each test here imports them again with its mocks
+        sys.modules.pop("napytau.import_export.reader.file_reader", None)
+        sys.modules.pop("napytau.import_export.writer.file_writer", None)
+
     def test_raisesAnErrorIfTheFileDoesNotExistWhenReadingRows(self):
         """Raises an error if the file does not exist when reading rows."""
         path_mock, isfile_mock = set_up_mocks()
@@ -58,6 +68,39 @@ class FileReaderUnitTest(unittest.TestCase):
                 text = FileReader.read_text(PurePath("test.txt"))
                 self.assertEqual(text, "text")
 
+    def test_raisesAnErrorIfTheDirectoryDoesNotExistWhenReadingArrays(self):
+        """Raises an error if the directory does not exist when reading arrays."""
+        path_mock, _ = set_up_mocks()
+        path_mock.isdir.return_value = False
+        with patch.dict("sys.modules", {"os.path": path_mock}):
+            from napytau.import_export.reader.file_reader import FileReader
+
+            with self.assertRaises(FileNotFoundError):
+                FileReader.read_arrays(PurePath("test"))
+
+    def test_readsTheArraysWrittenToADirectoryMemoryMapped(self):
+        """Reads the arrays written to a directory memory mapped."""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.reader.file_reader import FileReader
+            from napytau.import_export.writer.file_writer import FileWriter
+
+            with tempfile.TemporaryDirectory() as directory:
+                arrays = {
+                    "values": np.array([1.0, 2.0, np.nan]),
+                    "mask": np.array([True, False, True]),
+                    "names": np.array(["first", "second"]),
+                    "version": np.array(1),
+                }
+                FileWriter.write_arrays(PurePath(directory, "dataset"), arrays)
+
+                read_arrays = FileReader.read_arrays(PurePath(directory, "dataset"))
+
+                self.assertEqual(read_arrays.keys(), arrays.keys())
+                for name, array in arrays.items():
+                    np.testing.assert_array_equal(read_arrays[name], array)
+                self.assertIsInstance(read_arrays["values"], np.memmap)
+                self.assertFalse(read_arrays["values"].flags.writeable)
+
 
 if __name__ == "__main__":
     unittest.main()
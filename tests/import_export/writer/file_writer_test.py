@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 from pathlib import PurePath
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 
 class FileReaderUnitTest(unittest.TestCase):
     def test_writesRowsToTheFileAtTheGivenPath(self):
@@ -32,6 +36,29 @@ class FileReaderUnitTest(unittest.TestCase):
             write_function_mock = open_mock.return_value.__enter__.return_value.write
             write_function_mock.assert_called_once_with("text")
 
+    def test_replacesArraysWithoutChangingMemoryMappedOnes(self):
+        """Replaces arrays without changing memory mapped ones."""
+        with patch.dict("sys.modules"):
+            from napytau.import_export.writer.file_writer import FileWriter
+
+            with tempfile.TemporaryDirectory() as directory:
+                FileWriter.write_arrays(
+                    PurePath(directory), {"values": np.array([1.0, 2.0])}
+                )
+                mapped_values = np.load(
+                    os.path.join(directory, "values.npy"), mmap_mode="r"
+                )
+
+                FileWriter.write_arrays(
+                    PurePath(directory), {"values": np.array([3.0, 4.0, 5.0])}
+                )
+
+                np.testing.assert_array_equal(mapped_values, [1.0, 2.0])
+                np.testing.assert_array_equal(
+                    np.load(os.path.join(directory, "values.npy")), [3.0, 4.0, 5.0]
+                )
+                self.assertEqual(os.listdir(directory), ["values.npy"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import sys
 import unittest
 from argparse import Namespace
 from unittest.mock import MagicMock, patch
@@ -53,6 +54,28 @@ class MainUnitTest(unittest.TestCase):
             main()
             self.assertEqual(len(gui_mock.init.mock_calls), 1)
 
+    def test_doesNotImportTheGuiIfTheHeadlessFlagIsSupplied(self) -> None:
+        """Does not import the GUI if the headless flag is supplied"""
+        parser_mock, _, headless_mock = set_up_mocks()
+        with patch.dict(
+            "sys.modules",
+            {
+                "napytau.headless.headless_kernel": headless_mock,
+                "napytau.cli.parser": parser_mock,
+            },
+        ):
+            sys.modules.pop("napytau.gui.app", None)
+            sys.modules.pop("napytau.main", None)
+            parser_mock.parse_cli_arguments.return_value = Namespace(
+                headless=True, filename=None
+            )
+
+            from napytau.main import main
+
+            main()
+            self.assertEqual(len(headless_mock.init.mock_calls), 1)
+            self.assertNotIn("napytau.gui.app", sys.modules)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from napytau.util.model.ValueErrorPairCollection import ValueErrorPairCollection
+from napytau.util.model.value_error_pair import ValueErrorPair
+
+
+class ValueErrorPairCollectionUnitTest(unittest.TestCase):
+    def test_canProvideValuesAndErrorsOfItsElements(self):
+        """Can provide values and errors of its elements"""
+        collection = ValueErrorPairCollection(
+            [ValueErrorPair(1.0, 0.1), ValueErrorPair(2.0, 0.2)]
+        )
+
+        np.testing.assert_array_equal(collection.get_values(), np.array([1.0, 2.0]))
+        np.testing.assert_array_equal(collection.get_errors(), np.array([0.1, 0.2]))
+
+    def test_canBeBackedByArraysWithoutCopyingThem(self):
+        """Can be backed by arrays without copying them"""
+        values = np.array([1.0, 2.0])
+        errors = np.array([0.1, 0.2])
+
+        collection = ValueErrorPairCollection.from_arrays(values, errors)
+
+        self.assertTrue(np.shares_memory(collection.get_values(), values))
+        self.assertTrue(np.shares_memory(collection.get_errors(), errors))
+        self.assertFalse(collection.get_values().flags.writeable)
+        self.assertEqual(len(collection), 2)
+
+    def test_createsElementsOfArrayBackedCollectionsOnDemand(self):
+        """Creates elements of array backed collections on demand"""
+        collection = ValueErrorPairCollection.from_arrays(
+            np.array([1.0, 2.0]), np.array([0.1, 0.2])
+        )
+
+        self.assertEqual(collection[1], ValueErrorPair(2.0, 0.2))
+        self.assertEqual(
+            collection,
+            ValueErrorPairCollection(
+                [ValueErrorPair(1.0, 0.1), ValueErrorPair(2.0, 0.2)]
+            ),
+        )
+
+    def test_raisesAnErrorForArraysOfDifferentLengths(self):
+        """Raises an error for arrays of different lengths"""
+        with self.assertRaises(ValueError):
+            ValueErrorPairCollection.from_arrays(np.array([1.0]), np.array([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
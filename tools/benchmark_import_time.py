@@ -0,0 +1,89 @@
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules that are only needed by the GUI and must never be loaded by a headless run
+GUI_MODULES = ["tkinter", "customtkinter", "matplotlib"]
+
+
+def measure_import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Imports the module in a fresh interpreter with -X importtime and returns the
+    self and cumulative import time in microseconds of every module loaded.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times: Dict[str, Tuple[int, int]] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = (int(self_time), int(cumulative_time))
+
+    return import_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measures the import time of the headless path"
+    )
+    parser.add_argument(
+        "--module",
+        type=str,
+        default="napytau.headless.headless_kernel",
+        help="The module to import",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of measurements, the fastest one is reported",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="The number of modules with the highest cumulative time to list",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="Fail if the import takes longer than this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    measurements = [measure_import_times(args.module) for _ in range(args.repeat)]
+    import_times = min(
+        measurements, key=lambda measurement: measurement[args.module][1]
+    )
+    total_time = import_times[args.module][1] / 1000
+
+    print(f"Importing {args.module} took {total_time:.1f} ms")
+    print(f"{'cumulative [ms]':>16} {'self [ms]':>10}  module")
+    top_modules: List[Tuple[str, Tuple[int, int]]] = sorted(
+        import_times.items(), key=lambda item: item[1][1], reverse=True
+    )[: args.top]
+    for name, (self_time, cumulative_time) in top_modules:
+        print(f"{cumulative_time / 1000:>16.1f} {self_time / 1000:>10.1f}  {name}")
+
+    failed = False
+    loaded_gui_modules = [name for name in GUI_MODULES if name in import_times]
+    if loaded_gui_modules:
+        print(f"GUI modules were loaded: {', '.join(loaded_gui_modules)}")
+        failed = True
+    if args.budget is not None and total_time > args.budget:
+        print(f"The import exceeded the budget of {args.budget:.1f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()